@@ -14,8 +14,52 @@ __author__ = 'irwan@kartoza.com'
 __date__ = '13/06/2023'
 __copyright__ = ('Copyright 2023, Unicef')
 
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+AFTER_QUERY_PARAM = 'after'
+
+
+def encode_cursor(values: list) -> str:
+    """
+    Return the opaque token of the keys of the last row of a page.
+
+    :param values: Values of the keys.
+    :type values: list
+    :return: The token.
+    :rtype: str
+    """
+    return base64.urlsafe_b64encode(
+        json.dumps(values, default=str).encode()
+    ).decode()
+
+
+def decode_cursor(token: str) -> list:
+    """
+    Return the keys of the token, None if there is no token.
+
+    :param token: The token of :func:`encode_cursor`.
+    :type token: str
+    :return: Values of the keys.
+    :rtype: list
+    :raises NotFound: If the token is invalid.
+    """
+    if not token:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list):
+        raise NotFound('Invalid after token.')
+    return values
 
 
 class Pagination(PageNumberPagination):
@@ -68,3 +112,140 @@ class GeojsonPagination(Pagination):
         :rtype: dict
         """
         return data
+
+
+class KeysetPagination(BasePagination):
+    """Keyset pagination for API.
+
+    The page is the rows after the keys of the last row of the previous
+    page, so it does not scan the previous rows like the offset does.
+    The keys are the ordering of the view, ``get_keyset_ordering``,
+    which needs to be unique, e.g. ending with the id.
+    """
+
+    page_size = settings.DEFAULT_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    after_query_param = AFTER_QUERY_PARAM
+    ordering = ['id']
+
+    def get_page_size(self, request):
+        """
+        Return page size of the request.
+
+        :param request: The request.
+        :type request: Request
+        :return: The page size.
+        :rtype: int
+        """
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return page_size
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    @staticmethod
+    def keyset_filter(ordering: list, values: list) -> Q:
+        """
+        Return filter of the rows after the keys.
+
+        :param ordering: The ordering fields, prefixed by - if descending.
+        :type ordering: list
+        :param values: Values of the keys of the last row.
+        :type values: list
+        :return: The filter.
+        :rtype: Q
+        """
+        query = Q()
+        for idx in reversed(range(len(ordering))):
+            field = ordering[idx].lstrip('-')
+            lookup = 'lt' if ordering[idx].startswith('-') else 'gt'
+            after = Q(**{f'{field}__{lookup}': values[idx]})
+            if idx < len(ordering) - 1:
+                after |= Q(**{field: values[idx]}) & query
+            query = after
+        return query
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return the rows of the page after the token.
+
+        :param queryset: The queryset.
+        :type queryset: QuerySet
+        :param request: The request.
+        :type request: Request
+        :param view: The view, that can define ``get_keyset_ordering``.
+        :type view: APIView
+        :return: The rows of the page.
+        :rtype: list
+        :raises NotFound: If the token does not match the ordering.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if view is not None and hasattr(view, 'get_keyset_ordering'):
+            self.ordering = view.get_keyset_ordering()
+
+        queryset = queryset.order_by(*self.ordering)
+        after = decode_cursor(
+            request.query_params.get(self.after_query_param)
+        )
+        if after:
+            if len(after) != len(self.ordering):
+                raise NotFound('Invalid after token.')
+            queryset = queryset.filter(
+                self.keyset_filter(self.ordering, after)
+            )
+
+        # Query one more row to know if there is next page
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.after = None
+        if self.has_next:
+            self.after = encode_cursor(
+                [
+                    getattr(rows[-1], field.lstrip('-'))
+                    for field in self.ordering
+                ]
+            )
+        return rows
+
+    def get_next_link(self):
+        """
+        Return link of the next page, None if there is no next page.
+
+        :return: The url with the after token.
+        :rtype: str
+        """
+        if not self.after:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.after_query_param, self.after)
+
+    def get_paginated_response_data(self, data):
+        """
+        Build and return the paginated response data structure.
+
+        :param data: Serialized list of objects for the current page.
+        :type data: list or dict
+        :return: Dictionary containing pagination metadata and results.
+        :rtype: dict
+        """
+        return {
+            'next': self.get_next_link(),
+            'after': self.after,
+            'page_size': self.page_size,
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        """
+        Generate the paginated :class:`Response` object for the API.
+
+        :param data: Serialized data for the current page.
+        :type data: list or dict
+        :return: A REST framework :class:`Response` containing paginated data.
+        :rtype: rest_framework.response.Response
+        """
+        return Response(self.get_paginated_response_data(data))
@@ -212,3 +212,38 @@ if DATA_RESTORER_ENABLED:
         'geosight.data_restorer.'
         'context_processors.data_restorer_context_processors'
     ]
+
+# ----------------------------------------
+# GeoRepo request
+# ----------------------------------------
+# Timeout in seconds of connecting and reading the GeoRepo response
+GEOREPO_REQUEST_CONNECT_TIMEOUT = float(
+    os.environ.get('GEOREPO_REQUEST_CONNECT_TIMEOUT', 10)
+)
+GEOREPO_REQUEST_READ_TIMEOUT = float(
+    os.environ.get('GEOREPO_REQUEST_READ_TIMEOUT', 120)
+)
+# Retry of the idempotent requests, with exponential backoff
+GEOREPO_REQUEST_RETRIES = int(os.environ.get('GEOREPO_REQUEST_RETRIES', 3))
+GEOREPO_REQUEST_BACKOFF = float(
+    os.environ.get('GEOREPO_REQUEST_BACKOFF', 0.5)
+)
+GEOREPO_REQUEST_POOL_SIZE = int(
+    os.environ.get('GEOREPO_REQUEST_POOL_SIZE', 10)
+)
+
+# ----------------------------------------
+# Vector tile cache
+# ----------------------------------------
+# Directory of the cached vector tiles of reference datasets
+VECTOR_TILE_CACHE_ROOT = os.environ.get(
+    'VECTOR_TILE_CACHE_ROOT', os.path.join(MEDIA_ROOT, 'vector_tiles')  # noqa
+)
+# Maximum zoom that is generated when a reference dataset is imported
+VECTOR_TILE_SEED_MAX_ZOOM = int(
+    os.environ.get('VECTOR_TILE_SEED_MAX_ZOOM', 5)
+)
+# Maximum zoom that is cached, the tiles of higher zooms are not saved
+VECTOR_TILE_CACHE_MAX_ZOOM = int(
+    os.environ.get('VECTOR_TILE_CACHE_MAX_ZOOM', VECTOR_TILE_SEED_MAX_ZOOM)
+)
@@ -16,10 +16,13 @@ __copyright__ = ('Copyright 2023, Unicef')
 
 import base64
 import gzip
+import io
+import json
 import os
 import random
 import string
 import uuid
+from datetime import date, datetime
 from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
 
 from django.conf import settings
@@ -244,6 +247,69 @@ def pg_value(value, attr=None):
     return f"'{set_value}'" if value else "NULL"
 
 
+def pg_copy_value(value):
+    """Format a value for the PostgreSQL COPY text format.
+
+    :param value: The value to format.
+    :type value: any
+    :returns: The escaped value, or the NULL marker if ``value`` is None.
+    :rtype: str
+    """
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    return str(value).replace(
+        '\\', '\\\\'
+    ).replace(
+        '\t', '\\t'
+    ).replace(
+        '\n', '\\n'
+    ).replace(
+        '\r', '\\r'
+    )
+
+
+def pg_copy_rows(cursor, table_name, columns, rows, step=50000):
+    """Stream rows into a table with ``COPY ... FROM STDIN``.
+
+    The rows are written in chunks so the buffer stays bounded
+    regardless of the number of rows.
+
+    :param cursor: Database cursor to run the COPY on.
+    :type cursor: django.db.backends.utils.CursorWrapper
+    :param table_name: Name of the target table.
+    :type table_name: str
+    :param columns: Column names, in the order of each row.
+    :type columns: list[str]
+    :param rows: Iterable of rows; each row is a sequence of values.
+    :type rows: iterable
+    :param step: Number of rows written per COPY chunk.
+    :type step: int
+    :returns: Number of rows copied.
+    :rtype: int
+    """
+    query = f'COPY {table_name} ({", ".join(columns)}) FROM STDIN'
+    buffer = io.StringIO()
+    count = 0
+    for row in rows:
+        buffer.write('\t'.join([pg_copy_value(value) for value in row]))
+        buffer.write('\n')
+        count += 1
+        if count % step == 0:
+            buffer.seek(0)
+            cursor.copy_expert(query, buffer)
+            buffer = io.StringIO()
+    if buffer.tell():
+        buffer.seek(0)
+        cursor.copy_expert(query, buffer)
+    return count
+
+
 def compress_text(text):
     """Compress a UTF-8 string with gzip and return it as a base64 string.
 
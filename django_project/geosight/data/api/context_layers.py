@@ -103,12 +103,17 @@ class ContextLayerZonalAnalysisAPI(APIView):
                 "'aggregation_field' is required in payload"
             )
 
+        per_geometry = request.data.get('per_geometry', False) in [
+            True, 'true', 'True'
+        ]
+
         zonal_analysis = ZonalAnalysis.objects.create(
             uuid=uuid.uuid4(),
             context_layer=layer,
             aggregation=aggregation,
             aggregation_field=aggregation_field,
             geom_compressed=compress_text(json.dumps(geometry_datas)),
+            per_geometry=per_geometry
         )
         run_zonal_analysis.delay(zonal_analysis.uuid.hex)
 
@@ -14,14 +14,16 @@ __author__ = 'irwan@kartoza.com'
 __date__ = '29/11/2023'
 __copyright__ = ('Copyright 2023, Unicef')
 
+from django.core.exceptions import FieldDoesNotExist
 from rest_framework.authentication import (
     SessionAuthentication, BasicAuthentication
 )
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 
 from core.api.base import FilteredAPI
 from core.auth import BearerAuthentication
-from core.pagination import Pagination
+from core.pagination import AFTER_QUERY_PARAM, KeysetPagination, Pagination
 from geosight.data.api.v1.base import BaseApiV1
 from geosight.data.models.indicator import (
     Indicator, IndicatorValue
@@ -36,11 +38,69 @@ class BaseIndicatorValueApi(FilteredAPI):
     ]
     permission_classes = (IsAuthenticated,)
     pagination_class = Pagination
+    keyset_pagination_class = KeysetPagination
     model = IndicatorValue
-    filter_query_exclude = BaseApiV1.non_filtered_keys
+    filter_query_exclude = BaseApiV1.non_filtered_keys + [AFTER_QUERY_PARAM]
     extra_exclude_fields = []
     default_sort = None
 
+    @property
+    def paginator(self):
+        """
+        Return the paginator of the request.
+
+        The keyset pagination is used when the request has ``after``
+        parameter, an empty one for the first page.
+
+        :return: The paginator instance.
+        :rtype: BasePagination
+        """
+        if not hasattr(self, '_paginator'):
+            if (
+                    self.keyset_pagination_class and
+                    AFTER_QUERY_PARAM in self.request.GET
+            ):
+                self._paginator = self.keyset_pagination_class()
+            else:
+                return super().paginator
+        return self._paginator
+
+    def get_keyset_ordering(self):
+        """
+        Return the ordering of the keyset pagination.
+
+        It is the requested sort followed by ``id``, in the direction of
+        the last sort field. The sort fields need to be not null fields of
+        the model, the keys of rows can't be compared otherwise.
+
+        :return: List of ordering fields.
+        :rtype: list
+        :raises ValidationError: If a sort field is not supported.
+        """
+        sort = self.request.GET.get('sort')
+        if not sort:
+            return ['id']
+        ordering = []
+        for sort_field in sort.split(','):
+            name = sort_field.lstrip('-')
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                field = None
+            if (
+                    not field or not field.concrete or field.null or
+                    (field.is_relation and name != field.attname)
+            ):
+                raise ValidationError(
+                    f'Sort by {name} is not supported with '
+                    f'{AFTER_QUERY_PARAM}.'
+                )
+            ordering.append(sort_field)
+            if name == 'id':
+                return ordering
+        ordering.append('-id' if ordering[-1].startswith('-') else 'id')
+        return ordering
+
     def get_queryset(self):
         """
         Retrieve a filtered queryset of indicator values based on permissions.
@@ -48,11 +108,24 @@ class BaseIndicatorValueApi(FilteredAPI):
         :return: The filtered queryset of indicator values.
         :rtype: QuerySet
         """
+        return self.get_model_queryset(self.model)
+
+    def get_model_queryset(self, model):
+        """
+        Retrieve a filtered queryset of model based on permissions.
+
+        The model needs to have indicator_id field.
+
+        :param model: The model that will be queried.
+        :type model: Model
+        :return: The filtered queryset of the model.
+        :rtype: QuerySet
+        """
         query = None
         is_admin = False
         try:
             if self.request.user.profile.is_admin:
-                query = self.model.objects.all()
+                query = model.objects.all()
                 is_admin = True
         except AttributeError:
             pass
@@ -65,9 +138,9 @@ class BaseIndicatorValueApi(FilteredAPI):
                 'id', flat=True
             )
             if not indicators.count():
-                query = self.model.objects.none()
+                query = model.objects.none()
             else:
-                query = self.model.objects.filter(
+                query = model.objects.filter(
                     indicator_id__in=indicators
                 )
 
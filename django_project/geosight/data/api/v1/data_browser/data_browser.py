@@ -24,6 +24,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from core.api_utils import common_api_params, ApiTag, ApiParams
+from core.pagination import AFTER_QUERY_PARAM
 from core.utils import string_is_true
 from geosight.data.api.v1.base import BaseApiV1
 from geosight.data.api.v1.indicator_value import IndicatorValueApiUtilities
@@ -31,6 +32,7 @@ from geosight.data.models.indicator import (
     Indicator, IndicatorValue, IndicatorValueRejectedError
 )
 from geosight.data.serializer.indicator import IndicatorValueSerializer
+from geosight.georepo.models.reference_layer import ReferenceLayerView
 from .base import BaseIndicatorValueApi
 
 
@@ -43,7 +45,7 @@ class BaseDataBrowserApiList(
     serializer_class = IndicatorValueSerializer
     filter_query_exclude = BaseApiV1.non_filtered_keys + [
         'group_admin_level', 'detail', 'frequency',
-        'time', 'geometry_code'
+        'time', 'geometry_code', AFTER_QUERY_PARAM
     ]
     extra_exclude_fields = ['permission']
     default_sort = 'id'
@@ -179,6 +181,9 @@ class DataBrowserApiList(
         """
         Handle POST request to save a new value for an indicator.
 
+        When the ``bulk`` query parameter is true, the payload is a list
+        of values and they are saved in bulk.
+
         :param request: The HTTP request object containing the data payload.
         :type request: HttpRequest
         :return: HTTP response with status 201 if
@@ -187,23 +192,11 @@ class DataBrowserApiList(
         """
         try:
             data = request.data
-            if not data.get('indicator_id', 0) and not data.get(
-                    'indicator_shortcode', None):
-                return HttpResponseBadRequest(
-                    'indicator_id or indicator_shortcode is required'
-                )
-
-            try:
-                indicator = Indicator.objects.get(
-                    id=data.get('indicator_id', 0)
-                )
-            except Indicator.DoesNotExist:
-                try:
-                    indicator = Indicator.objects.get(
-                        shortcode=data.get('indicator_shortcode', '')
-                    )
-                except Indicator.DoesNotExist:
-                    return HttpResponseBadRequest('Indicator does not exist')
+            if string_is_true(request.GET.get('bulk', False)):
+                return self.post_bulk(data)
+            indicator = self.get_indicator(data)
+            if not indicator:
+                return HttpResponseBadRequest('Indicator does not exist')
             indicator.save_value(
                 date=data['date'],
                 geom_id=data['geom_id'],
@@ -212,12 +205,78 @@ class DataBrowserApiList(
                 value=data['value'],
                 extras=data.get('attributes', {})
             )
+        except SuspiciousOperation as e:
+            return HttpResponseBadRequest(f'{e}')
         except KeyError as e:
             return HttpResponseBadRequest(f'{e} is required on payload')
         except Exception as e:
             return HttpResponseBadRequest(f'{e}')
         return Response(status.HTTP_201_CREATED)
 
+    def get_indicator(self, data):  # noqa: DOC503
+        """
+        Return indicator of the payload.
+
+        :param data: The payload with indicator_id or indicator_shortcode.
+        :type data: dict
+        :return: The indicator or None if it does not exist.
+        :rtype: Indicator | None
+        :raises SuspiciousOperation:
+            If indicator_id and indicator_shortcode are empty.
+        """
+        if not data.get('indicator_id', 0) and not data.get(
+                'indicator_shortcode', None):
+            raise SuspiciousOperation(
+                'indicator_id or indicator_shortcode is required'
+            )
+        try:
+            return Indicator.objects.get(
+                id=data.get('indicator_id', 0)
+            )
+        except Indicator.DoesNotExist:
+            try:
+                return Indicator.objects.get(
+                    shortcode=data.get('indicator_shortcode', '')
+                )
+            except Indicator.DoesNotExist:
+                return None
+
+    def post_bulk(self, data):
+        """
+        Save a list of values in bulk.
+
+        :param data: List of values with the same payload as single POST.
+        :type data: list[dict]
+        :return: HTTP response with status 201 if
+            the values are successfully saved.
+        :rtype: Response
+        """
+        try:
+            data = json.loads(data['data'])
+        except (TypeError, KeyError):
+            pass
+        rows = []
+        for row in data:
+            indicator = self.get_indicator(row)
+            if not indicator:
+                return HttpResponseBadRequest('Indicator does not exist')
+            reference_layer, _ = ReferenceLayerView.objects.get_or_create(
+                identifier=row['dataset_uuid']
+            )
+            entity, value, extras = indicator.clean_value(
+                date=row['date'],
+                geom_id=row['geom_id'],
+                reference_layer=reference_layer,
+                admin_level=row['admin_level'],
+                value=row['value'],
+                extras=row.get('attributes', {})
+            )
+            rows.append(
+                indicator.value_row(row['date'], entity.geom_id, value, extras)
+            )
+        IndicatorValue.bulk_save(rows)
+        return Response(status.HTTP_201_CREATED)
+
     @swagger_auto_schema(auto_schema=None)
     def put(self, request):
         """
@@ -241,6 +300,8 @@ class DataBrowserApiList(
                 data = json.loads(request.data['data'])
             except TypeError:
                 pass
+            if string_is_true(request.GET.get('bulk', False)):
+                return self.put_bulk(request, data)
             for row in data:
                 try:
                     value = IndicatorValue.objects.get(id=row['id'])
@@ -259,6 +320,52 @@ class DataBrowserApiList(
         except KeyError:
             return HttpResponseBadRequest('`data` is required on payload')
 
+    def put_bulk(self, request, data):
+        """
+        Batch update the value of data in bulk.
+
+        :param request: The HTTP request object.
+        :type request: HttpRequest
+        :param data: List of rows with ``id`` and ``value``.
+        :type data: list[dict]
+        :return: A response indicating the success or
+            failure of the operation.
+        :rtype: Response
+        """
+        edited_values = {}
+        for row in data:
+            try:
+                edited_values[int(row['id'])] = row['value']
+            except (TypeError, ValueError):
+                pass
+
+        permissions = {}
+        rows = []
+        values = IndicatorValue.objects.filter(
+            id__in=list(edited_values.keys())
+        ).select_related('indicator')
+        for value in values:
+            indicator = value.indicator
+            if indicator.id not in permissions:
+                permissions[indicator.id] = value.permissions(
+                    request.user
+                )['edit']
+            if not permissions[indicator.id]:
+                continue
+            edited_value = edited_values[value.id]
+            try:
+                indicator.validate(edited_value)
+            except IndicatorValueRejectedError as e:
+                return HttpResponseBadRequest(f'Indicator {indicator}: {e}')
+            row = indicator.value_row(
+                value.date, value.geom_id, edited_value
+            )
+            row['value'] = edited_value
+            row['value_str'] = value.value_str
+            rows.append(row)
+        IndicatorValue.bulk_save(rows)
+        return Response('OK')
+
     @swagger_auto_schema(
         operation_id='data-browser-delete',
         tags=[ApiTag.DATA_BROWSER],
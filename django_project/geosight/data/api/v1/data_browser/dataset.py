@@ -18,7 +18,7 @@ import json
 
 from django.contrib.postgres.aggregates import StringAgg
 from django.core.exceptions import SuspiciousOperation
-from django.db.models import Value, Count, F, Max, Min, CharField
+from django.db.models import Value, Count, F, Max, Min, CharField, Sum
 from django.db.models.functions import Concat, Cast
 from django.http import HttpResponseBadRequest
 from django.urls import reverse
@@ -33,7 +33,7 @@ from geosight.data.models.indicator import (
     Indicator
 )
 from geosight.data.models.indicator.indicator_value_dataset import (
-    IndicatorValueDataset
+    IndicatorValueDataset, IndicatorValueDatasetSummary
 )
 from geosight.data.serializer.indicator_value_dataset import (
     IndicatorValueDatasetSerializer
@@ -50,6 +50,14 @@ class BaseDatasetApiList:
     ]
     serializer_class = IndicatorValueDatasetSerializer
 
+    # Filters that can be answered by the summary table
+    summary_filter_fields = [
+        'indicator', 'indicator_id', 'indicator_name', 'indicator_shortcode',
+        'country', 'country_id', 'country_name', 'country_geom_id',
+        'country_concept_uuid', 'admin_level',
+        'reference_layer_id', 'dataset_uuid', 'reference_layer_uuid'
+    ]
+
     @property
     def group_admin_level(self):
         """Check if query should be grouped by admin level.
@@ -61,6 +69,27 @@ class BaseDatasetApiList:
             'group_admin_level', 'False'
         ).lower() == 'true'
 
+    @property
+    def use_summary(self):
+        """Check if the query can be answered by the summary table.
+
+        The summary table is used when every filter is on the fields
+        of :class:`IndicatorValueDatasetSummary`.
+
+        :return: True if the summary table can be used.
+        :rtype: bool
+        """
+        ignores = self.filter_query_exclude + [
+            'sort', 'distinct', 'encoding', 'Content-Type', 'q'
+        ]
+        for param in self.request.GET.keys():
+            field = param.split('__')[0]
+            if field in ignores:
+                continue
+            if field not in self.summary_filter_fields:
+                return False
+        return True
+
     def get_queryset(self):
         """Build the queryset for dataset API.
 
@@ -68,21 +97,41 @@ class BaseDatasetApiList:
         aggregated by indicator, country,
         and optionally grouped by admin level.
 
+        The data is read from :class:`IndicatorValueDatasetSummary`,
+        it falls back to aggregating the indicator values
+        when the filters are not on the summary fields.
+
         :return: Queryset containing dataset information.
         :rtype: QuerySet
         """
+        if self.use_summary:
+            query = self.filter_query(
+                self.request,
+                self.get_model_queryset(IndicatorValueDatasetSummary),
+                self.filter_query_exclude,
+                sort=self.default_sort
+            )
+            data_count = Sum('data_count')
+            start_date = Min('start_date')
+            end_date = Max('end_date')
+        else:
+            query = super().get_queryset()
+            data_count = Count('*')
+            start_date = Min('date')
+            end_date = Max('date')
+
         if not self.group_admin_level:
-            query = super().get_queryset().values(
+            query = query.values(
                 'indicator_id', 'country_id', 'admin_level'
             ).annotate(
-                data_count=Count('*'),
+                data_count=data_count,
                 indicator_name=F('indicator_name'),
                 indicator_shortcode=F('indicator_shortcode'),
                 country_concept_uuid=F('country_concept_uuid'),
                 country_geom_id=F('country_geom_id'),
                 country_name=F('country_name'),
-                start_date=Min('date'),
-                end_date=Max('date'),
+                start_date=start_date,
+                end_date=end_date,
                 string_id=Concat(
                     Cast(F('indicator_id'), CharField()),
                     Value('-'),
@@ -101,7 +150,7 @@ class BaseDatasetApiList:
                 )
             return query
         else:
-            query = super().get_queryset().values(
+            query = query.values(
                 'indicator_id', 'country_id'
             ).annotate(
                 admin_level=StringAgg(
@@ -110,14 +159,14 @@ class BaseDatasetApiList:
                     distinct=True,
                     output_field=CharField()
                 ),
-                data_count=Count('*'),
+                data_count=data_count,
                 indicator_name=F('indicator_name'),
                 indicator_shortcode=F('indicator_shortcode'),
                 country_concept_uuid=F('country_concept_uuid'),
                 country_geom_id=F('country_geom_id'),
                 country_name=F('country_name'),
-                start_date=Min('date'),
-                end_date=Max('date'),
+                start_date=start_date,
+                end_date=end_date,
                 string_id=Concat(
                     Cast(F('indicator_id'), CharField()),
                     Value('-'),
@@ -144,6 +193,9 @@ class DatasetApiList(
 ):
     """Return Dataset with indicator, country and admin level."""
 
+    # The rows are groups, that do not have unique keys
+    keyset_pagination_class = None
+
     def get_serializer(self, *args, **kwargs):  # noqa
         """Return the serializer for the dataset.
 
@@ -29,7 +29,9 @@ from rest_framework.response import Response
 from rest_framework.utils.urls import replace_query_param
 
 from core.api_utils import ApiTag
-from core.pagination import Pagination
+from core.pagination import (
+    AFTER_QUERY_PARAM, Pagination, decode_cursor, encode_cursor
+)
 from geosight.data.models.related_table import RelatedTable
 from geosight.data.serializer.related_table import (
     RelatedTableGeoDataSerializer
@@ -124,7 +126,16 @@ class RelatedTableGeoDataViewSet(viewsets.ReadOnlyModelViewSet):
         page_size = request.GET.get('page_size', settings.DEFAULT_PAGE_SIZE)
         page = request.GET.get('page', None)
         offset = None
-        if page is not None:
+        after = None
+        is_keyset = AFTER_QUERY_PARAM in request.GET
+        if is_keyset:
+            # The page after the id of the token, empty for the first page
+            after = decode_cursor(request.GET[AFTER_QUERY_PARAM])
+            try:
+                after = int(after[0]) if after else 0
+            except (ValueError, TypeError):
+                return HttpResponseBadRequest('Invalid after token.')
+        elif page is not None:
             page = int(page)
             if page == 0:
                 return HttpResponseBadRequest("Page can't be zero")
@@ -139,13 +150,25 @@ class RelatedTableGeoDataViewSet(viewsets.ReadOnlyModelViewSet):
             max_time=max_time.isoformat(),
             min_time=min_time,
             limit=page_size,
-            offset=offset
+            offset=offset,
+            after=after
         )
 
         # -------------------------------------
         # If needs pagination
         # -------------------------------------
-        if page is not None:
+        if is_keyset:
+            next_after = encode_cursor([data[-1]['id']]) if has_next else None
+            data = {
+                'next': replace_query_param(
+                    self.request.build_absolute_uri(),
+                    AFTER_QUERY_PARAM, next_after
+                ) if next_after else None,
+                'after': next_after,
+                'page_size': int(page_size),
+                'results': data
+            }
+        elif page is not None:
             pagination = RelatedTableValuesPagination()
             pagination.page_number = int(page)
             pagination.page_size = page_size
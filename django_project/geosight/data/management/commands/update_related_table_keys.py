@@ -0,0 +1,32 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from django.core.management.base import BaseCommand
+
+from geosight.data.models.dashboard import Dashboard
+
+
+class Command(BaseCommand):
+    """Update the keys of related tables from the dashboards."""
+
+    help = 'Update the geography code and date keys of related table rows.'
+
+    def handle(self, *args, **options):
+        """Command handler."""
+        for dashboard in Dashboard.objects.filter(
+                dashboardrelatedtable__isnull=False
+        ).distinct():
+            dashboard.update_related_table_keys()
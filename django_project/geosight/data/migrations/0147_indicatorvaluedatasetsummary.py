@@ -0,0 +1,44 @@
+# Generated by Django 3.2.16 on 2026-10-18 08:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from geosight.data.migrations.sql.utils import load_sql
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geosight_georepo', '0025_alter_referencelayerview_modified_at'),
+        ('geosight_data', '0146_auto_20260611_0751'),
+    ]
+
+    triggers = load_sql('triggers', 'indicator_value_dataset_summary.sql')
+    drop_triggers = load_sql(
+        'triggers', 'indicator_value_dataset_summary_drop.sql'
+    )
+
+    operations = [
+        migrations.CreateModel(
+            name='IndicatorValueDatasetSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('admin_level', models.IntegerField(blank=True, null=True)),
+                ('indicator_name', models.CharField(blank=True, max_length=512, null=True)),
+                ('indicator_shortcode', models.CharField(blank=True, max_length=512, null=True)),
+                ('country_name', models.CharField(blank=True, max_length=512, null=True)),
+                ('country_geom_id', models.CharField(blank=True, max_length=256, null=True)),
+                ('country_concept_uuid', models.CharField(blank=True, max_length=256, null=True)),
+                ('data_count', models.IntegerField(default=0)),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('country', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='geosight_georepo.entity')),
+                ('indicator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='geosight_data.indicator')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='indicatorvaluedatasetsummary',
+            index=models.Index(fields=['indicator', 'country', 'admin_level'], name='geosight_da_indicat_db121b_idx'),
+        ),
+        migrations.RunSQL(triggers, drop_triggers),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geosight_data', '0147_indicatorvaluedatasetsummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='zonalanalysis',
+            name='per_geometry',
+            field=models.BooleanField(default=False, help_text='Aggregate every geometry separately. The result is the list of aggregate per geometry.'),
+        ),
+    ]
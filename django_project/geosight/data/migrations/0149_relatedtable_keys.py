@@ -0,0 +1,46 @@
+# Generated by Django 3.2.16 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geosight_data', '0148_zonalanalysis_per_geometry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='relatedtable',
+            name='date_field',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='relatedtable',
+            name='date_format',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='relatedtable',
+            name='geography_code_field_name',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='relatedtablerow',
+            name='date_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='relatedtablerow',
+            name='geo_code',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='relatedtablerow',
+            index=models.Index(fields=['table', 'geo_code'], name='geosight_da_table_i_cda355_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='relatedtablerow',
+            index=models.Index(fields=['table', 'date_time'], name='geosight_da_table_i_8cd7fd_idx'),
+        ),
+    ]
@@ -0,0 +1,293 @@
+-- One summary row per indicator x country x admin level, NULL included --
+CREATE UNIQUE INDEX geosight_data_indicatorvaluedatasetsummary_key
+    ON geosight_data_indicatorvaluedatasetsummary (
+                                                   indicator_id,
+                                                   COALESCE(country_id, 0),
+                                                   COALESCE(admin_level, -1)
+        );
+
+-- Add the aggregated rows to the summary --
+CREATE OR REPLACE FUNCTION geosight_data_indicatorvaluedatasetsummary_add(
+    _rows JSONB
+) RETURNS VOID AS
+$$
+BEGIN
+    INSERT INTO geosight_data_indicatorvaluedatasetsummary AS summary (
+        indicator_id, country_id, admin_level,
+        indicator_name, indicator_shortcode,
+        country_name, country_geom_id, country_concept_uuid,
+        data_count, start_date, end_date
+    )
+    SELECT indicator_id,
+           country_id,
+           admin_level,
+           indicator_name,
+           indicator_shortcode,
+           country_name,
+           country_geom_id,
+           country_concept_uuid,
+           data_count,
+           start_date,
+           end_date
+    FROM jsonb_to_recordset(_rows) AS rows(
+                                           indicator_id INTEGER,
+                                           country_id INTEGER,
+                                           admin_level INTEGER,
+                                           indicator_name VARCHAR,
+                                           indicator_shortcode VARCHAR,
+                                           country_name VARCHAR,
+                                           country_geom_id VARCHAR,
+                                           country_concept_uuid VARCHAR,
+                                           data_count INTEGER,
+                                           start_date DATE,
+                                           end_date DATE
+        )
+    ORDER BY indicator_id, country_id, admin_level
+    ON CONFLICT (
+        indicator_id, COALESCE(country_id, 0), COALESCE(admin_level, -1)
+        ) DO UPDATE SET data_count           = summary.data_count + EXCLUDED.data_count,
+                        start_date           = LEAST(summary.start_date, EXCLUDED.start_date),
+                        end_date             = GREATEST(summary.end_date, EXCLUDED.end_date),
+                        indicator_name       = EXCLUDED.indicator_name,
+                        indicator_shortcode  = EXCLUDED.indicator_shortcode,
+                        country_name         = EXCLUDED.country_name,
+                        country_geom_id      = EXCLUDED.country_geom_id,
+                        country_concept_uuid = EXCLUDED.country_concept_uuid;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Remove the aggregated rows from the summary --
+-- Dates are recalculated only when the removed rows were on the boundary --
+CREATE OR REPLACE FUNCTION geosight_data_indicatorvaluedatasetsummary_remove(
+    _rows JSONB
+) RETURNS VOID AS
+$$
+DECLARE
+    _ids          INTEGER[];
+    _boundary_ids INTEGER[];
+BEGIN
+    WITH removed AS (
+        SELECT *
+        FROM jsonb_to_recordset(_rows) AS rows(
+                                               indicator_id INTEGER,
+                                               country_id INTEGER,
+                                               admin_level INTEGER,
+                                               data_count INTEGER,
+                                               start_date DATE,
+                                               end_date DATE
+            )
+    ),
+         updated AS (
+             UPDATE geosight_data_indicatorvaluedatasetsummary AS summary
+                 SET data_count = summary.data_count - removed.data_count
+                 FROM removed
+                 WHERE summary.indicator_id = removed.indicator_id
+                     AND COALESCE(summary.country_id, 0) = COALESCE(removed.country_id, 0)
+                     AND COALESCE(summary.admin_level, -1) = COALESCE(removed.admin_level, -1)
+                 RETURNING summary.id,
+                     summary.data_count,
+                     removed.start_date <= summary.start_date
+                         OR removed.end_date >= summary.end_date AS boundary
+         )
+    SELECT array_agg(id) FILTER (WHERE data_count <= 0),
+           array_agg(id) FILTER (WHERE data_count > 0 AND boundary)
+    INTO _ids, _boundary_ids
+    FROM updated;
+
+    IF _ids IS NOT NULL THEN
+        DELETE
+        FROM geosight_data_indicatorvaluedatasetsummary
+        WHERE id = ANY (_ids);
+    END IF;
+
+    IF _boundary_ids IS NOT NULL THEN
+        UPDATE geosight_data_indicatorvaluedatasetsummary AS summary
+        SET (start_date, end_date) = (
+            SELECT MIN(value.date), MAX(value.date)
+            FROM geosight_data_indicatorvalue AS value
+            WHERE value.indicator_id = summary.indicator_id
+              AND (
+                    value.country_id = summary.country_id
+                    OR (value.country_id IS NULL AND summary.country_id IS NULL)
+                )
+              AND (
+                    value.admin_level = summary.admin_level
+                    OR (value.admin_level IS NULL AND summary.admin_level IS NULL)
+                )
+        )
+        WHERE summary.id = ANY (_boundary_ids);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Trigger function, for the rows of statement --
+CREATE OR REPLACE FUNCTION geosight_data_indicatorvalue_summary_trigger()
+    RETURNS TRIGGER AS
+$$
+DECLARE
+    _added   JSONB;
+    _removed JSONB;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT jsonb_agg(keys)
+        INTO _added
+        FROM (
+                 SELECT indicator_id,
+                        country_id,
+                        admin_level,
+                        MAX(indicator_name)       AS indicator_name,
+                        MAX(indicator_shortcode)  AS indicator_shortcode,
+                        MAX(country_name)         AS country_name,
+                        MAX(country_geom_id)      AS country_geom_id,
+                        MAX(country_concept_uuid) AS country_concept_uuid,
+                        COUNT(*)                  AS data_count,
+                        MIN(date)                 AS start_date,
+                        MAX(date)                 AS end_date
+                 FROM new_rows
+                 GROUP BY indicator_id, country_id, admin_level
+             ) AS keys;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT jsonb_agg(keys)
+        INTO _removed
+        FROM (
+                 SELECT indicator_id,
+                        country_id,
+                        admin_level,
+                        COUNT(*)  AS data_count,
+                        MIN(date) AS start_date,
+                        MAX(date) AS end_date
+                 FROM old_rows
+                 GROUP BY indicator_id, country_id, admin_level
+             ) AS keys;
+    ELSE
+        -- Only the rows that moved to other key or date --
+        SELECT jsonb_agg(keys)
+        INTO _removed
+        FROM (
+                 SELECT old_rows.indicator_id,
+                        old_rows.country_id,
+                        old_rows.admin_level,
+                        COUNT(*)           AS data_count,
+                        MIN(old_rows.date) AS start_date,
+                        MAX(old_rows.date) AS end_date
+                 FROM old_rows
+                          JOIN new_rows ON new_rows.id = old_rows.id
+                 WHERE (
+                           old_rows.indicator_id, old_rows.country_id,
+                           old_rows.admin_level, old_rows.date
+                           ) IS DISTINCT FROM (
+                           new_rows.indicator_id, new_rows.country_id,
+                           new_rows.admin_level, new_rows.date
+                           )
+                 GROUP BY old_rows.indicator_id, old_rows.country_id,
+                          old_rows.admin_level
+             ) AS keys;
+
+        -- The rows that are added or just renamed --
+        SELECT jsonb_agg(keys)
+        INTO _added
+        FROM (
+                 SELECT new_rows.indicator_id,
+                        new_rows.country_id,
+                        new_rows.admin_level,
+                        MAX(new_rows.indicator_name)       AS indicator_name,
+                        MAX(new_rows.indicator_shortcode)  AS indicator_shortcode,
+                        MAX(new_rows.country_name)         AS country_name,
+                        MAX(new_rows.country_geom_id)      AS country_geom_id,
+                        MAX(new_rows.country_concept_uuid) AS country_concept_uuid,
+                        COUNT(*) FILTER (WHERE moved)      AS data_count,
+                        MIN(new_rows.date) FILTER (WHERE moved) AS start_date,
+                        MAX(new_rows.date) FILTER (WHERE moved) AS end_date
+                 FROM new_rows
+                          JOIN old_rows ON old_rows.id = new_rows.id,
+                      LATERAL (
+                          SELECT (
+                                     old_rows.indicator_id, old_rows.country_id,
+                                     old_rows.admin_level, old_rows.date
+                                     ) IS DISTINCT FROM (
+                                     new_rows.indicator_id, new_rows.country_id,
+                                     new_rows.admin_level, new_rows.date
+                                     ) AS moved
+                          ) AS state
+                 WHERE moved
+                    OR (
+                           old_rows.indicator_name, old_rows.indicator_shortcode,
+                           old_rows.country_name, old_rows.country_geom_id,
+                           old_rows.country_concept_uuid
+                           ) IS DISTINCT FROM (
+                           new_rows.indicator_name, new_rows.indicator_shortcode,
+                           new_rows.country_name, new_rows.country_geom_id,
+                           new_rows.country_concept_uuid
+                           )
+                 GROUP BY new_rows.indicator_id, new_rows.country_id,
+                          new_rows.admin_level
+             ) AS keys;
+    END IF;
+
+    IF _removed IS NOT NULL THEN
+        PERFORM geosight_data_indicatorvaluedatasetsummary_remove(_removed);
+    END IF;
+    IF _added IS NOT NULL THEN
+        PERFORM geosight_data_indicatorvaluedatasetsummary_add(_added);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION geosight_data_indicatorvalue_summary_truncate()
+    RETURNS TRIGGER AS
+$$
+BEGIN
+    DELETE FROM geosight_data_indicatorvaluedatasetsummary;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Triggers --
+CREATE TRIGGER geosight_data_indicatorvalue_summary_insert
+    AFTER INSERT
+    ON geosight_data_indicatorvalue
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+EXECUTE PROCEDURE geosight_data_indicatorvalue_summary_trigger();
+
+CREATE TRIGGER geosight_data_indicatorvalue_summary_update
+    AFTER UPDATE
+    ON geosight_data_indicatorvalue
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+EXECUTE PROCEDURE geosight_data_indicatorvalue_summary_trigger();
+
+CREATE TRIGGER geosight_data_indicatorvalue_summary_delete
+    AFTER DELETE
+    ON geosight_data_indicatorvalue
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+EXECUTE PROCEDURE geosight_data_indicatorvalue_summary_trigger();
+
+CREATE TRIGGER geosight_data_indicatorvalue_summary_truncate
+    AFTER TRUNCATE
+    ON geosight_data_indicatorvalue
+    FOR EACH STATEMENT
+EXECUTE PROCEDURE geosight_data_indicatorvalue_summary_truncate();
+
+-- Initial data --
+INSERT INTO geosight_data_indicatorvaluedatasetsummary (
+    indicator_id, country_id, admin_level,
+    indicator_name, indicator_shortcode,
+    country_name, country_geom_id, country_concept_uuid,
+    data_count, start_date, end_date
+)
+SELECT indicator_id,
+       country_id,
+       admin_level,
+       MAX(indicator_name),
+       MAX(indicator_shortcode),
+       MAX(country_name),
+       MAX(country_geom_id),
+       MAX(country_concept_uuid),
+       COUNT(*),
+       MIN(date),
+       MAX(date)
+FROM geosight_data_indicatorvalue
+GROUP BY indicator_id, country_id, admin_level;
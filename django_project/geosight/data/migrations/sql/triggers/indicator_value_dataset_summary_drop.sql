@@ -0,0 +1,9 @@
+DROP TRIGGER IF EXISTS geosight_data_indicatorvalue_summary_insert ON geosight_data_indicatorvalue;
+DROP TRIGGER IF EXISTS geosight_data_indicatorvalue_summary_update ON geosight_data_indicatorvalue;
+DROP TRIGGER IF EXISTS geosight_data_indicatorvalue_summary_delete ON geosight_data_indicatorvalue;
+DROP TRIGGER IF EXISTS geosight_data_indicatorvalue_summary_truncate ON geosight_data_indicatorvalue;
+DROP FUNCTION IF EXISTS geosight_data_indicatorvalue_summary_trigger();
+DROP FUNCTION IF EXISTS geosight_data_indicatorvalue_summary_truncate();
+DROP FUNCTION IF EXISTS geosight_data_indicatorvaluedatasetsummary_add(JSONB);
+DROP FUNCTION IF EXISTS geosight_data_indicatorvaluedatasetsummary_remove(JSONB);
+DROP INDEX IF EXISTS geosight_data_indicatorvaluedatasetsummary_key;
@@ -619,6 +619,13 @@ class ZonalAnalysis(AbstractEditData):
         blank=False
     )
     geom_compressed = models.TextField()
+    per_geometry = models.BooleanField(
+        default=False,
+        help_text=(
+            'Aggregate every geometry separately. '
+            'The result is the list of aggregate per geometry.'
+        )
+    )
     status = models.CharField(
         choices=AnalysisStatus.choices,
         default=AnalysisStatus.PENDING,
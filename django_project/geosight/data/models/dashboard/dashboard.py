@@ -628,8 +628,69 @@ class Dashboard(
             obj.visible_by_default = tool['visible_by_default']
             obj.config = tool.get('config', None)
             obj.save()
+        self.update_related_table_keys()
         self.save()
 
+    def related_table_keys(self, related_table):
+        """
+        Return the keys of related table from the dashboard config.
+
+        The geography code field comes from the related table config and
+        the date field from the first layer of the related table.
+
+        :param related_table: The related table.
+        :type related_table: RelatedTable
+        :return: Tuple of geography code field, date field and date format.
+        :rtype: tuple
+        """
+        from geosight.data.models.dashboard import (
+            DashboardIndicatorLayerConfig
+        )
+        dashboard_related = self.dashboardrelatedtable_set.filter(
+            object=related_table
+        ).first()
+        if not dashboard_related:
+            return None, None, None
+        configs = {}
+        layer = self.dashboardindicatorlayer_set.filter(
+            dashboardindicatorlayerrelatedtable__related_table=(
+                related_table
+            )
+        ).order_by('id').first()
+        if layer:
+            configs = dict(
+                DashboardIndicatorLayerConfig.objects.filter(
+                    layer=layer, name__in=['date_field', 'date_format']
+                ).values_list('name', 'value')
+            )
+        return (
+            dashboard_related.geography_code_field_name or None,
+            configs.get('date_field') or None,
+            configs.get('date_format') or None
+        )
+
+    def update_related_table_keys(self):
+        """
+        Update the keys of the related tables from the dashboard config.
+
+        The rows of the tables that changed are updated in the background,
+        unless the current keys are still used by other dashboard.
+        """
+        from geosight.data.tasks.related_table import (
+            update_related_table_keys
+        )
+        for dashboard_related in self.dashboardrelatedtable_set.all():
+            related_table = dashboard_related.object
+            keys = self.related_table_keys(related_table)
+            if keys != (
+                    related_table.geography_code_field_name,
+                    related_table.date_field,
+                    related_table.date_format
+            ):
+                update_related_table_keys.delay(
+                    related_table.id, *keys, dashboard_id=self.id
+                )
+
     def save_relation(self, ModelClass, ObjectClass, modelQuery, inputData):
         """
         Save or update a dashboard relationship with linked objects.
@@ -17,3 +17,4 @@ __copyright__ = ('Copyright 2023, Unicef')
 from .indicator import *
 from .indicator_rule import *
 from .indicator_value import *
+from .indicator_value_dataset import *
@@ -283,13 +283,9 @@ class Indicator(
                 raise IndicatorValueRejectedError('Value is not string')
         return value, comment
 
-    def save_value(  # noqa: DOC501,DOC503
+    def clean_value(  # noqa: DOC501,DOC503
             self,
             date: date, geom_id: str, value: any,
-
-            # TODO:
-            #  reference layer will be removed after georepo
-            #  has API to check country
             reference_layer=None,
             admin_level: int = None,
             extras: dict = None,
@@ -297,7 +293,7 @@ class Indicator(
             more_error_information=False
     ):
         """
-        Save a new indicator value.
+        Validate a value and resolve its entity.
 
         :param date: The date of the value.
         :type date: date
@@ -306,7 +302,7 @@ class Indicator(
         :param value: The value to be stored.
         :type value: any
         :param reference_layer: The reference layer context.
-        :type reference_layer: ReferenceLayerView | str | None
+        :type reference_layer: ReferenceLayerView | None
         :param admin_level: Optional administrative level.
         :type admin_level: int | None
         :param extras: Optional extra metadata to attach to the value.
@@ -315,13 +311,9 @@ class Indicator(
         :type geom_id_type: str
         :param more_error_information: Include additional error context.
         :type more_error_information: bool
-        :return: The created or updated IndicatorValue instance.
-        :rtype: IndicatorValue
+        :return: Tuple of (entity, validated value, extras).
+        :rtype: tuple[Entity, any, dict | None]
         """
-        from geosight.data.models.indicator import (
-            IndicatorValue
-        )
-        from geosight.georepo.models import ReferenceLayerView
         from geosight.georepo.models.entity import Entity
 
         # Validate data
@@ -339,12 +331,6 @@ class Indicator(
                 raise IndicatorValueRejectedError(f'Error on {geom_id}: {e}')
             raise IndicatorValueRejectedError(e)
 
-        # Save data
-        if reference_layer and isinstance(reference_layer, str):
-            reference_layer, _ = ReferenceLayerView.objects.get_or_create(
-                identifier=reference_layer
-            )
-
         # Find the ucode
         try:
             entity = Entity.get_entity(
@@ -354,9 +340,65 @@ class Indicator(
                 admin_level=admin_level,
                 date_time=date
             )
-            ucode = entity.geom_id
         except Exception as e:
             raise IndicatorValueRejectedError(f'{e}')
+        return entity, value, extras
+
+    def save_value(  # noqa: DOC501,DOC503
+            self,
+            date: date, geom_id: str, value: any,
+
+            # TODO:
+            #  reference layer will be removed after georepo
+            #  has API to check country
+            reference_layer=None,
+            admin_level: int = None,
+            extras: dict = None,
+            geom_id_type: str = 'ucode',
+            more_error_information=False
+    ):
+        """
+        Save a new indicator value.
+
+        :param date: The date of the value.
+        :type date: date
+        :param geom_id: The geometry identifier (ucode or original ID).
+        :type geom_id: str
+        :param value: The value to be stored.
+        :type value: any
+        :param reference_layer: The reference layer context.
+        :type reference_layer: ReferenceLayerView | str | None
+        :param admin_level: Optional administrative level.
+        :type admin_level: int | None
+        :param extras: Optional extra metadata to attach to the value.
+        :type extras: dict | None
+        :param geom_id_type: The type of geometry ID (default: ``'ucode'``).
+        :type geom_id_type: str
+        :param more_error_information: Include additional error context.
+        :type more_error_information: bool
+        :return: The created or updated IndicatorValue instance.
+        :rtype: IndicatorValue
+        """
+        from geosight.data.models.indicator import (
+            IndicatorValue
+        )
+        from geosight.georepo.models import ReferenceLayerView
+
+        # Save data
+        if reference_layer and isinstance(reference_layer, str):
+            reference_layer, _ = ReferenceLayerView.objects.get_or_create(
+                identifier=reference_layer
+            )
+
+        entity, value, extras = self.clean_value(
+            date=date, geom_id=geom_id, value=value,
+            reference_layer=reference_layer,
+            admin_level=admin_level,
+            extras=extras,
+            geom_id_type=geom_id_type,
+            more_error_information=more_error_information
+        )
+        ucode = entity.geom_id
 
         # Save with original id first
         indicator_value, created = IndicatorValue.objects.get_or_create(
@@ -378,6 +420,84 @@ class Indicator(
                 indicator_value.add_extra_value(extra_key, extra_value)
         return indicator_value
 
+    def value_row(self, date: date, ucode: str, value: any, extras=None):
+        """
+        Return a row of value for :meth:`IndicatorValue.bulk_save`.
+
+        :param date: The date of the value.
+        :type date: date
+        :param ucode: The ucode of the entity.
+        :type ucode: str
+        :param value: The validated value.
+        :type value: any
+        :param extras: Optional extra metadata to attach to the value.
+        :type extras: dict | None
+        :return: Row of the value.
+        :rtype: dict
+        """
+        is_string = self.type == IndicatorType.STRING
+        return {
+            'indicator_id': self.id,
+            'date': date,
+            'geom_id': ucode,
+            'value': None if is_string else value,
+            'value_str': value if is_string else None,
+            'extra_value': extras
+        }
+
+    def save_values(  # noqa: DOC501,DOC503
+            self,
+            values: list,
+            reference_layer=None,
+            geom_id_type: str = 'ucode',
+            more_error_information=False
+    ):
+        """
+        Save multiple indicator values in bulk.
+
+        Every value is validated like :meth:`save_value`, but they are
+        written with :meth:`IndicatorValue.bulk_save`, so the indicator
+        version is increased once instead of once per value.
+
+        :param values:
+            List of dictionaries with ``date``, ``geom_id``, ``value`` and
+            optional ``admin_level`` and ``extras``.
+        :type values: list[dict]
+        :param reference_layer: The reference layer context.
+        :type reference_layer: ReferenceLayerView | str | None
+        :param geom_id_type: The type of geometry ID (default: ``'ucode'``).
+        :type geom_id_type: str
+        :param more_error_information: Include additional error context.
+        :type more_error_information: bool
+        :return: Number of values created or updated.
+        :rtype: int
+        """
+        from geosight.data.models.indicator import (
+            IndicatorValue
+        )
+        from geosight.georepo.models import ReferenceLayerView
+
+        if reference_layer and isinstance(reference_layer, str):
+            reference_layer, _ = ReferenceLayerView.objects.get_or_create(
+                identifier=reference_layer
+            )
+
+        rows = []
+        for data in values:
+            entity, value, extras = self.clean_value(
+                date=data['date'], geom_id=data['geom_id'],
+                value=data['value'],
+                reference_layer=reference_layer,
+                admin_level=data.get('admin_level', None),
+                extras=data.get('extras', None),
+                geom_id_type=geom_id_type,
+                more_error_information=more_error_information
+            )
+            rows.append(
+                self.value_row(data['date'], entity.geom_id, value, extras)
+            )
+        return IndicatorValue.bulk_save(rows)
+
     def query_values(
             self, date_data: date = None, min_date_data: date = None,
 
@@ -14,13 +14,16 @@ __author__ = 'irwan@kartoza.com'
 __date__ = '13/06/2023'
 __copyright__ = ('Copyright 2023, Unicef')
 
+from datetime import datetime
+
 from django.contrib.gis.db import models
-from django.db import connection
+from django.db import connection, transaction
 from django.db.models import Min, Max
 from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 
+from core.utils import pg_copy_rows
 from geosight.data.models.indicator.indicator import Indicator
 from geosight.data.models.indicator.indicator_type import IndicatorType
 from geosight.georepo.models.entity import Entity
@@ -405,6 +408,118 @@ class IndicatorValue(models.Model):
             cursor.execute(indicator_query, params)
             connection.commit()
 
+    @staticmethod
+    def bulk_save(
+            rows: list, step: int = 50000, increase_version: bool = True
+    ):
+        """
+        Upsert many values at once without the per-row signals.
+
+        The rows are copied into a staging table, upserted on
+        ``(indicator, date, geom_id)``, the flat columns are filled
+        with :meth:`get_raw_query` in one pass and every touched indicator
+        has its version increased once.
+        Extra values are merged into the existing ones,
+        like :meth:`add_extra_value` does.
+
+        :param rows:
+            List of dictionaries with ``indicator_id``, ``date``,
+            ``geom_id``, ``value``, ``value_str`` and ``extra_value``.
+            When a key appears more than once, the last row wins.
+        :type rows: list[dict]
+        :param step: Number of rows written per COPY chunk.
+        :type step: int
+        :param increase_version:
+            Whether to increase the version of the touched indicators.
+            It is off when the caller increases them once at the end.
+        :type increase_version: bool
+        :return: Number of values created or updated.
+        :rtype: int
+        """
+        if not rows:
+            return 0
+        table_name = 'tmp_indicator_value_bulk'
+        columns = [
+            '_row_', 'indicator_id', 'date', 'geom_id',
+            'value', 'value_str', 'extra_value'
+        ]
+
+        def _rows():
+            for idx, row in enumerate(rows):
+                _date = row['date']
+                if isinstance(_date, datetime):
+                    _date = _date.date()
+                yield [
+                    idx, row['indicator_id'], _date, row['geom_id'],
+                    row.get('value', None), row.get('value_str', None),
+                    row.get('extra_value', None) or None
+                ]
+
+        entity_query, indicator_query, _ = IndicatorValue.get_raw_query()
+        staging_filter = (
+            ' AND (value.indicator_id, value.date, value.geom_id) IN ('
+            f'SELECT indicator_id, date, geom_id FROM {table_name})'
+        )
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'CREATE TEMP TABLE {table_name} ('
+                    f'_row_ BIGINT, indicator_id BIGINT, date DATE, '
+                    f'geom_id VARCHAR(256), value DOUBLE PRECISION, '
+                    f'value_str VARCHAR(256), extra_value JSONB'
+                    f') ON COMMIT DROP'
+                )
+                pg_copy_rows(cursor, table_name, columns, _rows(), step=step)
+                cursor.execute(f'ANALYZE {table_name}')
+
+                # Upsert the values
+                cursor.execute(
+                    f"""
+                    WITH upserted AS (
+                        INSERT INTO geosight_data_indicatorvalue AS target
+                            (indicator_id, date, geom_id, value, value_str,
+                             extra_value)
+                        SELECT DISTINCT ON (indicator_id, date, geom_id)
+                            indicator_id, date, geom_id, value, value_str,
+                            extra_value
+                        FROM {table_name}
+                        ORDER BY indicator_id, date, geom_id, _row_ DESC
+                        ON CONFLICT (indicator_id, date, geom_id)
+                        DO UPDATE SET
+                            value = EXCLUDED.value,
+                            value_str = EXCLUDED.value_str,
+                            extra_value = CASE
+                                WHEN EXCLUDED.extra_value IS NULL
+                                THEN target.extra_value
+                                ELSE COALESCE(
+                                    target.extra_value, '{{}}'::jsonb
+                                ) || EXCLUDED.extra_value
+                            END
+                        RETURNING target.id
+                    )
+                    SELECT MIN(id), MAX(id), COUNT(id) FROM upserted
+                    """
+                )
+                start_id, end_id, count = cursor.fetchone()
+
+                # Fill the flat columns
+                params = {'start_id': start_id, 'end_id': end_id}
+                cursor.execute(entity_query + staging_filter, params)
+                cursor.execute(indicator_query + staging_filter, params)
+
+                cursor.execute(
+                    f'SELECT DISTINCT indicator_id FROM {table_name}'
+                )
+                indicator_ids = [row[0] for row in cursor.fetchall()]
+
+            # Increase the version once per indicator
+            if increase_version:
+                for indicator in Indicator.objects.filter(
+                        id__in=indicator_ids
+                ):
+                    indicator.increase_version()
+        return count
+
     def add_extra_value(self, name, value):
         """
         Add or update an extra key/value pair in ``extra_value``.
@@ -89,3 +89,53 @@ class IndicatorValueDataset(models.Model):
         :rtype: dict or Any
         """
         return self.indicator.permission.all_permission(user)
+
+
+class IndicatorValueDatasetSummary(models.Model):
+    """Summary of indicator value per indicator x country x admin level.
+
+    The table is maintained by the database triggers on
+    geosight_data_indicatorvalue, every statement that inserts,
+    updates or deletes values adds or removes its rows from the counts.
+    Values without country are summarized with empty country.
+    """
+
+    indicator = models.ForeignKey(Indicator, on_delete=models.CASCADE)
+    country = models.ForeignKey(
+        'geosight_georepo.Entity', on_delete=models.CASCADE,
+        null=True, blank=True
+    )
+    admin_level = models.IntegerField(
+        null=True, blank=True
+    )
+
+    indicator_name = models.CharField(
+        max_length=512, null=True, blank=True
+    )
+    indicator_shortcode = models.CharField(
+        max_length=512, null=True, blank=True
+    )
+    country_name = models.CharField(
+        max_length=512, null=True, blank=True
+    )
+    country_geom_id = models.CharField(
+        max_length=256, null=True, blank=True
+    )
+    country_concept_uuid = models.CharField(
+        max_length=256, null=True, blank=True
+    )
+
+    data_count = models.IntegerField(default=0)
+    start_date = models.DateField(
+        null=True, blank=True
+    )
+    end_date = models.DateField(
+        null=True, blank=True
+    )
+
+    class Meta:  # noqa: D106
+        indexes = [
+            models.Index(
+                fields=['indicator', 'country', 'admin_level']
+            ),
+        ]
@@ -17,20 +17,30 @@ __copyright__ = ('Copyright 2023, Unicef')
 import json
 import uuid
 
+import pytz
 from dateutil import parser
+from django.conf import settings
 from django.contrib.gis.db import models
 from django.db import connection, transaction
+from django.db.models import Max
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 from core.models.general import (
     AbstractEditData, AbstractTerm, AbstractVersionData, AbstractSource
 )
+from core.utils import pg_copy_rows
 from geosight.data.models.field_layer import BaseFieldLayerAbstract
 from geosight.data.utils import extract_time_string
 from geosight.importer.utilities import date_from_timestamp
 from geosight.permission.models.manager import PermissionManager
 
+# Number of rows that are updated per batch when the keys changed
+KEYS_STEP = 1000
+
+# Number of rows that are copied per chunk on bulk insert
+INSERT_STEP = 10000
+
 
 class RelatedTableException(Exception):
     """Error class for RelatedTable."""
@@ -59,6 +69,18 @@ class RelatedTable(
         null=True, blank=True,
         on_delete=models.SET_NULL
     )
+
+    # The fields of geography code and date that are kept on the
+    # shadow columns of the rows, so they are filtered in the database.
+    geography_code_field_name = models.TextField(
+        null=True, blank=True
+    )
+    date_field = models.TextField(
+        null=True, blank=True
+    )
+    date_format = models.TextField(
+        null=True, blank=True
+    )
     objects = models.Manager()
     permissions = PermissionManager()
 
@@ -123,35 +145,210 @@ class RelatedTable(
         except KeyError as e:
             raise RelatedTableException(f'{e} is required.')
 
-    def insert_rows(self, data_list: list, replace=False):
+    def insert_rows(
+            self, data_list, replace=False, step=INSERT_STEP, keep_order=True
+    ):
         """
-        Insert multiple rows into the related table.
+        Insert multiple rows into the related table in bulk.
 
-        :param data_list: List of row data dictionaries.
-        :type data_list: list
+        The orders are assigned in one sequence and the rows are copied
+        to the database in chunks. With replace, the existing rows are
+        deleted and the new rows are loaded in one transaction, so the
+        readers see either the old or the new rows. With keep_order,
+        a row with ``order`` replaces the previous row with same order,
+        like :meth:`insert_row`.
+
+        The fields and the relations are updated once at the end.
+
+        :param data_list: Iterable of row data dictionaries.
+        :type data_list: iterable
         :param replace: Whether to delete existing rows first.
         :type replace: bool
+        :param step: Number of rows that are copied per chunk.
+        :type step: int
+        :param keep_order:
+            Whether the ``order`` of data is used as the row order
+            when replacing. Otherwise the rows are ordered as the list.
+        :type keep_order: bool
         :return: Dictionary of errors (if any) with index as key.
         :rtype: dict
-        :raises Exception: Raised if one or more rows fail to insert.
         """
         errors = {}
-        try:
-            with transaction.atomic():
-                if replace:
-                    self.relatedtablerow_set.all().delete()
-
-                for idx, data in enumerate(data_list):
+        has_order = False
+        columns = ['table_id', '"order"', 'data', 'geo_code', 'date_time']
+
+        def _rows(next_order):
+            nonlocal has_order
+            for idx, data in enumerate(data_list):
+                if not isinstance(data, dict):
+                    errors[f'{idx}'] = 'Row needs to be an object.'
+                    continue
+                order = next_order
+                if (
+                        replace and keep_order and
+                        data.get('order') is not None
+                ):
                     try:
-                        self.insert_row(data, replace=replace)
-                    except RelatedTableException as e:
-                        errors[f'{idx}'] = f'{e}'
-                if errors.keys():
-                    raise Exception()
-        except Exception:
-            pass
+                        order = int(data['order'])
+                        has_order = True
+                    except (TypeError, ValueError):
+                        errors[f'{idx}'] = 'order needs to be an integer.'
+                        continue
+                next_order = max(next_order, order + 1)
+                geo_code, date_time = self.row_keys(data)
+                yield [self.id, order, data, geo_code, date_time]
+
+        with transaction.atomic():
+            if replace:
+                self.relatedtablerow_set.all().delete()
+                next_order = 0
+            else:
+                last = self.relatedtablerow_set.aggregate(
+                    order=Max('order')
+                )['order']
+                next_order = last + 1 if last is not None else 0
+
+            with connection.cursor() as cursor:
+                pg_copy_rows(
+                    cursor, RelatedTableRow._meta.db_table, columns,
+                    _rows(next_order), step=step
+                )
+                if errors:
+                    # Nothing is saved when a row is invalid
+                    transaction.set_rollback(True)
+                    return errors
+
+                # Keep the last row of the same order
+                if has_order:
+                    cursor.execute(
+                        f'DELETE FROM {RelatedTableRow._meta.db_table} '
+                        f'AS row '
+                        f'USING {RelatedTableRow._meta.db_table} AS other '
+                        f'WHERE row.table_id=%s '
+                        f'AND other.table_id=row.table_id '
+                        f'AND other."order"=row."order" '
+                        f'AND other.id > row.id',
+                        [self.id]
+                    )
+
+        self.set_fields()
+        self.check_relation()
+        self.increase_version()
         return errors
 
+    # ------------------------------------------------
+    # Keys of rows
+    # ------------------------------------------------
+    def row_keys(self, data: dict):
+        """
+        Return the geography code and the date of a row data.
+
+        :param data: Data dictionary of the row.
+        :type data: dict
+        :return: Tuple of geography code and date time, None if not found.
+        :rtype: tuple(str, datetime)
+        """
+        geo_code = None
+        date_time = None
+        if not data:
+            return geo_code, date_time
+        if self.geography_code_field_name:
+            value = data.get(self.geography_code_field_name)
+            if value not in [None, '']:
+                geo_code = f'{value}'
+        if self.date_field:
+            try:
+                date_time = extract_time_string(
+                    format_time=self.date_format,
+                    value=data[self.date_field]
+                )
+            except (KeyError, ValueError, TypeError, OverflowError):
+                pass
+        return geo_code, date_time
+
+    def has_geo_key(self, geo_field) -> bool:
+        """
+        Return if the geography code of the field is on the rows.
+
+        :param geo_field: Field name of the geography code.
+        :type geo_field: str
+        :rtype: bool
+        """
+        return bool(geo_field) and geo_field == self.geography_code_field_name
+
+    def has_date_key(self, date_field, date_format=None) -> bool:
+        """
+        Return if the date of the field and format is on the rows.
+
+        :param date_field: Field name of the date.
+        :type date_field: str
+        :param date_format: Format of the date.
+        :type date_format: str or None
+        :rtype: bool
+        """
+        return (
+            bool(date_field) and date_field == self.date_field and
+            (date_format or None) == self.date_format
+        )
+
+    def set_keys(self, geo_field=None, date_field=None, date_format=None):
+        """
+        Set the fields of geography code and date that are kept on the rows.
+
+        The rows are updated when the fields changed.
+
+        :param geo_field: Field name of the geography code.
+        :type geo_field: str or None
+        :param date_field: Field name of the date.
+        :type date_field: str or None
+        :param date_format: Format of the date.
+        :type date_format: str or None
+        :return: True if the keys are changed.
+        :rtype: bool
+        """
+        keys = (geo_field or None, date_field or None, date_format or None)
+        if keys == (
+                self.geography_code_field_name, self.date_field,
+                self.date_format
+        ):
+            return False
+        with transaction.atomic():
+            (
+                self.geography_code_field_name, self.date_field,
+                self.date_format
+            ) = keys
+            # Use update, so the dashboards are not invalidated
+            RelatedTable.objects.filter(pk=self.pk).update(
+                geography_code_field_name=self.geography_code_field_name,
+                date_field=self.date_field,
+                date_format=self.date_format
+            )
+            self.update_keys()
+        return True
+
+    def update_keys(self, step=KEYS_STEP):
+        """
+        Update the geography code and the date of all rows.
+
+        :param step: Number of rows that are updated per batch.
+        :type step: int
+        """
+        rows = []
+        for row in self.relatedtablerow_set.only('id', 'data').order_by(
+                'id'
+        ).iterator(chunk_size=step):
+            row.geo_code, row.date_time = self.row_keys(row.data)
+            rows.append(row)
+            if len(rows) >= step:
+                RelatedTableRow.objects.bulk_update(
+                    rows, ['geo_code', 'date_time']
+                )
+                rows = []
+        if rows:
+            RelatedTableRow.objects.bulk_update(
+                rows, ['geo_code', 'date_time']
+            )
+
     @property
     def related_fields(self):
         """
@@ -258,11 +455,14 @@ class RelatedTable(
 
     def query(
             self, select, order_by, country_geom_ids, geo_field,
-            geo_type='ucode'
+            geo_type='ucode', where=None
     ):
         """
         Build a SQL query string for retrieving related table data.
 
+        The geography code is read from the shadow column of the rows
+        when the field is the geography code field of the table.
+
         :param select: SQL select clause.
         :type select: str
         :param order_by: SQL order by clause.
@@ -273,6 +473,8 @@ class RelatedTable(
         :type geo_field: str
         :param geo_type: Type of geographic code (default 'ucode').
         :type geo_type: str
+        :param where: Additional SQL conditions of the rows.
+        :type where: list[str] or None
         :return: SQL query string or None.
         :rtype: str or None
         """
@@ -289,12 +491,20 @@ class RelatedTable(
         if not countries:
             return None
 
+        if self.has_geo_key(geo_field):
+            geo_key = 'row.geo_code'
+        else:
+            geo_key = f"data ->> {self.sql_string(geo_field)}::text"
+        conditions = ''.join(
+            [f'AND {condition} ' for condition in where or []]
+        )
+
         if geo_type.lower() == 'ucode':
             return (
                 f"select {select} "
                 f"  from geosight_data_relatedtablerow as row "
                 f"LEFT JOIN geosight_georepo_entity as entity "
-                f"  ON data ->> '{geo_field}'::text=entity.geom_id::text "
+                f"  ON {geo_key}=entity.geom_id::text "
                 f"WHERE row.table_id={self.id} AND "
                 f"  ("
                 f"      entity.country_id IN ({','.join(countries)}) OR"
@@ -303,6 +513,7 @@ class RelatedTable(
                 f"          entity.id IN ({','.join(countries)})"
                 f"      )"
                 f"  ) "
+                f"{conditions}"
                 f"ORDER BY {order_by}"
             )
         else:
@@ -310,8 +521,9 @@ class RelatedTable(
                 f"select {select} "
                 f"from geosight_data_relatedtablerow as row "
                 f"LEFT JOIN geosight_georepo_entitycode as entity_code "
-                f"ON data ->> '{geo_field}'::text=entity_code.code::text "
-                f"AND LOWER(entity_code.code_type)='{geo_type.lower()}' "
+                f"ON {geo_key}=entity_code.code::text "
+                f"AND LOWER(entity_code.code_type)="
+                f"{self.sql_string(geo_type.lower())} "
                 f"LEFT JOIN geosight_georepo_entity as entity "
                 f"ON entity.id=entity_code.entity_id "
                 f"WHERE row.table_id={self.id} AND "
@@ -322,6 +534,7 @@ class RelatedTable(
                 f"          entity.id IN ({','.join(countries)})"
                 f"      )"
                 f"  ) "
+                f"{conditions}"
                 f"ORDER BY {order_by}"
             )
 
@@ -363,23 +576,55 @@ class RelatedTable(
                         cast = '::numeric'
 
                 # query the data
+                value = f"data ->> {self.sql_string(field)}"
                 query = self.query(
                     country_geom_ids=country_geom_ids,
-                    select=f"DISTINCT(data ->> '{field}'){cast}",
+                    select=f"DISTINCT({value}){cast}",
                     geo_field=geo_field,
                     geo_type=geo_type,
-                    order_by=f"data ->> '{field}'",
+                    order_by=value,
                 )
                 if not query:
                     return []
-                cursor.execute(query)
+                cursor.execute(query, [])
                 rows = cursor.fetchall()
                 return [row[0] for row in rows]
 
+    @staticmethod
+    def sql_string(value) -> str:
+        """
+        Return the value as SQL string literal.
+
+        The literal is escaped for the queries that are executed
+        with parameters, so the quotes and percent signs are kept.
+
+        :param value: The value, e.g. the field name of data.
+        :type value: str
+        :return: The quoted SQL string.
+        :rtype: str
+        """
+        value = f'{value}'.replace("'", "''").replace('%', '%%')
+        return f"'{value}'"
+
+    @staticmethod
+    def _date_string(date_time) -> str:
+        """
+        Return date time of the date key as iso format string.
+
+        :param date_time: The date time of the date key.
+        :type date_time: datetime
+        :return: The date time in the server timezone, in iso format.
+        :rtype: str
+        """
+        return date_time.astimezone(
+            pytz.timezone(settings.TIME_ZONE)
+        ).isoformat()
+
     def data_with_query(
             self, country_geom_ids,
             geo_field, date_field=None, date_format=None, geo_type='ucode',
-            max_time=None, min_time=None, limit=25, offset=None
+            max_time=None, min_time=None, limit=25, offset=None,
+            after=None
     ):
         """
         Retrieve related table data joined with geographic context.
@@ -388,6 +633,11 @@ class RelatedTable(
         and enriches each entry with geometry and metadata information.
         Optionally filters the data based on date fields.
 
+        When the date field is the date field of the table, or there is
+        no time filter, the rows are filtered and paginated in the
+        database. Otherwise the dates are parsed and filtered per row
+        before the page is taken.
+
         :param country_geom_ids: List of geometry IDs to filter the data by.
         :type country_geom_ids: list
         :param geo_field: Name of the geometry field used in the join.
@@ -406,12 +656,41 @@ class RelatedTable(
         :type limit: int
         :param offset: Optional pagination offset.
         :type offset: int or None
+        :param after:
+            Optional id of the last row of the previous page,
+            the page is the rows after it instead of the offset.
+        :type after: int or None
         :return: A tuple containing:
             - List of result dictionaries with data and geometry info.
             - Boolean indicating if there are more results (has_next).
         :rtype: tuple(list[dict], bool)
         """
-        # Check codes based on code type
+        limit = int(limit)
+        date_key = self.has_date_key(date_field, date_format)
+        where = []
+        params = []
+        if date_key:
+            where.append('row.date_time IS NOT NULL')
+            if max_time:
+                where.append('row.date_time <= %s')
+                params.append(max_time)
+            if min_time:
+                where.append('row.date_time >= %s')
+                params.append(min_time)
+        elif date_field:
+            where.append('row.data ? %s')
+            params.append(date_field)
+        if after is not None:
+            # Keyset pagination, the rows after the previous page
+            where.append('row.id > %s')
+            params.append(int(after))
+            offset = 0
+
+        # Paginate in the database when there is no filter per row
+        paginate_query = offset is not None and (
+                date_key or not (max_time or min_time)
+        )
+
         output = []
         has_next = False
         with connection.cursor() as cursor:
@@ -420,20 +699,25 @@ class RelatedTable(
                 geo_field=geo_field,
                 select=(
                     "row.id, row.order, row.data::json, "
-                    "geom_id, concept_uuid, name, admin_level "
+                    "geom_id, concept_uuid, name, admin_level, "
+                    "row.date_time "
                 ),
                 geo_type=geo_type,
                 order_by='row.id',
+                where=where
             )
             if not query:
-                return []
-            if offset is not None:
-                query += f' LIMIT {limit} OFFSET {offset}'
+                return [], False
+            if paginate_query:
+                # Query one more row to know if there is next page
+                query += ' LIMIT %s OFFSET %s'
+                params += [limit + 1, int(offset)]
 
-            cursor.execute(query)
+            cursor.execute(query, params)
             rows = cursor.fetchall()
-            if len(rows) > 0:
-                has_next = True
+            if paginate_query:
+                has_next = len(rows) > limit
+                rows = rows[:limit]
             for idx, row in enumerate(rows):
                 data = row[2]
                 data.update({
@@ -444,7 +728,9 @@ class RelatedTable(
                     'geometry_name': row[5],
                     'admin_level': row[6],
                 })
-                if date_field:
+                if date_key:
+                    data[date_field] = self._date_string(row[7])
+                elif date_field:
                     try:
                         date_time = data[date_field]
                         # Update date field
@@ -460,6 +746,11 @@ class RelatedTable(
                     except KeyError:
                         continue
                 output.append(data)
+
+        if offset is not None and not paginate_query:
+            offset = int(offset)
+            has_next = len(output) > offset + limit
+            output = output[offset:offset + limit]
         return output, has_next
 
     def dates_with_query(
@@ -485,20 +776,33 @@ class RelatedTable(
         :return: List of unique ISO-formatted date strings.
         :rtype: list[str]
         """
+        date_key = self.has_date_key(date_field, date_format)
         with connection.cursor() as cursor:
-            query = self.query(
-                country_geom_ids=country_geom_ids,
-                geo_field=geo_field,
-                select=f"DISTINCT(data ->> '{date_field}')",
-                geo_type=geo_type,
-                order_by=f"data ->> '{date_field}'",
-            )
+            if date_key:
+                query = self.query(
+                    country_geom_ids=country_geom_ids,
+                    geo_field=geo_field,
+                    select="DISTINCT(row.date_time)",
+                    geo_type=geo_type,
+                    order_by="row.date_time",
+                    where=['row.date_time IS NOT NULL']
+                )
+            else:
+                query = self.query(
+                    country_geom_ids=country_geom_ids,
+                    geo_field=geo_field,
+                    select=f"DISTINCT(data ->> {self.sql_string(date_field)})",
+                    geo_type=geo_type,
+                    order_by=f"data ->> {self.sql_string(date_field)}",
+                )
             if not query:
                 return []
-            cursor.execute(query)
+            cursor.execute(query, [])
             dates = []
             for row in cursor.fetchall():
-                if row[0]:
+                if date_key:
+                    dates.append(self._date_string(row[0]))
+                elif row[0]:
                     dates.append(
                         extract_time_string(
                             format_time=date_format,
@@ -716,8 +1020,20 @@ class RelatedTableRow(models.Model):
     order = models.IntegerField(default=0)
     data = models.JSONField(null=True, blank=True)
 
+    # Shadow columns of the keys of the table, see RelatedTable.row_keys
+    geo_code = models.TextField(null=True, blank=True)
+    date_time = models.DateTimeField(null=True, blank=True)
+
     class Meta:  # noqa: D106
         ordering = ('order',)
+        indexes = [
+            models.Index(fields=['table', 'geo_code']),
+            models.Index(fields=['table', 'date_time']),
+        ]
+
+    def save(self, *args, **kwargs):  # noqa
+        self.geo_code, self.date_time = self.table.row_keys(self.data)
+        super(RelatedTableRow, self).save(*args, **kwargs)
 
 
 class RelatedTableField(BaseFieldLayerAbstract):
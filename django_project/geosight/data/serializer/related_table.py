@@ -157,6 +157,9 @@ class RelatedTableApiSerializer(ResourceSerializer):
     class Meta:  # noqa: D106
         model = RelatedTable
         fields = '__all__'
+        read_only_fields = (
+            'geography_code_field_name', 'date_field', 'date_format'
+        )
         swagger_schema_fields = {
             'type': openapi.TYPE_OBJECT,
             'title': 'RelatedTable',
@@ -199,7 +202,7 @@ class RelatedTableRowApiSerializer(DynamicModelSerializer):
 
     class Meta:  # noqa: D106
         model = RelatedTableRow
-        exclude = ('table', 'order', 'data')
+        exclude = ('table', 'order', 'data', 'geo_code', 'date_time')
         swagger_schema_fields = {
             'type': openapi.TYPE_OBJECT,
             'title': 'RelatedTableRow',
@@ -362,7 +365,7 @@ class RelatedTableGeoDataSerializer(DynamicModelSerializer):
 
     class Meta:  # noqa: D106
         model = RelatedTableRow
-        exclude = ('table', 'data')
+        exclude = ('table', 'data', 'geo_code', 'date_time')
 
 
 class RelatedTableRowSerializer(DynamicModelSerializer):
@@ -370,7 +373,7 @@ class RelatedTableRowSerializer(DynamicModelSerializer):
 
     class Meta:  # noqa: D106
         model = RelatedTableRow
-        exclude = ('table', 'data')
+        exclude = ('table', 'data', 'geo_code', 'date_time')
 
 
 class RelatedTableFieldSerializer(DynamicModelSerializer):
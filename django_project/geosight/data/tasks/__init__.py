@@ -15,4 +15,6 @@ __date__ = '13/02/2025'
 __copyright__ = ('Copyright 2025, Unicef')
 
 from .cog_classification import recalculate_cog_classification
-from .zonal_analysis import run_zonal_analysis
\ No newline at end of file
+from .related_table import update_related_table_keys
+from .zonal_analysis import run_zonal_analysis
+
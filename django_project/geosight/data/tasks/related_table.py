@@ -0,0 +1,67 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from celery.utils.log import get_task_logger
+
+from core.celery import app
+from geosight.data.models.related_table import RelatedTable
+
+logger = get_task_logger(__name__)
+
+
+@app.task
+def update_related_table_keys(
+        _id, geo_field=None, date_field=None, date_format=None,
+        dashboard_id=None
+):
+    """Set the keys of related table and update its rows.
+
+    The keys are kept when other dashboard than dashboard_id uses them,
+    so the dashboards with different fields do not rewrite the rows
+    in turn.
+
+    :param _id: The related table id.
+    :type _id: int
+    :param geo_field: Field of the geography code.
+    :type geo_field: str
+    :param date_field: Field of the date.
+    :type date_field: str
+    :param date_format: Format of the date.
+    :type date_format: str
+    :param dashboard_id: The dashboard that sets the keys.
+    :type dashboard_id: int
+    :return: True if the keys are changed.
+    :rtype: bool
+    """
+    from geosight.data.models.dashboard import Dashboard
+    try:
+        related_table = RelatedTable.objects.get(id=_id)
+    except RelatedTable.DoesNotExist:
+        return False
+    current = (
+        related_table.geography_code_field_name, related_table.date_field,
+        related_table.date_format
+    )
+    if any(current):
+        dashboards = Dashboard.objects.filter(
+            dashboardrelatedtable__object=related_table
+        ).exclude(id=dashboard_id).distinct()
+        for dashboard in dashboards:
+            if dashboard.related_table_keys(related_table) == current:
+                return False
+    return related_table.set_keys(
+        geo_field=geo_field, date_field=date_field, date_format=date_format
+    )
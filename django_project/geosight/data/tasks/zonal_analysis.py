@@ -31,7 +31,9 @@ from geosight.data.models.context_layer import (
     LayerType,
     ZonalAnalysis
 )
-from geosight.data.utils import run_zonal_analysis_raster
+from geosight.data.utils import (
+    run_zonal_analysis_raster, run_zonal_statistics_raster
+)
 
 
 @app.task
@@ -58,11 +60,25 @@ def run_zonal_analysis(zonal_analysis_uuid):
     if layer.layer_type in [LayerType.RASTER_TILE, LayerType.RASTER_COG]:
         bbox = geometries_combined.bounds
         layer_path = layer.download_layer(original_name=True, bbox=bbox)
-        result = run_zonal_analysis_raster(
-            layer_path,
-            [geometries_simplified],
-            aggregation
-        )
+        if zonal_analysis.per_geometry:
+            # All geometries are aggregated in one pass of the raster
+            statistics = run_zonal_statistics_raster(
+                layer_path,
+                {idx: geometry for idx, geometry in enumerate(geometries)}
+            )
+            result = json.dumps(
+                [
+                    statistic.get(aggregation.lower().strip(), 0)
+                    if statistic else None
+                    for statistic in statistics.values()
+                ]
+            )
+        else:
+            result = run_zonal_analysis_raster(
+                layer_path,
+                [geometries_simplified],
+                aggregation
+            )
         zonal_analysis.success(result)
         if layer.layer_type == LayerType.RASTER_TILE:
             os.remove(layer_path)
@@ -90,13 +106,31 @@ def run_zonal_analysis(zonal_analysis_uuid):
 
             if cloud_layer.layer_type == 'Vector Tile':
                 try:
-                    result = run_zonal_analysis_vector_layer(
-                        geometry=geometries_simplified,
-                        layer=cloud_layer,
-                        aggregation=aggregation,
-                        aggregation_field=zonal_analysis.aggregation_field,
-                    )
-                    zonal_analysis.success(float(result))
+                    if zonal_analysis.per_geometry:
+                        results = []
+                        for geometry in geometries:
+                            result = run_zonal_analysis_vector_layer(
+                                geometry=geometry,
+                                layer=cloud_layer,
+                                aggregation=aggregation,
+                                aggregation_field=(
+                                    zonal_analysis.aggregation_field
+                                ),
+                            )
+                            results.append(
+                                float(result) if result is not None else None
+                            )
+                        zonal_analysis.success(json.dumps(results))
+                    else:
+                        result = run_zonal_analysis_vector_layer(
+                            geometry=geometries_simplified,
+                            layer=cloud_layer,
+                            aggregation=aggregation,
+                            aggregation_field=(
+                                zonal_analysis.aggregation_field
+                            ),
+                        )
+                        zonal_analysis.success(float(result))
                 except KeyError as e:
                     zonal_analysis.failed(
                         f'{e} is required in payload'
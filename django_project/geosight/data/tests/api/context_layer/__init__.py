@@ -20,4 +20,5 @@ from .cloud_native_gis_api_flow import ContextLayerCloudNativeAPIFlowTest
 from .cloud_native_gis_download import ContextLayerCloudNativeDownloadTest
 from .cloud_native_zonal_analysis import TestCloudNativeZonalAnalysis  # noqa
 from .raster_zonal_analysis import TestRasterZonalAnalysis  # noqa
+from .raster_zonal_statistics import TestRasterZonalStatistics  # noqa
 from .resource_api import ContextLayerListApiTest  # noqa
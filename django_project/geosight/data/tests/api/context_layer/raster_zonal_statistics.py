@@ -0,0 +1,101 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from shapely.geometry import Polygon, box
+
+from core.settings.utils import ABS_PATH
+from core.tests.base_tests import TestCase
+from geosight.data.utils import (
+    run_zonal_analysis_raster, run_zonal_statistics_raster
+)
+
+
+class TestRasterZonalStatistics(TestCase):
+    """Test per geometry zonal statistics of raster."""
+
+    raster_path = ABS_PATH(
+        'geosight', 'data', 'tests', 'data', 'context_layer.tif'
+    )
+    geometries = {
+        'a': Polygon(
+            [
+                (45.19738527596081, 4.554035332048031),
+                (45.90987617833042, 4.260083544521251),
+                (45.09911066873855, 3.9905288280847344),
+                (45.19738527596081, 4.554035332048031)
+            ]
+        ),
+        'b': Polygon(
+            [
+                (46.74521033972894, 6.021839943659998),
+                (47.18744607223496, 5.5329643557698205),
+                (46.597798428894464, 5.4840539720461265),
+                (46.74521033972894, 6.021839943659998)
+            ]
+        ),
+        'outside': box(0, 0, 1, 1)
+    }
+
+    def test_statistics(self):
+        """Test every zone has same result with the single zone analysis."""
+        results = run_zonal_statistics_raster(
+            self.raster_path, self.geometries, block_rows=7
+        )
+        self.assertIsNone(results['outside'])
+        for key in ['a', 'b']:
+            self.assertGreater(results[key]['count'], 0)
+            for aggregation in ['sum', 'count', 'min', 'max', 'avg']:
+                self.assertAlmostEqual(
+                    results[key][aggregation],
+                    run_zonal_analysis_raster(
+                        self.raster_path, [self.geometries[key]], aggregation
+                    ),
+                    places=4
+                )
+
+        # The union of zones
+        self.assertEqual(
+            run_zonal_analysis_raster(
+                self.raster_path,
+                [self.geometries['a'], self.geometries['b']],
+                'count'
+            ),
+            results['a']['count'] + results['b']['count']
+        )
+
+    def test_overlap(self):
+        """Test the overlapping zones get all of their pixels."""
+        zones = {
+            'a': self.geometries['a'],
+            'a_buffer': self.geometries['a'].buffer(0.1),
+            'ab': self.geometries['a'].union(self.geometries['b']),
+            'b': self.geometries['b'],
+        }
+        results = run_zonal_statistics_raster(
+            self.raster_path, zones, block_rows=7
+        )
+        self.assertGreater(
+            results['a_buffer']['count'], results['a']['count']
+        )
+        for key, geometry in zones.items():
+            for aggregation in ['sum', 'count', 'min', 'max', 'avg']:
+                self.assertAlmostEqual(
+                    results[key][aggregation],
+                    run_zonal_analysis_raster(
+                        self.raster_path, [geometry], aggregation
+                    ),
+                    places=4
+                )
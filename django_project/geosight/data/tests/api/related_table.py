@@ -316,6 +316,27 @@ class RelatedTableApiTest(BasePermissionTest.TestCase):
             [res['geom_id'] for res in response.json()], ['A', 'A', 'B']
         )
 
+    def test_data_values_api_keyset(self):
+        """Test data with keyset pagination."""
+        param = (
+            f'country_geom_ids=A,B,C&'
+            f'geography_code_field_name={self.geography_code_field_name}&'
+            f'geography_code_type={self.geography_code_type}&'
+            f'date_field={self.date_field}&page_size=2&after='
+        )
+        response = self.data_api_assert('related_tables_geo_data-list', param)
+        data = response.json()
+        self.assertEqual(
+            [res['geom_id'] for res in data['results']], ['A', 'A']
+        )
+        self.assertIsNotNone(data['after'])
+
+        response = self.assertRequestGetView(data['next'], 200, self.viewer)
+        data = response.json()
+        self.assertEqual([res['geom_id'] for res in data['results']], ['B'])
+        self.assertIsNone(data['after'])
+        self.assertIsNone(data['next'])
+
     def test_data_dates_api(self):
         """Test data access."""
         param = (
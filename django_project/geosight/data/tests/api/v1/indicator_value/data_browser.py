@@ -86,6 +86,36 @@ class DataBrowserApiTest(BaseDataBrowserTest.TestCase):
             else:
                 self.assertTrue('description' not in result['attributes'])
 
+    def test_list_api_keyset(self):
+        """Test List API with keyset pagination."""
+        url = reverse('data-browser-list')
+        for sort, key in [
+            ('', 'id'), ('&sort=-date', 'date'),
+            ('&sort=geom_id,-date', 'geom_id')
+        ]:
+            ids = []
+            keys = []
+            next_url = f'{url}?page_size=10&after={sort}'
+            while next_url:
+                response = self.assertRequestGetView(
+                    next_url, 200, user=self.admin
+                )
+                data = response.json()
+                self.assertTrue(len(data['results']) <= 10)
+                ids += [result['id'] for result in data['results']]
+                keys += [result[key] for result in data['results']]
+                next_url = data['next']
+            self.assertEqual(len(ids), 36)
+            self.assertEqual(len(set(ids)), 36)
+            self.assertEqual(keys, sorted(keys, reverse=key == 'date'))
+
+        self.assertRequestGetView(f'{url}?after=invalid', 404, user=self.admin)
+
+        # Nullable fields can't be the keys
+        self.assertRequestGetView(
+            f'{url}?after=&sort=value', 400, user=self.admin
+        )
+
     def test_list_api_by_creator(self):
         """Test List API."""
         user = self.creator
@@ -18,6 +18,9 @@ from django.db import connection
 
 from core.tests.base_tests import TestCase
 from geosight.data.models.indicator import IndicatorValue, IndicatorExtraValue
+from geosight.data.models.indicator.indicator_value_dataset import (
+    IndicatorValueDatasetSummary
+)
 from geosight.data.tests.model_factories import (
     IndicatorValueF, IndicatorF
 )
@@ -582,3 +585,126 @@ class IndicatorValueTest(TestCase):
         # check indicator
         self.assertEquals(value_b.indicator_name, indicator.name)
         self.assertEquals(value_b.indicator_shortcode, indicator.shortcode)
+
+    def test_bulk_save(self):
+        """Test save values in bulk."""
+        indicator = IndicatorF(name='Indicator Bulk', shortcode='BULK')
+        version = indicator.version_data
+        count = indicator.save_values(
+            [
+                {
+                    'date': '2020-05-01', 'geom_id': 'AAA', 'value': 1,
+                    'admin_level': 2, 'extras': {'Extra 1': 'A'}
+                },
+                {
+                    'date': '2020-05-01', 'geom_id': 'A', 'value': 2,
+                    'admin_level': 0
+                },
+                {
+                    'date': '2020-05-01', 'geom_id': 'A', 'value': 3,
+                    'admin_level': 0
+                },
+            ],
+            reference_layer=self.reference_layer.identifier
+        )
+        self.assertEquals(count, 2)
+        self.assertEquals(indicator.indicatorvalue_set.count(), 2)
+        indicator.refresh_from_db()
+        self.assertNotEquals(indicator.version_data, version)
+
+        # Check the flat table
+        value_a = indicator.indicatorvalue_set.get(geom_id='AAA')
+        entity = Entity.objects.get(geom_id='AAA')
+        self.assertEquals(value_a.value, 1)
+        self.assertEquals(value_a.entity, entity)
+        self.assertEquals(value_a.entity_name, entity.name)
+        self.assertEquals(value_a.admin_level, 2)
+        self.assertEquals(value_a.concept_uuid, 'concept_AAA')
+        self.assertEquals(value_a.country, entity.country)
+        self.assertEquals(value_a.country_name, 'country')
+        self.assertEquals(value_a.country_geom_id, 'A')
+        self.assertEquals(value_a.indicator_name, indicator.name)
+        self.assertEquals(value_a.indicator_shortcode, 'BULK')
+        self.assertEquals(value_a.extra_value, {'Extra 1': 'A'})
+
+        # The last row wins
+        value_b = indicator.indicatorvalue_set.get(geom_id='A')
+        self.assertEquals(value_b.value, 3)
+        self.assertEquals(value_b.country, value_b.entity)
+        self.assertEquals(value_b.country_name, 'country')
+
+        # Update the existing one, extras are merged
+        count = indicator.save_values(
+            [
+                {
+                    'date': '2020-05-01', 'geom_id': 'AAA', 'value': 10,
+                    'admin_level': 2, 'extras': {'Extra 2': 'B'}
+                }
+            ],
+            reference_layer=self.reference_layer.identifier
+        )
+        self.assertEquals(count, 1)
+        self.assertEquals(indicator.indicatorvalue_set.count(), 2)
+        value_a.refresh_from_db()
+        self.assertEquals(value_a.value, 10)
+        self.assertEquals(
+            value_a.extra_value, {'Extra 1': 'A', 'Extra 2': 'B'}
+        )
+
+    def test_dataset_summary(self):
+        """Test the dataset summary is maintained."""
+        indicator = IndicatorF(name='Indicator Summary')
+        country = Entity.objects.get(geom_id='A')
+        for date, geom_id in [
+            ('2020-01-01', 'AA'), ('2020-03-01', 'AA'), ('2020-02-01', 'AAA')
+        ]:
+            IndicatorValueF(
+                indicator=indicator, date=date, geom_id=geom_id, value=1
+            )
+        summaries = IndicatorValueDatasetSummary.objects.filter(
+            indicator=indicator
+        ).order_by('admin_level')
+        self.assertEquals(summaries.count(), 2)
+        summary = summaries[0]
+        self.assertEquals(summary.country, country)
+        self.assertEquals(summary.admin_level, 1)
+        self.assertEquals(summary.data_count, 2)
+        self.assertEquals(summary.start_date.isoformat(), '2020-01-01')
+        self.assertEquals(summary.end_date.isoformat(), '2020-03-01')
+        self.assertEquals(summary.indicator_name, 'Indicator Summary')
+        self.assertEquals(summary.country_name, 'country')
+
+        # Delete the last date
+        indicator.indicatorvalue_set.filter(date='2020-03-01').delete()
+        summary = summaries[0]
+        self.assertEquals(summary.data_count, 1)
+        self.assertEquals(summary.end_date.isoformat(), '2020-01-01')
+
+        # Delete all values of level 2
+        indicator.indicatorvalue_set.filter(geom_id='AAA').delete()
+        self.assertEquals(summaries.count(), 1)
+
+        # Bulk save
+        indicator.save_values(
+            [
+                {
+                    'date': '2020-05-01', 'geom_id': 'AA', 'value': 1,
+                    'admin_level': 1
+                },
+            ],
+            reference_layer=self.reference_layer.identifier
+        )
+        summary = summaries[0]
+        self.assertEquals(summary.data_count, 2)
+        self.assertEquals(summary.end_date.isoformat(), '2020-05-01')
+
+        # Values without country are summarized too
+        indicator.indicatorvalue_set.filter(date='2020-05-01').update(
+            country_id=None
+        )
+        summary = summaries.get(country__isnull=True)
+        self.assertEquals(summary.data_count, 1)
+        self.assertEquals(summary.start_date.isoformat(), '2020-05-01')
+        summary = summaries.get(country=country)
+        self.assertEquals(summary.data_count, 1)
+        self.assertEquals(summary.end_date.isoformat(), '2020-01-01')
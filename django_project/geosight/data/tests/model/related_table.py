@@ -20,6 +20,10 @@ from geosight.data.models.related_table import (
     RelatedTable
 )
 from geosight.data.serializer.related_table import RelatedTableSerializer
+from geosight.georepo.models import Entity
+from geosight.georepo.tests.model_factories.reference_layer import (
+    ReferenceLayerF
+)
 
 
 class RelatedTableTest(TestCase):
@@ -201,3 +205,156 @@ class RelatedTableTest(TestCase):
             DashboardRelatedTable.objects.filter(
                 object=self.related_table).count(), 0
         )
+
+    def test_insert_rows_in_chunks(self):
+        """Test insert rows in chunks, with one sequence of orders."""
+        rows = self.related_table.relatedtablerow_set
+        errors = self.related_table.insert_rows(
+            ({'geom_id': f'Geom{idx}'} for idx in range(5)), step=2
+        )
+        self.assertEqual(errors, {})
+        self.related_table.insert_rows([{'geom_id': 'Geom5'}], step=2)
+        self.assertEqual(
+            list(rows.values_list('order', 'data__geom_id')),
+            [(idx, f'Geom{idx}') for idx in range(6)]
+        )
+        self.assertEqual(
+            self.related_table.fields_definition[0]['name'], 'geom_id'
+        )
+
+        # Replace, the last row of same order is kept
+        self.related_table.insert_rows(
+            [
+                {'order': 1, 'geom_id': 'A'},
+                {'geom_id': 'B'},
+                {'order': 1, 'geom_id': 'C'},
+            ],
+            replace=True
+        )
+        self.assertEqual(
+            list(rows.values_list('order', 'data__geom_id')),
+            [(1, 'C'), (2, 'B')]
+        )
+
+        # Replace without keeping the order of data
+        self.related_table.insert_rows(
+            [{'order': 'a', 'geom_id': 'A'}, {'order': 'a', 'geom_id': 'B'}],
+            replace=True, keep_order=False
+        )
+        self.assertEqual(
+            list(rows.values_list('order', 'data__geom_id')),
+            [(0, 'A'), (1, 'B')]
+        )
+
+        # Errors do not change the rows
+        errors = self.related_table.insert_rows(
+            [{'geom_id': 'D'}, 'invalid'], replace=True
+        )
+        self.assertEqual(list(errors.keys()), ['1'])
+        self.assertEqual(rows.count(), 2)
+
+    def test_keys(self):
+        """Test the rows are filtered and paginated by the keys."""
+        reference_layer = ReferenceLayerF()
+        for geom_id in ['A', 'B']:
+            Entity.get_or_create(
+                reference_layer, name='', geom_id=geom_id, admin_level=0
+            )
+        for idx in range(6):
+            self.related_table.insert_row(
+                {
+                    'geom_id': 'A' if idx % 2 else 'B',
+                    'date': f'{1577836800 + idx * 86400}'
+                }
+            )
+        self.assertTrue(self.related_table.set_keys('geom_id', 'date'))
+        self.assertFalse(self.related_table.set_keys('geom_id', 'date'))
+        row = self.related_table.relatedtablerow_set.first()
+        self.assertEqual(row.geo_code, 'B')
+        self.assertEqual(
+            row.date_time.isoformat(), '2020-01-01T00:00:00+00:00'
+        )
+
+        # New row has the keys
+        row = self.related_table.insert_row(
+            {'geom_id': 'C', 'date': '1577836800'}
+        )
+        self.assertEqual(row.geo_code, 'C')
+        row.delete()
+
+        kwargs = {
+            'country_geom_ids': ['A', 'B'],
+            'geo_field': 'geom_id',
+            'date_field': 'date',
+            'min_time': '2020-01-02T00:00:00+00:00',
+            'max_time': '2020-01-05T00:00:00+00:00',
+            'limit': 2
+        }
+        data, has_next = self.related_table.data_with_query(
+            offset=0, **kwargs
+        )
+        self.assertEqual(
+            [row['date'] for row in data],
+            ['2020-01-02T00:00:00+00:00', '2020-01-03T00:00:00+00:00']
+        )
+        self.assertEqual([row['geom_id'] for row in data], ['A', 'B'])
+        self.assertTrue(has_next)
+
+        data, has_next = self.related_table.data_with_query(
+            offset=2, **kwargs
+        )
+        self.assertEqual(
+            [row['date'] for row in data],
+            ['2020-01-04T00:00:00+00:00', '2020-01-05T00:00:00+00:00']
+        )
+        self.assertFalse(has_next)
+
+        # Other date format is filtered per row, with same pages
+        self.assertEqual(
+            self.related_table.data_with_query(
+                offset=0, date_format='timestamp', **kwargs
+            )[0],
+            self.related_table.data_with_query(offset=0, **kwargs)[0]
+        )
+        self.assertEqual(
+            len(
+                self.related_table.dates_with_query(
+                    ['A', 'B'], 'geom_id', 'date'
+                )
+            ),
+            6
+        )
+
+    def test_query_field_names(self):
+        """Test the fields with quote and percent sign are queried."""
+        reference_layer = ReferenceLayerF()
+        Entity.get_or_create(
+            reference_layer, name='', geom_id='A', admin_level=0
+        )
+        related_table = RelatedTable.objects.create(name='Test fields')
+        related_table.insert_rows(
+            [
+                {"geo '%": 'A', 'date %': '1577836800'},
+                {"geo '%": 'A'},
+                {"geo '%": 'A', 'date %': '1577923200'},
+            ]
+        )
+
+        # Without time filter, the page is taken in the database
+        data, has_next = related_table.data_with_query(
+            ['A'], "geo '%", date_field='date %', limit=1, offset=0
+        )
+        self.assertEqual(
+            [row['date %'] for row in data], ['2020-01-01T00:00:00+00:00']
+        )
+        self.assertTrue(has_next)
+        data, has_next = related_table.data_with_query(
+            ['A'], "geo '%", date_field='date %', limit=1, offset=1
+        )
+        self.assertEqual(
+            [row['date %'] for row in data], ['2020-01-02T00:00:00+00:00']
+        )
+        self.assertFalse(has_next)
+        self.assertEqual(
+            len(related_table.dates_with_query(['A'], "geo '%", 'date %')), 2
+        )
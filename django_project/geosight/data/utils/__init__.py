@@ -1,5 +1,7 @@
 from .common import download_file_from_url
-from .raster import run_zonal_analysis_raster, ClassifyRasterData
+from .raster import (
+    run_zonal_analysis_raster, run_zonal_statistics_raster, ClassifyRasterData
+)
 from .utils import (
     sizeof_fmt,
     path_to_dict,
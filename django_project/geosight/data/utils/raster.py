@@ -20,52 +20,218 @@ import numpy as np
 import rasterio
 import shapely
 from pyproj import Transformer
-from rasterio.mask import mask
-from shapely.ops import transform
+from rasterio.features import rasterize
+from rasterio.windows import Window, bounds as window_bounds
+from shapely.ops import transform, unary_union
 import jenkspy
 
 
-def run_zonal_analysis_raster(
+ZONAL_STATISTICS = ['sum', 'count', 'min', 'max', 'avg']
+
+
+def _zonal_window(src, shapes: list):
+    """Return the pixel window (row_start, row_stop, col_start, col_stop).
+
+    The window covers all of shapes, clipped to the raster.
+    Return None if the shapes are outside the raster.
+
+    :param src: The opened raster.
+    :type src: rasterio.DatasetReader
+    :param shapes: List of (geometry, label) in the raster crs.
+    :type shapes: list
+    :return: The window, or None.
+    :rtype: tuple
+    """
+    minx = min(geom.bounds[0] for geom, _ in shapes)
+    miny = min(geom.bounds[1] for geom, _ in shapes)
+    maxx = max(geom.bounds[2] for geom, _ in shapes)
+    maxy = max(geom.bounds[3] for geom, _ in shapes)
+    corners = [(minx, miny), (minx, maxy), (maxx, miny), (maxx, maxy)]
+    cols, rows = zip(*[~src.transform * corner for corner in corners])
+    row_start = max(0, int(np.floor(min(rows))))
+    row_stop = min(src.height, int(np.ceil(max(rows))))
+    col_start = max(0, int(np.floor(min(cols))))
+    col_stop = min(src.width, int(np.ceil(max(cols))))
+    if row_start >= row_stop or col_start >= col_stop:
+        return None
+    return row_start, row_stop, col_start, col_stop
+
+
+def _zone_layers(shapes):
+    """Split the shapes into layers whose shapes do not overlap.
+
+    A label array holds just one zone per pixel,
+    so the overlapping zones, e.g. parent and children,
+    are rasterised in separate layers.
+    The zones that just touch each other are in the same layer.
+
+    :param shapes: List of geometry and label.
+    :type shapes: list
+    :return: List of layer, that is list of geometry and label.
+    :rtype: list
+    """
+    tree = shapely.STRtree([geom for geom, _ in shapes])
+    layer_of = {}
+    layers = []
+    for idx, (geom, _) in enumerate(shapes):
+        used = set()
+        for other in tree.query(geom, predicate='intersects'):
+            if other in layer_of and not geom.touches(shapes[other][0]):
+                used.add(layer_of[other])
+        layer = 0
+        while layer in used:
+            layer += 1
+        if layer == len(layers):
+            layers.append([])
+        layers[layer].append(shapes[idx])
+        layer_of[idx] = layer
+    return layers
+
+
+def run_zonal_statistics_raster(
         raster_path: str,
-        geometries: typing.List[shapely.Geometry],
-        aggregation: str
-):
-    """Run zonal analysis on multiple geometries."""
-    aggregation = aggregation.lower().strip()
+        zones: dict,
+        block_rows: int = 1024
+) -> dict:
+    """Run zonal statistics for every zone in one pass of the raster.
+
+    The zones are rasterised into a label array per block of rows,
+    and the statistics of all zones are reduced with bincount.
+    The overlapping zones are rasterised into separate label arrays,
+    so every zone gets all of its pixels.
+    A pixel belongs to the zone that contains its center,
+    the same as :func:`rasterio.mask.mask`.
+
+    :param raster_path: Path of the raster.
+    :type raster_path: str
+    :param zones: Key of zone and the geometry in EPSG:4326.
+    :type zones: dict
+    :param block_rows: Number of rows that are read per block.
+    :type block_rows: int
+    :return:
+        Key of zone and the statistics (sum, count, min, max and avg).
+        The statistics is None if the zone is outside the raster.
+    :rtype: dict
+    """
+    keys = list(zones.keys())
+    size = len(keys) + 1
+    total = np.zeros(size, dtype=np.float64)
+    count = np.zeros(size, dtype=np.int64)
+    minimum = np.full(size, np.inf)
+    maximum = np.full(size, -np.inf)
+    overlap = np.zeros(size, dtype=bool)
+
     with rasterio.open(raster_path) as src:
+        is_integer = np.issubdtype(np.dtype(src.dtypes[0]), np.integer)
         transformer = Transformer.from_crs(
             "EPSG:4326",
             str(src.crs),
             always_xy=True
         )
-        transformed_geoms = [
-            transform(
-                transformer.transform,
-                geometry
-            ) for geometry in geometries
-        ]
-        try:
-            out_image, out_transform = mask(src, transformed_geoms, crop=True)
-        except ValueError:
-            return None
-        data = out_image[0]
-
-        # mask invalid data e.g. nan and inf
-        data = np.ma.masked_invalid(data)
-        # mask nodata
-        data = np.ma.masked_equal(data, src.nodata).compressed()
-        aggregate = 0
-        if aggregation == 'sum':
-            aggregate = np.sum(data) if data.size else None
-        elif aggregation == 'count':
-            aggregate = data.size
-        elif aggregation == 'min':
-            aggregate = np.min(data) if data.size else None
-        elif aggregation == 'max':
-            aggregate = np.max(data) if data.size else None
-        elif aggregation == 'avg':
-            aggregate = np.average(data) if data.size else None
-        return aggregate
+
+        # Label 0 is for outside of zones
+        shapes = []
+        for idx, key in enumerate(keys):
+            geometry = zones[key]
+            if geometry is None or geometry.is_empty:
+                continue
+            shapes.append(
+                (transform(transformer.transform, geometry), idx + 1)
+            )
+
+        window = _zonal_window(src, shapes) if shapes else None
+        if window:
+            layers = _zone_layers(shapes)
+            row_start, row_stop, col_start, col_stop = window
+            for row in range(row_start, row_stop, block_rows):
+                block = Window(
+                    col_start, row, col_stop - col_start,
+                    min(block_rows, row_stop - row)
+                )
+                left, bottom, right, top = window_bounds(block, src.transform)
+                data = None
+                for layer in layers:
+                    block_shapes = [
+                        (geom, label) for geom, label in layer
+                        if geom.bounds[0] <= right and
+                        geom.bounds[2] >= left and
+                        geom.bounds[1] <= top and geom.bounds[3] >= bottom
+                    ]
+                    if not block_shapes:
+                        continue
+                    for _, label in block_shapes:
+                        overlap[label] = True
+
+                    if data is None:
+                        data = src.read(1, window=block)
+                        # Skip nan, inf and nodata
+                        finite = np.isfinite(data)
+                        if src.nodata is not None:
+                            finite &= data != src.nodata
+                    labels = rasterize(
+                        block_shapes,
+                        out_shape=data.shape,
+                        transform=src.window_transform(block),
+                        fill=0,
+                        dtype='int32'
+                    )
+
+                    # Skip outside zones
+                    valid = (labels > 0) & finite
+                    labels = labels[valid]
+                    values = data[valid].astype(np.float64)
+
+                    total += np.bincount(
+                        labels, weights=values, minlength=size
+                    )
+                    count += np.bincount(labels, minlength=size)
+                    np.minimum.at(minimum, labels, values)
+                    np.maximum.at(maximum, labels, values)
+
+    def _value(value):
+        """Return python value with the type of raster.
+
+        :param value: The numpy value.
+        :type value: numpy.number
+        :return: The value as int or float.
+        :rtype: int | float
+        """
+        return int(value) if is_integer else float(value)
+
+    results = {}
+    for idx, key in enumerate(keys):
+        label = idx + 1
+        if not overlap[label]:
+            results[key] = None
+        elif not count[label]:
+            results[key] = {
+                'sum': None, 'count': 0, 'min': None, 'max': None,
+                'avg': None
+            }
+        else:
+            results[key] = {
+                'sum': _value(total[label]),
+                'count': int(count[label]),
+                'min': _value(minimum[label]),
+                'max': _value(maximum[label]),
+                'avg': float(total[label] / count[label])
+            }
+    return results
+
+
+def run_zonal_analysis_raster(
+        raster_path: str,
+        geometries: typing.List[shapely.Geometry],
+        aggregation: str
+):
+    """Run zonal analysis on multiple geometries."""
+    aggregation = aggregation.lower().strip()
+    result = run_zonal_statistics_raster(
+        raster_path, {0: unary_union(geometries)}
+    )[0]
+    if result is None:
+        return None
+    return result.get(aggregation, 0)
 
 
 class ClassifyRasterData:
@@ -20,6 +20,9 @@ from django.db.utils import IntegrityError
 
 from geosight.data_restorer.importers.base import BaseImporter
 from geosight.georepo.models.entity import Entity
+from geosight.georepo.models.entity_geometry import (
+    EntitySimplifiedGeometry
+)
 from geosight.georepo.models.reference_layer import ReferenceLayerView
 from geosight.georepo.models.reference_layer_entity import (
     ReferenceLayerViewEntity
@@ -118,5 +121,8 @@ class DatasetImporter(BaseImporter):
             for entity in entities
         ])
 
+        EntitySimplifiedGeometry.generate(
+            [entity.id for entity in entities]
+        )
         reference_layer.assign_countries()
         return reference_layer
@@ -46,7 +46,7 @@ class NullCountryFilter(admin.SimpleListFilter):
 @admin.action(description='Assign country')
 def assign_country(modeladmin, request, queryset):
     """Assign country."""
-    Entity.assign_country()
+    Entity.assign_country(list(queryset.values_list('id', flat=True)))
 
 
 class EntityCodeInline(admin.TabularInline):
@@ -0,0 +1,883 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+import json
+import math
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterator
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import BaseAdapter
+
+from geosight.georepo.request.request import (
+    mount_georepo_adapter, override_georepo_url
+)
+
+START_DATE = '2020-01-01T00:00:00Z'
+
+
+class FixtureEntities(object):
+    """Entities of a level that are loaded from fixture."""
+
+    def __init__(self, entities: list):  # noqa: DOC101,DOC103
+        """Init the entities.
+
+        :param entities: List of GeoRepo entity data.
+        :type entities: list
+        """
+        self.entities = entities
+        self._index = None
+
+    def __len__(self) -> int:
+        """Return number of entities.
+
+        :return: Number of entities.
+        :rtype: int
+        """
+        return len(self.entities)
+
+    def page(self, start: int, end: int) -> list:
+        """Return entities from start to end index.
+
+        :param start: The start index.
+        :type start: int
+        :param end: The end index, excluded.
+        :type end: int
+        :return: List of GeoRepo entity.
+        :rtype: list
+        """
+        return self.entities[start:end]
+
+    @property
+    def index(self) -> dict:
+        """Return (id_type, code) : entities, built on the first lookup."""
+        if self._index is None:
+            self._index = {}
+            for entity in self.entities:
+                codes = dict(entity.get('ext_codes') or {})
+                for id_type in ['ucode', 'uuid', 'concept_uuid']:
+                    codes[id_type] = entity.get(id_type)
+                for id_type, code in codes.items():
+                    if code is not None:
+                        self._index.setdefault(
+                            (id_type, f'{code}'), []
+                        ).append(entity)
+        return self._index
+
+    def find(self, id_type: str, code: str) -> list:
+        """Return entities of the code.
+
+        :param id_type: The type of the code.
+        :type id_type: str
+        :param code: The code.
+        :type code: str
+        :return: List of GeoRepo entity.
+        :rtype: list
+        """
+        return self.index.get((id_type, f'{code}'), [])
+
+
+class GeneratedEntities(object):
+    """Entities of a level that are generated on request.
+
+    The entity is computed from its index, so millions of entities
+    can be served without keeping them in memory.
+    Entity ``i`` of the level has parent ``i // branching``
+    on the level above.
+    """
+
+    UCODE = re.compile(r'^EMU_(\d+)_(\d+)_V1$')
+    PCODE = re.compile(r'^EMU(\d+)P(\d+)$')
+
+    def __init__(  # noqa: DOC101,DOC103
+            self, level: int, count: int, branching: int
+    ):
+        """Init the entities.
+
+        :param level: The admin level.
+        :type level: int
+        :param count: Number of entities of the level.
+        :type count: int
+        :param branching: Number of children per entity of level above.
+        :type branching: int
+        """
+        self.level = level
+        self.count = count
+        self.branching = branching
+
+    def __len__(self) -> int:
+        """Return number of entities.
+
+        :return: Number of entities.
+        :rtype: int
+        """
+        return self.count
+
+    @staticmethod
+    def ucode(level: int, idx: int) -> str:
+        """Return ucode of entity.
+
+        :param level: The admin level.
+        :type level: int
+        :param idx: The index of entity in the level.
+        :type idx: int
+        :return: The ucode.
+        :rtype: str
+        """
+        return f'EMU_{level}_{idx}_V1'
+
+    @staticmethod
+    def pcode(level: int, idx: int) -> str:
+        """Return PCode of entity.
+
+        :param level: The admin level.
+        :type level: int
+        :param idx: The index of entity in the level.
+        :type idx: int
+        :return: The PCode.
+        :rtype: str
+        """
+        return f'EMU{level}P{idx}'
+
+    @staticmethod
+    def uuid(level: int, idx: int, concept: bool = False) -> str:
+        """Return uuid of entity.
+
+        :param level: The admin level.
+        :type level: int
+        :param idx: The index of entity in the level.
+        :type idx: int
+        :param concept: Whether to return the concept uuid.
+        :type concept: bool
+        :return: The uuid.
+        :rtype: str
+        """
+        return str(
+            uuid.UUID(int=(int(concept) << 100) + (level << 64) + idx + 1)
+        )
+
+    def entity(self, idx: int) -> dict:
+        """Return entity data of the index.
+
+        :param idx: The index of entity in the level.
+        :type idx: int
+        :return: The GeoRepo entity.
+        :rtype: dict
+        """
+        level = self.level
+        width = 10.0 / (self.branching ** level)
+        parents = []
+        parent_idx = idx
+        for parent_level in range(level - 1, -1, -1):
+            parent_idx = parent_idx // self.branching
+            parents.append(
+                {
+                    'ucode': self.ucode(parent_level, parent_idx),
+                    'admin_level': parent_level
+                }
+            )
+        return {
+            'name': f'Entity {level}-{idx}',
+            'ucode': self.ucode(level, idx),
+            'uuid': self.uuid(level, idx),
+            'concept_uuid': self.uuid(level, idx, concept=True),
+            'admin_level': level,
+            'is_latest': True,
+            'start_date': START_DATE,
+            'end_date': None,
+            'ext_codes': {
+                'PCode': self.pcode(level, idx),
+                'default': self.pcode(level, idx)
+            },
+            'parents': parents,
+            'bbox': [idx * width, 0, (idx + 1) * width, 10]
+        }
+
+    def page(self, start: int, end: int) -> list:
+        """Return entities from start to end index.
+
+        :param start: The start index.
+        :type start: int
+        :param end: The end index, excluded.
+        :type end: int
+        :return: List of GeoRepo entity.
+        :rtype: list
+        """
+        return [
+            self.entity(idx) for idx in range(start, min(end, self.count))
+        ]
+
+    def find(self, id_type: str, code: str) -> list:
+        """Return entities of the code.
+
+        :param id_type: The type of the code.
+        :type id_type: str
+        :param code: The code.
+        :type code: str
+        :return: List of GeoRepo entity.
+        :rtype: list
+        """
+        code = f'{code}'
+        level = idx = None
+        if id_type == 'ucode':
+            match = self.UCODE.match(code)
+            if match:
+                level, idx = match.groups()
+        elif id_type in ['PCode', 'default']:
+            match = self.PCODE.match(code)
+            if match:
+                level, idx = match.groups()
+        elif id_type in ['uuid', 'concept_uuid']:
+            try:
+                value = uuid.UUID(code).int - 1
+                concept = value >> 100
+                if concept == int(id_type == 'concept_uuid'):
+                    value -= concept << 100
+                    level, idx = value >> 64, value & ((1 << 64) - 1)
+            except ValueError:
+                pass
+        if level is None or int(level) != self.level:
+            return []
+        idx = int(idx)
+        if 0 <= idx < self.count:
+            return [self.entity(idx)]
+        return []
+
+
+class GeorepoEmulator(object):
+    """Local stand-in of GeoRepo API, backed by fixture or generated data.
+
+    It serves the module, dataset, view, entity, containment, bbox and
+    batch identifier endpoints that :class:`GeorepoRequest` uses,
+    through a requests transport adapter.
+    Every request waits ``latency`` seconds, to emulate the network.
+
+    The data format is::
+
+        {"modules": [{
+            "uuid": "", "name": "",
+            "datasets": [{
+                "uuid": "", "name": "", "description": "",
+                "views": [{
+                    "uuid": "", "name": "", "description": "",
+                    "entities": [<GeoRepo entity>]
+                }]
+            }]
+        }]}
+    """
+
+    url = 'http://georepo.emulator/api/v1'
+
+    ROUTES = [
+        ('GET', r'/search/module/list/?', 'module_list'),
+        (
+            'GET', r'/search/module/(?P<uuid>[^/]+)/dataset/list/?',
+            'dataset_list'
+        ),
+        ('GET', r'/search/dataset/(?P<uuid>[^/]+)/view/list/?', 'view_list'),
+        ('GET', r'/search/dataset/(?P<uuid>[^/]+)/?', 'dataset_detail'),
+        (
+            'GET', r'/search/view/(?P<uuid>[^/]+)/entity/level/'
+                   r'(?P<level>\d+)/?',
+            'entity_list'
+        ),
+        (
+            'GET', r'/search/view/(?P<uuid>[^/]+)/entity/identifier/'
+                   r'(?P<id_type>[^/]+)/(?P<code>[^/]+)/?',
+            'find_entity'
+        ),
+        (
+            'POST', r'/search/view/(?P<uuid>[^/]+)/entity/batch/identifier/'
+                    r'(?P<id_type>[^/]+)/?',
+            'identify_codes'
+        ),
+        ('GET', r'/search/view/(?P<uuid>[^/]+)/?', 'view_detail'),
+        ('GET', r'/jobs/(?P<job>[^/]+)/status/?', 'job_status'),
+        ('GET', r'/jobs/(?P<job>[^/]+)/output/?', 'job_output'),
+        (
+            'GET', r'/operation/view/(?P<uuid>[^/]+)/bbox/uuid/'
+                   r'(?P<entity>[^/]+)/?',
+            'bbox'
+        ),
+        (
+            'POST', r'/operation/view/(?P<uuid>[^/]+)/containment-check/'
+                    r'(?P<spatial_query>[^/]+)/(?P<distance>[^/]+)/'
+                    r'(?P<id_type>[^/]+)/?',
+            'containment'
+        ),
+    ]
+
+    def __init__(  # noqa: DOC101,DOC103
+            self, data: dict, latency: float = 0, job_polls: int = 0
+    ):
+        """Init the emulator.
+
+        :param data: The modules, datasets, views and entities.
+        :type data: dict
+        :param latency: Seconds of waiting per request.
+        :type latency: float
+        :param job_polls: Number of status checks that a batch job is
+            still running before it is done.
+        :type job_polls: int
+        """
+        self.latency = latency
+        self.job_polls = job_polls
+        self.routes = [
+            (method, re.compile(f'^{pattern}$'), getattr(self, handler))
+            for method, pattern, handler in self.ROUTES
+        ]
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.requests = 0
+
+        self.modules = {}
+        self.datasets = {}
+        self.views = {}
+        for module in data.get('modules', []):
+            self.modules[module['uuid']] = module
+            for dataset in module.get('datasets', []):
+                self.datasets[dataset['uuid']] = dataset
+                for view in dataset.get('views', []):
+                    levels = view.get('levels')
+                    if levels is None:
+                        levels = {}
+                        for entity in view.get('entities', []):
+                            levels.setdefault(
+                                entity['admin_level'], []
+                            ).append(entity)
+                        levels = {
+                            level: FixtureEntities(entities)
+                            for level, entities in levels.items()
+                        }
+                    self.views[view['uuid']] = {
+                        'view': view,
+                        'levels': dict(sorted(levels.items()))
+                    }
+
+    # ------------------------------------------------
+    # Factories
+    # ------------------------------------------------
+    @staticmethod
+    def from_fixture(path: str, **kwargs) -> 'GeorepoEmulator':
+        """Return emulator of fixture JSON file.
+
+        :param path: Path of the fixture.
+        :type path: str
+        :param **kwargs: Options of the emulator.
+        :type **kwargs: dict
+        :return: The emulator.
+        :rtype: GeorepoEmulator
+        """
+        with open(path) as _file:
+            return GeorepoEmulator(json.load(_file), **kwargs)
+
+    @staticmethod
+    def generate(
+            entities: int, levels: int = 3, branching: int = 10, **kwargs
+    ) -> 'GeorepoEmulator':
+        """Return emulator with one view of around ``entities`` entities.
+
+        :param entities: Number of entities of the view.
+        :type entities: int
+        :param levels: Number of admin levels.
+        :type levels: int
+        :param branching: Number of children per entity.
+        :type branching: int
+        :param **kwargs: Options of the emulator.
+        :type **kwargs: dict
+        :return: The emulator.
+        :rtype: GeorepoEmulator
+        """
+        countries = max(
+            1, math.ceil(
+                entities / sum(branching ** level for level in range(levels))
+            )
+        )
+        return GeorepoEmulator(
+            {
+                'modules': [{
+                    'uuid': 'emulator-module',
+                    'name': 'Admin Boundaries',
+                    'datasets': [{
+                        'uuid': 'emulator-dataset',
+                        'name': 'Emulator',
+                        'description': '',
+                        'views': [{
+                            'uuid': 'emulator-view',
+                            'name': f'Emulator {entities}',
+                            'description': '',
+                            'levels': {
+                                level: GeneratedEntities(
+                                    level, countries * (branching ** level),
+                                    branching
+                                )
+                                for level in range(levels)
+                            }
+                        }]
+                    }]
+                }]
+            },
+            **kwargs
+        )
+
+    # ------------------------------------------------
+    # Serving
+    # ------------------------------------------------
+    def handle(self, method: str, url: str, body=None) -> (int, object):
+        """Return status code and JSON content of the request.
+
+        :param method: The HTTP method.
+        :type method: str
+        :param url: The full url.
+        :type url: str
+        :param body: The request body.
+        :type body: bytes
+        :return: Status code and the content.
+        :rtype: (int, object)
+        """
+        with self.lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        parsed = urlparse(url)
+        path = parsed.path[len(urlparse(self.url).path):]
+        query = {
+            key: value[0] for key, value in parse_qs(parsed.query).items()
+        }
+        data = json.loads(body) if body else None
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                try:
+                    return handler(query=query, data=data, **match.groupdict())
+                except KeyError:
+                    return 404, {'detail': 'Not found.'}
+        return 404, {'detail': 'Not found.'}
+
+    @staticmethod
+    def _paginate(items, query: dict) -> (int, dict):
+        """Return page of items.
+
+        :param items: List of items or the level entities.
+        :type items: list
+        :param query: The query parameters, with page and page_size.
+        :type query: dict
+        :return: Status code and the page.
+        :rtype: (int, dict)
+        """
+        page = int(query.get('page', 1))
+        page_size = int(query.get('page_size', 50))
+        total = len(items)
+        start = (page - 1) * page_size
+        if hasattr(items, 'page'):
+            results = items.page(start, start + page_size)
+        else:
+            results = items[start:start + page_size]
+        return 200, {
+            'page': page,
+            'total_page': max(1, math.ceil(total / page_size)),
+            'page_size': page_size,
+            'results': results
+        }
+
+    @staticmethod
+    def _detail(data: dict, exclude: str) -> dict:
+        """Return data without the nested key.
+
+        :param data: The module, dataset or view data.
+        :type data: dict
+        :param exclude: The nested key.
+        :type exclude: str
+        :return: The detail.
+        :rtype: dict
+        """
+        return {
+            key: value for key, value in data.items()
+            if key not in [exclude, 'entities', 'levels']
+        }
+
+    def module_list(self, query: dict, **kwargs) -> (int, dict):
+        """Return modules.
+
+        :param query: The query parameters.
+        :type query: dict
+        :param **kwargs: Other parameters of the request.
+        :type **kwargs: dict
+        :return: Status code and the page.
+        :rtype: (int, dict)
+        """
+        return self._paginate(
+            [
+                self._detail(module, 'datasets')
+                for module in self.modules.values()
+            ],
+            query
+        )
+
+    def dataset_list(self, uuid: str, query: dict, **kwargs) -> (int, dict):
+        """Return datasets of module.
+
+        :param uuid: The module uuid.
+        :type uuid: str
+        :param query: The query parameters.
+        :type query: dict
+        :param **kwargs: Other parameters of the request.
+        :type **kwargs: dict
+        :return: Status code and the page.
+        :rtype: (int, dict)
+        """
+        return self._paginate(
+            [
+                self._detail(dataset, 'views')
+                for dataset in self.modules[uuid].get('datasets', [])
+            ],
+            query
+        )
+
+    def dataset_detail(self, uuid: str, **kwargs) -> (int, dict):
+        """Return dataset detail.
+
+        :param uuid: The dataset uuid.
+        :type uuid: str
+        :param **kwargs: Other parameters of the request.
+        :type **kwargs: dict
+        :return: Status code and the detail.
+        :rtype: (int, dict)
+        """
+        return 200, self._detail(self.datasets[uuid], 'views')
+
+    def view_list(self, uuid: str, query: dict, **kwargs) -> (int, dict):
+        """Return views of dataset.
+
+        :param uuid: The dataset uuid.
+        :type uuid: str
+        :param query: The query parameters.
+        :type query: dict
+        :param **kwargs: Other parameters of the request.
+        :type **kwargs: dict
+        :return: Status code and the page.
+        :rtype: (int, dict)
+        """
+        return self._paginate(
+            [
+                self._detail(view, 'entities')
+                for view in self.datasets[uuid].get('views', [])
+            ],
+            query
+        )
+
+    def view_detail(self, uuid: str, **kwargs) -> (int, dict):
+        """Return view detail with the dataset levels.
+
+        :param uuid: The view uuid.
+        :type uuid: str
+        :param **kwargs: Other parameters of the request.
+        :type **kwargs: dict
+        :return: Status code and the detail.
+        :rtype: (int, dict)
+        """
+        view = self.views[uuid]
+        detail = self._detail(view['view'], 'entities')
+        detail['dataset_levels'] = [
+            {
+                'level': level,
+                'url': f'{self.url}/search/view/{uuid}/entity/level/{level}/'
+            }
+            for level in view['levels'].keys()
+        ]
+        return 200, detail
+
+    def entity_list(
+            self, uuid: str, level: str, query: dict, **kwargs
+    ) -> (int, dict):
+        """Return entities of level.
+
+        :param uuid: The view uuid.
+        :type uuid: str
+        :param level: The admin level.
+        :type level: str
+        :param query: The query parameters.
+        :type query: dict
+        :param **kwargs: Other parameters of the request.
+        :type **kwargs: dict
+        :return: Status code and the page.
+        :rtype: (int, dict)
+        """
+        return self._paginate(self.views[uuid]['levels'][int(level)], query)
+
+    def find(self, uuid: str, id_type: str, code: str) -> list:
+        """Return entities of view by the code.
+
+        :param uuid: The view uuid.
+        :type uuid: str
+        :param id_type: The type of the code.
+        :type id_type: str
+        :param code: The code.
+        :type code: str
+        :return: List of GeoRepo entity.
+        :rtype: list
+        """
+        entities = []
+        for level_entities in self.views[uuid]['levels'].values():
+            entities += level_entities.find(id_type, code)
+        return entities
+
+    def find_entity(
+            self, uuid: str, id_type: str, code: str, **kwargs
+    ) -> (int, dict):
+        """Return entity by the code.
+
+        :param uuid: The view uuid.
+        :type uuid: str
+        :param id_type: The type of the code.
+        :type id_type: str
+        :param code: The code.
+        :type code: str
+        :param **kwargs: Other parameters of the request.
+        :type **kwargs: dict
+        :return: Status code and the entities.
+        :rtype: (int, dict)
+        """
+        return 200, {'results': self.find(uuid, id_type, code)}
+
+    def identify_codes(
+            self, uuid: str, id_type: str, data: list, **kwargs
+    ) -> (int, dict):
+        """Submit batch job of identifying the codes.
+
+        :param uuid: The view uuid.
+        :type uuid: str
+        :param id_type: The type of the codes.
+        :type id_type: str
+        :param data: The codes.
+        :type data: list
+        :param **kwargs: Other parameters of the request.
+        :type **kwargs: dict
+        :return: Status code and the status url of the job.
+        :rtype: (int, dict)
+        """
+        job = str(len(self.jobs) + 1)
+        output = {}
+        for code in data or []:
+            entities = self.find(uuid, id_type, code)
+            if entities:
+                output[f'{code}'] = entities
+        with self.lock:
+            self.jobs[job] = {'polls': 0, 'output': output}
+        return 200, {'status_url': f'{self.url}/jobs/{job}/status/'}
+
+    def job_status(self, job: str, **kwargs) -> (int, dict):
+        """Return status of batch job.
+
+        :param job: The job id.
+        :type job: str
+        :param **kwargs: Other parameters of the request.
+        :type **kwargs: dict
+        :return: Status code and the job status.
+        :rtype: (int, dict)
+        """
+        with self.lock:
+            self.jobs[job]['polls'] += 1
+            polls = self.jobs[job]['polls']
+        if polls <= self.job_polls:
+            return 200, {'status': 'PROCESSING'}
+        return 200, {
+            'status': 'DONE', 'output_url': f'{self.url}/jobs/{job}/output/'
+        }
+
+    def job_output(self, job: str, **kwargs) -> (int, dict):
+        """Return output of batch job.
+
+        :param job: The job id.
+        :type job: str
+        :param **kwargs: Other parameters of the request.
+        :type **kwargs: dict
+        :return: Status code and the entities of the codes.
+        :rtype: (int, dict)
+        """
+        return 200, self.jobs[job]['output']
+
+    def _entity_by_uuid(self, uuid: str, entity: str) -> dict:
+        """Return entity of view by uuid.
+
+        :param uuid: The view uuid.
+        :type uuid: str
+        :param entity: The entity uuid.
+        :type entity: str
+        :return: The GeoRepo entity.
+        :rtype: dict
+        """
+        return self.find(uuid, 'uuid', entity)[0]
+
+    def bbox(self, uuid: str, entity: str, **kwargs) -> (int, object):
+        """Return bbox of entity.
+
+        :param uuid: The view uuid.
+        :type uuid: str
+        :param entity: The entity uuid.
+        :type entity: str
+        :param **kwargs: Other parameters of the request.
+        :type **kwargs: dict
+        :return: Status code and the bbox.
+        :rtype: (int, object)
+        """
+        try:
+            return 200, self._entity_by_uuid(uuid, entity)['bbox']
+        except IndexError:
+            return 404, {'detail': 'Not found.'}
+
+    @staticmethod
+    def _coordinates(geometry: dict) -> list:
+        """Return flat list of coordinates of GeoJSON.
+
+        :param geometry: The GeoJSON geometry, feature or collection.
+        :type geometry: dict
+        :return: List of coordinates.
+        :rtype: list
+        """
+        if geometry.get('type') == 'FeatureCollection':
+            return [
+                coord for feature in geometry['features']
+                for coord in GeorepoEmulator._coordinates(feature)
+            ]
+        if geometry.get('type') == 'Feature':
+            return GeorepoEmulator._coordinates(geometry['geometry'])
+
+        def _flat(coords):
+            if coords and isinstance(coords[0], (int, float)):
+                return [coords]
+            return [point for coord in coords for point in _flat(coord)]
+
+        return _flat(geometry.get('coordinates', []))
+
+    def containment(
+            self, uuid: str, spatial_query: str, distance: str, id_type: str,
+            query: dict, data: dict, **kwargs
+    ) -> (int, dict):
+        """Return entities of the level that intersect bbox of GeoJSON.
+
+        The bbox of entity is used as its geometry.
+
+        :param uuid: The view uuid.
+        :type uuid: str
+        :param spatial_query: The spatial query, it is not used.
+        :type spatial_query: str
+        :param distance: The distance to the GeoJSON.
+        :type distance: str
+        :param id_type: The type of the returned codes.
+        :type id_type: str
+        :param query: The query parameters, with admin_level.
+        :type query: dict
+        :param data: The GeoJSON.
+        :type data: dict
+        :param **kwargs: Other parameters of the request.
+        :type **kwargs: dict
+        :return: Status code and the feature collection.
+        :rtype: (int, dict)
+        """
+        coords = self._coordinates(data or {})
+        if not coords:
+            return 200, {'type': 'FeatureCollection', 'features': []}
+        distance = float(distance)
+        min_x = min(coord[0] for coord in coords) - distance
+        min_y = min(coord[1] for coord in coords) - distance
+        max_x = max(coord[0] for coord in coords) + distance
+        max_y = max(coord[1] for coord in coords) + distance
+
+        level = int(query.get('admin_level', 0))
+        entities = self.views[uuid]['levels'].get(level, FixtureEntities([]))
+        features = []
+        for entity in entities.page(0, len(entities)):
+            bbox = entity.get('bbox')
+            if not bbox:
+                continue
+            if bbox[0] <= max_x and bbox[2] >= min_x and \
+                    bbox[1] <= max_y and bbox[3] >= min_y:
+                features.append(
+                    {
+                        'type': 'Feature',
+                        'properties': {id_type: [entity.get(id_type)]},
+                        'geometry': None
+                    }
+                )
+        return 200, {'type': 'FeatureCollection', 'features': features}
+
+    # ------------------------------------------------
+    # Using
+    # ------------------------------------------------
+    @contextmanager
+    def emulate(self) -> Iterator['GeorepoEmulator']:
+        """Serve the GeoRepo requests from this emulator.
+
+        The GeoRepo url is pointed to the emulator in this process only,
+        the site preferences are not changed.
+
+        :yield: The emulator.
+        :ytype: GeorepoEmulator
+        """
+        override_georepo_url(self.url)
+        mount_georepo_adapter(self.url, GeorepoEmulatorAdapter(self))
+        try:
+            yield self
+        finally:
+            mount_georepo_adapter(self.url)
+            override_georepo_url()
+
+
+class GeorepoEmulatorAdapter(BaseAdapter):
+    """Requests transport adapter that is served by the emulator."""
+
+    def __init__(self, emulator: GeorepoEmulator):  # noqa: DOC101,DOC103
+        """Init the adapter.
+
+        :param emulator: The emulator.
+        :type emulator: GeorepoEmulator
+        """
+        super().__init__()
+        self.emulator = emulator
+
+    def send(
+            self, request: requests.PreparedRequest, **kwargs
+    ) -> requests.Response:
+        """Return response of the emulator for the prepared request.
+
+        :param request: The prepared request.
+        :type request: requests.PreparedRequest
+        :param **kwargs: Options of sending, they are not used.
+        :type **kwargs: dict
+        :return: The response.
+        :rtype: requests.Response
+        """
+        status_code, content = self.emulator.handle(
+            request.method, request.url, request.body
+        )
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = json.dumps(content).encode('utf-8')
+        response.encoding = 'utf-8'
+        response.headers['Content-Type'] = 'application/json'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        """Nothing to close."""
+        pass
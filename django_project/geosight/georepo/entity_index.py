@@ -0,0 +1,382 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.utils import timezone
+
+from geosight.georepo.models.entity import Entity, EntityCode
+from geosight.georepo.models.reference_layer import ReferenceLayerView
+
+logger = logging.getLogger(__name__)
+
+UCODE = 'ucode'
+CONCEPT_UUID = 'concept_uuid'
+
+# Fields of entity that are kept in the index, in the order of the model,
+# as Model.from_db needs. The geometries are deferred.
+ENTITY_FIELDS = [
+    field.attname for field in Entity._meta.concrete_fields
+    if field.attname not in ['geometry', 'centroid']
+]
+_ID = ENTITY_FIELDS.index('id')
+_GEOM_ID = ENTITY_FIELDS.index('geom_id')
+_CONCEPT_UUID = ENTITY_FIELDS.index('concept_uuid')
+_START_DATE = ENTITY_FIELDS.index('start_date')
+_END_DATE = ENTITY_FIELDS.index('end_date')
+
+# Number of indexes that are kept in the memory of a process
+LOCAL_SIZE = 8
+CACHE_TIMEOUT = 60 * 60 * 24
+
+# Cache key : (stamp, index), least recently used first
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def as_datetime(date_time):
+    """Return date time as aware datetime.
+
+    :param date_time: Date time, date or timestamp.
+    :type date_time: datetime | date | float
+    :return: Aware datetime, None if it is not a date.
+    :rtype: datetime
+    """
+    try:
+        date_time = datetime.fromtimestamp(date_time)
+    except (ValueError, TypeError, OverflowError, OSError):
+        pass
+    if isinstance(date_time, datetime):
+        pass
+    elif isinstance(date_time, date):
+        date_time = datetime.combine(date_time, datetime.min.time())
+    else:
+        return None
+    if timezone.is_naive(date_time):
+        date_time = timezone.make_aware(date_time)
+    return date_time
+
+
+def _interval_key(interval: tuple) -> tuple:
+    """Order intervals by start date, the open start is the last.
+
+    :param interval: Tuple of start date, end date and entity id.
+    :type interval: tuple
+    :return: The sort key.
+    :rtype: tuple
+    """
+    return interval[0] is None, interval[0] or datetime.min
+
+
+class EntityIndex(object):
+    """In memory lookup of the entities of a view.
+
+    The index maps (code_type, code) to the validity intervals of the
+    entities, ordered by start date, like :meth:`Entity.get_entity` orders
+    the candidates. The ucode and the concept uuid are indexed as code types.
+
+    It is built with two queries and cached per view version,
+    so the lookups do not query the database.
+    """
+
+    def __init__(self, version: str):  # noqa: DOC101,DOC103
+        """Init the index.
+
+        :param version: The version of the view.
+        :type version: str
+        """
+        self.version = version
+        self.stamp = None
+
+        # id : values of ENTITY_FIELDS
+        self.entities = {}
+
+        # (code_type, code) : list of (start_date, end_date, id)
+        self.codes = {}
+
+    def __len__(self) -> int:
+        """Return number of entities.
+
+        :return: Number of entities.
+        :rtype: int
+        """
+        return len(self.entities)
+
+    # ------------------------------------------------
+    # Building
+    # ------------------------------------------------
+    def _add_code(self, code_type: str, code, entity_id: int):
+        """Add the code of entity.
+
+        :param code_type: The type of the code.
+        :type code_type: str
+        :param code: The code.
+        :type code: str
+        :param entity_id: The entity id.
+        :type entity_id: int
+        """
+        values = self.entities[entity_id]
+        interval = (values[_START_DATE], values[_END_DATE], entity_id)
+        intervals = self.codes.setdefault((code_type, f'{code}'), [])
+        if interval not in intervals:
+            intervals.append(interval)
+            intervals.sort(key=_interval_key)
+
+    def add(self, entity: Entity, codes: dict = None):
+        """Add entity and its codes to the index.
+
+        :param entity: The entity.
+        :type entity: Entity
+        :param codes: Dictionary of code type and code.
+        :type codes: dict
+        """
+        self.entities[entity.id] = tuple(
+            getattr(entity, field) for field in ENTITY_FIELDS
+        )
+        self._add_code(UCODE, entity.geom_id, entity.id)
+        if entity.concept_uuid:
+            self._add_code(CONCEPT_UUID, entity.concept_uuid, entity.id)
+        for code_type, code in (codes or {}).items():
+            if code is not None:
+                self._add_code(code_type, code, entity.id)
+
+    @staticmethod
+    def build(reference_layer: ReferenceLayerView) -> 'EntityIndex':
+        """Build the index of the view from the database.
+
+        :param reference_layer: The view.
+        :type reference_layer: ReferenceLayerView
+        :return: The index.
+        :rtype: EntityIndex
+        """
+        index = EntityIndex(reference_layer.version_with_uuid)
+        entity_ids = reference_layer.referencelayerviewentity_set.values(
+            'entity_id'
+        )
+        for values in Entity.objects.filter(
+                pk__in=entity_ids
+        ).values_list(*ENTITY_FIELDS).iterator(chunk_size=10000):
+            index.entities[values[_ID]] = values
+        for entity_id, values in index.entities.items():
+            index._add_code(UCODE, values[_GEOM_ID], entity_id)
+            if values[_CONCEPT_UUID]:
+                index._add_code(
+                    CONCEPT_UUID, values[_CONCEPT_UUID], entity_id
+                )
+
+        for entity_id, code_type, code in EntityCode.objects.filter(
+                entity_id__in=entity_ids
+        ).values_list(
+            'entity_id', 'code_type', 'code'
+        ).iterator(chunk_size=10000):
+            if entity_id in index.entities:
+                index._add_code(code_type, code, entity_id)
+        return index
+
+    # ------------------------------------------------
+    # Cache
+    # ------------------------------------------------
+    @staticmethod
+    def cache_key(reference_layer: ReferenceLayerView) -> str:
+        """Return cache key of the index of the view.
+
+        :param reference_layer: The view.
+        :type reference_layer: ReferenceLayerView
+        :return: The cache key.
+        :rtype: str
+        """
+        schema = getattr(connection, 'schema_name', 'public')
+        return f'entity-index-{schema}-{reference_layer.version_with_uuid}'
+
+    @staticmethod
+    def get(
+            reference_layer: ReferenceLayerView, build: bool = True
+    ) -> 'EntityIndex':
+        """Return the index of the view.
+
+        The index is kept in the process and in the cache.
+        The stamp on the cache tells whether the index of the process
+        is still the latest one. When the stamp can not be read,
+        e.g. the cache is down, the index of the process is used.
+
+        :param reference_layer: The view.
+        :type reference_layer: ReferenceLayerView
+        :param build:
+            Whether to build the index when there is none,
+            False for one-off lookups that query the database instead.
+        :type build: bool
+        :return: The index, None if it is not built and build is False.
+        :rtype: EntityIndex
+        """
+        key = EntityIndex.cache_key(reference_layer)
+        stamp_key = f'{key}-stamp'
+        stamp = EntityIndex._cache_get(stamp_key)
+        with _local_lock:
+            try:
+                local_stamp, index = _local[key]
+                if stamp is None or local_stamp == stamp:
+                    _local.move_to_end(key)
+                    return index
+            except KeyError:
+                pass
+
+        if stamp is not None:
+            index = EntityIndex._cache_get(key)
+            if index is not None and index.stamp == stamp:
+                EntityIndex._keep(key, index)
+                return index
+
+        if not build:
+            return None
+        index = EntityIndex.build(reference_layer)
+        index.stamp = uuid.uuid4().hex
+        try:
+            cache.set(key, index, CACHE_TIMEOUT)
+            cache.set(stamp_key, index.stamp, None)
+        except Exception as e:
+            logger.exception(e)
+        EntityIndex._keep(key, index)
+        return index
+
+    @staticmethod
+    def _cache_get(key: str):
+        """Return value from the cache, None when the cache fails.
+
+        :param key: The cache key.
+        :type key: str
+        :return: The cached value.
+        :rtype: object
+        """
+        try:
+            return cache.get(key)
+        except Exception as e:
+            logger.exception(e)
+            return None
+
+    @staticmethod
+    def _keep(key: str, index: 'EntityIndex'):
+        """Keep the index in the process.
+
+        :param key: The cache key of the view.
+        :type key: str
+        :param index: The index.
+        :type index: EntityIndex
+        """
+        with _local_lock:
+            _local[key] = (index.stamp, index)
+            _local.move_to_end(key)
+            while len(_local) > LOCAL_SIZE:
+                _local.popitem(last=False)
+
+    @staticmethod
+    def invalidate(reference_layer: ReferenceLayerView):
+        """Invalidate the index of the view, e.g. after the entities synced.
+
+        The stamp is replaced rather than deleted,
+        so the other processes see that their index is outdated.
+
+        :param reference_layer: The view.
+        :type reference_layer: ReferenceLayerView
+        """
+        key = EntityIndex.cache_key(reference_layer)
+        with _local_lock:
+            _local.pop(key, None)
+        try:
+            cache.delete(key)
+            cache.set(f'{key}-stamp', uuid.uuid4().hex, None)
+        except Exception as e:
+            logger.exception(e)
+
+    # ------------------------------------------------
+    # Lookup
+    # ------------------------------------------------
+    def lookup(self, code_type: str, code, date_time: datetime):
+        """Return id of entity of the code that is valid on the date.
+
+        :param code_type: The type of the code.
+        :type code_type: str
+        :param code: The code.
+        :type code: str
+        :param date_time: The aware date time.
+        :type date_time: datetime
+        :return: Id of entity, None if it is not found.
+        :rtype: int
+        """
+        for start_date, end_date, entity_id in self.codes.get(
+                (code_type, f'{code}'), []
+        ):
+            if end_date is None or (
+                    start_date is not None and
+                    start_date <= date_time <= end_date
+            ):
+                return entity_id
+        return None
+
+    def ids(self, code_type: str, code) -> list:
+        """Return ids of entities of the code, on every date.
+
+        :param code_type: The type of the code.
+        :type code_type: str
+        :param code: The code.
+        :type code: str
+        :return: List of entity id.
+        :rtype: list
+        """
+        return [
+            entity_id for _, _, entity_id in self.codes.get(
+                (code_type, f'{code}'), []
+            )
+        ]
+
+    def entity(self, entity_id: int) -> Entity:
+        """Return entity object from the index, without querying.
+
+        The geometries are deferred.
+
+        :param entity_id: Id of entity.
+        :type entity_id: int
+        :return: The entity.
+        :rtype: Entity
+        """
+        return Entity.from_db(
+            DEFAULT_DB_ALIAS, ENTITY_FIELDS, self.entities[entity_id]
+        )
+
+    def get_entity(self, code_type: str, code, date_time) -> Entity:
+        """Return entity of the code that is valid on the date.
+
+        :param code_type: The type of the code.
+        :type code_type: str
+        :param code: The code.
+        :type code: str
+        :param date_time: Date time, date or timestamp.
+        :type date_time: datetime | date | float
+        :return: The entity, None if it is not found.
+        :rtype: Entity
+        """
+        date_time = as_datetime(date_time)
+        if date_time is None:
+            return None
+        entity_id = self.lookup(code_type, code, date_time)
+        if entity_id is None:
+            return None
+        return self.entity(entity_id)
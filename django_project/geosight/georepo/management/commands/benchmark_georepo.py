@@ -0,0 +1,171 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from geosight.georepo.emulator import GeorepoEmulator
+from geosight.georepo.entity_index import EntityIndex
+from geosight.georepo.models.entity import Entity
+from geosight.georepo.models.reference_layer import ReferenceLayerView
+from geosight.georepo.request import GeorepoRequest
+from geosight.georepo.sync import EntitySync
+from geosight.importer.importers.entity_resolver import EntityResolver
+
+CODE_TYPE = 'PCode'
+
+
+class Command(BaseCommand):
+    """Benchmark the GeoRepo code paths against the local emulator.
+
+    Every size is run in a transaction that is rolled back,
+    so the database is not changed.
+    """
+
+    help = (
+        'Benchmark entity sync and entity resolution against '
+        'the local GeoRepo emulator.'
+    )
+
+    def add_arguments(self, parser):
+        """Add arguments."""
+        parser.add_argument(
+            '--sizes', nargs='+', type=int,
+            default=[10000, 100000, 1000000],
+            help='Number of entities of the emulated view.'
+        )
+        parser.add_argument(
+            '--fixture', type=str, default=None,
+            help='Fixture JSON of the emulator, instead of generated data.'
+        )
+        parser.add_argument(
+            '--latency', type=float, default=0,
+            help='Seconds of latency per GeoRepo request.'
+        )
+        parser.add_argument(
+            '--sample', type=int, default=10000,
+            help='Number of codes that are resolved.'
+        )
+        parser.add_argument(
+            '--requests', type=int, default=100,
+            help='Number of codes that are resolved one request per code.'
+        )
+
+    def timed(self, name: str, count: int, function):
+        """Run the function and write the throughput."""
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(
+            f'  {name:<24} {count:>9} in {elapsed:>8.2f}s '
+            f'= {rate:>10.0f}/s'
+        )
+
+    def benchmark(self, emulator: GeorepoEmulator, options: dict):
+        """Benchmark of an emulator."""
+        view_uuid, view = list(emulator.views.items())[0]
+        levels = view['levels']
+        total = sum(len(entities) for entities in levels.values())
+        self.stdout.write(f'{total} entities, {len(levels)} levels')
+
+        # Codes of the deepest level
+        entities = list(levels.values())[-1]
+        codes = [
+            entity['ext_codes'][CODE_TYPE]
+            for entity in entities.page(0, options['sample'])
+        ]
+        date_time = timezone.now()
+
+        with emulator.emulate(), transaction.atomic():
+            reference_layer, _ = ReferenceLayerView.objects.get_or_create(
+                identifier=view_uuid,
+                defaults={'name': view['view'].get('name', view_uuid)}
+            )
+
+            # Identify codes that are not synced yet
+            self.timed(
+                'identify codes', len(codes),
+                lambda: EntityResolver(reference_layer).identify_codes(
+                    CODE_TYPE, codes
+                )
+            )
+
+            # One request per code
+            request = GeorepoRequest()
+            self.timed(
+                'find entity', len(codes[:options['requests']]),
+                lambda: [
+                    request.View.find_entity(view_uuid, CODE_TYPE, code)
+                    for code in codes[:options['requests']]
+                ]
+            )
+
+            self.timed(
+                'sync', total, lambda: EntitySync(reference_layer).run()
+            )
+
+            self.timed(
+                'build index', total,
+                lambda: EntityIndex.build(reference_layer)
+            )
+
+            # Import path, resolving from the synced entities
+            def _resolve():
+                resolver = EntityResolver(reference_layer)
+                resolver.prefetch(CODE_TYPE, codes)
+                for code in codes:
+                    resolver.get_entity(
+                        CODE_TYPE, code, date_time=date_time,
+                        auto_fetch=False
+                    )
+
+            self.timed('resolve (resolver)', len(codes), _resolve)
+            self.timed(
+                'resolve (get_entity)', len(codes[:options['requests']]),
+                lambda: [
+                    Entity.get_entity(
+                        reference_layer=reference_layer,
+                        original_id_type=CODE_TYPE,
+                        original_id=code,
+                        date_time=date_time,
+                        auto_fetch=False
+                    )
+                    for code in codes[:options['requests']]
+                ]
+            )
+            self.stdout.write(f'  {emulator.requests} GeoRepo request(s)')
+            transaction.set_rollback(True)
+        EntityIndex.invalidate(reference_layer)
+
+    def handle(self, *args, **options):
+        """Command handler."""
+        if options['fixture']:
+            self.benchmark(
+                GeorepoEmulator.from_fixture(
+                    options['fixture'], latency=options['latency']
+                ),
+                options
+            )
+            return
+        for size in options['sizes']:
+            self.benchmark(
+                GeorepoEmulator.generate(size, latency=options['latency']),
+                options
+            )
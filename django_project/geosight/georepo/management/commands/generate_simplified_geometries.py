@@ -0,0 +1,53 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from django.core.management.base import BaseCommand
+
+from geosight.georepo.models.entity import Entity
+from geosight.georepo.models.entity_geometry import (
+    EntitySimplifiedGeometry
+)
+
+
+class Command(BaseCommand):
+    """Generate the simplified geometries of the existing entities."""
+
+    help = 'Generate the simplified geometries of entities for vector tiles.'
+
+    def add_arguments(self, parser):
+        """Add arguments."""
+        parser.add_argument(
+            '--step', type=int, default=1000,
+            help='Number of entities per statement.'
+        )
+
+    def handle(self, *args, **options):
+        """Command handler."""
+        step = options['step']
+        last_id = 0
+        total = 0
+        while True:
+            ids = list(
+                Entity.objects.filter(
+                    id__gt=last_id, geometry__isnull=False
+                ).order_by('id').values_list('id', flat=True)[:step]
+            )
+            if not ids:
+                break
+            EntitySimplifiedGeometry.generate(ids)
+            last_id = ids[-1]
+            total += len(ids)
+            self.stdout.write(f'{total} entities')
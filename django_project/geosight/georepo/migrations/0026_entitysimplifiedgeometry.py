@@ -0,0 +1,27 @@
+# Generated by Django 3.2.16 on 2026-10-18 00:00
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geosight_georepo', '0025_alter_referencelayerview_modified_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EntitySimplifiedGeometry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tier', models.IntegerField(help_text='Index of the tier on GEOMETRY_TIERS.')),
+                ('geometry', django.contrib.gis.db.models.fields.GeometryField(srid=3857)),
+                ('entity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='simplified_geometries', to='geosight_georepo.entity')),
+            ],
+            options={
+                'unique_together': {('entity', 'tier')},
+            },
+        ),
+    ]
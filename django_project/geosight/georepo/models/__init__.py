@@ -15,6 +15,7 @@ __date__ = '13/06/2023'
 __copyright__ = ('Copyright 2023, Unicef')
 
 from .entity import *
+from .entity_geometry import *
 from .reference_layer import *
 from .reference_layer_entity import *
 from .reference_layer_indicator_value import *
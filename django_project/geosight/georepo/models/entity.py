@@ -19,7 +19,7 @@ from datetime import datetime
 from django.contrib.gis.db import models
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import connection
-from django.db.models import Q, Subquery, Max, Min
+from django.db.models import Q, Subquery
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
@@ -146,15 +146,27 @@ class Entity(models.Model):
             date_time=timezone.now(),
             auto_fetch: bool = True
     ):
-        """Return ucode for the code."""
+        """Return ucode for the code.
+
+        The entity is looked up on the :class:`EntityIndex` of the view
+        when it is already built, the database is queried otherwise.
+        A one-off lookup does not build the index of the whole view.
+        """
+        from geosight.georepo.entity_index import EntityIndex
         if not date_time:
             raise GeorepoRequestError('Date time is empty.')
+        index = EntityIndex.get(reference_layer, build=False)
         try:
+            entity = None
+            if index is not None:
+                entity = index.get_entity(
+                    original_id_type, original_id, date_time
+                )
             try:
                 date_time = datetime.fromtimestamp(date_time)
             except (ValueError, TypeError):
                 pass
-            if original_id_type != 'ucode':
+            if not entity and original_id_type != 'ucode':
                 entities = reference_layer.entities_set.values_list(
                     'id', flat=True
                 )
@@ -171,7 +183,7 @@ class Entity(models.Model):
                 if not entity_code:
                     raise EntityCode.DoesNotExist
                 entity = entity_code.entity
-            else:
+            elif not entity:
                 entity = reference_layer.entities_set.filter(
                     Q(end_date__isnull=True) | Q(
                         Q(start_date__lte=date_time) &
@@ -210,6 +222,8 @@ class Entity(models.Model):
                 code=original_id
             )
             entity = entity_code.entity
+            if index is not None:
+                index.add(entity, {original_id_type: original_id})
 
         # Check admin level
         if admin_level is not None:
@@ -248,6 +262,7 @@ class Entity(models.Model):
         from geosight.georepo.models.reference_layer_entity import (
             ReferenceLayerViewEntity
         )
+        from geosight.georepo.sync import EntityChanges
         obj, created = Entity.objects.get_or_create(
             geom_id=geom_id,
             defaults={
@@ -265,10 +280,25 @@ class Entity(models.Model):
         obj.reference_layer = reference_layer
         obj.concept_uuid = concept_uuid
         obj.name = name
+        parents_changed = created or obj.parents != parents
         obj.parents = parents
-
-        Entity.check_country(obj, admin_level, parents, reference_layer)
         obj.save()
+
+        # Assign the country from the local entities,
+        # fetch it when it is not saved locally yet.
+        if admin_level != admin_level_country and (
+                parents_changed or not obj.country_id
+        ):
+            changes = EntityChanges()
+            changes.parents_changed([obj.id])
+            if obj.id in changes.propagate():
+                obj.refresh_from_db(fields=['country'])
+            elif not obj.country_id:
+                Entity.check_country(
+                    obj, admin_level, parents, reference_layer
+                )
+                if obj.country_id:
+                    obj.save()
         reference_layer.assign_country(obj, check_entity=False)
         return obj, created
 
@@ -330,29 +360,25 @@ class Entity(models.Model):
         return self.admin_level == admin_level_country
 
     @staticmethod
-    def assign_country(step=1000000):
-        """Assign country to entity."""
-        query = """
-            UPDATE geosight_georepo_entity AS entity
-            SET country_id = parent.id
-            FROM geosight_georepo_entity AS parent
-            WHERE
-                entity.id BETWEEN %(start_id)s AND %(end_id)s
-            AND
-                entity.parents ->> (entity.admin_level - 1) = parent.geom_id;
+    def assign_country(ids: list = None):
+        """Assign country to the entities from their top parent.
+
+        The countries and the indicator values of just the given entities
+        are updated, in one statement each.
+
+        :param ids: Ids of entity, None for the entities without country.
+        :type ids: list
         """
-        id__max = Entity.objects.aggregate(
-            Max('id')
-        )['id__max']
-        id__min = Entity.objects.aggregate(
-            Min('id')
-        )['id__min']
-        for i in range(id__min, id__max + 1, step):
-            with connection.cursor() as cursor:
-                start_id = i
-                end_id = i + step
-                params = {'start_id': start_id, 'end_id': end_id}
-                cursor.execute(query, params)
+        from geosight.georepo.sync import EntityChanges
+        if ids is None:
+            ids = Entity.objects.filter(
+                country__isnull=True
+            ).exclude(
+                admin_level=admin_level_country
+            ).values_list('id', flat=True)
+        changes = EntityChanges()
+        changes.parents_changed(ids)
+        changes.propagate()
 
     def update_indicator_value_data(self):
         """Update entity data in indicator value."""
@@ -0,0 +1,101 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from django.contrib.gis.db import models
+from django.db import connection
+
+from geosight.georepo.models.entity import Entity
+
+# Tiers of simplified geometry, as (maximum zoom, tolerance in meters).
+# The tolerance is around a pixel of a 256px tile on the maximum zoom.
+# The zooms above the last tier use the full geometry.
+GEOMETRY_TIERS = [
+    (4, 5000),
+    (7, 600),
+    (10, 75)
+]
+
+GENERATE_QUERY = """
+    INSERT INTO {table} (entity_id, tier, geometry)
+    SELECT entity.id, tiers.tier,
+        ST_SimplifyPreserveTopology(
+            ST_Transform(entity.geometry, 3857), tiers.tolerance
+        )
+    FROM geosight_georepo_entity AS entity,
+        unnest(%(tiers)s::int[], %(tolerances)s::float[])
+            AS tiers(tier, tolerance)
+    WHERE entity.id = ANY(%(ids)s) AND entity.geometry IS NOT NULL
+    ON CONFLICT (entity_id, tier)
+        DO UPDATE SET geometry = EXCLUDED.geometry
+"""
+
+
+class EntitySimplifiedGeometry(models.Model):
+    """Simplified geometry of entity for a band of zooms.
+
+    It is transformed to EPSG:3857 already,
+    so the vector tile is cut from it without transforming.
+    """
+
+    entity = models.ForeignKey(
+        Entity, on_delete=models.CASCADE,
+        related_name='simplified_geometries'
+    )
+    tier = models.IntegerField(
+        help_text='Index of the tier on GEOMETRY_TIERS.'
+    )
+    geometry = models.GeometryField(srid=3857)
+
+    class Meta:  # noqa: D106
+        unique_together = ('entity', 'tier')
+
+    @staticmethod
+    def tier_of_zoom(z: int):
+        """Return tier of the zoom, None if it uses the full geometry.
+
+        :param z: The zoom.
+        :type z: int
+        :return: The tier.
+        :rtype: int
+        """
+        for tier, (max_zoom, _) in enumerate(GEOMETRY_TIERS):
+            if z <= max_zoom:
+                return tier
+        return None
+
+    @staticmethod
+    def generate(ids: list) -> None:
+        """Generate simplified geometries of entities, in one statement.
+
+        :param ids: Ids of entity.
+        :type ids: list
+        """
+        ids = list(ids)
+        if not ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                GENERATE_QUERY.format(
+                    table=EntitySimplifiedGeometry._meta.db_table
+                ),
+                {
+                    'ids': ids,
+                    'tiers': list(range(len(GEOMETRY_TIERS))),
+                    'tolerances': [
+                        float(tolerance) for _, tolerance in GEOMETRY_TIERS
+                    ]
+                }
+            )
@@ -16,8 +16,9 @@ __copyright__ = ('Copyright 2023, Unicef')
 
 import logging
 
+from django.apps import apps
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import connection, models, transaction
 from django.db.models import Max, Subquery
 from django.utils.translation import ugettext_lazy as _
 
@@ -34,6 +35,25 @@ User = get_user_model()
 
 logger = logging.getLogger(__name__)
 
+# Insert the missing reference layer x indicator pairs
+# and their permissions in one statement.
+DATA_ACCESS_QUERY = """
+    WITH inserted AS (
+        INSERT INTO {access_table} (reference_layer_id, indicator_id)
+        SELECT reference_layer.id, indicator.id
+        FROM {view_table} AS reference_layer
+            CROSS JOIN {indicator_table} AS indicator
+        WHERE {where}
+        ON CONFLICT (reference_layer_id, indicator_id) DO NOTHING
+        RETURNING id
+    )
+    INSERT INTO {permission_table} (
+        obj_id, organization_permission, public_permission
+    )
+    SELECT id, %(organization_permission)s, %(public_permission)s
+    FROM inserted
+"""
+
 
 class ReferenceLayerView(AbstractEditData, AbstractVersionData):
     """Reference Layer view data."""
@@ -183,7 +203,8 @@ class ReferenceLayerView(AbstractEditData, AbstractVersionData):
     def sync_entities_code(self, level=None, sync_all=True):
         """Sync entities code.
 
-        Sync entities code from georepo remote server.
+        Sync entities code from georepo remote server,
+        the entities are saved in bulk by :class:`EntitySync`.
         :param level: Optional level to filter which entities to synchronize.
         :type level: Optional[Any], defaults to None
         :param sync_all:
@@ -191,6 +212,7 @@ class ReferenceLayerView(AbstractEditData, AbstractVersionData):
             Defaults to True.
         :type sync_all: bool, optional
         """
+        from geosight.georepo.sync import EntitySync
         min_level = None
         if not sync_all:
             try:
@@ -199,22 +221,10 @@ class ReferenceLayerView(AbstractEditData, AbstractVersionData):
                 )['admin_level__max']
             except KeyError:
                 pass
-        detail = GeorepoRequest().View.get_detail(self.identifier)
         logger.debug(f"Fetching entities: {self.identifier}")
-        for dataset_level in detail['dataset_levels']:
-            if level and dataset_level['level'] != level:
-                continue
-            if min_level is not None and dataset_level['level'] <= min_level:
-                continue
-            logger.debug(
-                f"Fetching entities: "
-                f"{self.identifier}-{dataset_level['level']}"
-            )
-            entities = GeorepoRequest().View.entities(
-                self.identifier, dataset_level['level']
-            )
-            for entity in entities:
-                self.save_entity(entity)
+        EntitySync(self).run(
+            levels=[level] if level else None, min_level=min_level
+        )
 
     @property
     def detail_url(self):
@@ -368,3 +378,59 @@ class ReferenceLayerIndicator(models.Model):
     def modified_at(self):
         """Return modified time from the indicator."""
         return self.indicator.modified_at
+
+    @staticmethod
+    def create_data_access(
+            indicator_ids: list = None, reference_layer_ids: list = None
+    ) -> int:
+        """Create the missing data access of indicators x reference layers.
+
+        The pairs are inserted with one INSERT ... SELECT,
+        so it is not a query per pair.
+        The existing pairs are skipped by the unique constraint.
+
+        :param indicator_ids: The indicators, None for all indicators.
+        :type indicator_ids: list
+        :param reference_layer_ids: The reference layers, None for all.
+        :type reference_layer_ids: list
+        :return: Number of data access that are created.
+        :rtype: int
+        """
+        from geosight.permission.models.effective_permission import (
+            EffectivePermission
+        )
+        permission_model = apps.get_model(
+            'geosight_permission', 'ReferenceLayerIndicatorPermission'
+        )
+        where = ['TRUE']
+        params = {
+            'organization_permission': permission_model._meta.get_field(
+                'organization_permission'
+            ).default,
+            'public_permission': permission_model._meta.get_field(
+                'public_permission'
+            ).default
+        }
+        if indicator_ids is not None:
+            where.append('indicator.id = ANY(%(indicator_ids)s)')
+            params['indicator_ids'] = list(indicator_ids)
+        if reference_layer_ids is not None:
+            where.append('reference_layer.id = ANY(%(reference_layer_ids)s)')
+            params['reference_layer_ids'] = list(reference_layer_ids)
+
+        query = DATA_ACCESS_QUERY.format(
+            access_table=ReferenceLayerIndicator._meta.db_table,
+            view_table=ReferenceLayerView._meta.db_table,
+            indicator_table=Indicator._meta.db_table,
+            permission_table=permission_model._meta.db_table,
+            where=' AND '.join(where)
+        )
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(query, params)
+                count = cursor.rowcount
+            if count:
+                EffectivePermission.invalidate_resources(
+                    EffectivePermission.resources(permission_model)
+                )
+        return count
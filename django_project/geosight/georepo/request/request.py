@@ -16,13 +16,19 @@ __copyright__ = ('Copyright 2023, Unicef')
 
 import json
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
 from urllib.parse import urlparse
 
 import requests
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import MultipleObjectsReturned
+from requests.adapters import HTTPAdapter
 from requests.exceptions import Timeout
+from urllib3.util.retry import Retry
 
 from core.models.preferences import SitePreferences
 from geosight.georepo.request.data import GeorepoEntity
@@ -31,6 +37,77 @@ logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
+_session = threading.local()
+
+# Prefix of url : adapter that is mounted to the sessions,
+# e.g. the local GeoRepo emulator
+_adapters = {}
+
+# GeoRepo url that is used instead of site preferences in this process
+_georepo_url = {'url': None}
+
+
+def mount_georepo_adapter(prefix: str, adapter=None):
+    """Mount a transport adapter for url prefix to the GeoRepo sessions.
+
+    :param prefix: The url prefix that is served by the adapter.
+    :type prefix: str
+    :param adapter: The adapter, None to unmount it.
+    :type adapter: requests.adapters.BaseAdapter
+    """
+    if adapter is None:
+        _adapters.pop(prefix, None)
+    else:
+        _adapters[prefix] = adapter
+
+
+def override_georepo_url(url: str = None):
+    """Use the url as GeoRepo url of this process.
+
+    The site preferences are not changed, so other processes still use
+    the url of preferences.
+
+    :param url: The GeoRepo url, None to use the site preferences.
+    :type url: str
+    """
+    _georepo_url['url'] = url
+
+
+def georepo_session() -> requests.Session:
+    """Return the keep-alive session of GeoRepo for current thread.
+
+    The session pools the connections, so the pages and the requests
+    after it reuse the opened connection.
+    The idempotent requests are retried with exponential backoff
+    when the connection fails or GeoRepo is temporarily unavailable.
+    Session is not thread safe, so every thread has its own session.
+
+    :return: The session.
+    :rtype: requests.Session
+    """
+    session = getattr(_session, 'session', None)
+    if session is None:
+        retry = Retry(
+            total=settings.GEOREPO_REQUEST_RETRIES,
+            backoff_factor=settings.GEOREPO_REQUEST_BACKOFF,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['HEAD', 'GET', 'OPTIONS'],
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=settings.GEOREPO_REQUEST_POOL_SIZE,
+            pool_maxsize=settings.GEOREPO_REQUEST_POOL_SIZE,
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _session.session = session
+    for prefix, adapter in _adapters.items():
+        if session.adapters.get(prefix) is not adapter:
+            session.mount(prefix, adapter)
+    return session
+
 
 class GeorepoUrlDoesNotExist(Exception):
     """Raised when the GeoRepo URL is not configured in site preferences."""
@@ -74,13 +151,17 @@ class GeorepoPostPooling:
     Submits a POST request, obtains a ``status_url`` from the response,
     then polls that URL until the job reaches ``DONE``, ``ERROR``, or
     ``CANCELLED`` — or until :attr:`LIMIT` retries are exhausted.
+
+    The job can also be polled without blocking by :meth:`check`,
+    and resumed later from the stored ``callback_url``.
     """
 
     LIMIT = 1500  # Check result maximum 1500 times or 4500 seconds
     INTERVAL = 5  # Interval of check results
+    MAX_INTERVAL = 300  # Maximum interval of the backoff
 
     def __init__(  # noqa: DOC101,DOC103,DOC501,DOC503
-            self, request, url, data
+            self, request, url=None, data=None, callback_url=None
     ):
         """
         Submit the initial POST request and store the callback URL.
@@ -93,12 +174,19 @@ class GeorepoPostPooling:
         :type url: str
         :param data: JSON-serialisable payload to send in the POST body.
         :type data: object
+        :param callback_url: Status URL of a job that is already submitted.
+            When it is provided, nothing is posted.
+        :type callback_url: str
         :raises GeorepoRequestError: If the POST response status is not 200,
             or if the response body does not contain a ``status_url`` key.
         """
         self.request = request
         self.current_repeat = 0
 
+        if callback_url:
+            self.callback_url = callback_url
+            return
+
         response = request.post(url, data)
         if response.status_code != 200:
             raise GeorepoRequestError(
@@ -111,12 +199,62 @@ class GeorepoPostPooling:
         except KeyError:
             raise GeorepoRequestError('Status url is not found.')
 
-    def results(self):
+    @classmethod
+    def interval(cls, attempt: int) -> float:
+        """
+        Return the exponential backoff interval of the attempt.
+
+        :param attempt: Number of checks that have been done.
+        :type attempt: int
+        :return: Seconds before the next check.
+        :rtype: float
+        """
+        return min(cls.INTERVAL * (2 ** attempt), cls.MAX_INTERVAL)
+
+    def check(self):
+        """
+        Check the status of the job once, without waiting.
+
+        :return: The ``output_url`` when the job is done,
+            None when it is still running.
+        :rtype: str or None
+        :raises GeorepoRequestError: If the job status is ``ERROR`` or
+            ``CANCELLED``, or if the callback URL returns a non-200 status.
+        """
+        response = self.request.get(self.callback_url)
+        if response.status_code != 200:
+            raise GeorepoRequestError(
+                f'{response.status_code} - {response.text}'
+            )
+        response = response.json()
+        if response['status'] == 'DONE':
+            return response['output_url']
+        elif response['status'] in ['ERROR', 'CANCELLED']:
+            try:
+                raise GeorepoRequestError(response['error'])
+            except KeyError:
+                raise GeorepoRequestError(response['status'])
+        return None
+
+    def output(self, output_url: str):
+        """
+        Return the output of the job that is done.
+
+        :param output_url: The ``output_url`` returned by :meth:`check`.
+        :type output_url: str
+        :return: The parsed JSON output returned by GeoRepo.
+        :rtype: list or dict
+        """
+        return self.request.get(output_url).json()
+
+    def results(self):  # noqa: DOC503
         """
         Poll the callback URL until the job is complete and return the output.
 
-        Recursively retries up to :attr:`LIMIT` times, sleeping
+        Retries up to :attr:`LIMIT` times, sleeping
         :attr:`INTERVAL` seconds between attempts.
+        A timeout on checking the status or on fetching the output
+        is retried as well.
 
         :return: The parsed JSON output returned by GeoRepo on completion.
         :rtype: list or dict
@@ -125,30 +263,19 @@ class GeorepoPostPooling:
         :raises requests.exceptions.Timeout: If :attr:`LIMIT` retries are
             exhausted.
         """
-        self.current_repeat += 1
-        if self.current_repeat >= self.LIMIT:
-            raise requests.exceptions.Timeout()
-        try:
-            response = self.request.get(self.callback_url)
-            if response.status_code != 200:
-                raise GeorepoRequestError(
-                    f'{response.status_code} - {response.text}'
-                )
-            response = response.json()
-            if response['status'] == 'DONE':
-                results = self.request.get(response['output_url'])
-                return results.json()
-            elif response['status'] in ['ERROR', 'CANCELLED']:
-                try:
-                    raise GeorepoRequestError(response['error'])
-                except KeyError:
-                    raise GeorepoRequestError(response['status'])
-            else:
-                time.sleep(self.INTERVAL)
-                return self.results()
-        except requests.exceptions.Timeout:
+        output_url = None
+        while True:
+            self.current_repeat += 1
+            if self.current_repeat >= self.LIMIT:
+                raise requests.exceptions.Timeout()
+            try:
+                if not output_url:
+                    output_url = self.check()
+                if output_url:
+                    return self.output(output_url)
+            except requests.exceptions.Timeout:
+                pass
             time.sleep(self.INTERVAL)
-            return self.results()
 
 
 class GeorepoUrl:
@@ -177,8 +304,9 @@ class GeorepoUrl:
         :type api_key_email: str
         """
         pref = SitePreferences.preferences()
-        if pref.georepo_url:
-            self.georepo_url = pref.georepo_url.strip('/')
+        georepo_url = _georepo_url['url'] or pref.georepo_url
+        if georepo_url:
+            self.georepo_url = georepo_url.strip('/')
         else:
             self.georepo_url = ''
         parsed = urlparse(self.georepo_url)
@@ -352,7 +480,8 @@ class GeorepoRequest:
 
     Wraps authenticated HTTP requests and exposes methods for common
     operations such as listing reference layers and resolving entity codes.
-    Pagination is handled transparently by :meth:`_request_paginated`.
+    Pagination is handled by :meth:`request_pages`,
+    which yields the pages lazily.
     """
 
     page_size = 200
@@ -375,7 +504,9 @@ class GeorepoRequest:
         :return: The HTTP response object.
         :rtype: requests.Response
         """
-        return requests.get(url, headers=self.urls.headers)
+        return georepo_session().get(
+            url, headers=self.urls.headers, timeout=self.timeout
+        )
 
     def post(self, url, data: json):
         """
@@ -388,7 +519,39 @@ class GeorepoRequest:
         :return: The HTTP response object.
         :rtype: requests.Response
         """
-        return requests.post(url, json=data, headers=self.urls.headers)
+        return georepo_session().post(
+            url, json=data, headers=self.urls.headers, timeout=self.timeout
+        )
+
+    @property
+    def timeout(self) -> tuple:
+        """
+        Return the (connect, read) timeout of the requests.
+
+        :return: Timeout in seconds.
+        :rtype: tuple
+        """
+        return (
+            settings.GEOREPO_REQUEST_CONNECT_TIMEOUT,
+            settings.GEOREPO_REQUEST_READ_TIMEOUT
+        )
+
+    def iter_reference_layers(self) -> Iterator[dict]:
+        """
+        Yield the reference layer datasets of all modules lazily.
+
+        Each dataset dict is augmented with an ``'identifier'`` key equal to
+        its ``'uuid'``.
+
+        :yield: The dataset dict returned by GeoRepo.
+        :ytype: dict
+        """
+        for module in self.iter_results(self.urls.module_list):
+            for reference_layer in self.iter_results(
+                    self.urls.reference_layer_list(module['uuid'])
+            ):
+                reference_layer['identifier'] = reference_layer['uuid']
+                yield reference_layer
 
     def get_reference_layer_list(self):
         """
@@ -401,15 +564,7 @@ class GeorepoRequest:
         :return: List of dataset dicts returned by GeoRepo.
         :rtype: list[dict]
         """
-        modules = self._request_paginated(self.urls.module_list)
-        reference_layers = []
-        for module in modules:
-            reference_layers += self._request_paginated(
-                self.urls.reference_layer_list(module['uuid'])
-            )
-        for reference_layer in reference_layers:
-            reference_layer['identifier'] = reference_layer['uuid']
-        return reference_layers
+        return list(self.iter_reference_layers())
 
     def get_reference_layer_detail(self, reference_layer_identifier: str):
         """
@@ -430,6 +585,21 @@ class GeorepoRequest:
             )
         return response.json()
 
+    def iter_reference_layer_views(
+            self, reference_layer_identifier: str
+    ) -> Iterator[dict]:
+        """
+        Yield the views of a reference layer dataset lazily.
+
+        :param reference_layer_identifier: UUID / identifier of the dataset.
+        :type reference_layer_identifier: str
+        :return: Iterator of view dicts returned by GeoRepo.
+        :rtype: Iterator[dict]
+        """
+        return self.iter_results(
+            self.urls.reference_layer_views(reference_layer_identifier)
+        )
+
     def get_reference_layer_views(self, reference_layer_identifier: str):
         """
         Return a list of all views for a reference layer dataset.
@@ -439,20 +609,20 @@ class GeorepoRequest:
         :return: List of view dicts returned by GeoRepo.
         :rtype: list[dict]
         """
-        url = self.urls.reference_layer_views(reference_layer_identifier)
-        return self._request_paginated(url)
+        return list(
+            self.iter_reference_layer_views(reference_layer_identifier)
+        )
 
-    def _request_paginated(self, url: str, page: int = 1) -> list:
+    def get_page(self, url: str, page: int) -> dict:
         """
-        Fetch all pages of a paginated GeoRepo endpoint and return the results.
+        Fetch a page of a paginated GeoRepo endpoint.
 
         :param url: Base endpoint URL (with or without existing query params).
         :type url: str
-        :param page: Page number to fetch (1-based). Used internally for
-            recursion.
+        :param page: Page number to fetch (1-based).
         :type page: int
-        :return: Aggregated list of result dicts across all pages.
-        :rtype: list[dict]
+        :return: The page, with ``results`` and ``total_page``.
+        :rtype: dict
         :raises GeorepoRequestError: If the response status is not 200.
         """
         if '?' not in url:
@@ -465,11 +635,68 @@ class GeorepoRequest:
                 f"Error fetching on {url_request} "
                 f"- {response.status_code} - {response.text}"
             )
-        result = response.json()
-        if result['total_page'] <= page:
-            return result['results']
-        else:
-            return result['results'] + self._request_paginated(url, page + 1)
+        return response.json()
+
+    def request_pages(
+            self, url: str, prefetch: bool = True
+    ) -> Iterator[list]:
+        """
+        Yield the results of every page of a paginated GeoRepo endpoint.
+
+        The pages are fetched lazily. With ``prefetch``, the next page is
+        fetched on a background thread while the current page is consumed.
+
+        :param url: Base endpoint URL (with or without existing query params).
+        :type url: str
+        :param prefetch: Whether to fetch the next page concurrently.
+        :type prefetch: bool
+        :yield: The result list of each page.
+        :ytype: list
+        """
+        page = 1
+        result = self.get_page(url, page)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            try:
+                while True:
+                    has_next = page < result['total_page']
+                    future = None
+                    if has_next and prefetch:
+                        future = executor.submit(
+                            self.get_page, url, page + 1
+                        )
+                    yield result['results']
+                    if not has_next:
+                        break
+                    page += 1
+                    result = future.result() if future else self.get_page(
+                        url, page
+                    )
+            finally:
+                # Skip the next page when the consumer stops early
+                executor.shutdown(cancel_futures=True)
+
+    def iter_results(self, url: str) -> Iterator[dict]:
+        """
+        Yield the results of a paginated GeoRepo endpoint one by one.
+
+        :param url: Base endpoint URL (with or without existing query params).
+        :type url: str
+        :yield: The result dict of every page.
+        :ytype: dict
+        """
+        for results in self.request_pages(url):
+            yield from results
+
+    def _request_paginated(self, url: str) -> list:
+        """
+        Fetch all pages of a paginated GeoRepo endpoint and return the results.
+
+        :param url: Base endpoint URL (with or without existing query params).
+        :type url: str
+        :return: Aggregated list of result dicts across all pages.
+        :rtype: list[dict]
+        """
+        return list(self.iter_results(url))
 
     # VIEW REQUESTS
     class ViewRequest:
@@ -588,8 +815,8 @@ class GeorepoRequest:
             for dataset_level in detail['dataset_levels']:
                 if level is not None and dataset_level['level'] != level:
                     continue
-                entities += GeorepoRequest()._request_paginated(
-                    dataset_level['url']
+                entities.extend(
+                    self.request.iter_results(dataset_level['url'])
                 )
             return entities
 
@@ -618,7 +845,7 @@ class GeorepoRequest:
             # Get list of entity on first level
             first_level = detail['dataset_levels'][0]
             url = first_level['url']
-            entities = GeorepoRequest()._request_paginated(url)
+            entities = self.request.iter_results(url)
             bbox = None
             for entity in entities:
                 url = (
@@ -703,6 +930,55 @@ class GeorepoRequest:
             response['features'] = features
             return response
 
+        def identify_codes_url(
+                self, reference_layer_identifier: str, original_id_type: str
+        ) -> str:
+            """
+            Return the API URL of batch identifying the codes.
+
+            :param reference_layer_identifier: UUID of the GeoRepo view.
+            :type reference_layer_identifier: str
+            :param original_id_type: Identifier type of the input codes
+                (e.g. ``'PCode'``).
+            :type original_id_type: str
+            :return: Fully-formed batch identifier endpoint URL.
+            :rtype: str
+            """
+            return (
+                f"{self.urls.georepo_url}/search/view/"
+                f"{reference_layer_identifier}/"
+                f"entity/batch/identifier/{original_id_type}/"
+            )
+
+        def submit_identify_codes(
+                self, reference_layer_identifier: str, codes: list,
+                original_id_type: str
+        ) -> GeorepoPostPooling:
+            """
+            Submit the job of identifying the codes, without waiting.
+
+            :param reference_layer_identifier: UUID of the GeoRepo view.
+            :type reference_layer_identifier: str
+            :param codes: List of identifier values to resolve.
+            :type codes: list
+            :param original_id_type: Identifier type of the input codes
+                (e.g. ``'PCode'``).
+            :type original_id_type: str
+            :return: The submitted job, poll it with
+                :meth:`GeorepoPostPooling.check`.
+            :rtype: GeorepoPostPooling
+            :raises GeorepoRequestError: If the batch request fails.
+            """
+            url = self.identify_codes_url(
+                reference_layer_identifier, original_id_type
+            )
+            try:
+                return GeorepoPostPooling(self.request, url, codes)
+            except GeorepoRequestError as e:
+                raise GeorepoRequestError(
+                    f'Error when identifying codes - {e}'
+                )
+
         def identify_codes(
                 self, reference_layer_identifier: str, codes: list,
                 original_id_type: str, return_id_type: str
@@ -711,7 +987,7 @@ class GeorepoRequest:
             Batch-resolve a list of codes to their GeoRepo ucodes.
 
             Uses the asynchronous POST pooling endpoint; blocks until the job
-            is complete.
+            is complete. Use :meth:`submit_identify_codes` to not block.
 
             :param reference_layer_identifier: UUID of the GeoRepo view.
             :type reference_layer_identifier: str
@@ -727,13 +1003,11 @@ class GeorepoRequest:
             :rtype: list or dict
             :raises GeorepoRequestError: If the batch request or polling fails.
             """
-            url = (
-                f"{self.urls.georepo_url}/search/view/"
-                f"{reference_layer_identifier}/"
-                f"entity/batch/identifier/{original_id_type}/"
+            pooling = self.submit_identify_codes(
+                reference_layer_identifier, codes, original_id_type
             )
             try:
-                return GeorepoPostPooling(self.request, url, codes).results()
+                return pooling.results()
             except GeorepoRequestError as e:
                 raise GeorepoRequestError(
                     f'Error when identifying codes - {e}'
@@ -0,0 +1,446 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from django.db import connection, transaction
+
+from geosight.georepo.entity_index import EntityIndex
+from geosight.georepo.models.entity import Entity, EntityCode
+from geosight.georepo.models.reference_layer import ReferenceLayerView
+from geosight.georepo.models.reference_layer_entity import (
+    ReferenceLayerViewEntity
+)
+from geosight.georepo.request import GeorepoRequest
+from geosight.georepo.request.data import GeorepoEntity
+from geosight.georepo.term import admin_level_country
+
+logger = logging.getLogger(__name__)
+
+# Fields that are updated on the existing entity, like Entity.get_or_create
+UPDATE_FIELDS = ['name', 'concept_uuid', 'parents', 'reference_layer']
+
+# Flatten the entity and the country of entity to indicator value
+INDICATOR_VALUE_QUERY = """
+    UPDATE geosight_data_indicatorvalue AS value
+    SET entity_name = entity.name,
+        admin_level = entity.admin_level,
+        concept_uuid = entity.concept_uuid,
+        entity_start_date = entity.start_date,
+        entity_end_date = entity.end_date,
+        country_id = CASE
+            WHEN entity.admin_level = %(admin_level_country)s
+            THEN entity.id ELSE country.id
+        END,
+        country_name = CASE
+            WHEN entity.admin_level = %(admin_level_country)s
+            THEN entity.name ELSE country.name
+        END,
+        country_geom_id = CASE
+            WHEN entity.admin_level = %(admin_level_country)s
+            THEN entity.geom_id ELSE country.geom_id
+        END,
+        country_concept_uuid = CASE
+            WHEN entity.admin_level = %(admin_level_country)s
+            THEN entity.concept_uuid ELSE country.concept_uuid
+        END
+    FROM geosight_georepo_entity AS entity
+        LEFT JOIN geosight_georepo_entity AS country
+            ON entity.country_id = country.id
+    WHERE value.entity_id = entity.id
+      AND (
+        value.entity_id = ANY(%(ids)s) OR value.country_id = ANY(%(ids)s)
+      )
+"""
+
+# Assign the country of entities from the top parent,
+# just the entities whose country is changed are updated.
+COUNTRY_QUERY = """
+    UPDATE geosight_georepo_entity AS entity
+    SET country_id = country.id
+    FROM geosight_georepo_entity AS country
+    WHERE entity.id = ANY(%(ids)s)
+      AND entity.admin_level != %(admin_level_country)s
+      AND country.geom_id = entity.parents ->> -1
+      AND country.admin_level = %(admin_level_country)s
+      AND entity.country_id IS DISTINCT FROM country.id
+    RETURNING entity.id
+"""
+
+
+class EntityChanges(object):
+    """Dirty set of entities that are changed.
+
+    The entities whose parents are changed get their country reassigned,
+    and the entities whose data or country are changed get the flattened
+    columns of their indicator values updated.
+    Each of them is one statement over the dirty ids only,
+    so a change of a country does not touch the rest of the entities.
+    """
+
+    def __init__(self):
+        """Init the dirty set."""
+        self.parents = set()
+        self.data = set()
+
+    def __bool__(self) -> bool:
+        """Return if there is any change.
+
+        :return: True if there is an entity to propagate.
+        :rtype: bool
+        """
+        return bool(self.parents or self.data)
+
+    def parents_changed(self, ids):
+        """Record entities whose parents are changed or that are new.
+
+        :param ids: List of entity id.
+        :type ids: list
+        """
+        self.parents |= set(ids)
+
+    def data_changed(self, ids):
+        """Record entities whose data is changed.
+
+        :param ids: List of entity id.
+        :type ids: list
+        """
+        self.data |= set(ids)
+
+    def assign_countries(self) -> set:
+        """Assign country of the entities whose parents are changed.
+
+        :return: Ids of entities whose country is changed.
+        :rtype: set
+        """
+        ids = list(self.parents)
+        self.parents = set()
+        if not ids:
+            return set()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                COUNTRY_QUERY,
+                {'ids': ids, 'admin_level_country': admin_level_country}
+            )
+            changed = {row[0] for row in cursor.fetchall()}
+        self.data |= changed
+        return changed
+
+    def update_indicator_values(self) -> None:
+        """Update the entity data of indicator values of changed entities.
+
+        It is the bulk version of :meth:`Entity.update_indicator_value_data`
+        and :meth:`Entity.update_parent_of_indicator_value_data`.
+        """
+        ids = list(self.data)
+        self.data = set()
+        if not ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                INDICATOR_VALUE_QUERY,
+                {'ids': ids, 'admin_level_country': admin_level_country}
+            )
+
+    def propagate(self) -> set:
+        """Propagate the changes, countries first then indicator values.
+
+        :return: Ids of entities whose country is changed.
+        :rtype: set
+        """
+        changed = self.assign_countries()
+        self.update_indicator_values()
+        return changed
+
+
+_DONE = object()
+
+
+class EntitySync(object):
+    """Synchronise the entities of a view from GeoRepo in bulk.
+
+    The levels are fetched concurrently, page by page.
+    Every page is compared against the existing entities by geom_id,
+    and it is applied with bulk create/update queries.
+    The countries are assigned in one pass after all pages.
+    """
+
+    def __init__(  # noqa: DOC101,DOC103
+            self, reference_layer: ReferenceLayerView, workers: int = 4,
+            queue_size: int = 8
+    ):
+        """Init the sync.
+
+        :param reference_layer: The view that will be synchronised.
+        :type reference_layer: ReferenceLayerView
+        :param workers: Number of levels that are fetched concurrently.
+        :type workers: int
+        :param queue_size: Maximum pages that are fetched but not saved.
+        :type queue_size: int
+        """
+        self.reference_layer = reference_layer
+        self.workers = workers
+        self.queue_size = queue_size
+        self.request = GeorepoRequest()
+
+        self.changes = EntityChanges()
+        self.country_ids = set()
+        self.created = 0
+        self.updated = 0
+
+    # ------------------------------------------------
+    # Fetching
+    # ------------------------------------------------
+    def _fetch_pages(
+            self, url: str, pages: queue.Queue, stop: threading.Event
+    ) -> None:
+        """Fetch all pages of url and put the results to the queue.
+
+        :param url: The url of the entities of a level.
+        :type url: str
+        :param pages: The queue of the pages that are not saved yet.
+        :type pages: queue.Queue
+        :param stop: Event to stop fetching, when the saving fails.
+        :type stop: threading.Event
+        """
+        pages_of_url = self.request.request_pages(url)
+        try:
+            for results in pages_of_url:
+                if stop.is_set():
+                    return
+                pages.put(results)
+        finally:
+            pages_of_url.close()
+
+    def dataset_levels(
+            self, levels: List[int] = None, min_level: int = None
+    ) -> list:
+        """Return dataset levels of the view.
+
+        :param levels: The levels that are returned, None for all.
+        :type levels: list
+        :param min_level: Just return the levels above this level.
+        :type min_level: int
+        :return: List of dataset level from GeoRepo.
+        :rtype: list
+        """
+        detail = self.request.View.get_detail(self.reference_layer.identifier)
+        return [
+            dataset_level for dataset_level in detail['dataset_levels']
+            if (levels is None or dataset_level['level'] in levels) and
+            (min_level is None or dataset_level['level'] > min_level)
+        ]
+
+    # ------------------------------------------------
+    # Saving
+    # ------------------------------------------------
+    def save_page(self, data: List[dict]) -> None:
+        """Save a page of GeoRepo entities.
+
+        :param data: List of entity data from GeoRepo.
+        :type data: list
+        """
+        georepo_entities = {}
+        for row in data:
+            georepo_entity = GeorepoEntity(row)
+            georepo_entities[georepo_entity.ucode] = georepo_entity
+        if not georepo_entities:
+            return
+
+        with transaction.atomic():
+            entities = {
+                entity.geom_id: entity for entity in Entity.objects.filter(
+                    geom_id__in=list(georepo_entities.keys())
+                )
+            }
+
+            # Create the new entities
+            new_entities = [
+                Entity(
+                    geom_id=ucode,
+                    name=georepo_entity.name,
+                    admin_level=georepo_entity.admin_level,
+                    concept_uuid=georepo_entity.concept_uuid,
+                    start_date=georepo_entity.start_date,
+                    end_date=georepo_entity.end_date,
+                    parents=georepo_entity.parents,
+                    reference_layer=self.reference_layer
+                )
+                for ucode, georepo_entity in georepo_entities.items()
+                if ucode not in entities
+            ]
+            if new_entities:
+                Entity.objects.bulk_create(
+                    new_entities, ignore_conflicts=True
+                )
+                for entity in Entity.objects.filter(
+                        geom_id__in=[
+                            entity.geom_id for entity in new_entities
+                        ]
+                ):
+                    entities[entity.geom_id] = entity
+                    self.changes.parents_changed([entity.id])
+                self.created += len(new_entities)
+
+            # Update the existing entities
+            updated_entities = []
+            for ucode, georepo_entity in georepo_entities.items():
+                entity = entities[ucode]
+                changed = False
+                for field, value in [
+                    ('name', georepo_entity.name),
+                    ('concept_uuid', georepo_entity.concept_uuid),
+                ]:
+                    if getattr(entity, field) != value:
+                        setattr(entity, field, value)
+                        changed = True
+                if entity.parents != georepo_entity.parents:
+                    entity.parents = georepo_entity.parents
+                    self.changes.parents_changed([entity.id])
+                    changed = True
+                elif not entity.country_id:
+                    # The country may be synchronised after the entity
+                    self.changes.parents_changed([entity.id])
+                if entity.reference_layer_id != self.reference_layer.id:
+                    entity.reference_layer = self.reference_layer
+                    changed = True
+                if changed:
+                    updated_entities.append(entity)
+            if updated_entities:
+                Entity.objects.bulk_update(
+                    updated_entities, UPDATE_FIELDS, batch_size=1000
+                )
+                self.changes.data_changed(
+                    [entity.id for entity in updated_entities]
+                )
+                self.updated += len(updated_entities)
+
+            entity_ids = [entity.id for entity in entities.values()]
+            self.country_ids |= {
+                entity.id for entity in entities.values()
+                if entity.admin_level == admin_level_country
+            }
+
+            # Link the entities to the view
+            linked_ids = set(
+                ReferenceLayerViewEntity.objects.filter(
+                    reference_layer=self.reference_layer,
+                    entity_id__in=entity_ids
+                ).values_list('entity_id', flat=True)
+            )
+            ReferenceLayerViewEntity.objects.bulk_create(
+                [
+                    ReferenceLayerViewEntity(
+                        reference_layer=self.reference_layer,
+                        entity_id=entity_id
+                    )
+                    for entity_id in entity_ids if entity_id not in linked_ids
+                ]
+            )
+
+            # Codes, the existing codes are ignored by unique constraint
+            EntityCode.objects.bulk_create(
+                [
+                    EntityCode(
+                        entity=entities[ucode],
+                        code_type=code_type,
+                        code=code
+                    )
+                    for ucode, georepo_entity in georepo_entities.items()
+                    for code_type, code in (
+                        georepo_entity.ext_codes or {}
+                    ).items()
+                    if code is not None
+                ],
+                ignore_conflicts=True
+            )
+
+    def assign_countries(self):
+        """Assign country of the changed entities and countries of view."""
+        self.changes.assign_countries()
+        if self.country_ids:
+            self.reference_layer.countries.add(*self.country_ids)
+
+    def update_indicator_values(self):
+        """Update the entity data of indicator values of changed entities."""
+        self.changes.update_indicator_values()
+
+    # ------------------------------------------------
+    # Run
+    # ------------------------------------------------
+    def run(self, levels: List[int] = None, min_level: int = None):
+        """Run the synchronisation.
+
+        :param levels: The levels that are synchronised, None for all.
+        :type levels: list
+        :param min_level: Just synchronise the levels above this level.
+        :type min_level: int
+        :raises Exception: The error of saving a page,
+            after the fetchers are stopped.
+        """
+        dataset_levels = self.dataset_levels(levels, min_level)
+        pages = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+
+        def _fetch(dataset_level):
+            try:
+                logger.debug(
+                    f"Fetching entities: "
+                    f"{self.reference_layer.identifier}-"
+                    f"{dataset_level['level']}"
+                )
+                self._fetch_pages(dataset_level['url'], pages, stop)
+            finally:
+                pages.put(_DONE)
+
+        # Fetch the levels concurrently,
+        # the database is just accessed on this thread.
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(_fetch, dataset_level)
+                for dataset_level in dataset_levels
+            ]
+            done = 0
+            try:
+                while done < len(futures):
+                    page = pages.get()
+                    if page is _DONE:
+                        done += 1
+                        continue
+                    self.save_page(page)
+            except Exception:
+                # Release the fetchers that wait for the queue
+                stop.set()
+                while done < len(futures):
+                    if pages.get() is _DONE:
+                        done += 1
+                raise
+
+            # Raise the error of fetching
+            for future in futures:
+                future.result()
+
+        self.assign_countries()
+        self.update_indicator_values()
+        EntityIndex.invalidate(self.reference_layer)
+        logger.debug(
+            f'{self.reference_layer.identifier}: '
+            f'{self.created} created, {self.updated} updated'
+        )
@@ -50,13 +50,16 @@ def fetch_reference_codes(_id):
 
 @app.task
 def fetch_datasets(fetch_code=True):
-    """Fetch reference codes."""
-    datasets = GeorepoRequest().get_reference_layer_list()
-    for dataset in datasets:
-        reference_layer_list = GeorepoRequest().get_reference_layer_views(
-            dataset['uuid']
-        )
-        for reference_layer in reference_layer_list:
+    """Fetch reference codes.
+
+    The datasets and the views are consumed as a stream of pages,
+    so the views are saved while the next page is fetched.
+    """
+    request = GeorepoRequest()
+    for dataset in request.iter_reference_layers():
+        for reference_layer in request.iter_reference_layer_views(
+                dataset['uuid']
+        ):
             ref, created = ReferenceLayerView.objects.get_or_create(
                 identifier=reference_layer['uuid'],
                 defaults={
@@ -73,33 +76,40 @@ def fetch_datasets(fetch_code=True):
 @app.task
 def create_data_access_indicator(_id):
     """Create data access of indicator for all reference layer view."""
-    try:
-        indicator = Indicator.objects.get(id=_id)
-        for reference_layer in ReferenceLayerView.objects.all():
-            ReferenceLayerIndicator.objects.get_or_create(
-                reference_layer=reference_layer,
-                indicator=indicator
-            )
-    except Indicator.DoesNotExist:
-        pass
+    ReferenceLayerIndicator.create_data_access(indicator_ids=[_id])
 
 
 @app.task
 def create_data_access_reference_layer_view(_id):
     """Create data access of indicator for all reference layer view."""
-    try:
-        reference_layer = ReferenceLayerView.objects.get(id=_id)
-        for indicator in Indicator.objects.all():
-            ReferenceLayerIndicator.objects.get_or_create(
-                reference_layer=reference_layer,
-                indicator=indicator
-            )
-    except ReferenceLayerView.DoesNotExist:
-        pass
+    ReferenceLayerIndicator.create_data_access(reference_layer_ids=[_id])
 
 
 @app.task
-def create_data_access():
-    """Create data access."""
-    for indicator in Indicator.objects.all():
-        create_data_access_indicator(indicator.id)
+def create_data_access(start_id=0, step=100) -> None:
+    """Create data access for all indicators and reference layer views.
+
+    The indicators are processed in chunks by id,
+    every chunk queues the next one, so it does not block the queue.
+    It can be resumed from the last id of the log.
+
+    :param start_id: The chunk starts after this indicator id.
+    :type start_id: int
+    :param step: Number of indicators per chunk.
+    :type step: int
+    """
+    indicator_ids = list(
+        Indicator.objects.filter(id__gt=start_id).order_by(
+            'id'
+        ).values_list('id', flat=True)[:step]
+    )
+    if not indicator_ids:
+        return
+    count = ReferenceLayerIndicator.create_data_access(
+        indicator_ids=indicator_ids
+    )
+    logger.info(
+        f'Data access of indicator {indicator_ids[0]}-{indicator_ids[-1]}: '
+        f'{count} created'
+    )
+    create_data_access.delay(indicator_ids[-1], step)
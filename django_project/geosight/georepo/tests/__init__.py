@@ -14,6 +14,11 @@ __author__ = 'irwan@kartoza.com'
 __date__ = '13/06/2023'
 __copyright__ = ('Copyright 2023, Unicef')
 
+from .test_data_access import *  # noqa
+from .test_emulator import *  # noqa
 from .test_entity import *  # noqa
+from .test_entity_index import *  # noqa
+from .test_entity_sync import *  # noqa
 from .test_reference_layer import *  # noqa
 from .test_reference_layer_function import *  # noqa
+from .test_request import *  # noqa
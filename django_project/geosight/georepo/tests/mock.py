@@ -63,6 +63,21 @@ def mock_get_entity(
     return entity
 
 
+def mock_resolver_get_entity(
+        self, original_id_type: str, original_id: str,
+        admin_level=None, date_time=None, auto_fetch=True
+):
+    """Mock for get entity of entity resolver."""
+    return mock_get_entity(
+        original_id_type=original_id_type,
+        original_id=original_id,
+        reference_layer=self.reference_layer,
+        admin_level=admin_level,
+        date_time=date_time,
+        auto_fetch=auto_fetch
+    )
+
+
 @property
 def need_review(self):
     """Mock for need_review importer."""
@@ -0,0 +1,98 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from unittest.mock import patch
+
+from core.tests.base_tests import TestCase
+from geosight.data.tests.model_factories import IndicatorF
+from geosight.georepo.models.reference_layer import ReferenceLayerIndicator
+from geosight.georepo.tasks import (
+    create_data_access, create_data_access_indicator,
+    create_data_access_reference_layer_view
+)
+from geosight.georepo.tests.model_factories import ReferenceLayerF
+from geosight.permission.models.resource.dataset import (
+    ReferenceLayerIndicatorPermission
+)
+
+
+class DataAccessTest(TestCase):
+    """Test for set-based data access creation."""
+
+    def setUp(self):
+        """To setup test."""
+        self.views = [ReferenceLayerF(), ReferenceLayerF()]
+        self.indicators = [IndicatorF(), IndicatorF(), IndicatorF()]
+        ReferenceLayerIndicator.objects.all().delete()
+
+    def assert_access(self, count):
+        """Assert the access and the permission of every access."""
+        self.assertEqual(ReferenceLayerIndicator.objects.count(), count)
+        self.assertEqual(
+            ReferenceLayerIndicatorPermission.objects.count(), count
+        )
+
+    def test_indicator(self):
+        """Test create data access of indicator."""
+        create_data_access_indicator(self.indicators[0].id)
+        self.assert_access(2)
+        self.assertEqual(
+            set(
+                ReferenceLayerIndicator.objects.values_list(
+                    'reference_layer_id', flat=True
+                )
+            ),
+            {view.id for view in self.views}
+        )
+        permission = ReferenceLayerIndicatorPermission.objects.first()
+        default = ReferenceLayerIndicatorPermission()
+        self.assertEqual(
+            permission.organization_permission,
+            default.organization_permission
+        )
+        self.assertEqual(
+            permission.public_permission, default.public_permission
+        )
+
+        # The existing access is skipped
+        self.assertEqual(
+            ReferenceLayerIndicator.create_data_access(
+                indicator_ids=[self.indicators[0].id]
+            ),
+            0
+        )
+        self.assert_access(2)
+
+    def test_reference_layer_view(self):
+        """Test create data access of reference layer view."""
+        create_data_access_reference_layer_view(self.views[0].id)
+        self.assert_access(3)
+
+    def test_all(self):
+        """Test create data access in chunks."""
+        with patch.object(create_data_access, 'delay') as delay:
+            create_data_access(0, 2)
+            self.assert_access(4)
+            delay.assert_called_once_with(self.indicators[1].id, 2)
+
+            delay.reset_mock()
+            create_data_access(self.indicators[1].id, 2)
+            self.assert_access(6)
+            delay.assert_called_once_with(self.indicators[2].id, 2)
+
+            delay.reset_mock()
+            create_data_access(self.indicators[2].id, 2)
+            delay.assert_not_called()
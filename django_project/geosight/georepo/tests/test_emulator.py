@@ -0,0 +1,101 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+import os
+
+from core.models.preferences import SitePreferences
+from core.tests.base_tests import TestCase
+from geosight.georepo.emulator import GeorepoEmulator
+from geosight.georepo.models.reference_layer import ReferenceLayerView
+from geosight.georepo.request import GeorepoRequest
+from geosight.georepo.sync import EntitySync
+from geosight.georepo.tasks import fetch_datasets
+from geosight.georepo.tests.model_factories import ReferenceLayerF
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '_fixtures', 'georepo.json'
+)
+
+
+class GeorepoEmulatorTest(TestCase):
+    """Test the GeoRepo code paths against the emulator."""
+
+    def test_fixture(self):
+        """Test the requests are served from fixture."""
+        emulator = GeorepoEmulator.from_fixture(FIXTURE)
+        with emulator.emulate():
+            request = GeorepoRequest()
+            self.assertEqual(
+                [
+                    dataset['identifier']
+                    for dataset in request.get_reference_layer_list()
+                ],
+                ['dataset-1']
+            )
+            entity = request.View.find_entity('view-1', 'PCode', 'PAA')
+            self.assertEqual(entity.ucode, 'AA_V1')
+            self.assertEqual(entity.parents, ['A_V1'])
+
+            results = request.View.identify_codes(
+                'view-1', ['PAB', 'PAC'], 'PCode', 'ucode'
+            )
+            self.assertEqual(list(results.keys()), ['PAB'])
+
+            containment = request.View.containment(
+                'view-1', 'ST_Intersects', 0, 1,
+                {'type': 'Point', 'coordinates': [7, 5]}
+            )
+            self.assertEqual(
+                [
+                    feature['properties']['ucode']
+                    for feature in containment['features']
+                ],
+                ['AB_V1']
+            )
+            self.assertEqual(
+                request.View.get_reference_layer_bbox('view-1'), [0, 0, 10, 10]
+            )
+
+            # Fetch the views and the entities
+            fetch_datasets()
+            view = ReferenceLayerView.objects.get(identifier='view-1')
+            self.assertEqual(view.entities_set.count(), 3)
+
+    def test_generated(self):
+        """Test the entities are generated."""
+        emulator = GeorepoEmulator.generate(111)
+        reference_layer = ReferenceLayerF(identifier='emulator-view')
+        georepo_url = SitePreferences.preferences().georepo_url
+        with emulator.emulate():
+            EntitySync(reference_layer).run()
+
+            # The site preferences are not changed
+            self.assertEqual(
+                SitePreferences.preferences().georepo_url, georepo_url
+            )
+        self.assertEqual(reference_layer.entities_set.count(), 111)
+        self.assertEqual(
+            reference_layer.entities_set.get(
+                geom_id='EMU_2_15_V1'
+            ).parents,
+            ['EMU_1_1_V1', 'EMU_0_0_V1']
+        )
+        self.assertEqual(
+            list(
+                reference_layer.countries.values_list('geom_id', flat=True)
+            ),
+            ['EMU_0_0_V1']
+        )
@@ -0,0 +1,152 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+
+from django.utils import timezone
+
+from core.tests.base_tests import TestCase
+from geosight.georepo.entity_index import EntityIndex
+from geosight.georepo.models.entity import Entity, EntityCode
+from geosight.georepo.models.reference_layer_entity import (
+    ReferenceLayerViewEntity
+)
+from geosight.georepo.tests.model_factories import ReferenceLayerF
+
+
+class EntityIndexTest(TestCase):
+    """Test for entity index."""
+
+    def create_entity(self, geom_id, code, start_date=None, end_date=None):
+        """Create entity of the view."""
+        entity = Entity.objects.create(
+            geom_id=geom_id, name=geom_id, admin_level=0,
+            concept_uuid='concept_A', start_date=start_date,
+            end_date=end_date, reference_layer=self.reference_layer
+        )
+        ReferenceLayerViewEntity.objects.create(
+            reference_layer=self.reference_layer, entity=entity
+        )
+        EntityCode.objects.create(entity=entity, code_type='PCode', code=code)
+        return entity
+
+    def setUp(self):
+        """To setup test."""
+        self.reference_layer = ReferenceLayerF()
+        self.old = self.create_entity(
+            'A_V1', 'PA',
+            start_date=timezone.make_aware(datetime(2010, 1, 1)),
+            end_date=timezone.make_aware(datetime(2019, 12, 31))
+        )
+        self.new = self.create_entity(
+            'A_V2', 'PA',
+            start_date=timezone.make_aware(datetime(2020, 1, 1))
+        )
+
+        # Entity that is not in the view
+        Entity.objects.create(geom_id='B', name='B', admin_level=0)
+
+    def test_lookup(self):
+        """Test lookup by code and date."""
+        index = EntityIndex.build(self.reference_layer)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(
+            index.lookup(
+                'PCode', 'PA', timezone.make_aware(datetime(2015, 1, 1))
+            ),
+            self.old.id
+        )
+        self.assertEqual(
+            index.lookup(
+                'PCode', 'PA', timezone.make_aware(datetime(2021, 1, 1))
+            ),
+            self.new.id
+        )
+        self.assertIsNone(
+            index.lookup(
+                'PCode', 'PB', timezone.make_aware(datetime(2021, 1, 1))
+            )
+        )
+        self.assertEqual(
+            sorted(index.ids('concept_uuid', 'concept_A')),
+            sorted([self.old.id, self.new.id])
+        )
+        self.assertEqual(index.ids('ucode', 'B'), [])
+
+        # The entity is returned without querying
+        with self.assertNumQueries(0):
+            entity = index.get_entity('ucode', 'A_V1', date(2015, 1, 1))
+            self.assertEqual(entity, self.old)
+            self.assertEqual(entity.name, 'A_V1')
+            self.assertEqual(
+                entity.reference_layer_id, self.reference_layer.id
+            )
+            entity = index.get_entity(
+                'PCode', 'PA',
+                datetime.timestamp(datetime(2021, 1, 1))
+            )
+            self.assertEqual(entity, self.new)
+
+    def test_add(self):
+        """Test add entity to the index."""
+        index = EntityIndex.build(self.reference_layer)
+        entity = Entity.objects.create(geom_id='C', name='C', admin_level=0)
+        index.add(entity, {'PCode': 'PC'})
+        self.assertEqual(
+            index.lookup('PCode', 'PC', timezone.now()), entity.id
+        )
+        self.assertEqual(
+            index.lookup('ucode', 'C', timezone.now()), entity.id
+        )
+
+    def test_get_entity(self):
+        """Test Entity.get_entity uses the index."""
+        entity = Entity.get_entity(
+            original_id_type='PCode', original_id='PA',
+            reference_layer=self.reference_layer,
+            date_time=datetime.timestamp(datetime(2015, 1, 1)),
+            auto_fetch=False
+        )
+        self.assertEqual(entity, self.old)
+
+    def test_get_without_stamp(self):
+        """Test the index of process is used when the stamp is not read."""
+        EntityIndex.invalidate(self.reference_layer)
+        index = EntityIndex.get(self.reference_layer)
+        cache = MagicMock()
+        cache.get.return_value = None
+        with patch(
+                'geosight.georepo.entity_index.cache', cache
+        ), patch.object(EntityIndex, 'build') as build:
+            self.assertIs(EntityIndex.get(self.reference_layer), index)
+            build.assert_not_called()
+
+    def test_get_not_build(self):
+        """Test one-off lookup does not build the index."""
+        EntityIndex.invalidate(self.reference_layer)
+        with patch.object(EntityIndex, 'build') as build:
+            self.assertIsNone(
+                EntityIndex.get(self.reference_layer, build=False)
+            )
+            entity = Entity.get_entity(
+                original_id_type='ucode', original_id='A_V2',
+                reference_layer=self.reference_layer,
+                date_time=datetime.timestamp(datetime(2021, 1, 1)),
+                auto_fetch=False
+            )
+            self.assertEqual(entity, self.new)
+            build.assert_not_called()
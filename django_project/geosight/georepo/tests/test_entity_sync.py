@@ -0,0 +1,232 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlparse
+
+from core.tests.base_tests import TestCase
+from geosight.data.models.indicator import IndicatorValue
+from geosight.data.tests.model_factories.indicator.value import (
+    IndicatorValueF
+)
+from geosight.georepo.models.entity import Entity, EntityCode
+from geosight.georepo.sync import EntityChanges
+from geosight.georepo.tests.model_factories.reference_layer import (
+    ReferenceLayerF
+)
+
+
+def _entity(ucode, admin_level, parents=None, name=None):
+    """Return GeoRepo entity data."""
+    return {
+        'name': name or ucode,
+        'ucode': ucode,
+        'concept_uuid': f'concept_{ucode}',
+        'admin_level': admin_level,
+        'ext_codes': {'PCode': f'P{ucode}', 'default': f'P{ucode}'},
+        'parents': [
+            {'ucode': parent, 'admin_level': level}
+            for level, parent in enumerate(parents or [])
+        ]
+    }
+
+
+class EntitySyncTest(TestCase):
+    """Test for bulk entity sync."""
+
+    # level : list of page
+    levels = {
+        0: [[_entity('A', 0), _entity('B', 0)]],
+        1: [
+            [_entity('AA', 1, ['A']), _entity('AB', 1, ['A'])],
+            [_entity('BA', 1, ['B'], name='BA new')]
+        ],
+        2: [[_entity('AAA', 2, ['A', 'AA'])]]
+    }
+
+    def setUp(self):
+        """To setup test."""
+        self.reference_layer = ReferenceLayerF(name='view')
+
+        # Existing entity of other view
+        self.other_view = ReferenceLayerF(name='other')
+        Entity.objects.create(
+            name='BA', geom_id='BA', admin_level=1,
+            reference_layer=self.other_view
+        )
+
+    def mock_detail(self, identifier):
+        """Mock detail of view."""
+        return {
+            'dataset_levels': [
+                {'level': level, 'url': f'http://georepo/{level}'}
+                for level in self.levels.keys()
+            ]
+        }
+
+    def mock_get(self, url):
+        """Mock get the page."""
+        parsed = urlparse(url)
+        level = int(parsed.path.split('/')[-1])
+        page = int(parse_qs(parsed.query)['page'][0])
+        pages = self.levels[level]
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {
+            'results': pages[page - 1],
+            'total_page': len(pages)
+        }
+        return response
+
+    def sync(self, sync_all=True):
+        """Run sync."""
+        with patch(
+                'geosight.georepo.request.request.GeorepoRequest.get',
+                side_effect=self.mock_get
+        ), patch(
+            'geosight.georepo.request.request.GeorepoRequest.ViewRequest.'
+            'get_detail',
+            side_effect=self.mock_detail
+        ):
+            self.reference_layer.sync_entities_code(sync_all=sync_all)
+
+    def test_sync(self):
+        """Test sync creates, updates and links the entities."""
+        self.sync()
+        self.assertEqual(
+            list(
+                self.reference_layer.entities_set.order_by(
+                    'geom_id'
+                ).values_list('geom_id', flat=True)
+            ),
+            ['A', 'AA', 'AAA', 'AB', 'B', 'BA']
+        )
+
+        # Existing entity is updated
+        entity = Entity.objects.get(geom_id='BA')
+        self.assertEqual(entity.name, 'BA new')
+        self.assertEqual(entity.parents, ['B'])
+        self.assertEqual(entity.reference_layer, self.reference_layer)
+
+        # Countries
+        self.assertEqual(entity.country.geom_id, 'B')
+        self.assertEqual(
+            Entity.objects.get(geom_id='AAA').country.geom_id, 'A'
+        )
+        self.assertEqual(
+            list(
+                self.reference_layer.countries.order_by(
+                    'geom_id'
+                ).values_list('geom_id', flat=True)
+            ),
+            ['A', 'B']
+        )
+
+        # Codes
+        self.assertEqual(
+            EntityCode.objects.filter(entity__geom_id='AAA').count(), 2
+        )
+        self.assertEqual(
+            EntityCode.objects.get(
+                entity__geom_id='AAA', code_type='PCode'
+            ).code,
+            'PAAA'
+        )
+
+        # Run again does not duplicate the rows
+        self.sync()
+        self.assertEqual(self.reference_layer.entities_set.count(), 6)
+        self.assertEqual(
+            self.reference_layer.referencelayerviewentity_set.count(), 6
+        )
+        self.assertEqual(
+            EntityCode.objects.filter(entity__geom_id='AAA').count(), 2
+        )
+
+    def test_sync_new_levels(self):
+        """Test sync just the levels above existing levels."""
+        Entity.objects.create(
+            name='AA', geom_id='AA', admin_level=1, parents=['A'],
+            reference_layer=self.reference_layer
+        )
+        self.sync(sync_all=False)
+        self.assertEqual(
+            list(
+                self.reference_layer.entities_set.order_by(
+                    'geom_id'
+                ).values_list('geom_id', flat=True)
+            ),
+            ['AA', 'AAA']
+        )
+
+    def test_sync_parents_changed(self):
+        """Test the country is reassigned when the parents changed."""
+        self.sync()
+        levels = self.levels
+        self.levels = {
+            0: levels[0],
+            1: [
+                [_entity('AA', 1, ['B']), _entity('AB', 1, ['A'])],
+                levels[1][1]
+            ],
+            2: levels[2]
+        }
+        try:
+            self.sync()
+        finally:
+            self.levels = levels
+        self.assertEqual(Entity.objects.get(geom_id='AA').country.geom_id, 'B')
+        self.assertEqual(Entity.objects.get(geom_id='AB').country.geom_id, 'A')
+
+    def test_changes(self):
+        """Test the changes are propagated just to the dirty entities."""
+        country = Entity.objects.create(
+            name='X', geom_id='X', admin_level=0, concept_uuid='concept_X'
+        )
+        entity = Entity.objects.create(
+            name='XA', geom_id='XA', admin_level=1, parents=['X']
+        )
+        other = Entity.objects.create(
+            name='XB', geom_id='XB', admin_level=1, parents=['X']
+        )
+        Entity.objects.filter(id__in=[entity.id, other.id]).update(
+            country=None
+        )
+        value = IndicatorValueF(geom_id='XA')
+        IndicatorValue.objects.filter(id=value.id).update(
+            country=None, country_name=None, country_geom_id=None,
+            country_concept_uuid=None
+        )
+
+        changes = EntityChanges()
+        changes.parents_changed([entity.id])
+        self.assertEqual(changes.propagate(), {entity.id})
+        self.assertFalse(changes)
+        entity.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(entity.country, country)
+        self.assertIsNone(other.country)
+
+        # The flattened country of indicator value is updated
+        value.refresh_from_db()
+        self.assertEqual(value.country, country)
+        self.assertEqual(value.country_name, 'X')
+        self.assertEqual(value.country_geom_id, 'X')
+        self.assertEqual(value.country_concept_uuid, 'concept_X')
+
+        # Nothing is changed on the second time
+        changes.parents_changed([entity.id])
+        self.assertEqual(changes.propagate(), set())
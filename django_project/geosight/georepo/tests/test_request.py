@@ -0,0 +1,93 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlparse
+
+from core.tests.base_tests import TestCase
+from geosight.georepo.request.request import (
+    GeorepoRequest, GeorepoRequestError, georepo_session
+)
+
+
+class GeorepoRequestTest(TestCase):
+    """Test for GeoRepo request."""
+
+    total_page = 1500
+
+    def mock_get(self, url):
+        """Mock get the page, the page is the result."""
+        page = int(parse_qs(urlparse(url).query)['page'][0])
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {
+            'results': [page], 'total_page': self.total_page
+        }
+        return response
+
+    def test_request_pages(self):
+        """Test pages are yielded in order without recursion."""
+        request = GeorepoRequest()
+        with patch.object(GeorepoRequest, 'get', side_effect=self.mock_get):
+            for prefetch in [True, False]:
+                pages = list(
+                    request.request_pages('http://georepo/', prefetch)
+                )
+                self.assertEqual(
+                    pages, [[page] for page in range(1, self.total_page + 1)]
+                )
+            self.assertEqual(
+                request._request_paginated('http://georepo/?cached=False'),
+                list(range(1, self.total_page + 1))
+            )
+
+    def test_request_pages_lazy(self):
+        """Test the pages are fetched just when needed."""
+        request = GeorepoRequest()
+        with patch.object(
+                GeorepoRequest, 'get', side_effect=self.mock_get
+        ) as get:
+            pages = request.request_pages('http://georepo/', prefetch=False)
+            self.assertEqual(next(pages), [1])
+            self.assertEqual(next(pages), [2])
+            pages.close()
+            self.assertEqual(get.call_count, 2)
+
+    def test_request_pages_error(self):
+        """Test error of a page is raised."""
+        request = GeorepoRequest()
+        self.total_page = 3
+
+        def mock_get(url):
+            response = self.mock_get(url)
+            if 'page=2&' in url:
+                response.status_code = 500
+            return response
+
+        with patch.object(GeorepoRequest, 'get', side_effect=mock_get):
+            pages = request.request_pages('http://georepo/')
+            self.assertEqual(next(pages), [1])
+            with self.assertRaises(GeorepoRequestError):
+                next(pages)
+
+    def test_session(self):
+        """Test the session is reused with timeout."""
+        self.assertIs(georepo_session(), georepo_session())
+        request = GeorepoRequest()
+        with patch('requests.Session.request') as session_request:
+            request.get('http://georepo/')
+            kwargs = session_request.call_args.kwargs
+            self.assertEqual(kwargs['timeout'], request.timeout)
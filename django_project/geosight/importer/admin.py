@@ -19,7 +19,8 @@ from django.contrib import admin
 from geosight.data.admin.base import BaseAdminResourceMixin
 from geosight.importer.models import (
     Importer, ImporterAttribute, ImporterMapping,
-    ImporterLog, ImporterAlert, ImporterLogDataSaveProgress
+    ImporterLog, ImporterAlert, ImporterLogDataSaveProgress,
+    ImporterLogGeorepoJob
 )
 from geosight.importer.tasks import (
     run_importer,
@@ -65,6 +66,15 @@ class ImporterLogDataSaveProgressInline(admin.TabularInline):
     extra = 0
 
 
+class ImporterLogGeorepoJobInline(admin.TabularInline):
+    """ImporterLogGeorepoJob inline."""
+
+    model = ImporterLogGeorepoJob
+    fields = ('original_id_type', 'status', 'attempts', 'error')
+    readonly_fields = ('original_id_type', 'status', 'attempts', 'error')
+    extra = 0
+
+
 class ImporterAttributeInline(admin.TabularInline):
     """ImporterAttribute inline."""
 
@@ -151,7 +161,9 @@ class ImporterLogAdmin(admin.ModelAdmin):
     list_display = ('importer', 'start_time', 'end_time', 'status', 'note')
     readonly_fields = ('importer', 'start_time', 'end_time')
     list_filter = ('status',)
-    inlines = [ImporterLogDataSaveProgressInline]
+    inlines = [
+        ImporterLogDataSaveProgressInline, ImporterLogGeorepoJobInline
+    ]
     search_fields = ('note', 'importer__unique_id')
     actions = (recalculate_data_count,)
 
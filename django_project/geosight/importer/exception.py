@@ -32,3 +32,15 @@ class ImporterDoesNotExist(Exception):
     def __init__(self):
         """init."""
         super().__init__('Importer does not exist.')
+
+
+class ImporterWaiting(Exception):
+    """Raised when the importer waits for GeoRepo jobs.
+
+    The importer stops and it is run again when the jobs are done.
+    """
+
+    def __init__(self, message):  # noqa: DOC101,DOC103
+        """init."""
+        self.message = message
+        super().__init__(self.message)
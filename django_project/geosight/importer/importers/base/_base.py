@@ -22,7 +22,7 @@ from typing import List
 import pytz
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
 from django.db.models.signals import post_save
 from django.utils import timezone
 from django.utils.timezone import now
@@ -31,11 +31,12 @@ from core.utils import temp_disconnect_signal
 from geosight.data.models.indicator.indicator_value import (
     IndicatorValue, increase_version
 )
+from geosight.georepo.request import GeorepoPostPooling
 from geosight.importer.attribute import ImporterAttribute
-from geosight.importer.exception import ImporterError
+from geosight.importer.exception import ImporterError, ImporterWaiting
 from geosight.importer.models.importer_definition import ImportType
 from geosight.importer.models.log import (
-    ImporterLog, ImporterLogData, LogStatus
+    ImporterLog, ImporterLogChunk, ImporterLogData, LogStatus
 )
 
 User = get_user_model()
@@ -48,6 +49,18 @@ class BaseImporter(ABC):
     mapping = {}
     objects = {}
 
+    # Number of log data that are saved in one bulk create
+    log_data_step = 1000
+
+    # Progress is saved when it increases by this percentage
+    # or after this seconds from the last save
+    progress_step = 1
+    progress_interval = 5
+
+    # The chunks are failed when none of them is done in this seconds,
+    # e.g. when the task of a chunk is lost
+    chunk_timeout = 30 * 60
+
     def __init__(self, log: ImporterLog):
         """Init class."""
         self.objects = {}
@@ -57,6 +70,10 @@ class BaseImporter(ABC):
         self.mapping = self.importer.mapping
         self.now_time = now()
         self.now_time = self.now_time.replace(microsecond=0)
+        self.log_data_buffer = []
+        self.progress_updated_at = None
+        self.progress_updated = None
+        self.progress_connection = None
 
     @staticmethod
     def attributes_definition(**kwargs) -> List[ImporterAttribute]:
@@ -72,8 +89,11 @@ class BaseImporter(ABC):
         if success:
             if not self.log.importer.need_review:
                 logs = self.log.importerlogdata_set.order_by('id')
-                for line_idx, log in enumerate(logs):
-                    self._save_log_data_to_model(log)
+                if self.is_bulk_save:
+                    self._bulk_save_log_data_to_model(logs)
+                else:
+                    for line_idx, log in enumerate(logs):
+                        self._save_log_data_to_model(log)
         elif not success:
             error = (
                 'Importing is failed. No data saved. '
@@ -83,21 +103,27 @@ class BaseImporter(ABC):
                 error += '\n' + note
             raise ImporterError(error)
 
-    def run(self):
+    def run(self) -> None:
         """To run the process."""
         from geosight.data.models.context_layer import ContextLayerRequestError
 
         try:
-            self.log.status = LogStatus.RUNNING
-            self.log.save()
-            self.log.send_alert()
+            # The log is already running when it is resumed
+            if self.log.status != LogStatus.RUNNING:
+                self.log.status = LogStatus.RUNNING
+                self.log.save()
+                self.log.send_alert()
 
             self.check_attributes()
             self.log.importerlogdata_set.all().delete()
             success, note = self._process_data()
+            self._flush_data_to_log()
 
             # Use transaction atomic when indicator value
             if self.importer.import_type != ImportType.RELATED_TABLE:
+                if self.is_chunked(success):
+                    self._run_chunks(note)
+                    return
                 with transaction.atomic():
                     with temp_disconnect_signal(
                             signal=post_save, receiver=increase_version,
@@ -106,6 +132,8 @@ class BaseImporter(ABC):
                         self.after_import(success, note)
 
             self._done(note)
+        except ImporterWaiting as e:
+            self._wait(f'{e}')
         except (ImporterError, ContextLayerRequestError) as e:
             self._error(f'{e}')
         except Exception:
@@ -137,6 +165,20 @@ class BaseImporter(ABC):
         self.log.save()
         self.log.send_alert()
 
+    def _wait(self, message: str):
+        """Stop the process until the GeoRepo jobs are done.
+
+        The jobs are polled by a task, that runs the importer again.
+
+        :param message: The note of the waiting.
+        :type message: str
+        """
+        from geosight.importer.tasks import poll_georepo_jobs
+        self._update(message)
+        poll_georepo_jobs.apply_async(
+            (self.log.id,), countdown=GeorepoPostPooling.INTERVAL
+        )
+
     def _done(self, message: str = ''):
         """Update log to done."""
         self.log.end_time = timezone.now()
@@ -152,6 +194,86 @@ class BaseImporter(ABC):
         if progress:
             self.log.progress = progress
         self.log.save()
+        self.progress_updated_at = timezone.now()
+        self.progress_updated = progress
+
+    def _progress_throttled(self, progress: int = None) -> bool:
+        """Return if the progress is not saved yet.
+
+        The progress is saved only when it increases by
+        progress_step or progress_interval seconds has passed.
+
+        :param progress: The progress.
+        :type progress: int
+        :return: True if the progress is not saved.
+        :rtype: bool
+        """
+        if self.progress_updated_at is None:
+            return False
+        elapsed = (
+            timezone.now() - self.progress_updated_at
+        ).total_seconds()
+        increased = (progress or 0) - (self.progress_updated or 0)
+        return (
+            elapsed < self.progress_interval and
+            increased < self.progress_step
+        )
+
+    def _update_progress(
+            self, message: str = '', progress: int = None
+    ) -> None:
+        """Update note for the log, throttled for the loop of records.
+
+        The log is saved only when the progress increases by
+        progress_step or progress_interval seconds has passed.
+
+        :param message: The note.
+        :type message: str
+        :param progress: The progress.
+        :type progress: int
+        """
+        if self._progress_throttled(progress):
+            return
+        self._update(message, progress)
+
+    def _update_progress_on_connection(
+            self, message: str = '', progress: int = None
+    ) -> None:
+        """Update note for the log on own connection, throttled.
+
+        It is used inside a transaction, as the log that is saved there
+        is not seen by the others until the transaction is committed.
+        Close the connection by :meth:`_close_progress_connection`.
+
+        :param message: The note.
+        :type message: str
+        :param progress: The progress.
+        :type progress: int
+        """
+        if self._progress_throttled(progress):
+            return
+        self.log.note = message
+        if progress:
+            self.log.progress = progress
+        if self.progress_connection is None:
+            self.progress_connection = connections.create_connection(
+                DEFAULT_DB_ALIAS
+            )
+        schema = getattr(connection, 'schema_name', 'public')
+        with self.progress_connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE "{schema}".{ImporterLog._meta.db_table} '
+                f'SET note=%s, progress=%s WHERE id=%s',
+                [self.log.note, self.log.progress, self.log.id]
+            )
+        self.progress_updated_at = timezone.now()
+        self.progress_updated = progress
+
+    def _close_progress_connection(self):
+        """Close the own connection of progress."""
+        if self.progress_connection is not None:
+            self.progress_connection.close()
+            self.progress_connection = None
 
     def _check_data_to_log(self, data: dict, note: dict) -> (dict, dict):
         """Save data that constructed from importer.
@@ -167,7 +289,11 @@ class BaseImporter(ABC):
         raise NotImplemented()
 
     def _save_data_to_log(self, data: dict, note: dict):
-        """Save data to log."""
+        """Save data to log.
+
+        The data is buffered and saved in bulk per log_data_step,
+        call _flush_data_to_log to save the rest of buffer.
+        """
         data, note = self._check_data_to_log(data, note)
         for key, value in data.items():
             if value.__class__ in [date]:
@@ -175,16 +301,256 @@ class BaseImporter(ABC):
             if value.__class__ in [datetime, time]:
                 value = value.replace(tzinfo=pytz.timezone(settings.TIME_ZONE))
                 data[key] = value.timestamp()
-        return ImporterLogData.objects.create(
+        log_data = ImporterLogData(
             log=self.log,
             data=data,
             note=note
         )
+        self.log_data_buffer.append(log_data)
+        if len(self.log_data_buffer) >= self.log_data_step:
+            self._flush_data_to_log()
+        return log_data
+
+    def _flush_data_to_log(self):
+        """Save the buffered data to log."""
+        if self.log_data_buffer:
+            ImporterLogData.objects.bulk_create(
+                self.log_data_buffer, batch_size=self.log_data_step
+            )
+            self.log_data_buffer = []
 
     def _save_log_data_to_model(self, log_data: ImporterLogData):
         """Save data from log to actual model."""
         raise NotImplemented()
 
+    @property
+    def is_bulk_save(self) -> bool:
+        """Return if the log data is saved to the model in bulk."""
+        return False
+
+    def _bulk_save_log_data_to_model(self, log_datas):
+        """Save data from multiple logs to actual model.
+
+        By default, it saves the log one by one.
+
+        :param log_datas: Log data records to be saved.
+        :type log_datas: QuerySet[ImporterLogData]
+        """
+        for log_data in log_datas:
+            self._save_log_data_to_model(log_data)
+
+    # --------------------------------------------------
+    # CHUNKED SAVE
+    # --------------------------------------------------
+    @property
+    def chunk_size(self) -> int:
+        """Return number of log data that are saved per chunk.
+
+        0 means the log data is saved in the importer task.
+        """
+        return 0
+
+    def is_chunked(self, success: bool) -> bool:
+        """Return if the log data is saved in chunks by subtasks.
+
+        :param success: Whether the process of the data is success.
+        :type success: bool
+        :return: True if the log data is saved in chunks.
+        :rtype: bool
+        """
+        return (
+            success and self.chunk_size > 0 and
+            not self.log.importer.need_review
+        )
+
+    def partitions(self, log_datas) -> List[dict]:
+        """Return lookups of the partitions of the log data.
+
+        Every partition is split into chunks of chunk_size.
+
+        :param log_datas: The log data of the log.
+        :type log_datas: QuerySet[ImporterLogData]
+        :return: List of the lookups of every partition.
+        :rtype: list
+        """
+        return [{}]
+
+    def get_chunks(self) -> List[dict]:
+        """Return lookups of the chunks of the log data.
+
+        The lookups are the partition and the range of id of the chunk,
+        so they can be saved on the chunk and queried by the subtask.
+
+        :return: List of the lookups of every chunk.
+        :rtype: list
+        """
+        log_datas = self.log.importerlogdata_set.all()
+        chunks = []
+        for lookups in self.partitions(log_datas):
+            ids = log_datas.filter(**lookups).order_by('id').values_list(
+                'id', flat=True
+            )
+            start_id = None
+            count = 0
+            for _id in ids.iterator(chunk_size=self.log_data_step):
+                if start_id is None:
+                    start_id = _id
+                count += 1
+                if count == self.chunk_size:
+                    chunks.append(
+                        dict(lookups, id__gte=start_id, id__lte=_id)
+                    )
+                    start_id = None
+                    count = 0
+            if start_id is not None:
+                chunks.append(dict(lookups, id__gte=start_id, id__lte=_id))
+        return chunks
+
+    def _run_chunks(self, note: str) -> None:
+        """Stage the log data by parallel subtasks.
+
+        Every chunk is an :class:`ImporterLogChunk`,
+        the subtask that finishes the last chunk runs :meth:`merge_chunks`.
+        The log stays running until then, a watchdog task fails the log
+        when no chunk is done in :attr:`chunk_timeout`.
+
+        :param note: Note of the process of the data.
+        :type note: str
+        """
+        from geosight.importer.tasks import (
+            expire_importer_chunks, save_importer_chunk
+        )
+        chunks = ImporterLogChunk.objects.bulk_create(
+            [
+                ImporterLogChunk(log=self.log, lookups=lookups)
+                for lookups in self.get_chunks()
+            ]
+        )
+        if not chunks:
+            self._done(note)
+            return
+        self._update(f'Saving the data in {len(chunks)} chunks')
+        for chunk in chunks:
+            save_importer_chunk.delay(chunk.id, note)
+        expire_importer_chunks.apply_async(
+            (self.log.id, note), countdown=self.chunk_timeout
+        )
+
+    def _stage_log_data(self, chunk: ImporterLogChunk, log_datas):
+        """Validate the log data of chunk and stage it to be published.
+
+        :param chunk: The chunk.
+        :type chunk: ImporterLogChunk
+        :param log_datas: The log data of the chunk that are not saved.
+        :type log_datas: QuerySet[ImporterLogData]
+        :raises NotImplemented: When it is not overridden.
+        """
+        raise NotImplemented()
+
+    def _publish_chunks(self):
+        """Save the staged data of every chunk to the actual model.
+
+        :raises NotImplemented: When it is not overridden.
+        """
+        raise NotImplemented()
+
+    def stage_chunk(self, chunk: ImporterLogChunk) -> bool:
+        """Stage a chunk of the log data, in its own transaction.
+
+        An error is kept on the chunk rather than raised,
+        so the last chunk still merges the chunks.
+        The chunk that is already expired by the watchdog is not done again.
+
+        :param chunk: The chunk.
+        :type chunk: ImporterLogChunk
+        :return: True if it is the last chunk that is done.
+        :rtype: bool
+        """
+        if chunk.done:
+            return False
+        log_datas = self.log.importerlogdata_set.filter(
+            saved=False, **chunk.lookups
+        ).order_by('id')
+        try:
+            with transaction.atomic():
+                self._stage_log_data(chunk, log_datas)
+        except Exception as e:
+            chunk.error = f'{e}'
+
+        # The log is locked so just one chunk is the last one
+        with transaction.atomic():
+            log = ImporterLog.objects.select_for_update().get(id=self.log.id)
+            done = ImporterLogChunk.objects.filter(
+                id=chunk.id, done=False
+            ).update(done=True, error=chunk.error)
+            if not done or log.status != LogStatus.RUNNING:
+                return False
+            chunk.done = True
+            return not self.log.importerlogchunk_set.filter(
+                done=False
+            ).exists()
+
+    def merge_chunks(self, note: str = '', expire: bool = False) -> None:
+        """Publish the staged chunks in one transaction and finish the log.
+
+        When a chunk is failed, nothing is published,
+        like the import in one task.
+        The log is locked while merging, so the chunks are merged once.
+
+        :type note: str
+        :param note: Note of the process of the data
+
+        :type expire: bool
+        :param expire: Fail the chunks that are not done yet.
+        """
+        chunks = self.log.importerlogchunk_set.all()
+        errors = []
+        try:
+            with transaction.atomic():
+                log = ImporterLog.objects.select_for_update().get(
+                    id=self.log.id
+                )
+                if log.status != LogStatus.RUNNING or not chunks.exists():
+                    return
+                if expire:
+                    chunks.filter(done=False).update(
+                        done=True,
+                        error=(
+                            'Chunk is not saved in '
+                            f'{self.chunk_timeout} seconds.'
+                        )
+                    )
+                errors = list(
+                    chunks.filter(error__isnull=False).values_list(
+                        'error', flat=True
+                    )
+                )
+                if not errors:
+                    with temp_disconnect_signal(
+                            signal=post_save, receiver=increase_version,
+                            sender=IndicatorValue
+                    ):
+                        self._publish_chunks()
+                chunks.delete()
+        except Exception:
+            errors.append(
+                f'{traceback.format_exc().replace(" File", "<br>File")}'
+            )
+            chunks.delete()
+
+        log_datas = self.log.importerlogdata_set.all()
+        self.log.total_count = log_datas.count()
+        self.log.success_count = log_datas.filter(saved=True).count()
+        self.log.save()
+        if errors:
+            error = (
+                'Importing is failed. No data saved. '
+                f'Saving {len(errors)} chunk(s) is failed.'
+            )
+            self._error('\n'.join([error] + errors))
+        else:
+            self._done(note)
+
     def get_records(self) -> List:
         """Get records form upload session.
 
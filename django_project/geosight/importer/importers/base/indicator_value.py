@@ -17,14 +17,15 @@ __copyright__ = ('Copyright 2023, Unicef')
 import copy
 from abc import ABC
 from datetime import datetime, date
-from typing import List
+from typing import Iterator, List
 
 from django.core.exceptions import ValidationError
 from requests.exceptions import Timeout
 
 from core.utils import string_is_true
 from geosight.data.models.indicator import (
-    Indicator, IndicatorValueRejectedError, VALUE_IS_EMPTY_TEXT
+    Indicator, IndicatorValue, IndicatorValueRejectedError,
+    VALUE_IS_EMPTY_TEXT
 )
 from geosight.data.models.indicator.indicator_type import (
     IndicatorType
@@ -32,10 +33,17 @@ from geosight.data.models.indicator.indicator_type import (
 from geosight.data.utils import extract_time_string
 from geosight.georepo.models.entity import Entity
 from geosight.georepo.models.reference_layer import ReferenceLayerView
+from geosight.georepo.request import GeorepoRequestError
 from geosight.importer.attribute import ImporterAttribute
-from geosight.importer.exception import ImporterError
-from geosight.importer.importers.query_data import QueryDataImporter
-from geosight.importer.models.log import ImporterLogData
+from geosight.importer.exception import ImporterError, ImporterWaiting
+from geosight.importer.importers.entity_resolver import EntityResolver
+from geosight.importer.importers.query_data import (
+    AggregationEngine, QueryDataImporter
+)
+from geosight.importer.models.log import (
+    GeorepoJobStatus, ImporterLogChunk, ImporterLogData,
+    ImporterLogGeorepoJob, ImporterLogValue
+)
 from geosight.importer.utilities import get_data_from_record
 from ._base import BaseImporter
 
@@ -63,6 +71,13 @@ class AdminLevelType(object):
     DATA_DRIVEN = 'Data Driven'
 
 
+NON_EXTRA_KEYS = [
+    'ucode', 'value', 'geo_code', 'admin_level', 'date_time',
+    'indicator_id', 'indicator_name', 'indicator_shortcode',
+    'reference_layer_identifier'
+]
+
+
 class MultipleValueAggregationType(object):
     """A quick couple of variable and multiple value aggregation type."""
 
@@ -201,8 +216,46 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
                 input_type=ImporterAttributeInputType.NUMBER,
                 required=False
             ),
+
+            # Engine of the aggregations
+            ImporterAttribute(
+                name='aggregation_engine',
+                input_type=ImporterAttributeInputType.TEXT,
+                required=False,
+                options=[
+                    AggregationEngine.SQL,
+                    AggregationEngine.MEMORY
+                ]
+            ),
+
+            # Save the data in bulk
+            ImporterAttribute(
+                name='bulk_save',
+                input_type=ImporterAttributeInputType.BOOLEAN,
+                required=False,
+                default_value=False
+            ),
+
+            # Save the data in chunks by parallel subtasks
+            ImporterAttribute(
+                name='chunk_size',
+                input_type=ImporterAttributeInputType.NUMBER,
+                required=False
+            ),
         ]
 
+    def run(self):
+        """To run the process.
+
+        The temporary table of querying data is reused across the
+        aggregations, so it is deleted when the process is done.
+        """
+        try:
+            super().run()
+        finally:
+            if self.table_definition is not None:
+                self.clean_query_data()
+
     def check_attributes(self):
         """Check attributes definition.
 
@@ -374,6 +427,23 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
                     data['description'] = comment
         return indicator
 
+    @property
+    def entity_resolver(self) -> EntityResolver:
+        """Return entity resolver of the import.
+
+        The resolver is cached per import,
+        so the codes are resolved once for the whole run.
+
+        :return: The entity resolver of the reference layer of the importer.
+        :rtype: EntityResolver
+        """
+        key = 'entity_resolver'
+        try:
+            return self.objects[key]
+        except KeyError:
+            self.objects[key] = EntityResolver(self.importer.reference_layer)
+            return self.objects[key]
+
     def get_entity(
             self, data, original_id_type: str, auto_fetch: bool = True
     ):
@@ -390,7 +460,6 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
             Tuple of (entity, error_message); error_message is None on success.
         :rtype: tuple
         """
-        from geosight.georepo.models.entity import Entity
         from geosight.georepo.request import (
             GeorepoEntityDoesNotExist, MultipleObjectsReturned,
             GeorepoRequestError
@@ -398,8 +467,7 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
         adm_code = data['geo_code']
         admin_level = data['admin_level']
         try:
-            entity = Entity.get_entity(
-                reference_layer=self.importer.reference_layer,
+            entity = self.entity_resolver.get_entity(
                 original_id_type=original_id_type,
                 original_id=adm_code,
                 admin_level=admin_level,
@@ -419,32 +487,67 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
     def check_codes(self, codes: list):
         """Check codes against GeoRepo.
 
+        The codes are deduplicated and identified in batches,
+        the codes that are already identified in this import are skipped.
+
+        The batches are submitted as GeoRepo jobs and the importer stops
+        until they are done, then it is run again and
+        it uses the output of the jobs.
+
         :param codes: List of geographic codes to identify.
         :type codes: list
         :return: Dictionary mapping codes to their GeoRepo lookup results.
         :rtype: dict
-        :raises ImporterError: If the GeoRepo request times out.
+        :raises ImporterError: If the GeoRepo request times out or fails.
+        :raises ImporterWaiting: If the GeoRepo jobs are not done.
         """
-        from geosight.georepo.request import GeorepoRequest
         importer = self.importer
 
         # If the reference layer is local everything is error
         if not importer.reference_layer.in_georepo:
             return {}
 
+        original_id_type = importer.admin_code_type
         self._update('Identifying codes from GeoRepo')
         try:
-            results = GeorepoRequest().View.identify_codes(
-                reference_layer_identifier=importer.reference_layer.identifier,
-                original_id_type=importer.admin_code_type,
-                codes=codes,
-                return_id_type='ucode'
+            jobs = self.log.importerloggeorepojob_set.filter(
+                original_id_type=original_id_type
+            ).order_by('id')
+            for job in jobs:
+                if job.status == GeorepoJobStatus.FAILED:
+                    raise ImporterError(job.error)
+                elif job.status == GeorepoJobStatus.DONE:
+                    self.entity_resolver.add_identified(
+                        original_id_type, job.codes, job.results()
+                    )
+                else:
+                    raise ImporterWaiting(
+                        'Waiting GeoRepo for identifying codes'
+                    )
+
+            requested = self.entity_resolver.unidentified(
+                original_id_type, codes
+            )
+            if requested:
+                step = self.entity_resolver.identify_step
+                for idx in range(0, len(requested), step):
+                    ImporterLogGeorepoJob.submit(
+                        self.log, original_id_type,
+                        requested[idx:idx + step]
+                    )
+                    self.entity_resolver.requests += 1
+                raise ImporterWaiting('Waiting GeoRepo for identifying codes')
 
+            results = self.entity_resolver.identify_codes(
+                original_id_type=original_id_type,
+                codes=codes
             )
             self._update('Saving codes to Cache')
             return results
         except Timeout:
             raise ImporterError('Identifying codes from GeoRepo is timeout.')
+        except GeorepoRequestError as e:
+            raise ImporterError(f'{e}')
 
     def _check_data_to_log(self, data: dict, note: dict) -> (dict, dict):
         """Save data that constructed from importer.
@@ -487,11 +590,7 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
 
             extras = {}
             for key, value in data.items():
-                if key in [
-                    'ucode', 'value', 'geo_code', 'admin_level', 'date_time',
-                    'indicator_id', 'indicator_name', 'indicator_shortcode',
-                    'reference_layer_identifier'
-                ]:
+                if key in NON_EXTRA_KEYS:
                     continue
                 extras[key] = value
 
@@ -520,6 +619,162 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
             self.log.success_count = self.log.success_count + 1
             self.log.save()
 
+    @property
+    def is_bulk_save(self) -> bool:
+        """Return if the log data is saved to the model in bulk.
+
+        :return: True if the bulk_save attribute is enabled.
+        :rtype: bool
+        """
+        return string_is_true(self.get_attribute('bulk_save'))
+
+    def _log_data_rows(self, log_datas) -> Iterator[tuple]:
+        """Return the validated rows of value of the log data.
+
+        The values are validated like :meth:`_save_log_data_to_model`,
+        the log data that is not saved is skipped.
+
+        :param log_datas: Log data records to be saved.
+        :type log_datas: QuerySet[ImporterLogData]
+        :yield: Tuple of log data and row for IndicatorValue.bulk_save.
+        :ytype: tuple
+        """
+        reference_layers = {}
+        for log_data in log_datas:
+            if log_data.status not in ['Review', 'Warning']:
+                continue
+            data = log_data.data
+            indicator = self.get_indicator(data)
+            if not indicator:
+                continue
+
+            # Skip if the value or geo_code is empty
+            if data['value'] in [None, '']:
+                continue
+            if data['geo_code'] in [None, '']:
+                continue
+
+            reference_layer = None
+            identifier = data.get('reference_layer_identifier', None)
+            if identifier:
+                if identifier not in reference_layers:
+                    reference_layers[identifier] = (
+                        ReferenceLayerView.objects.get(identifier=identifier)
+                    )
+                reference_layer = reference_layers[identifier]
+
+            extras = {}
+            for key, value in data.items():
+                if key in NON_EXTRA_KEYS:
+                    continue
+                extras[key] = value
+
+            date_time = datetime.fromtimestamp(data['date_time'])
+            entity, value, extras = indicator.clean_value(
+                date_time, data['geo_code'], data['value'],
+                reference_layer, data['admin_level'],
+                extras=extras
+            )
+            yield log_data, indicator.value_row(
+                date_time, entity.geom_id, value, extras
+            )
+
+    def _bulk_save_log_data_to_model(self, log_datas):
+        """Save data from multiple logs to actual model in bulk.
+
+        The values are validated with :meth:`_log_data_rows`,
+        but written with :meth:`IndicatorValue.bulk_save`.
+
+        :param log_datas: Log data records to be saved.
+        :type log_datas: QuerySet[ImporterLogData]
+        """
+        rows = []
+        saved_ids = []
+        for log_data, row in self._log_data_rows(log_datas):
+            rows.append(row)
+            saved_ids.append(log_data.id)
+
+        IndicatorValue.bulk_save(rows)
+        ImporterLogData.objects.filter(id__in=saved_ids).update(saved=True)
+        self.log.success_count = self.log.success_count + len(saved_ids)
+        self.log.save()
+
+    @property
+    def chunk_size(self) -> int:
+        """Return number of log data that are saved per chunk.
+
+        :return: The chunk_size attribute, 0 when it is not set.
+        :rtype: int
+        """
+        try:
+            return int(self.get_attribute('chunk_size') or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def partitions(self, log_datas) -> List[dict]:
+        """Return lookups of the partitions of the log data.
+
+        :param log_datas: Log data of the import.
+        :type log_datas: QuerySet[ImporterLogData]
+        :return: List of lookups per indicator.
+        :rtype: list
+        """
+        indicator_ids = log_datas.order_by().values_list(
+            'data__indicator_id', flat=True
+        ).distinct()
+        return [
+            {'data__indicator_id': indicator_id}
+            for indicator_id in indicator_ids
+        ]
+
+    def _stage_log_data(self, chunk: ImporterLogChunk, log_datas):
+        """Validate the log data of chunk and stage the rows of value.
+
+        :param chunk: The chunk of the log data.
+        :type chunk: ImporterLogChunk
+        :param log_datas: Log data of the chunk.
+        :type log_datas: QuerySet[ImporterLogData]
+        """
+        values = []
+        for log_data, row in self._log_data_rows(log_datas):
+            if isinstance(row['date'], datetime):
+                row['date'] = row['date'].date()
+            row['date'] = row['date'].isoformat()
+            values.append(
+                ImporterLogValue(chunk=chunk, log_data=log_data, row=row)
+            )
+            if len(values) >= self.log_data_step:
+                ImporterLogValue.objects.bulk_create(values)
+                values = []
+        ImporterLogValue.objects.bulk_create(values)
+
+    def _publish_chunks(self) -> None:
+        """Save the staged rows of every chunk to the indicator values.
+
+        The version of the indicators is increased once at the end.
+        """
+        values = ImporterLogValue.objects.filter(chunk__log=self.log)
+        if not values.exists():
+            return
+        IndicatorValue.bulk_save(
+            (
+                value.row for value in values.order_by('id').iterator(
+                    chunk_size=self.log_data_step
+                )
+            ),
+            increase_version=False
+        )
+        ImporterLogData.objects.filter(
+            id__in=values.values('log_data_id')
+        ).update(saved=True)
+        indicator_ids = values.order_by().values_list(
+            'row__indicator_id', flat=True
+        ).distinct()
+        for indicator in Indicator.objects.filter(
+                id__in=list(indicator_ids)
+        ):
+            indicator.increase_version()
+
     def process_data_from_records(self) -> (List, List, List, bool):
         """Process data from records.
 
@@ -550,16 +805,23 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
             records_by_indicator[indicator_id].append(record)
         return records_by_indicator
 
-    def get_parents_records(self, record, entity: Entity):
-        """Return parents from record.
+    def get_parents(self, entity: Entity) -> List:
+        """Return the parents that will be aggregated for the entity.
+
+        The result is cached per entity,
+        so the ancestor chain is computed once per import.
 
-        :param record: The data record to generate parent-level records from.
-        :type record: dict
         :param entity: The entity whose parent hierarchy is traversed.
         :type entity: Entity
-        :return: List of parent-level records.
+        :return: List of (geo_code, admin_level) of the parents.
         :rtype: list
         """
+        key = ('parents', entity.id)
+        try:
+            return self.objects[key]
+        except KeyError:
+            pass
+
         aggregate_upper_level_up_to = self.get_attribute(
             'aggregate_upper_level_up_to'
         )
@@ -577,20 +839,49 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
             )
             upper_level_count = aggregate_upper_level_n_level_up
 
-        if upper_level_count <= 0:
-            return []
-        if not entity.parents:
-            return []
+        parents = []
+        if upper_level_count > 0 and entity.parents:
+            for idx, geocode in enumerate(
+                    entity.parents[:upper_level_count]
+            ):
+                parents.append((geocode, admin_level - (idx + 1)))
+        self.objects[key] = parents
+        return parents
+
+    def get_parents_records(self, record, entity: Entity):
+        """Return parents from record.
 
+        :param record: The data record to generate parent-level records from.
+        :type record: dict
+        :param entity: The entity whose parent hierarchy is traversed.
+        :type entity: Entity
+        :return: List of parent-level records.
+        :rtype: list
+        """
         # Create record for upper level
         records = []
-        for idx, geocode in enumerate(entity.parents[:upper_level_count]):
-            record = copy.deepcopy(record)
-            record['geo_code'] = geocode
-            record['admin_level'] = admin_level - (idx + 1)
-            records.append(record)
+        for geocode, admin_level in self.get_parents(entity):
+            _record = copy.copy(record)
+            _record['geo_code'] = geocode
+            _record['admin_level'] = admin_level
+            records.append(_record)
         return records
 
+    @staticmethod
+    def record_key(record: dict):
+        """Return key of record to check the conflict.
+
+        :param record: The data record.
+        :type record: dict
+        :return: Tuple of (indicator_id, date_time, geo_code).
+        :rtype: tuple
+        """
+        return (
+            record.get('indicator_id', None),
+            record.get('date_time', None),
+            record.get('geo_code', None)
+        )
+
     def get_indicator_fields(self, indicator):
         """Return indicator fields.
 
@@ -715,6 +1006,12 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
             )
             if aggregate_upper_level:
                 records_by_indicator = self.group_records_by_indicator(records)
+
+                # Index of source records, to check the conflict
+                records_index = {}
+                for idx, _r in enumerate(records):
+                    records_index.setdefault(self.record_key(_r), idx)
+
                 for indicator_id, _records in records_by_indicator.items():
                     indicator = self.get_indicator(
                         {'indicator_id': indicator_id}
@@ -726,6 +1023,9 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
                         )
                         continue
 
+                    self.entity_resolver.prefetch(
+                        'ucode', [record['geo_code'] for record in _records]
+                    )
                     upper_level_records = []
                     for record in _records:
                         # We need to check the geography code
@@ -742,20 +1042,14 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
                             record, entity
                         )
                         for _pr in parents_records:
-                            exist = False
-                            for idx, _r in enumerate(records):
-                                if _r['indicator_id'] == _pr[
-                                    'indicator_id'] and \
-                                        _r['date_time'] == _pr['date_time'] \
-                                        and _r['geo_code'] == _pr['geo_code']:
-                                    exist = True
-                                    warning = (
-                                        'Conflict between generated one and '
-                                        'source data. It is using source data'
-                                    )
-                                    notes[idx].update({'warning': warning})
-                                    break
-                            if not exist:
+                            idx = records_index.get(self.record_key(_pr))
+                            if idx is not None:
+                                warning = (
+                                    'Conflict between generated one and '
+                                    'source data. It is using source data'
+                                )
+                                notes[idx].update({'warning': warning})
+                            else:
                                 upper_level_records += [_pr]
 
                     if not upper_level_records:
@@ -819,7 +1113,7 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
         total = len(records)
         warning_data = 0
         for line_idx, record in enumerate(records):
-            self._update(
+            self._update_progress(
                 f'Save the data to be reviewed {line_idx}/{total}',
                 progress=int((line_idx / total) * 50) + 50
             )
@@ -855,6 +1149,7 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
             if len(note_keys):
                 success = False
 
+        self._flush_data_to_log()
         self.log.total_count = line_idx + 1
         self.log.save()
 
@@ -865,5 +1160,6 @@ class AbstractImporterIndicatorValue(BaseImporter, QueryDataImporter, ABC):
                 f'There are {warning_data} warning(s)'
                 f'</div>'
             )
+        additional_notes.append(self.entity_resolver.summary)
 
         return success, '\n'.join(additional_notes)
@@ -111,6 +111,14 @@ class IndicatorValueLongFormat(AbstractImporterIndicatorValue, ABC):
         value_column = self.get_attribute('key_value')
         code_type = self.importer.admin_code_type
 
+        # Load the entities of the codes in bulk
+        self.entity_resolver.prefetch(
+            code_type, [
+                get_data_from_record(adm_code_column, record)
+                for record in records if record
+            ]
+        )
+
         # Save the geocode that is not exist
         checked_geocode = []
         invalid_check_idx = []
@@ -125,7 +133,7 @@ class IndicatorValueLongFormat(AbstractImporterIndicatorValue, ABC):
                 continue
 
             # Update log
-            self._update(
+            self._update_progress(
                 f'Processing line {line_idx}/{total}',
                 progress=int((line_idx / total) * 50)
             )
@@ -225,8 +233,8 @@ class IndicatorValueLongFormat(AbstractImporterIndicatorValue, ABC):
                         geo_code = record['geo_code']
                         codes = results[f'{geo_code}']
                         entity = codes[len(codes) - 1]
-                        entity = self.importer.reference_layer.save_entity(
-                            entity
+                        entity = self.entity_resolver.save_entity(
+                            code_type, geo_code, entity
                         )
                         clean_records[idx]['geo_code'] = entity.geom_id
                         clean_records[idx]['admin_level'] = entity.admin_level
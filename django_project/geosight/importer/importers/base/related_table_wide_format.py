@@ -21,7 +21,7 @@ import pytz
 from django.conf import settings
 
 from geosight.data.models.related_table import (
-    RelatedTable, RelatedTableRow, RelatedTableGroup
+    RelatedTable, RelatedTableGroup
 )
 from geosight.importer.attribute import ImporterAttribute
 from geosight.importer.exception import ImporterError
@@ -63,7 +63,8 @@ class RelatedTableWideFormat(AbstractImporterRelatedTable):
           - Creating or updating the related table instance.
           - Validating permissions and creating group/category.
           - Converting cell data (numeric, date, datetime, timezone aware).
-          - Bulk-creating :class:`RelatedTableRow` objects for efficiency.
+          - Replacing the rows in bulk with
+            :meth:`RelatedTable.insert_rows`, in the order of records.
           - Updating relationships and version tracking.
 
         :return: A tuple ``(success, error_message)``.
@@ -96,7 +97,6 @@ class RelatedTableWideFormat(AbstractImporterRelatedTable):
                     'description': related_table_description,
                 }
             )
-            related_table.relatedtablerow_set.all().delete()
             related_table.name = name
             if related_table_category:
                 group, _ = RelatedTableGroup.objects.get_or_create(
@@ -124,63 +124,65 @@ class RelatedTableWideFormat(AbstractImporterRelatedTable):
 
         success = True
         total = len(records)
-        last_progress = 0
-        rows = []
-        order = 0
-        for line_idx, record in enumerate(records):
-            if not record:
-                continue
-
-            progress = int((line_idx / total) * 100)
-
-            if progress != last_progress:
-                # Update log
-                self._update(
-                    f'Prepare data {line_idx}/{total}',
-                    progress=progress
-                )
 
-            # ---------------------------------------
-            # Construct data
-            # ---------------------------------------
-            data = {}
-            for key, value in record.items():
-                if value.__class__ is str:
-                    try:
-                        value = float(value)
-                        if value.is_integer():
-                            value = int(value)
-                    except (ValueError, TypeError):
-                        pass
-
-                if value.__class__ is date:
-                    value = datetime.combine(value, datetime.min.time())
-                if value.__class__ is time:
-                    value = str(value)
-                elif value.__class__ is datetime:
-                    value = value.replace(
-                        tzinfo=pytz.timezone(settings.TIME_ZONE))
-                    value = value.timestamp()
-
-                if value is None:
-                    value = ''
-                data[key] = value
-
-            # Prepare data
-            order += 1
-            rows.append(
-                RelatedTableRow(
-                    table=related_table,
-                    order=order,
-                    data=data
+        def _rows():
+            last_progress = 0
+            for line_idx, record in enumerate(records):
+                if not record:
+                    continue
+
+                progress = int((line_idx / total) * 100)
+
+                if progress != last_progress:
+                    # The rows are copied in the transaction of insert_rows
+                    self._update_progress_on_connection(
+                        f'Save data {line_idx}/{total}',
+                        progress=progress
+                    )
+                    last_progress = progress
+
+                # ---------------------------------------
+                # Construct data
+                # ---------------------------------------
+                data = {}
+                for key, value in record.items():
+                    if value.__class__ is str:
+                        try:
+                            value = float(value)
+                            if value.is_integer():
+                                value = int(value)
+                        except (ValueError, TypeError):
+                            pass
+
+                    if value.__class__ is date:
+                        value = datetime.combine(value, datetime.min.time())
+                    if value.__class__ is time:
+                        value = str(value)
+                    elif value.__class__ is datetime:
+                        value = value.replace(
+                            tzinfo=pytz.timezone(settings.TIME_ZONE))
+                        value = value.timestamp()
+
+                    if value is None:
+                        value = ''
+                    data[key] = value
+                yield data
+
+        # Replace the rows in one transaction, that also updates
+        # the fields, the relations and the version of table.
+        # The rows are streamed from the records to the copy.
+        # The order column of data is not the row order.
+        try:
+            errors = related_table.insert_rows(
+                _rows(), replace=True, keep_order=False
+            )
+        finally:
+            self._close_progress_connection()
+        if errors:
+            raise ImporterError(
+                ', '.join(
+                    [f'Row {idx}: {error}' for idx, error in errors.items()]
                 )
             )
-
         self._update('Save to database', progress=100)
-        RelatedTableRow.objects.bulk_create(rows)
-
-        # Check relation for other place
-        related_table.set_fields()
-        related_table.check_relation()
-        related_table.increase_version()
         return success, None
@@ -0,0 +1,272 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from typing import List
+
+from geosight.georepo.entity_index import EntityIndex, as_datetime
+from geosight.georepo.models.entity import Entity
+from geosight.georepo.models.reference_layer import ReferenceLayerView
+from geosight.georepo.request import (
+    GeorepoEntityDoesNotExist, GeorepoRequest, GeorepoRequestError
+)
+from geosight.georepo.request.data import GeorepoEntity
+from geosight.georepo.term import admin_level_country
+
+UCODE = 'ucode'
+
+
+class EntityResolver(object):
+    """Resolve the codes of an import to entities.
+
+    The codes are looked up on the :class:`EntityIndex` of the view,
+    so the rest of the import does not query the entity per record.
+    The codes that are missing locally are identified on GeoRepo in batches.
+
+    The candidates are filtered by date and admin level in memory,
+    following :meth:`Entity.get_entity`.
+    """
+
+    def __init__(  # noqa: DOC101,DOC103
+            self, reference_layer: ReferenceLayerView,
+            identify_step: int = 1000
+    ):
+        """Init the resolver.
+
+        :param reference_layer: Reference layer of the import.
+        :type reference_layer: ReferenceLayerView
+        :param identify_step: Number of codes per GeoRepo identify request.
+        :type identify_step: int
+        """
+        self.reference_layer = reference_layer
+        self.identify_step = identify_step
+        self._index = None
+
+        # (code_type, code) : result of GeoRepo identification
+        self.identified = {}
+
+        # (code_type, code) that are not found on GeoRepo
+        self.not_found = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.queries = 0
+        self.requests = 0
+
+    @staticmethod
+    def _code(code) -> str:
+        """Return the code as string.
+
+        :param code: The code.
+        :type code: str
+        :return: The code as string.
+        :rtype: str
+        """
+        return f'{code}'
+
+    @property
+    def index(self) -> EntityIndex:
+        """Return the entity index of the view, loaded once per import."""
+        if self._index is None:
+            self.queries += 1
+            self._index = EntityIndex.get(self.reference_layer)
+        return self._index
+
+    def prefetch(self, code_type: str, codes: List) -> EntityIndex:
+        """Load the entities of the codes in bulk.
+
+        The whole view is on the index,
+        so it just makes sure that the index is loaded.
+
+        :param code_type: The type of the codes.
+        :type code_type: str
+        :param codes: List of codes, can contain duplicates and empty code.
+        :type codes: list
+        :return: The entity index of the view.
+        :rtype: EntityIndex
+        """
+        return self.index
+
+    def get_entity(
+            self, original_id_type: str, original_id: str,
+            admin_level: int = None, date_time=None, auto_fetch: bool = True
+    ) -> Entity:
+        """Return entity of the code, like :meth:`Entity.get_entity`.
+
+        :param original_id_type: The type of the code.
+        :type original_id_type: str
+        :param original_id: The code.
+        :type original_id: str
+        :param admin_level: The admin level that needs to be checked.
+        :type admin_level: int
+        :param date_time: Date time of the data.
+        :type date_time: datetime | float
+        :param auto_fetch: Fetch the entity from GeoRepo if it is missing.
+        :type auto_fetch: bool
+        :return: The entity.
+        :rtype: Entity
+        :raises GeorepoRequestError: If the date time is empty.
+        :raises GeorepoEntityDoesNotExist: If the entity does not exist.
+        """
+        if not date_time:
+            raise GeorepoRequestError('Date time is empty.')
+        if as_datetime(date_time) is None:
+            # Let the model to handle the invalid date time
+            return Entity.get_entity(
+                reference_layer=self.reference_layer,
+                original_id_type=original_id_type,
+                original_id=original_id,
+                admin_level=admin_level,
+                date_time=date_time,
+                auto_fetch=auto_fetch
+            )
+
+        entity = self.index.get_entity(
+            original_id_type, original_id, date_time
+        )
+        if entity and (
+                entity.admin_level != admin_level_country and
+                not entity.parents
+        ):
+            entity = None
+
+        if entity:
+            self.hits += 1
+        else:
+            self.misses += 1
+            key = (original_id_type, self._code(original_id))
+
+            # The codes that GeoRepo does not have are not requested again
+            if (
+                    not auto_fetch or key in self.not_found or
+                    self.identified.get(key) == []
+            ):
+                raise GeorepoEntityDoesNotExist()
+            try:
+                entity = Entity.get_entity(
+                    reference_layer=self.reference_layer,
+                    original_id_type=original_id_type,
+                    original_id=original_id,
+                    date_time=date_time
+                )
+            except GeorepoEntityDoesNotExist:
+                self.not_found.add(key)
+                raise
+            self.index.add(
+                entity, {original_id_type: self._code(original_id)}
+            )
+
+        # Check admin level
+        if admin_level is not None:
+            if entity.admin_level != int(admin_level):
+                raise GeorepoEntityDoesNotExist()
+        return entity
+
+    def unidentified(self, original_id_type: str, codes: List) -> list:
+        """Return the distinct codes that are not identified yet.
+
+        :param original_id_type: The type of the codes.
+        :type original_id_type: str
+        :param codes: List of codes, can contain duplicates.
+        :type codes: list
+        :return: List of codes.
+        :rtype: list
+        """
+        return sorted(
+            {
+                self._code(code) for code in codes
+                if (original_id_type, self._code(code)) not in self.identified
+            }
+        )
+
+    def add_identified(
+            self, original_id_type: str, codes: List, results: dict
+    ):
+        """Save the result of GeoRepo identification of the codes.
+
+        :param original_id_type: The type of the codes.
+        :type original_id_type: str
+        :param codes: The codes that were requested.
+        :type codes: list
+        :param results: Dictionary of code and list of GeoRepo entities.
+        :type results: dict
+        """
+        for code in codes:
+            code = self._code(code)
+            self.identified[(original_id_type, code)] = results.get(code, [])
+
+    def identify_codes(self, original_id_type: str, codes: List) -> dict:
+        """Identify the codes on GeoRepo in batches.
+
+        The codes that are already identified are not requested again.
+
+        :param original_id_type: The type of the codes.
+        :type original_id_type: str
+        :param codes: List of codes, can contain duplicates.
+        :type codes: list
+        :return: Dictionary of code and list of GeoRepo entities.
+        :rtype: dict
+        """
+        requested = self.unidentified(original_id_type, codes)
+        for idx in range(0, len(requested), self.identify_step):
+            chunk = requested[idx:idx + self.identify_step]
+            self.requests += 1
+            results = GeorepoRequest().View.identify_codes(
+                reference_layer_identifier=self.reference_layer.identifier,
+                original_id_type=original_id_type,
+                codes=chunk,
+                return_id_type=UCODE
+            )
+            self.add_identified(original_id_type, chunk, results)
+
+        results = {}
+        for code in codes:
+            code = self._code(code)
+            entities = self.identified[(original_id_type, code)]
+            if entities:
+                results[code] = entities
+        return results
+
+    def save_entity(self, original_id_type: str, code: str, entity: dict):
+        """Save GeoRepo entity of the code, once per import.
+
+        :param original_id_type: The type of the code.
+        :type original_id_type: str
+        :param code: The code that is identified.
+        :type code: str
+        :param entity: GeoRepo entity data.
+        :type entity: dict
+        :return: The saved entity.
+        :rtype: Entity
+        """
+        key = (original_id_type, self._code(code), 'saved')
+        try:
+            return self.identified[key]
+        except KeyError:
+            obj = self.reference_layer.save_entity(entity)
+            self.identified[key] = obj
+            codes = dict(GeorepoEntity(entity).ext_codes or {})
+            codes[original_id_type] = key[1]
+            self.index.add(obj, codes)
+            return obj
+
+    @property
+    def summary(self) -> str:
+        """Return the summary of the resolver."""
+        return (
+            f'Entity lookup: {self.hits} hit(s), {self.misses} miss(es), '
+            f'{len(self._index or [])} indexed entity(s), '
+            f'{self.requests} GeoRepo identify request(s).'
+        )
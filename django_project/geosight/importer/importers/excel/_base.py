@@ -15,16 +15,178 @@ __date__ = '13/06/2023'
 __copyright__ = ('Copyright 2023, Unicef')
 
 from abc import ABC
-from typing import List
+from typing import Iterator, List
 
+from openpyxl import load_workbook
 from pyexcel_xls import get_data as xls_get
-from pyexcel_xlsx import get_data as xlsx_get
 
 from geosight.importer.attribute import ImporterAttribute
 from geosight.importer.exception import ImporterError
 from geosight.importer.utilities import clean_value
 
 
+def _trim(row) -> list:
+    """Return row without the trailing empty cells.
+
+    :param row: The cell values of the row.
+    :type row: tuple
+    :return: The cell values until the last non empty cell.
+    :rtype: list
+    """
+    row = list(row)
+    while row and row[-1] is None:
+        row.pop()
+    return row
+
+
+class ExcelRecords(object):
+    """Records of a sheet of excel, that are read lazily.
+
+    The xlsx is streamed with the read only workbook of openpyxl, that
+    parses the rows of the sheet one by one, so the memory does not grow
+    with the file. Every iteration reads the sheet again, so the records
+    can be iterated more than once.
+
+    The xls can not be streamed, it is read at once.
+    """
+
+    def __init__(  # noqa: DOC101,DOC103,DOC501,DOC503
+            self, content, sheet_name, header_row: int, mapping: dict
+    ):
+        """Init the records and check the sheet.
+
+        :param content: The excel file.
+        :type content: file
+        :param sheet_name: The name of sheet.
+        :type sheet_name: str
+        :param header_row: The row number of header, starts from 1.
+        :type header_row: int
+        :param mapping: Mapping of column to the key of record.
+        :type mapping: dict
+        """
+        self.content = content
+        self.sheet_name = sheet_name
+        self.header_row = header_row
+        self.mapping = mapping
+        self.xls_rows = None
+        self.total = None
+
+        try:
+            workbook = self._workbook()
+        except Exception:
+            workbook = None
+        if workbook is not None:
+            try:
+                sheet = self._sheet(workbook)
+                if sheet.max_row:
+                    self.total = max(sheet.max_row - header_row, 0)
+            finally:
+                workbook.close()
+        else:
+            try:
+                self.content.seek(0)
+                sheets = xls_get(self.content)
+            except Exception:
+                raise ImporterError('File is not excel.')
+            try:
+                self.xls_rows = sheets[sheet_name][header_row - 1:]
+            except KeyError:
+                self._sheet_error()
+            self.total = max(len(self.xls_rows) - 1, 0)
+
+    def _workbook(self):
+        """Return read only workbook of the content.
+
+        :return: The workbook.
+        :rtype: openpyxl.Workbook
+        """
+        self.content.seek(0)
+        return load_workbook(self.content, read_only=True, data_only=True)
+
+    def _sheet_error(self):
+        """Raise error of the sheet does not exist.
+
+        :raises ImporterError: Always.
+        """
+        raise ImporterError(
+            f'Sheet name : {self.sheet_name} does not exist.'
+        )
+
+    def _sheet(self, workbook):
+        """Return the sheet of workbook.
+
+        :param workbook: The workbook.
+        :type workbook: openpyxl.Workbook
+        :return: The sheet.
+        :rtype: openpyxl.worksheet.worksheet.Worksheet
+        """
+        try:
+            return workbook[self.sheet_name]
+        except KeyError:
+            self._sheet_error()
+
+    def rows(self) -> Iterator[list]:
+        """Yield the rows from the header, without trailing empty cells.
+
+        :yield: The cell values of the row.
+        :ytype: list
+        """
+        if self.xls_rows is not None:
+            yield from self.xls_rows
+            return
+
+        workbook = self._workbook()
+        try:
+            for row in self._sheet(workbook).iter_rows(
+                    min_row=self.header_row, values_only=True
+            ):
+                yield _trim(row)
+        finally:
+            workbook.close()
+
+    def __len__(self) -> int:
+        """Return number of records.
+
+        :return: Number of records.
+        :rtype: int
+        """
+        if self.total is None:
+            # The sheet is unsized, count the rows
+            self.total = max(sum(1 for _ in self.rows()) - 1, 0)
+        return self.total
+
+    def __iter__(self) -> Iterator[dict]:
+        """Yield the records as dictionary of header and value.
+
+        :yield: The record.
+        :ytype: dict
+        """
+        rows = self.rows()
+        try:
+            headers = next(rows)
+        except StopIteration:
+            return
+        for record in rows:
+            row = {}
+            for idx, header in enumerate(headers):
+                if header is None:
+                    continue
+                header = f'{header}'.strip()
+                try:
+                    row[header] = clean_value(record[idx])
+                except IndexError:
+                    if row.keys():
+                        row[header] = None
+                except ValueError:
+                    pass
+            for key, value in self.mapping.items():
+                try:
+                    row[value] = clean_value(row[key.strip()])
+                except KeyError:
+                    row[value] = None
+            yield row
+
+
 class BaseExcelFormatImporter(ABC):
     """Import data from excel format."""
 
@@ -66,54 +228,18 @@ class BaseExcelFormatImporter(ABC):
 
         return _file
 
-    def get_records(self) -> List:
+    def get_records(self) -> ExcelRecords:
         """Get records form upload session.
 
-        Returning records and headers
+        The records are read lazily from the sheet,
+        from the row of header.
         """
         content = self.file_content()
-        try:
-            try:
-                sheet = xlsx_get(content)
-            except Exception:
-                sheet = xls_get(content)
-        except Exception:
-            raise ImporterError('File is not excel.')
-
-        records = []
-        if sheet:
-            try:
-                records = sheet[self.attributes.get('sheet_name', '')]
-            except KeyError:
-                raise ImporterError(
-                    f'Sheet name : {self.attributes.get("sheet_name", "")} '
-                    f'does not exist.'
-                )
-
-        # format data
         try:
             column_header = int(self.attributes['row_number_for_header'])
         except ValueError:
             raise ImporterError('row_number_for_header is not an integer')
-
-        records = records[column_header - 1:]
-        headers = records[0]
-
-        data = []
-        for record in records[1:]:
-            row = {}
-            for idx, header in enumerate(headers):
-                try:
-                    row[header.strip()] = clean_value(record[idx])
-                except IndexError:
-                    if row.keys():
-                        row[header.strip()] = None
-                except ValueError:
-                    pass
-            for key, value in self.mapping.items():
-                try:
-                    row[value] = clean_value(row[key.strip()])
-                except KeyError:
-                    row[value] = None
-            data.append(row)
-        return data
+        return ExcelRecords(
+            content, self.attributes.get('sheet_name', ''),
+            column_header, self.mapping
+        )
@@ -15,14 +15,8 @@ __date__ = '05/07/2023'
 __copyright__ = ('Copyright 2023, Unicef')
 
 import json
-from json import JSONDecodeError
 from typing import List
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-
-from core.settings.utils import ABS_PATH
 from geosight.data.models.indicator import Indicator
 from geosight.georepo.models import ReferenceLayerView
 from geosight.georepo.models.reference_layer_indicator_value import (
@@ -31,6 +25,10 @@ from geosight.georepo.models.reference_layer_indicator_value import (
 from geosight.importer.attribute import ImporterAttribute
 from geosight.importer.exception import ImporterError
 from geosight.importer.importers.base import IndicatorValueLongFormat
+from .expression import (
+    BrowserExpression, ExpressionError, ExpressionNotSupported,
+    FormulaExpression
+)
 
 
 class FormulaBasedOnOtherIndicatorsIndicatorValue(IndicatorValueLongFormat):
@@ -38,9 +36,6 @@ class FormulaBasedOnOtherIndicatorsIndicatorValue(IndicatorValueLongFormat):
 
     attributes = {}
     mapping = {}
-    html_file = ABS_PATH(
-        'geosight', 'importer', 'importers', 'nunjucks', 'django-nunjucks.html'
-    )
 
     @staticmethod
     def attributes_definition(**kwargs) -> List[ImporterAttribute]:
@@ -72,6 +67,9 @@ class FormulaBasedOnOtherIndicatorsIndicatorValue(IndicatorValueLongFormat):
     def get_records(self) -> List:
         """Get records form upload session.
 
+        The expression is evaluated in process by :class:`FormulaExpression`,
+        headless chrome is used only when the expression is not supported.
+
         Returning records and headers
         """
         selected_indicators = self.attributes.get('selected_indicators', None)
@@ -106,59 +104,65 @@ class FormulaBasedOnOtherIndicatorsIndicatorValue(IndicatorValueLongFormat):
             indicators=indicators
         )
 
-        # TODO:
-        #  Change how to get the Nunjucks results without browser
-        driver = None
+        self._update('Compiling expression.')
+        try:
+            formula = FormulaExpression(expression)
+        except ExpressionNotSupported:
+            formula = None
+        browser = BrowserExpression(expression)
+
         try:
             records = []
             total = len(context)
-            url = f'file://{self.html_file}'
-            options = Options()
-            options.add_argument('--headless')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            driver = webdriver.Chrome(
-                options=options
-            )
             for idx, ctx in enumerate(context):
-                context = {
-                    'context': {
-                        'admin_boundary': json.loads(json.dumps(ctx))
-                    }
-                }
-                self._update(
+                self._update_progress(
                     f'Processing data {idx + 1}/{total}.',
                     progress=int((idx / total) * 50)
                 )
-                # TODO:
-                #  We need to think about another approach
-                driver.get(url)
-                driver.execute_script(
-                    f"callNunjucks(`{expression}`, `{json.dumps(context)}`);"
-                )
-                result = driver.find_element(By.ID, 'result')
-                try:
-                    output = result.text.split(',')
-                    if output == '':
-                        continue
+                output = None
+                if formula:
                     try:
-                        time = output[1].strip()
-                    except IndexError:
-                        time = None
-                    if output[0].strip() != '':
-                        records.append({
-                            "concept_uuid": ctx['concept_uuid'],
-                            "geom_code": ctx['geom_code'],
-                            "admin_level": ctx['admin_level'],
-                            "time": time,
-                            "value": output[0].strip()
-                        })
-                except JSONDecodeError:
-                    raise Exception('Expression result is not json.')
-            driver.close()
+                        output = formula.render(ctx)
+                    except ExpressionNotSupported:
+                        pass
+
+                # Use browser for the expression that is not supported
+                if output is None:
+                    output = browser.render(ctx)
+
+                record = self.record_from_output(ctx, output)
+                if record:
+                    records.append(record)
             return records
-        except Exception as e:
-            if driver:
-                driver.close()
-            err = f'{e}'
-            raise ImporterError(err.split('(Session info:')[0])
+        except ExpressionError as e:
+            raise ImporterError(f'{e}')
+        finally:
+            browser.close()
+
+    @staticmethod
+    def record_from_output(ctx: dict, output: str):
+        """Return record from the result of expression.
+
+        The output is in format of "value,time".
+
+        :param ctx: Context of the admin boundary.
+        :type ctx: dict
+        :param output: Result of the expression.
+        :type output: str
+        :return: The record, or None if the value is empty.
+        :rtype: dict or None
+        """
+        output = output.split(',')
+        try:
+            time = output[1].strip()
+        except IndexError:
+            time = None
+        if output[0].strip() == '':
+            return None
+        return {
+            "concept_uuid": ctx['concept_uuid'],
+            "geom_code": ctx['geom_code'],
+            "admin_level": ctx['admin_level'],
+            "time": time,
+            "value": output[0].strip()
+        }
@@ -0,0 +1,751 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+import copy
+import json
+import math
+import re
+from decimal import Decimal
+
+from dateutil import parser
+from dateutil.relativedelta import relativedelta
+from django.utils import timezone
+from jinja2 import TemplateError, Undefined, nodes, pass_context
+from jinja2.compiler import CodeGenerator
+from jinja2.sandbox import SandboxedEnvironment
+
+from core.settings.utils import ABS_PATH
+
+TIME_OPTIONS = (
+    "The options are ['now', 'last x day(s)', 'last x month(s)', "
+    "'last x year(s)' and '%Y-%m-%dT%H:%M:%S']."
+)
+GEOMETRY_TYPE_OPTIONS = (
+    "The options are ['current', 'parent', 'children', 'siblings']."
+)
+AGGREGATION_OPTIONS = "The options are ['last', 'sum', 'min', 'max', 'avg']."
+
+
+class ExpressionError(Exception):
+    """Error of the expression, it is also raised by the browser."""
+
+    pass
+
+
+class ExpressionNotSupported(Exception):
+    """Expression can not be evaluated by :class:`FormulaExpression`."""
+
+    pass
+
+
+# -------------------------------------------------------
+# Javascript semantics
+# -------------------------------------------------------
+def _js_number(value) -> str:
+    """Return the string of number like javascript Number.toString does.
+
+    :param value: The number.
+    :type value: int | float
+    :return: The string of number.
+    :rtype: str
+    """
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return 'Infinity' if value > 0 else '-Infinity'
+    if value == 0:
+        return '0'
+    sign = '-' if value < 0 else ''
+
+    # Shortest digits that round trip, same as javascript
+    _, digits, exponent = Decimal(repr(abs(value))).normalize().as_tuple()
+    digits = ''.join(f'{digit}' for digit in digits)
+    k = len(digits)
+    n = exponent + k
+    if k <= n <= 21:
+        output = digits + '0' * (n - k)
+    elif 0 < n <= 21:
+        output = f'{digits[:n]}.{digits[n:]}'
+    elif -6 < n <= 0:
+        output = f'0.{"0" * -n}{digits}'
+    else:
+        output = digits[0]
+        if k > 1:
+            output += f'.{digits[1:]}'
+        output += f'e{"+" if n > 0 else "-"}{abs(n - 1)}'
+    return sign + output
+
+
+def _js_string(value) -> str:
+    """Return the string of value like javascript does.
+
+    Null and undefined are printed as empty string, like Nunjucks does.
+
+    :param value: The value.
+    :type value: object
+    :return: The string of value.
+    :rtype: str
+    """
+    if value is None or isinstance(value, Undefined):
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return _js_number(value)
+    if isinstance(value, (list, tuple)):
+        return ','.join([_js_string(item) for item in value])
+    if isinstance(value, dict):
+        return '[object Object]'
+    return f'{value}'
+
+
+class JSArray(list):
+    """List that is truthy and printed like javascript array."""
+
+    def __bool__(self):
+        """Array is always truthy, also the empty one.
+
+        :return: True.
+        :rtype: bool
+        """
+        return True
+
+    def __str__(self):
+        """Items are joined with comma.
+
+        :return: The string of array.
+        :rtype: str
+        """
+        return _js_string(self)
+
+
+class JSObject(dict):
+    """Dictionary that is truthy and printed like javascript object."""
+
+    def __bool__(self):
+        """Object is always truthy, also the empty one.
+
+        :return: True.
+        :rtype: bool
+        """
+        return True
+
+    def __str__(self):
+        """Object is printed as [object Object].
+
+        :return: The string of object.
+        :rtype: str
+        """
+        return _js_string(self)
+
+
+def _is_number(value) -> bool:
+    """Return if value is number or boolean, that are compared as number.
+
+    :param value: The value.
+    :type value: object
+    :return: True if it is number or boolean.
+    :rtype: bool
+    """
+    return isinstance(value, (int, float))
+
+
+class _CodeGenerator(CodeGenerator):
+    """Code generator for javascript equality, arrays and objects."""
+
+    def _output_child_to_const(self, node, frame, finalize):
+        """Evaluate the output on render, not as python constant.
+
+        :param node: The node.
+        :type node: jinja2.nodes.Node
+        :param frame: The frame.
+        :type frame: jinja2.compiler.Frame
+        :param finalize: The finalize of output.
+        :type finalize: jinja2.compiler.CodeGenerator._FinalizeInfo
+        :return: The constant of template data.
+        :rtype: str
+        :raises nodes.Impossible: If the node is not template data.
+        """
+        if not isinstance(node, nodes.TemplateData):
+            raise nodes.Impossible()
+        return super()._output_child_to_const(node, frame, finalize)
+
+    def visit_Compare(self, node, frame) -> None:
+        """Compare with == and != by :meth:`_Environment.js_equal`.
+
+        :param node: The node.
+        :type node: jinja2.nodes.Node
+        :param frame: The frame.
+        :type frame: jinja2.compiler.Frame
+        """
+        if not any(op.op in ['eq', 'ne'] for op in node.ops):
+            super().visit_Compare(node, frame)
+            return
+        if len(node.ops) != 1:
+            self.fail('Chained == or != is not supported.', node.lineno)
+        operand = node.ops[0]
+        self.write(f'environment.js_equal({operand.op!r}, ')
+        self.visit(node.expr, frame)
+        self.write(', ')
+        self.visit(operand.expr, frame)
+        self.write(')')
+
+    def visit_Concat(self, node, frame):
+        """Concatenate with ~ by :meth:`_Environment.js_concat`.
+
+        :param node: The node.
+        :type node: jinja2.nodes.Node
+        :param frame: The frame.
+        :type frame: jinja2.compiler.Frame
+        """
+        self.write('environment.js_concat((')
+        for child in node.nodes:
+            self.visit(child, frame)
+            self.write(', ')
+        self.write('))')
+
+    def visit_List(self, node, frame):
+        """Array literal is :class:`JSArray`.
+
+        :param node: The node.
+        :type node: jinja2.nodes.Node
+        :param frame: The frame.
+        :type frame: jinja2.compiler.Frame
+        """
+        self.write('environment.js_array(')
+        super().visit_List(node, frame)
+        self.write(')')
+
+    def visit_Dict(self, node, frame):
+        """Object literal is :class:`JSObject`.
+
+        :param node: The node.
+        :type node: jinja2.nodes.Node
+        :param frame: The frame.
+        :type frame: jinja2.compiler.Frame
+        """
+        self.write('environment.js_object(')
+        super().visit_Dict(node, frame)
+        self.write(')')
+
+
+class _Environment(SandboxedEnvironment):
+    """Sandboxed environment that follows javascript semantics of Nunjucks.
+
+    The operations that javascript evaluates differently and are not
+    emulated raise :class:`ExpressionNotSupported`, so the expression
+    is evaluated by the browser.
+    """
+
+    code_generator_class = _CodeGenerator
+    intercepted_binops = frozenset(['+', '%'])
+    js_array = JSArray
+    js_object = JSObject
+
+    def call_binop(self, context, operator, left, right):
+        """Call binary operator, javascript adds arrays as strings.
+
+        % is the remainder of javascript, it has the sign of the dividend.
+
+        :param context: The template context.
+        :type context: jinja2.runtime.Context
+        :param operator: The operator.
+        :type operator: str
+        :param left: The left operand.
+        :type left: object
+        :param right: The right operand.
+        :type right: object
+        :return: The result.
+        :rtype: object
+        :raises ExpressionNotSupported:
+            If the operands are evaluated differently by javascript.
+        """
+        for value in [left, right]:
+            if isinstance(value, (list, tuple, dict)):
+                raise ExpressionNotSupported(
+                    f'{operator} of array or object is not supported.'
+                )
+        if operator == '%':
+            if not (_is_number(left) and _is_number(right)):
+                raise ExpressionNotSupported(
+                    f'{type(left).__name__} % {type(right).__name__} '
+                    f'is not supported.'
+                )
+            if isinstance(left, int) and isinstance(right, int):
+                remainder = abs(left) % abs(right)
+                return -remainder if left < 0 else remainder
+            return math.fmod(left, right)
+        return super().call_binop(context, operator, left, right)
+
+    @staticmethod
+    def js_concat(values) -> str:
+        """Concatenate values with ~ of Nunjucks.
+
+        Nunjucks concatenates by javascript + "" +,
+        so null and undefined are printed as is.
+
+        :param values: The values.
+        :type values: tuple
+        :return: The concatenated string.
+        :rtype: str
+        """
+        output = ''
+        for value in values:
+            if value is None:
+                output += 'null'
+            elif isinstance(value, Undefined):
+                output += 'undefined'
+            else:
+                output += _js_string(value)
+        return output
+
+    @staticmethod
+    def js_equal(operator, left, right) -> bool:
+        """Compare values with == or != of javascript.
+
+        Javascript converts the values of different types before comparing
+        and compares arrays and objects by reference, those are not
+        supported.
+
+        :param operator: eq or ne.
+        :type operator: str
+        :param left: The left operand.
+        :type left: object
+        :param right: The right operand.
+        :type right: object
+        :return: The result of comparison.
+        :rtype: bool
+        :raises ExpressionNotSupported: If the types are different.
+        """
+        if not (
+                (_is_number(left) and _is_number(right)) or
+                (isinstance(left, str) and isinstance(right, str)) or
+                (
+                        isinstance(left, Undefined) and
+                        isinstance(right, Undefined)
+                ) or
+                (left is None and not isinstance(right, Undefined)) or
+                (right is None and not isinstance(left, Undefined))
+        ):
+            raise ExpressionNotSupported(
+                f'{type(left).__name__} == {type(right).__name__} '
+                f'is not supported.'
+            )
+        equal = left == right
+        return equal if operator == 'eq' else not equal
+
+
+# -------------------------------------------------------
+# Filters and functions that are on django-nunjucks.html
+# -------------------------------------------------------
+def _humanize(value):
+    """Humanize filter.
+
+    :param value: The value.
+    :type value: object
+    :return: The value with space instead of underscore.
+    :rtype: str
+    """
+    return f'{value}'.replace('_', ' ')
+
+
+def _max(array):
+    """Max filter.
+
+    :param array: The values.
+    :type array: list
+    :return: The maximum value, None when it is empty.
+    :rtype: float
+    """
+    return max(array) if len(array) else None
+
+
+def _min(array):
+    """Min filter.
+
+    :param array: The values.
+    :type array: list
+    :return: The minimum value, None when it is empty.
+    :rtype: float
+    """
+    return min(array) if len(array) else None
+
+
+def _sum(array):
+    """Sum filter.
+
+    :param array: The values.
+    :type array: list
+    :return: The sum, None when it is empty.
+    :rtype: float
+    """
+    return sum(array) if len(array) else None
+
+
+def _avg(array):
+    """Avg filter.
+
+    :param array: The values.
+    :type array: list
+    :return: The average, None when it is empty.
+    :rtype: float
+    """
+    return sum(array) / len(array) if len(array) else None
+
+
+def _round(value, precision=0, method='common'):
+    """Round filter, Math.round of javascript rounds half up.
+
+    :param value: The value.
+    :type value: float
+    :param precision: Number of decimals.
+    :type precision: int
+    :param method: common, ceil or floor.
+    :type method: str
+    :return: The rounded value.
+    :rtype: float
+    :raises ExpressionNotSupported: If the value is not number.
+    """
+    if not _is_number(value) or not _is_number(precision):
+        raise ExpressionNotSupported(
+            f'round of {type(value).__name__} is not supported.'
+        )
+    factor = 10 ** precision
+    value = value * factor
+    if method == 'ceil':
+        value = math.ceil(value)
+    elif method == 'floor':
+        value = math.floor(value)
+    else:
+        rounded = math.floor(value)
+        value = rounded + 1 if value - rounded >= 0.5 else rounded
+    return value / factor
+
+
+def _get_time(time, label):
+    """Return datetime of time option.
+
+    :param time: The time option.
+    :type time: str
+    :param label: Label of the option, for the error.
+    :type label: str
+    :return: The datetime.
+    :rtype: datetime
+    :raises ExpressionError: If the time option is empty or not recognized.
+    """
+    now = timezone.now()
+    if not time:
+        raise ExpressionError(
+            f"{label} can't be empty. "
+            "The options are ['last x days', 'last x months', "
+            "'last x years', 'now']."
+        )
+    for unit in ['day', 'month', 'year']:
+        match = re.search(
+            r'last ([1-9]|[0-9]\d+) ' + unit + r'\(s\)', time
+        )
+        if match:
+            return now - relativedelta(**{f'{unit}s': int(match.group(1))})
+    if time == 'now':
+        return now
+    if 'Z' not in time and '+' not in time:
+        time += '+00:00'
+    try:
+        return parser.isoparse(time)
+    except ValueError:
+        raise ExpressionError(f'{label} is not recognized. {TIME_OPTIONS}')
+
+
+def _indicator_data(geometries, indicator, time_from, time_to):
+    """Return the data of indicator of geometries in the time range.
+
+    :param geometries: List of admin boundary context.
+    :type geometries: list
+    :param indicator: Shortcode of the indicator.
+    :type indicator: str
+    :param time_from: The start, None for no start.
+    :type time_from: datetime
+    :param time_to: The end.
+    :type time_to: datetime
+    :return: The rows that are sorted by time.
+    :rtype: list
+    """
+    data = []
+    for geometry in geometries:
+        if not geometry:
+            continue
+        try:
+            rows = geometry['indicators'][indicator]
+        except (KeyError, TypeError):
+            continue
+        for row in rows:
+            row = copy.copy(row)
+            row['admin_level'] = geometry.get('admin_level')
+            row['concept_uuid'] = geometry.get('concept_uuid')
+            row['geom_code'] = geometry.get('geom_code')
+            row['name'] = geometry.get('name')
+            data.append(row)
+
+    output = []
+    for row in data:
+        time = parser.isoparse(row['time'])
+        if (not time_from or time >= time_from) and time <= time_to:
+            output.append(row)
+    return sorted(output, key=lambda row: row['time'])
+
+
+@pass_context
+def get_values(context, indicator, geometry_type, t1=None, t2=None):
+    """Return values of indicator for the geometry type.
+
+    :param context: The template context.
+    :type context: jinja2.runtime.Context
+    :param indicator: Shortcode of the indicator.
+    :type indicator: str
+    :param geometry_type: current, parent, children or siblings.
+    :type geometry_type: str
+    :param t1: Time option of the start, None for no start.
+    :type t1: str
+    :param t2: Time option of the end.
+    :type t2: str
+    :return: The rows of indicator.
+    :rtype: JSArray
+    :raises ExpressionError: If the options are not recognized.
+    """
+    try:
+        admin_boundary = context['context']['admin_boundary']
+    except (KeyError, TypeError):
+        return JSArray()
+    if not admin_boundary:
+        return JSArray()
+
+    time_from = _get_time(t1, 't1') if t1 else None
+    time_to = _get_time(t2, 't2')
+    if time_from and time_to < time_from:
+        raise ExpressionError("t2 can't be lesser than t1")
+
+    if geometry_type == 'current':
+        geometries = [admin_boundary]
+    elif geometry_type == 'parent':
+        geometries = [admin_boundary.get('parent')]
+    elif geometry_type == 'children':
+        geometries = admin_boundary.get('children') or []
+    elif geometry_type == 'siblings':
+        geometries = admin_boundary.get('siblings') or []
+    else:
+        raise ExpressionError(
+            f'Geometry type {geometry_type} is not recognized. '
+            f'{GEOMETRY_TYPE_OPTIONS}'
+        )
+    return JSArray(
+        _indicator_data(geometries, indicator, time_from, time_to)
+    )
+
+
+@pass_context
+def get_value(
+        context, indicator, geometry_type, t1=None, t2=None, aggregation=None
+):
+    """Return aggregated value of indicator for the geometry type.
+
+    :param context: The template context.
+    :type context: jinja2.runtime.Context
+    :param indicator: Shortcode of the indicator.
+    :type indicator: str
+    :param geometry_type: current, parent, children or siblings.
+    :type geometry_type: str
+    :param t1: Time option of the start, None for no start.
+    :type t1: str
+    :param t2: Time option of the end.
+    :type t2: str
+    :param aggregation: last, sum, min, max or avg.
+    :type aggregation: str
+    :return: The aggregated value, None when there is no data.
+    :rtype: float
+    :raises ExpressionError: If the aggregation is not recognized.
+    """
+    data = [
+        row['value'] for row in get_values(
+            context, indicator, geometry_type, t1, t2
+        )
+    ]
+    if not data:
+        return None
+    if aggregation == 'last':
+        return data[-1]
+    elif aggregation == 'sum':
+        return sum(data)
+    elif aggregation == 'min':
+        return min(data)
+    elif aggregation == 'max':
+        return max(data)
+    elif aggregation == 'avg':
+        return sum(data) / len(data)
+    if not aggregation:
+        raise ExpressionError(
+            f"aggregation is can't be empty. {AGGREGATION_OPTIONS}"
+        )
+    raise ExpressionError(
+        f'aggregation {aggregation} is not recognized. {AGGREGATION_OPTIONS}'
+    )
+
+
+def _finalize(value):
+    """Print the value like javascript does.
+
+    :param value: The value.
+    :type value: object
+    :return: The string of value.
+    :rtype: str
+    """
+    return _js_string(value)
+
+
+class FormulaExpression(object):
+    """Nunjucks expression that is evaluated in process.
+
+    It supports the subset of Nunjucks that is shared with Jinja,
+    e.g. arithmetic, conditionals, set and the get_value/get_values
+    functions over context.admin_boundary.
+    Arrays and objects are truthy and printed like javascript,
+    numbers are printed, concatenated with ~, rounded and divided with %
+    like javascript too.
+    == and != of different types raise :class:`ExpressionNotSupported`.
+    The expression is compiled once and rendered for every admin boundary.
+    """
+
+    def __init__(  # noqa: DOC101,DOC103,DOC501,DOC503
+            self, expression: str
+    ):
+        """Compile the expression.
+
+        :param expression: The Nunjucks expression.
+        :type expression: str
+        :raises ExpressionNotSupported: If the expression can't be compiled.
+        """
+        # Not optimized, so the constants are not folded as python values
+        env = _Environment(finalize=_finalize, optimized=False)
+        env.filters.update(
+            {
+                'humanize': _humanize,
+                'max': _max,
+                'min': _min,
+                'avg': _avg,
+                'sum': _sum,
+                'round': _round,
+            }
+        )
+        env.globals.update(
+            {
+                'null': None,
+                'get_value': get_value,
+                'get_values': get_values,
+            }
+        )
+        try:
+            # Nunjucks does not parse exponent and underscore in number
+            for _, token, value in env.lex(expression):
+                if token in ['integer', 'float'] and re.search(
+                        r'[eE_]', value
+                ):
+                    raise ExpressionNotSupported(
+                        f'Number {value} is not supported.'
+                    )
+            self.template = env.from_string(expression)
+        except TemplateError as e:
+            raise ExpressionNotSupported(f'{e}')
+
+    def render(self, admin_boundary: dict) -> str:
+        """Render the expression for an admin boundary.
+
+        :param admin_boundary: Context of the admin boundary.
+        :type admin_boundary: dict
+        :return: Rendered result.
+        :rtype: str
+        :raises ExpressionError: If the expression raises error.
+        :raises ExpressionNotSupported:
+            If the expression can't be evaluated like Nunjucks does,
+            e.g. javascript operation on null value.
+        """
+        try:
+            return self.template.render(
+                context={'admin_boundary': admin_boundary}
+            ).strip()
+        except ExpressionError:
+            raise
+        except Exception as e:
+            raise ExpressionNotSupported(f'{e}')
+
+
+class BrowserExpression(object):
+    """Nunjucks expression that is evaluated by headless chrome.
+
+    This is used as fallback for the expression that is not supported
+    by :class:`FormulaExpression`. The browser is started on first render.
+    """
+
+    html_file = ABS_PATH(
+        'geosight', 'importer', 'importers', 'nunjucks', 'django-nunjucks.html'
+    )
+
+    def __init__(self, expression: str):  # noqa: DOC101,DOC103
+        """Init the expression.
+
+        :param expression: The Nunjucks expression.
+        :type expression: str
+        """
+        self.expression = expression
+        self.driver = None
+
+    def render(self, admin_boundary: dict) -> str:
+        """Render the expression for an admin boundary.
+
+        :param admin_boundary: Context of the admin boundary.
+        :type admin_boundary: dict
+        :return: Rendered result.
+        :rtype: str
+        :raises ExpressionError: If the browser raises error.
+        """
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.common.by import By
+        try:
+            if not self.driver:
+                options = Options()
+                options.add_argument('--headless')
+                options.add_argument('--no-sandbox')
+                options.add_argument('--disable-dev-shm-usage')
+                self.driver = webdriver.Chrome(options=options)
+            context = {
+                'context': {
+                    'admin_boundary': json.loads(json.dumps(admin_boundary))
+                }
+            }
+            self.driver.get(f'file://{self.html_file}')
+            self.driver.execute_script(
+                f"callNunjucks(`{self.expression}`, `{json.dumps(context)}`);"
+            )
+            return self.driver.find_element(By.ID, 'result').text
+        except Exception as e:
+            err = f'{e}'
+            raise ExpressionError(err.split('(Session info:')[0])
+
+    def close(self):
+        """Close the browser."""
+        if self.driver:
+            self.driver.close()
+            self.driver = None
@@ -21,7 +21,9 @@ from typing import List
 
 from django.db import connections
 
+from core.utils import pg_copy_rows
 from geosight.importer.attribute import ImporterAttribute
+from geosight.importer.importers.query_data_memory import query_rows
 from geosight.importer.utilities import date_from_timestamp
 
 
@@ -46,6 +48,13 @@ class Aggregations(object):
     MINORITY = 'MINORITY'
 
 
+class AggregationEngine(object):
+    """Engine that does the aggregation."""
+
+    SQL = 'SQL'
+    MEMORY = 'Memory'
+
+
 class QueryDataImporter(ABC):
     """Import data from api."""
 
@@ -69,16 +78,91 @@ class QueryDataImporter(ABC):
             )
         ]
 
+    table_definition = None
+
     def delete_tables(self):
         """Delete all tables from database."""
         self.cursor.execute(
             f'DROP TABLE IF EXISTS {self.importer.data_table_name}'
         )
+        self.table_definition = None
+
+    def clean_query_data(self):
+        """Delete the temporary table that is reused by querying_data."""
+        with connections['temp'].cursor() as cursor:
+            self.cursor = cursor
+            self.delete_tables()
+
+    @staticmethod
+    def field_type(field: dict) -> str:
+        """Return database type of the field.
+
+        :param field: The field, with name and type.
+        :type field: dict
+        :return: The database type.
+        :rtype: str
+        """
+        _type = field["type"]
+        if _type.lower() == 'string':
+            _type = 'VARCHAR'
+        if _type.lower() == 'number':
+            _type = 'DOUBLE PRECISION'
+        if _type.lower() == 'date':
+            _type = 'DATE'
+        return _type
+
+    @staticmethod
+    def field_value(value, field_type: str):
+        """Return value that is matched with the database type.
+
+        :param value: The value of the feature.
+        :type value: object
+        :param field_type: The database type of the field.
+        :type field_type: str
+        :return: The value for the database.
+        :rtype: object
+        """
+        if value is None:
+            return None
+        field_type = field_type.upper()
+        if field_type == 'DATE':
+            if isinstance(value, datetime):
+                return value.date()
+            if isinstance(value, date):
+                return value
+            if not isinstance(value, str):
+                value = date_from_timestamp(value)
+                if isinstance(value, datetime):
+                    return value.date()
+        elif field_type in ['INT', 'INTEGER', 'BIGINT']:
+            if isinstance(value, float) and value.is_integer():
+                return int(value)
+        return value
+
+    def create_table(self, table_name: str, fields: list) -> None:
+        """Create the table, or truncate it when it can be reused.
+
+        The table is unlogged because the data is only for querying.
+
+        :param table_name: The table name.
+        :type table_name: str
+        :param fields: The fields, with name and type.
+        :type fields: list
+        """
+        table_definition = ', '.join(
+            [f'{field["name"]} {self.field_type(field)}' for field in fields]
+        )
+        if self.table_definition == table_definition:
+            self.cursor.execute(f'TRUNCATE {table_name}')
+            return
+        self.cursor.execute(f'DROP TABLE IF EXISTS {table_name}')
+        self.cursor.execute(
+            f'CREATE UNLOGGED TABLE {table_name} ({table_definition})'
+        )
+        self.table_definition = table_definition
 
     def insert_features(self, data: list, table_name: str, fields: list):
-        """Insert features to table."""
-        # -------------------------------------------------
-        # Create table
+        """Insert features to table using COPY."""
         fields = copy.deepcopy(fields)
         fields += [
             {
@@ -86,44 +170,75 @@ class QueryDataImporter(ABC):
                 'type': 'INT'
             }
         ]
-        table_definition = []
-        for field in fields:
-            _type = field["type"]
-            if _type.lower() == 'string':
-                _type = 'VARCHAR'
-            if _type.lower() == 'number':
-                _type = 'DOUBLE PRECISION'
-            if _type.lower() == 'date':
-                _type = 'DATE'
-            table_definition.append(f'{field["name"]} {_type}')
-
-        definition = str(tuple(table_definition)).replace("'", "")
-        self.cursor.execute(f'CREATE TABLE {table_name} {definition}')
-        # -------------------------------------------------
-        for idx, row in enumerate(data):
-            properties = row
-            properties['_row_'] = idx
-            values = []
-            for field in fields:
-                value = properties[field['name']]
-                if value is None:
-                    value = 'NULL'
-                if field['type'].lower() == 'date':
-                    if isinstance(value, datetime):
-                        value = value.strftime("%Y-%m-%d")
-                    elif not isinstance(value, str):
-                        value = date_from_timestamp(value).strftime("%Y-%m-%d")
-                try:
-                    value = value.replace("'", "`").replace('"', "`")
-                except Exception:
-                    pass
-                values.append(value)
-            values_str = str(
-                tuple(values)).replace('"', "'").replace("''", "'")
-            values_str = values_str.replace("'NULL'", "NULL")
-            self.cursor.execute(
-                f'INSERT INTO {table_name} VALUES {values_str}'
-            )
+        self.create_table(table_name, fields)
+        types = [self.field_type(field) for field in fields[:-1]]
+
+        def _rows():
+            for idx, row in enumerate(data):
+                values = [
+                    self.field_value(row[field['name']], types[field_idx])
+                    for field_idx, field in enumerate(fields[:-1])
+                ]
+                values.append(idx)
+                yield values
+
+        pg_copy_rows(
+            self.cursor, table_name,
+            [field['name'] for field in fields], _rows()
+        )
+        self.cursor.execute(f'ANALYZE {table_name}')
+
+    @staticmethod
+    def rows_to_records(
+            rows: List, group_field: str, aggregation_method: str
+    ) -> List:
+        """Return records from the rows of aggregation.
+
+        :param rows: Rows of aggregation.
+        :type rows: list
+        :param group_field: Field name that are grouped.
+        :type group_field: str
+        :param aggregation_method: Aggregation method.
+        :type aggregation_method: str
+        :return: List of record.
+        :rtype: list
+        """
+        # Return record with unique data
+        data_found = {}
+        for row in rows:
+            record = {}
+            try:
+                record['value'] = float(row[0])
+            except Exception:
+                record['value'] = row[0]
+
+            identifier = ''
+            for idx, field in enumerate(group_field.split(',')):
+                record[field] = row[idx + 1]
+                if isinstance(record[field], date):
+                    record[field] = record[field].isoformat()
+                identifier += f'{record[field]}'
+
+            if identifier not in data_found:
+                data_found[identifier] = {
+                    'count': 0,
+                    'record': None
+                }
+
+            data_found[identifier]['count'] += row[len(row) - 1]
+            data_found[identifier]['record'] = record
+
+        records = []
+        for identifier, value in data_found.items():
+            if value['record']:
+                record = value['record']
+                count = value['count']
+                if count > 1:
+                    record['description'] = (
+                        f'{aggregation_method} of {count} records'
+                    )
+                records.append(record)
+        return records
 
     def querying_data(
             self, data: List, fields: List, group_field: str,
@@ -175,11 +290,27 @@ class QueryDataImporter(ABC):
         if not aggregation_query:
             raise QueryError('Aggregation is required.')
 
+        # Aggregate in memory, the filter can just be done by the database
+        engine = self.attributes.get('aggregation_engine', None)
+        if engine == AggregationEngine.MEMORY and not input_filter:
+            try:
+                rows = query_rows(
+                    data=data,
+                    fields=fields,
+                    group_field=group_field,
+                    aggregation_method=aggregation_method,
+                    aggregation_field=aggregation_field
+                )
+            except Exception as e:
+                raise QueryError(e)
+            return self.rows_to_records(
+                rows, group_field, aggregation_method
+            )
+
         # We do query
         try:
             with connections['temp'].cursor() as cursor:
                 self.cursor = cursor
-                self.delete_tables()
 
                 # Insert features to database
                 self.insert_features(
@@ -215,44 +346,10 @@ class QueryDataImporter(ABC):
                     )
                 self.cursor.execute(query)
                 rows = self.cursor.fetchall()
-                self.delete_tables()
 
-                # Return record with unique data
-                data_found = {}
-                for row in rows:
-                    record = {}
-                    try:
-                        record['value'] = float(row[0])
-                    except Exception:
-                        record['value'] = row[0]
-
-                    identifier = ''
-                    for idx, field in enumerate(group_field.split(',')):
-                        record[field] = row[idx + 1]
-                        if isinstance(record[field], date):
-                            record[field] = record[field].isoformat()
-                        identifier += f'{record[field]}'
-
-                    if identifier not in data_found:
-                        data_found[identifier] = {
-                            'count': 0,
-                            'record': None
-                        }
-
-                    data_found[identifier]['count'] += row[len(row) - 1]
-                    data_found[identifier]['record'] = record
-
-                records = []
-                for identifier, value in data_found.items():
-                    if value['record']:
-                        record = value['record']
-                        count = value['count']
-                        if count > 1:
-                            record['description'] = (
-                                f'{aggregation_method} of {count} records'
-                            )
-                        records.append(record)
-                return records
+                return self.rows_to_records(
+                    rows, group_field, aggregation_method
+                )
         except Exception as e:
             with connections['temp'].cursor() as cursor:
                 self.cursor = cursor
@@ -0,0 +1,260 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from datetime import date, datetime
+from typing import List
+
+import numpy as np
+
+from geosight.importer.utilities import date_from_timestamp
+
+NUMBER_TYPES = ['DOUBLE PRECISION', 'NUMBER', 'FLOAT', 'REAL', 'NUMERIC']
+INTEGER_TYPES = ['INT', 'INTEGER', 'BIGINT', 'SMALLINT']
+DATE_TYPES = ['DATE']
+
+
+def _cast_date(value):
+    """Cast value to date like the temporary table column does.
+
+    :param value: The value, date, iso string or timestamp.
+    :type value: object
+    :return: The date.
+    :rtype: date
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).date()
+    value = date_from_timestamp(value)
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _cast(values: List, field_type: str):
+    """Cast values like the temporary table column does.
+
+    :param values: The values of a field.
+    :type values: list
+    :param field_type: The database type of the field.
+    :type field_type: str
+    :return: Tuple of array of the values that are not None
+        and the mask of them.
+    :rtype: tuple
+    :raises ValueError: If a value of integer field has fraction.
+    """
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    valid = np.not_equal(array, None)
+    array = array[valid]
+    if field_type in INTEGER_TYPES:
+        numbers = array.astype(np.float64)
+        fractions = numbers[np.mod(numbers, 1) != 0]
+        if len(fractions):
+            raise ValueError(f'{fractions[0]} is not integer')
+        return array.astype(np.int64), valid
+    if field_type in NUMBER_TYPES:
+        return array.astype(np.float64), valid
+    if field_type in DATE_TYPES:
+        array = np.frompyfunc(_cast_date, 1, 1)(array)
+        dates = np.not_equal(array, None)
+        valid[valid] = dates
+        return array[dates], valid
+    return array.astype(str), valid
+
+
+def _codes(values: List, field_type: str):
+    """Return the code of each value, in the sorted order of values.
+
+    None has the last code, like PostgreSQL ASC.
+
+    :param values: The values of a field.
+    :type values: list
+    :param field_type: The database type of the field.
+    :type field_type: str
+    :return: Tuple of the codes and the values of codes.
+    :rtype: tuple
+    """
+    array, valid = _cast(values, field_type)
+    uniques, inverse = np.unique(array, return_inverse=True)
+    codes = np.full(len(values), len(uniques), dtype=np.int64)
+    codes[valid] = inverse.reshape(-1)
+    return codes, uniques.tolist() + [None]
+
+
+def query_rows(
+        data: List, fields: List, group_field: str,
+        aggregation_method: str, aggregation_field: str = None
+) -> List:
+    """Aggregate the data in memory.
+
+    This returns the rows in the same shape and order as the query
+    of :meth:`QueryDataImporter.querying_data` returns, so the rows can be
+    converted to records in the same way.
+    For SUM, MIN, MAX, AVG and COUNT, the rows are
+    (value, *group_values, count).
+    For MAJORITY and MINORITY, the rows are
+    (value, *group_values, count of value, count).
+
+    Ties of MAJORITY and MINORITY are resolved by numpy ordering of values,
+    which can differ from the database collation for strings.
+
+    :param data: The data that will be aggregated.
+    :type data: list
+    :param fields: List of fields definition.
+    :type fields: list
+    :param group_field: Field names that will be grouped, comma separated.
+    :type group_field: str
+    :param aggregation_method: Aggregation method.
+    :type aggregation_method: str
+    :param aggregation_field: Field that is aggregated.
+    :type aggregation_field: str
+    :return: The rows of aggregation.
+    :rtype: list
+    :raises KeyError: If a field does not exist.
+    :raises ValueError: If the method needs number field.
+    """
+    from geosight.importer.importers.query_data import (
+        Aggregations, QueryDataImporter
+    )
+    types = {
+        field['name'].lower(): QueryDataImporter.field_type(field).upper()
+        for field in fields
+    }
+    names = {field['name'].lower(): field['name'] for field in fields}
+    group_fields = [field.strip() for field in group_field.split(',')]
+    for field in group_fields + (
+            [aggregation_field] if aggregation_field else []
+    ):
+        if field.lower() not in types:
+            raise KeyError(f'{field} does not exist')
+    if not data:
+        return []
+
+    def _column(field):
+        """Return codes of the field.
+
+        :param field: The field name.
+        :type field: str
+        :return: Tuple of the codes and the values of codes.
+        :rtype: tuple
+        """
+        return _codes(
+            [row[names[field.lower()]] for row in data], types[field.lower()]
+        )
+
+    # Assign the group index for each row,
+    # the groups are sorted by the group values
+    columns = [_column(field) for field in group_fields]
+    groups, codes = np.unique(
+        np.stack([column_codes for column_codes, _ in columns], axis=1),
+        axis=0, return_inverse=True
+    )
+    codes = codes.reshape(-1)
+    keys = [
+        tuple(
+            columns[idx][1][code] for idx, code in enumerate(group)
+        )
+        for group in groups.tolist()
+    ]
+    counts = np.bincount(codes, minlength=len(keys)).tolist()
+
+    # COUNT
+    if aggregation_method == Aggregations.COUNT:
+        return [
+            (counts[code], *key, counts[code])
+            for code, key in enumerate(keys)
+        ]
+
+    field_type = types[aggregation_field.lower()]
+    values = [row[names[aggregation_field.lower()]] for row in data]
+
+    # MAJORITY and MINORITY
+    if aggregation_method in [Aggregations.MAJORITY, Aggregations.MINORITY]:
+        value_codes, value_uniques = _codes(values, field_type)
+        size = len(value_uniques)
+        pairs, totals = np.unique(
+            codes * size + value_codes, return_counts=True
+        )
+        pair_codes, pair_values = np.divmod(pairs, size)
+
+        # COUNT of value does not count the NULL
+        value_counts = np.where(pair_values == size - 1, 0, totals)
+
+        # ORDER BY count {ASC|DESC}, value ASC
+        order = np.lexsort(
+            (
+                pair_values,
+                value_counts
+                if aggregation_method == Aggregations.MAJORITY
+                else -value_counts
+            )
+        )
+        return [
+            (value_uniques[value], *keys[code], value_count, total)
+            for code, value, value_count, total in zip(
+                pair_codes[order].tolist(), pair_values[order].tolist(),
+                value_counts[order].tolist(), totals[order].tolist()
+            )
+        ]
+
+    # SUM, MIN, MAX, AVG
+    if field_type not in NUMBER_TYPES + INTEGER_TYPES:
+        if aggregation_method not in [Aggregations.MIN, Aggregations.MAX]:
+            raise ValueError(
+                f'{aggregation_method} needs number field.'
+            )
+        # The codes are in the order of values, None is the last
+        value_codes, value_uniques = _codes(values, field_type)
+        none_code = len(value_uniques) - 1
+        if aggregation_method == Aggregations.MIN:
+            aggregated = np.full(len(keys), none_code)
+            np.minimum.at(aggregated, codes, value_codes)
+        else:
+            aggregated = np.full(len(keys), none_code)
+            valid = value_codes != none_code
+            valid_groups = np.unique(codes[valid])
+            aggregated[valid_groups] = -1
+            np.maximum.at(aggregated, codes[valid], value_codes[valid])
+        results = [value_uniques[code] for code in aggregated.tolist()]
+    else:
+        array, valid = _cast(values, field_type)
+        valid_codes = codes[valid]
+        valid_values = array.astype(np.float64)
+        valid_counts = np.bincount(valid_codes, minlength=len(keys))
+        if aggregation_method in [Aggregations.SUM, Aggregations.AVG]:
+            aggregated = np.bincount(
+                valid_codes, weights=valid_values, minlength=len(keys)
+            )
+            if aggregation_method == Aggregations.AVG:
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    aggregated = aggregated / valid_counts
+        elif aggregation_method == Aggregations.MIN:
+            aggregated = np.full(len(keys), np.inf)
+            np.minimum.at(aggregated, valid_codes, valid_values)
+        else:
+            aggregated = np.full(len(keys), -np.inf)
+            np.maximum.at(aggregated, valid_codes, valid_values)
+        results = [
+            result if count else None
+            for result, count in zip(
+                aggregated.tolist(), valid_counts.tolist()
+            )
+        ]
+    return [
+        (results[code], *key, counts[code])
+        for code, key in enumerate(keys)
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 3.2.16 on 2026-10-18 00:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geosight_importer', '0024_alter_importer_modified_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImporterLogGeorepoJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id_type', models.CharField(max_length=256)),
+                ('codes', models.JSONField()),
+                ('status_url', models.TextField()),
+                ('output_url', models.TextField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Done', 'Done'), ('Failed', 'Failed')], default='Pending', max_length=100)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('attempts', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('log', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='geosight_importer.importerlog')),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.16 on 2026-10-18 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geosight_importer', '0025_importerloggeorepojob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImporterLogChunk',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lookups', models.JSONField()),
+                ('done', models.BooleanField(default=False)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('log', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='geosight_importer.importerlog')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ImporterLogValue',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('row', models.JSONField()),
+                ('chunk', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='geosight_importer.importerlogchunk')),
+                ('log_data', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='geosight_importer.importerlogdata')),
+            ],
+        ),
+    ]
@@ -19,7 +19,9 @@ from django.contrib.gis.db import models
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
+from requests.exceptions import Timeout
 
 from core.models.preferences import SitePreferences
 from geosight.importer.models.importer import Importer
@@ -180,9 +182,153 @@ class ImporterLogDataSaveProgress(models.Model):
             id__in=self.target_ids
         )
         importer = self.log.importer.importer(self.log)
-        for log_data in log_datas:
-            if log_data.id not in self.saved_ids:
-                importer._save_log_data_to_model(log_data)
-                self.saved_ids.append(log_data.id)
-                self.save()
+        if importer.is_bulk_save:
+            importer._bulk_save_log_data_to_model(
+                log_datas.exclude(id__in=self.saved_ids)
+            )
+            self.saved_ids = list(self.target_ids)
+            self.save()
+        else:
+            for log_data in log_datas:
+                if log_data.id not in self.saved_ids:
+                    importer._save_log_data_to_model(log_data)
+                    self.saved_ids.append(log_data.id)
+                    self.save()
         self.delete()
+
+
+class GeorepoJobStatus(object):
+    """Quick access for coupling variable with GeoRepo job status string."""
+
+    PENDING = 'Pending'
+    DONE = 'Done'
+    FAILED = 'Failed'
+
+
+class ImporterLogGeorepoJob(models.Model):
+    """GeoRepo job of identifying codes that the log waits for.
+
+    The job is submitted by the importer, then it is polled by a task,
+    so the importer does not hold the worker while GeoRepo works.
+    When every job of the log is done, the importer is run again and
+    it uses the output of the jobs.
+    """
+
+    # Maximum seconds of waiting the job
+    TIMEOUT = 4500
+
+    log = models.ForeignKey(ImporterLog, on_delete=models.CASCADE)
+    original_id_type = models.CharField(max_length=256)
+    codes = models.JSONField()
+    status_url = models.TextField()
+    output_url = models.TextField(blank=True, null=True)
+    status = models.CharField(
+        max_length=100,
+        choices=(
+            (GeorepoJobStatus.PENDING, _(GeorepoJobStatus.PENDING)),
+            (GeorepoJobStatus.DONE, _(GeorepoJobStatus.DONE)),
+            (GeorepoJobStatus.FAILED, _(GeorepoJobStatus.FAILED)),
+        ),
+        default=GeorepoJobStatus.PENDING
+    )
+    error = models.TextField(blank=True, null=True)
+    attempts = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @staticmethod
+    def submit(
+            log: ImporterLog, original_id_type: str, codes: list
+    ) -> 'ImporterLogGeorepoJob':
+        """Submit job of identifying the codes to GeoRepo.
+
+        :param log: The log that waits for the job.
+        :type log: ImporterLog
+        :param original_id_type: The type of the codes.
+        :type original_id_type: str
+        :param codes: The codes that are identified.
+        :type codes: list
+        :return: The job.
+        :rtype: ImporterLogGeorepoJob
+        """
+        from geosight.georepo.request import GeorepoRequest
+        pooling = GeorepoRequest().View.submit_identify_codes(
+            reference_layer_identifier=log.importer.reference_layer.identifier,
+            codes=codes,
+            original_id_type=original_id_type
+        )
+        return ImporterLogGeorepoJob.objects.create(
+            log=log,
+            original_id_type=original_id_type,
+            codes=codes,
+            status_url=pooling.callback_url
+        )
+
+    @property
+    def pooling(self):
+        """Return the pooling of the job."""
+        from geosight.georepo.request import (
+            GeorepoPostPooling, GeorepoRequest
+        )
+        return GeorepoPostPooling(
+            GeorepoRequest(), callback_url=self.status_url
+        )
+
+    @property
+    def next_interval(self) -> float:
+        """Return seconds before the next poll, with exponential backoff."""
+        from geosight.georepo.request import GeorepoPostPooling
+        return GeorepoPostPooling.interval(self.attempts)
+
+    def poll(self) -> None:
+        """Check the status of the job once, without waiting."""
+        from geosight.georepo.request import GeorepoRequestError
+        if self.status != GeorepoJobStatus.PENDING:
+            return
+        self.attempts += 1
+        try:
+            output_url = self.pooling.check()
+            if output_url:
+                self.output_url = output_url
+                self.status = GeorepoJobStatus.DONE
+        except GeorepoRequestError as e:
+            self.status = GeorepoJobStatus.FAILED
+            self.error = f'Error when identifying codes - {e}'
+        except Timeout:
+            pass
+
+        if self.status == GeorepoJobStatus.PENDING and (
+                timezone.now() - self.created_at
+        ).total_seconds() > self.TIMEOUT:
+            self.status = GeorepoJobStatus.FAILED
+            self.error = 'Identifying codes from GeoRepo is timeout.'
+        self.save()
+
+    def results(self) -> dict:
+        """Return the output of the job.
+
+        :return: Dictionary of code and list of GeoRepo entities.
+        :rtype: dict
+        """
+        return self.pooling.output(self.output_url)
+
+
+class ImporterLogChunk(models.Model):
+    """Chunk of the log data that is staged by a subtask.
+
+    The chunks are staged in parallel, the subtask that finishes
+    the last chunk publishes every chunk in one transaction.
+    """
+
+    log = models.ForeignKey(ImporterLog, on_delete=models.CASCADE)
+    lookups = models.JSONField()
+    done = models.BooleanField(default=False)
+    error = models.TextField(blank=True, null=True)
+
+
+class ImporterLogValue(models.Model):
+    """Validated row of log data, staged until the chunks are published."""
+
+    id = models.BigAutoField(primary_key=True)
+    chunk = models.ForeignKey(ImporterLogChunk, on_delete=models.CASCADE)
+    log_data = models.ForeignKey(ImporterLogData, on_delete=models.CASCADE)
+    row = models.JSONField()
@@ -20,6 +20,9 @@ from core.celery import app
 from geosight.importer.models import (
     Importer, ImporterLog, ImporterLogDataSaveProgress
 )
+from geosight.importer.models.log import (
+    GeorepoJobStatus, ImporterLogChunk, LogStatus
+)
 
 logger = get_task_logger(__name__)
 
@@ -40,6 +43,40 @@ def run_importer(_id, log_id=None):
         importer.run(log=log)
 
 
+@app.task
+def poll_georepo_jobs(log_id) -> None:
+    """Poll the GeoRepo jobs of log once, then resume the importer.
+
+    When some jobs are still pending, it is scheduled again
+    with exponential backoff, so no worker is held while waiting.
+
+    :param log_id: Id of the importer log.
+    :type log_id: int
+    """
+    try:
+        log = ImporterLog.objects.get(id=log_id)
+    except ImporterLog.DoesNotExist:
+        logger.error(f'Importer log {log_id} does not exist')
+        return
+    if log.status != LogStatus.RUNNING:
+        return
+
+    jobs = log.importerloggeorepojob_set.filter(
+        status=GeorepoJobStatus.PENDING
+    )
+    for job in jobs:
+        job.poll()
+
+    pending = list(jobs.all())
+    if pending:
+        poll_georepo_jobs.apply_async(
+            (log_id,),
+            countdown=min(job.next_interval for job in pending)
+        )
+    else:
+        run_importer.delay(log.importer_id, log.id)
+
+
 @app.task
 def run_save_log_data(_id):
     """Run importer by id."""
@@ -59,3 +96,75 @@ def calculate_data_counts(_id):
     log.total_count = log_datas.count()
     log.success_count = success_log_datas.count()
     log.save()
+
+
+@app.task
+def save_importer_chunk(_id, note='') -> None:
+    """Stage a chunk of the log data of importer.
+
+    The task that finishes the last chunk merges the chunks.
+
+    :param _id: Id of the importer log chunk.
+    :type _id: int
+    :param note: Note of the process of the data.
+    :type note: str
+    """
+    try:
+        chunk = ImporterLogChunk.objects.get(id=_id)
+    except ImporterLogChunk.DoesNotExist:
+        logger.error(f'Importer log chunk {_id} does not exist')
+        return
+    log = chunk.log
+    if log.importer.importer(log).stage_chunk(chunk):
+        merge_importer_chunks.delay(log.id, note)
+
+
+@app.task
+def merge_importer_chunks(log_id, note='') -> None:
+    """Publish the staged chunks of the log and finish it.
+
+    :param log_id: Id of the importer log.
+    :type log_id: int
+    :param note: Note of the process of the data.
+    :type note: str
+    """
+    try:
+        log = ImporterLog.objects.get(id=log_id)
+    except ImporterLog.DoesNotExist:
+        logger.error(f'Importer log {log_id} does not exist')
+        return
+    log.importer.importer(log).merge_chunks(note)
+
+
+@app.task
+def expire_importer_chunks(log_id, note='', done=0) -> None:
+    """Fail the chunks of the log when none of them is done in time.
+
+    A chunk whose task is lost would keep the log running forever.
+    It is scheduled again while the chunks are still progressing.
+    When every chunk is done but the merge task is lost,
+    the chunks are merged.
+
+    :param log_id: Id of the importer log.
+    :type log_id: int
+    :param note: Note of the process of the data.
+    :type note: str
+    :param done: Number of chunks that were done on the last check.
+    :type done: int
+    """
+    try:
+        log = ImporterLog.objects.get(id=log_id)
+    except ImporterLog.DoesNotExist:
+        logger.error(f'Importer log {log_id} does not exist')
+        return
+    if log.status != LogStatus.RUNNING:
+        return
+    chunks = log.importerlogchunk_set.all()
+    done_count = chunks.filter(done=True).count()
+    importer = log.importer.importer(log)
+    if done_count > done and chunks.filter(done=False).exists():
+        expire_importer_chunks.apply_async(
+            (log_id, note, done_count), countdown=importer.chunk_timeout
+        )
+        return
+    importer.merge_chunks(note, expire=True)
@@ -14,9 +14,12 @@ __author__ = 'irwan@kartoza.com'
 __date__ = '13/06/2023'
 __copyright__ = ('Copyright 2023, Unicef')
 
+from .entity_resolver import *
 from .excel import *
 from .formula_based_on_other_indicators import *
 from .functions import *
+from .georepo_job import *
+from .query_data import *
 from .related_table import *
 from .schedule import *
 from .sharepoint import *
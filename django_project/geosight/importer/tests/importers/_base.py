@@ -30,7 +30,7 @@ from geosight.data.tests.model_factories import (
 from geosight.georepo.models.entity import EntityCode
 from geosight.georepo.request.data import GeorepoEntity
 from geosight.georepo.tests.mock import (
-    mock_get_entity, need_review, check_country
+    mock_get_entity, mock_resolver_get_entity, need_review, check_country
 )
 from geosight.georepo.tests.model_factories import ReferenceLayerF
 from geosight.importer.models import ImporterLog
@@ -139,18 +139,26 @@ class BaseImporterTest(TestCase):
             'geosight.georepo.models.entity.Entity.get_entity',
             mock_get_entity
         )
+        self.resolver_patcher = patch(
+            'geosight.importer.importers.entity_resolver.'
+            'EntityResolver.get_entity',
+            mock_resolver_get_entity
+        )
         self.review_patcher = patch(
             'geosight.importer.models.importer.Importer.need_review',
             need_review
         )
         self.entity_patcher.start()
+        self.resolver_patcher.start()
         self.review_patcher.start()
         self.addCleanup(self.entity_patcher.stop)
+        self.addCleanup(self.resolver_patcher.stop)
         self.addCleanup(self.review_patcher.stop)
 
     def tearDown(self):
         """Stop the patcher."""
         self.entity_patcher.stop()
+        self.resolver_patcher.stop()
         self.review_patcher.stop()
         self.auto_fetch_country.stop()
         super().tearDown()
@@ -0,0 +1,119 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from datetime import datetime
+from unittest.mock import patch
+
+from core.tests.base_tests import TestCase
+from geosight.georepo.models.entity import Entity, EntityCode
+from geosight.georepo.request import GeorepoEntityDoesNotExist
+from geosight.georepo.request.data import GeorepoEntity
+from geosight.georepo.tests.mock import check_country
+from geosight.georepo.tests.model_factories import ReferenceLayerF
+from geosight.importer.importers.entity_resolver import EntityResolver
+
+
+class EntityResolverTest(TestCase):
+    """Test for entity resolver."""
+
+    def setUp(self):
+        """To setup tests."""
+        patcher = patch(
+            'geosight.georepo.models.entity.Entity.check_country',
+            check_country
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.reference_layer = ReferenceLayerF()
+        GeorepoEntity(
+            {'name': 'A', 'ucode': 'A', 'admin_level': 0}
+        ).get_or_create(self.reference_layer)
+        for ucode in ['AA', 'AB']:
+            entity, _ = GeorepoEntity(
+                {
+                    'name': ucode,
+                    'ucode': ucode,
+                    'admin_level': 1,
+                    'parents': [{'ucode': 'A', 'admin_level': 0}]
+                }
+            ).get_or_create(self.reference_layer)
+            EntityCode.objects.create(
+                entity=entity, code=f'code_{ucode}', code_type='custom_code'
+            )
+        self.date_time = datetime.timestamp(datetime(2020, 1, 1))
+
+    def test_get_entity(self):
+        """Test get entity from the prefetched codes."""
+        resolver = EntityResolver(self.reference_layer)
+        resolver.prefetch('ucode', ['A', 'AA', 'AA', 'AB', 'X', None])
+        self.assertEqual(resolver.queries, 1)
+
+        for ucode in ['A', 'AA', 'AB', 'AA']:
+            entity = resolver.get_entity(
+                'ucode', ucode, date_time=self.date_time, auto_fetch=False
+            )
+            self.assertEqual(entity.geom_id, ucode)
+        with self.assertRaises(GeorepoEntityDoesNotExist):
+            resolver.get_entity(
+                'ucode', 'X', date_time=self.date_time, auto_fetch=False
+            )
+        with self.assertRaises(GeorepoEntityDoesNotExist):
+            resolver.get_entity(
+                'ucode', 'AA', admin_level=0,
+                date_time=self.date_time, auto_fetch=False
+            )
+        self.assertEqual(resolver.hits, 5)
+        self.assertEqual(resolver.misses, 1)
+        self.assertEqual(resolver.queries, 1)
+
+    def test_get_entity_by_code(self):
+        """Test get entity by other code type."""
+        resolver = EntityResolver(self.reference_layer)
+        resolver.prefetch('custom_code', ['code_AA', 'code_AB'])
+        entity = resolver.get_entity(
+            'custom_code', 'code_AB', admin_level=1,
+            date_time=self.date_time, auto_fetch=False
+        )
+        self.assertEqual(entity.geom_id, 'AB')
+
+        # The index has every code of the view, it is loaded once
+        with self.assertRaises(GeorepoEntityDoesNotExist):
+            resolver.get_entity(
+                'custom_code', 'code_AC',
+                date_time=self.date_time, auto_fetch=False
+            )
+        self.assertEqual(resolver.queries, 1)
+
+    def test_get_entity_not_found(self):
+        """Test the code that is not found is requested just once."""
+        resolver = EntityResolver(self.reference_layer)
+        with patch.object(
+                Entity, 'get_entity', side_effect=GeorepoEntityDoesNotExist
+        ) as get_entity:
+            for _ in range(3):
+                with self.assertRaises(GeorepoEntityDoesNotExist):
+                    resolver.get_entity(
+                        'ucode', 'X', date_time=self.date_time
+                    )
+            self.assertEqual(get_entity.call_count, 1)
+
+            # The code that is not identified is not requested
+            resolver.add_identified('ucode', ['Y'], {})
+            with self.assertRaises(GeorepoEntityDoesNotExist):
+                resolver.get_entity('ucode', 'Y', date_time=self.date_time)
+            self.assertEqual(get_entity.call_count, 1)
+        self.assertEqual(resolver.misses, 4)
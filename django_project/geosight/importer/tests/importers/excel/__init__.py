@@ -18,3 +18,4 @@ from .long_indicator_value import *
 from .long_indicator_value_with_code_type import *
 from .wide_indicator_value import *
 from .wide_related_table import *
+from .records import *
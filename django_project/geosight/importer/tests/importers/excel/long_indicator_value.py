@@ -28,7 +28,9 @@ from geosight.importer.importers.base.indicator_value import (
     ImporterTimeDataType, AdminLevelType, MultipleValueAggregationType
 )
 from geosight.importer.models import Importer, ImportType, InputFormat
-from geosight.importer.models.log import LogStatus
+from geosight.importer.models.log import (
+    ImporterLogChunk, ImporterLogValue, LogStatus
+)
 from geosight.importer.tests.importers._base import (
     BaseIndicatorValueImporterTest
 )
@@ -150,6 +152,131 @@ class ExcelLongFormatIndicatorValueTest(BaseIndicatorValueImporterTest):
 
         self.assertImporter(self.importer)
 
+    def run_in_chunks(self, lost=None):
+        """Run the importer with the chunk tasks in the process.
+
+        The chunk tasks of index in lost are not run.
+        """
+        from geosight.importer.tasks import (
+            merge_importer_chunks, save_importer_chunk
+        )
+        filepath = ABS_PATH(
+            'geosight', 'importer', 'tests', 'importers',
+            '_fixtures', 'excel_long_indicator_value.xlsx'
+        )
+        with open(filepath, 'rb') as _file:
+            attributes = {**self.attributes, 'chunk_size': 2}
+            files = {
+                'file': File(_file, name=os.path.basename(_file.name))
+            }
+            self.importer.save_attributes(attributes, files)
+
+        chunks = []
+
+        def _save_importer_chunk(_id, note):
+            """Run the chunk task, unless it is lost."""
+            chunks.append(ImporterLogChunk.objects.get(id=_id).lookups)
+            if len(chunks) - 1 not in (lost or []):
+                save_importer_chunk(_id, note)
+
+        with patch(
+                'geosight.importer.tasks.save_importer_chunk.delay',
+                side_effect=_save_importer_chunk
+        ), patch(
+            'geosight.importer.tasks.merge_importer_chunks.delay',
+            side_effect=merge_importer_chunks
+        ), patch(
+            'geosight.importer.tasks.expire_importer_chunks.apply_async'
+        ):
+            self.importer.run()
+        return self.importer.importerlog_set.all().last(), chunks
+
+    def test_run_in_chunks(self):
+        """Test the data is saved in chunks."""
+        log, chunks = self.run_in_chunks()
+        self.assertEqual(log.status, LogStatus.SUCCESS)
+
+        # Every indicator is split into the chunks of 2 data
+        indicator_ids = set()
+        for lookups in chunks:
+            indicator_ids.add(lookups['data__indicator_id'])
+            self.assertLessEqual(
+                log.importerlogdata_set.filter(**lookups).count(), 2
+            )
+        self.assertEqual(
+            indicator_ids, {self.indicator_1.id, self.indicator_2.id}
+        )
+        self.assertGreater(len(chunks), len(indicator_ids))
+        self.assertEqual(log.success_count, log.total_count)
+        self.assertFalse(log.importerlogchunk_set.exists())
+        self.assertFalse(
+            ImporterLogValue.objects.filter(chunk__log=log).exists()
+        )
+        self.assertEqual(
+            self.indicator_1.query_values(
+                reference_layer=self.reference_layer,
+                admin_level=self.admin_level
+            ).get(geom_id='A').val,
+            1
+        )
+
+    def test_run_in_chunks_error(self):
+        """Test no data is saved when a chunk is failed."""
+        stage_log_data = IndicatorValueExcelLongFormat._stage_log_data
+        staged = []
+
+        def _stage_log_data(importer, chunk, log_datas):
+            """Fail on the second chunk."""
+            staged.append(chunk.id)
+            if len(staged) == 2:
+                raise ValueError('Chunk is failed')
+            stage_log_data(importer, chunk, log_datas)
+
+        with patch.object(
+                IndicatorValueExcelLongFormat, '_stage_log_data',
+                _stage_log_data
+        ):
+            log, _ = self.run_in_chunks()
+        self.assertEqual(log.status, LogStatus.FAILED)
+        self.assertIn('No data saved', log.note)
+        self.assertEqual(log.success_count, 0)
+        self.assertFalse(
+            IndicatorValue.objects.filter(
+                indicator__in=[self.indicator_1, self.indicator_2]
+            ).exists()
+        )
+
+    def test_run_in_chunks_lost(self):
+        """Test the log is failed when the task of a chunk is lost."""
+        from geosight.importer.tasks import expire_importer_chunks
+        log, chunks = self.run_in_chunks(lost=[1])
+        self.assertEqual(log.status, LogStatus.RUNNING)
+        done = log.importerlogchunk_set.filter(done=True).count()
+        self.assertEqual(done, len(chunks) - 1)
+
+        # Still progressing, it is checked again
+        with patch(
+                'geosight.importer.tasks.expire_importer_chunks.apply_async'
+        ) as apply_async:
+            expire_importer_chunks(log.id, '', 0)
+        apply_async.assert_called_once()
+        self.assertEqual(apply_async.call_args[0][0], (log.id, '', done))
+
+        # No chunk is done since the last check
+        expire_importer_chunks(log.id, '', done)
+        log.refresh_from_db()
+        self.assertEqual(log.status, LogStatus.FAILED)
+        self.assertIn('Chunk is not saved', log.note)
+        self.assertFalse(log.importerlogchunk_set.exists())
+        self.assertFalse(
+            ImporterLogValue.objects.filter(chunk__log=log).exists()
+        )
+        self.assertFalse(
+            IndicatorValue.objects.filter(
+                indicator__in=[self.indicator_1, self.indicator_2]
+            ).exists()
+        )
+
     @patch(
         'django.db.models.fields.files.FieldFile.save',
         side_effect=FileNotFoundError("File does not found")
@@ -0,0 +1,58 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from core.settings.utils import ABS_PATH
+from core.tests.base_tests import TestCase
+from geosight.importer.exception import ImporterError
+from geosight.importer.importers.excel._base import ExcelRecords
+
+
+class ExcelRecordsTest(TestCase):
+    """Test for the lazy records of excel."""
+
+    filepath = ABS_PATH(
+        'geosight', 'importer', 'tests', 'importers',
+        '_fixtures', 'excel_wide_related_table.xlsx'
+    )
+
+    def test_records(self):
+        """Test the records are read lazily from the header."""
+        with open(self.filepath, 'rb') as _file:
+            records = ExcelRecords(
+                _file, 'Sheet 1', 1, {'geom_code': 'code'}
+            )
+            self.assertTrue(len(records) >= 9)
+            rows = [record for record in records if record['code']]
+            self.assertEqual(len(rows), 9)
+            self.assertEqual(len(rows[0].keys()), 7)
+            self.assertEqual(rows[0]['geom_code'], 'A')
+            self.assertEqual(rows[0]['code'], 'A')
+            self.assertEqual(rows[0]['Population'], 1)
+
+            # Read again
+            self.assertEqual(
+                [record for record in records if record['code']], rows
+            )
+
+            # The header is the second row
+            records = ExcelRecords(_file, 'Sheet 1', 2, {})
+            self.assertEqual(len([record for record in records if record]), 8)
+
+    def test_sheet_does_not_exist(self):
+        """Test the error of sheet."""
+        with open(self.filepath, 'rb') as _file:
+            with self.assertRaises(ImporterError):
+                ExcelRecords(_file, 'Sheet 2', 1, {})
@@ -0,0 +1,141 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from core.tests.base_tests import TestCase
+from geosight.importer.importers.formula_based_on_other_indicators import (
+    FormulaBasedOnOtherIndicatorsIndicatorValue
+)
+from geosight.importer.importers.formula_based_on_other_indicators.expression import (  # noqa: E501
+    ExpressionError, ExpressionNotSupported, FormulaExpression
+)
+from .base import expression_1, expression_2, expression_3, expression_4
+
+
+class FormulaExpressionTest(TestCase):
+    """Test for in process expression of formula based importer."""
+
+    def setUp(self):
+        """To setup tests."""
+        self.admin_boundary = {
+            'concept_uuid': 'Concept Id 1',
+            'geom_code': 'Geom_1',
+            'admin_level': 0,
+            'indicators': {
+                'TEST_1': [
+                    {'value': 10, 'time': '2020-01-01T00:00:00+00:00'},
+                    {'value': 20, 'time': '2020-02-01T00:00:00+00:00'},
+                ],
+                'TEST_2': [
+                    {'value': 20, 'time': '2020-01-01T00:00:00+00:00'},
+                    {'value': 100, 'time': '2020-02-01T00:00:00+00:00'},
+                ]
+            },
+            'children': [],
+            'siblings': []
+        }
+
+    def render(self, expression):
+        """Render expression and return the record."""
+        output = FormulaExpression(expression).render(self.admin_boundary)
+        return FormulaBasedOnOtherIndicatorsIndicatorValue.record_from_output(
+            self.admin_boundary, output
+        )
+
+    def test_expression(self):
+        """Test the expressions."""
+        for expression, value in [
+            (expression_1, '150'),
+            (expression_2, '3600'),
+            (expression_3, '30'),
+            (expression_4, '75'),
+        ]:
+            record = self.render(expression)
+            self.assertEqual(record['value'], value)
+            self.assertEqual(record['time'], '2020-12-31T00:00:00')
+            self.assertEqual(record['geom_code'], 'Geom_1')
+
+    def test_not_supported(self):
+        """Test the expression that is not supported."""
+        with self.assertRaises(ExpressionNotSupported):
+            FormulaExpression('{{ [1, 2].map(x => x) }}')
+        with self.assertRaises(ExpressionNotSupported):
+            self.render(
+                '{{ get_value("TEST_3", "current", null, "now", "sum") + 1 }}'
+            )
+
+    def test_javascript_semantics(self):
+        """Test the output follows javascript like Nunjucks does."""
+        for expression, output in [
+            ('{{ [1, 2.0, null, true] }}', '1,2,,true'),
+            ('{{ "a" ~ [1, 2] }}', 'a1,2'),
+            ('{{ {} }}', '[object Object]'),
+            ('{% if [] %}a{% else %}b{% endif %}', 'a'),
+            (
+                    '{% if get_values("TEST_3", "current", null, "now") %}'
+                    'a{% else %}b{% endif %}',
+                    'a'
+            ),
+            ('{{ 1 == 1.0 }}', 'true'),
+            ('{{ "a" != "b" }}', 'true'),
+            ('{{ null == 0 }}', 'false'),
+            ('{{ 10 / 2 ~ "x" }}', '5x'),
+            ('{{ "a" ~ true }}', 'atrue'),
+            ('{{ null ~ "a" ~ x }}', 'nullaundefined'),
+            ('{{ -7 % 3 }}', '-1'),
+            ('{{ 7 % -3 }}', '1'),
+            ('{{ -7.5 % 2 }}', '-1.5'),
+            ('{{ 2.5|round }}', '3'),
+            ('{{ -2.5|round }}', '-2'),
+            ('{{ 1.23456|round(3) }}', '1.235'),
+            ('{{ 2 ** 70 }}', '1.1805916207174113e+21'),
+            ('{{ 0.0000001 }}', '1e-7'),
+            ('{{ 0.1 + 0.2 }}', '0.30000000000000004'),
+        ]:
+            self.assertEqual(
+                FormulaExpression(expression).render(self.admin_boundary),
+                output
+            )
+
+        # Coercion of javascript is evaluated by the browser
+        for expression in [
+            '{{ 1 == "1" }}',
+            '{% if 1 != "1" %}a{% endif %}',
+            '{{ [1] == [1] }}',
+            '{{ [1] + [2] }}',
+            '{{ x == null }}',
+            '{{ "a" % 2 }}',
+            '{{ 1 % 0 }}',
+            '{{ "a"|round }}',
+        ]:
+            with self.assertRaises(ExpressionNotSupported):
+                FormulaExpression(expression).render(self.admin_boundary)
+        with self.assertRaises(ExpressionNotSupported):
+            FormulaExpression('{{ 1 == 1 == 1 }}')
+
+        # Nunjucks does not parse the exponent of number
+        with self.assertRaises(ExpressionNotSupported):
+            FormulaExpression('{{ 1e21 }}')
+
+    def test_error(self):
+        """Test the expression error."""
+        with self.assertRaises(ExpressionError):
+            self.render(
+                '{{ get_value("TEST_1", "current", null, "now", "test") }}'
+            )
+        with self.assertRaises(ExpressionError):
+            self.render(
+                '{{ get_value("TEST_1", "current", null, "test", "sum") }}'
+            )
@@ -0,0 +1,158 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from core.tests.base_tests import TestCase
+from geosight.georepo.request import GeorepoPostPooling, GeorepoRequestError
+from geosight.georepo.tests.model_factories import ReferenceLayerF
+from geosight.importer.exception import ImporterError, ImporterWaiting
+from geosight.importer.importers.base.indicator_value import (
+    AbstractImporterIndicatorValue
+)
+from geosight.importer.models import (
+    Importer, ImportType, InputFormat, ImporterLog
+)
+from geosight.importer.models.log import (
+    GeorepoJobStatus, ImporterLogGeorepoJob, LogStatus
+)
+from geosight.importer.tasks import poll_georepo_jobs
+
+CHECK = 'geosight.georepo.request.request.GeorepoPostPooling.check'
+OUTPUT = 'geosight.georepo.request.request.GeorepoPostPooling.output'
+SUBMIT = (
+    'geosight.georepo.request.request.GeorepoRequest.ViewRequest.'
+    'submit_identify_codes'
+)
+
+
+class ImporterGeorepoJobTest(TestCase):
+    """Test for GeoRepo job of importer."""
+
+    databases = {'default', 'temp'}
+
+    def setUp(self):
+        """To setup test."""
+        self.importer = Importer.objects.create(
+            import_type=ImportType.INDICATOR_VALUE,
+            input_format=InputFormat.SDMX,
+            reference_layer=ReferenceLayerF()
+        )
+        self.log = ImporterLog.objects.create(
+            importer=self.importer, status=LogStatus.RUNNING
+        )
+
+    def create_job(self, codes):
+        """Create job of log."""
+        return ImporterLogGeorepoJob.objects.create(
+            log=self.log, original_id_type='PCode', codes=codes,
+            status_url='http://georepo/status'
+        )
+
+    def test_interval(self):
+        """Test the interval is increased until the maximum."""
+        self.assertEqual(GeorepoPostPooling.interval(0), 5)
+        self.assertEqual(GeorepoPostPooling.interval(2), 20)
+        self.assertEqual(
+            GeorepoPostPooling.interval(100), GeorepoPostPooling.MAX_INTERVAL
+        )
+
+    def test_results_retry_timeout(self):
+        """Test a timeout on checking or on the output is retried."""
+        pooling = GeorepoPostPooling(
+            MagicMock(), callback_url='http://georepo/status'
+        )
+        timeout = requests.exceptions.Timeout()
+        with patch(
+                CHECK, side_effect=[timeout, 'http://georepo/output']
+        ) as check, patch(
+            OUTPUT, side_effect=[timeout, {'A': []}]
+        ) as output, patch('time.sleep'):
+            self.assertEqual(pooling.results(), {'A': []})
+        self.assertEqual(check.call_count, 2)
+        self.assertEqual(output.call_count, 2)
+
+    def test_poll(self):
+        """Test poll the job once."""
+        job = self.create_job(['A'])
+        with patch(CHECK, return_value=None):
+            job.poll()
+        self.assertEqual(job.status, GeorepoJobStatus.PENDING)
+        self.assertEqual(job.attempts, 1)
+
+        with patch(CHECK, return_value='http://georepo/output'):
+            job.poll()
+        self.assertEqual(job.status, GeorepoJobStatus.DONE)
+        self.assertEqual(job.output_url, 'http://georepo/output')
+
+        job = self.create_job(['B'])
+        with patch(CHECK, side_effect=GeorepoRequestError('ERROR')):
+            job.poll()
+        self.assertEqual(job.status, GeorepoJobStatus.FAILED)
+        self.assertIn('ERROR', job.error)
+
+    def test_poll_task(self):
+        """Test the task reschedules or resumes the importer."""
+        self.create_job(['A'])
+        with patch.object(
+                poll_georepo_jobs, 'apply_async'
+        ) as apply_async, patch(
+            'geosight.importer.tasks.run_importer.delay'
+        ) as run_importer:
+            with patch(CHECK, return_value=None):
+                poll_georepo_jobs(self.log.id)
+            apply_async.assert_called_once()
+            run_importer.assert_not_called()
+
+            with patch(CHECK, return_value='http://georepo/output'):
+                poll_georepo_jobs(self.log.id)
+            run_importer.assert_called_once_with(
+                self.importer.id, self.log.id
+            )
+
+    def test_check_codes(self):
+        """Test check codes submits the jobs and uses the output."""
+        importer = AbstractImporterIndicatorValue(self.log)
+        importer.entity_resolver.identify_step = 2
+        pooling = MagicMock(callback_url='http://georepo/status')
+        with patch(SUBMIT, return_value=pooling) as submit:
+            with self.assertRaises(ImporterWaiting):
+                importer.check_codes(['A', 'B', 'C', 'A'])
+            self.assertEqual(submit.call_count, 2)
+
+        # Still waiting
+        importer = AbstractImporterIndicatorValue(self.log)
+        with self.assertRaises(ImporterWaiting):
+            importer.check_codes(['A', 'B', 'C'])
+
+        # Resumed from the output
+        self.log.importerloggeorepojob_set.update(
+            status=GeorepoJobStatus.DONE, output_url='http://georepo/output'
+        )
+        importer = AbstractImporterIndicatorValue(self.log)
+        with patch(OUTPUT, return_value={'A': [{'ucode': 'A'}]}):
+            results = importer.check_codes(['A', 'B', 'C'])
+        self.assertEqual(results, {'A': [{'ucode': 'A'}]})
+
+        # Failed
+        self.log.importerloggeorepojob_set.update(
+            status=GeorepoJobStatus.FAILED, error='Error'
+        )
+        importer = AbstractImporterIndicatorValue(self.log)
+        with self.assertRaises(ImporterError):
+            importer.check_codes(['A'])
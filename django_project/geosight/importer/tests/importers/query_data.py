@@ -0,0 +1,147 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+import random
+import uuid
+
+from django.conf import settings
+
+from core.tests.base_tests import TestCase
+from geosight.importer.importers.query_data import (
+    AggregationEngine, QueryDataImporter
+)
+
+
+class _Importer:
+    """Importer with unique data table name."""
+
+    def __init__(self):
+        """Init."""
+        self.data_table_name = (
+            f'{settings.TEMP_SCHEMA_NAME}.temp_data_{uuid.uuid4().hex}'
+        )
+
+
+class _QueryData(QueryDataImporter):
+    """Query data importer with selected engine."""
+
+    def __init__(self, engine):
+        """Init."""
+        self.importer = _Importer()
+        self.attributes = {'aggregation_engine': engine}
+
+
+class QueryDataEngineParityTest(TestCase):
+    """Test the in memory aggregation has same result with SQL."""
+
+    databases = {'default', 'temp'}
+
+    fields = [
+        {'name': 'indicator_id', 'type': 'INTEGER'},
+        {'name': 'date_time', 'type': 'NUMBER'},
+        {'name': 'geo_code', 'type': 'VARCHAR'},
+        {'name': 'reference_layer_identifier', 'type': 'VARCHAR'},
+        {'name': 'admin_level', 'type': 'INTEGER'},
+        {'name': 'value', 'type': 'DOUBLE PRECISION'},
+        {'name': 'category', 'type': 'VARCHAR'},
+    ]
+    group_field = (
+        'indicator_id,date_time,geo_code,admin_level,'
+        'reference_layer_identifier'
+    )
+
+    def setUp(self):
+        """To setup test."""
+        random.seed(0)
+        self.data = []
+        for idx in range(500):
+            self.data.append(
+                {
+                    'indicator_id': random.choice([1, 2]),
+                    'date_time': random.choice(
+                        [1577836800, 1609459200]
+                    ),
+                    'geo_code': random.choice(['A', 'AA', 'AB', 'B']),
+                    'reference_layer_identifier': 'view',
+                    'admin_level': random.choice([0, 1]),
+                    'value': random.choice(
+                        [None, 0, 1.5, 2, 10, -3.25, random.random()]
+                    ),
+                    'category': random.choice(
+                        [None, 'a', 'b', 'c', "it's"]
+                    ),
+                }
+            )
+
+    def query(self, engine, aggregation):
+        """Return sorted records of the engine."""
+        query_data = _QueryData(engine)
+        records = query_data.querying_data(
+            data=self.data,
+            fields=self.fields,
+            group_field=self.group_field,
+            aggregation=aggregation
+        )
+        query_data.clean_query_data()
+        return sorted(
+            records,
+            key=lambda record: [
+                f'{record[field]}' for field in self.group_field.split(',')
+            ]
+        )
+
+    def assert_parity(self, aggregation):
+        """Assert the engines return same records."""
+        sql_records = self.query(AggregationEngine.SQL, aggregation)
+        memory_records = self.query(AggregationEngine.MEMORY, aggregation)
+        self.assertEqual(len(sql_records), len(memory_records))
+        for sql_record, memory_record in zip(sql_records, memory_records):
+            self.assertEqual(sql_record.keys(), memory_record.keys())
+            for key, value in sql_record.items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(value, memory_record[key])
+                else:
+                    self.assertEqual(value, memory_record[key])
+
+    def test_count(self):
+        """Test COUNT."""
+        self.assert_parity('COUNT(value)')
+
+    def test_sum(self):
+        """Test SUM."""
+        self.assert_parity('SUM(value)')
+
+    def test_min(self):
+        """Test MIN."""
+        self.assert_parity('MIN(value)')
+
+    def test_max(self):
+        """Test MAX."""
+        self.assert_parity('MAX(value)')
+
+    def test_avg(self):
+        """Test AVG."""
+        self.assert_parity('AVG(value)')
+
+    def test_majority(self):
+        """Test MAJORITY."""
+        self.assert_parity('MAJORITY(value)')
+        self.assert_parity('MAJORITY(category)')
+
+    def test_minority(self):
+        """Test MINORITY."""
+        self.assert_parity('MINORITY(value)')
+        self.assert_parity('MINORITY(category)')
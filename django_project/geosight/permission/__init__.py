@@ -26,5 +26,12 @@ class Config(AppConfig):
     name = 'geosight.permission'
     verbose_name = "GeoSight Permission"
 
+    def ready(self):
+        """Connect the signals of permission models."""
+        from geosight.permission.models.effective_permission import (
+            connect_permission_signals
+        )
+        connect_permission_signals(self.get_models())
+
 
 default_app_config = 'geosight.permission.Config'
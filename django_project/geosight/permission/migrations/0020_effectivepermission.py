@@ -0,0 +1,49 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('geosight_permission', '0019_alter_groupmodelpermission_modified_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EffectivePermission',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=256)),
+                ('permission', models.CharField(max_length=16)),
+                ('generated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'resource', 'permission')},
+            },
+        ),
+        migrations.CreateModel(
+            name='EffectivePermissionObject',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('object_id', models.BigIntegerField()),
+                ('effective_permission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='geosight_permission.effectivepermission')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='effectivepermission',
+            index=models.Index(fields=['resource'], name='geosight_pe_resourc_1c7d68_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='effectivepermission',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('resource', 'permission'), name='unique_anonymous_effective_permission'),
+        ),
+        migrations.AddIndex(
+            model_name='effectivepermissionobject',
+            index=models.Index(fields=['effective_permission', 'object_id'], name='geosight_pe_effecti_dac5e1_idx'),
+        ),
+    ]
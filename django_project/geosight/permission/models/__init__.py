@@ -14,5 +14,8 @@ __author__ = 'irwan@kartoza.com'
 __date__ = '13/06/2023'
 __copyright__ = ('Copyright 2023, Unicef')
 
+from .effective_permission import (
+    EffectivePermission, EffectivePermissionObject
+)
 from .factory import PermissionDetail, PERMISSIONS_LENGTH, PERMISSIONS
 from .resource import *
@@ -0,0 +1,421 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection, models, transaction
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_init, post_save
+)
+from django.dispatch import receiver
+
+from geosight.permission.models.factory import PERMISSIONS_LENGTH
+
+User = get_user_model()
+
+# Permission model label : other permission model labels that use it.
+# Reference layer indicator is also accessible through the indicator.
+DEPENDENCIES = {
+    'geosight_permission.indicatorpermission': [
+        'geosight_permission.referencelayerindicatorpermission'
+    ]
+}
+
+
+class EffectivePermission(models.Model):
+    """Precomputed ids of resource that the user can access.
+
+    It is per user, resource model and minimum permission,
+    the ids are rows of :class:`EffectivePermissionObject`.
+    The rows are deleted when the permission of the resource changes,
+    or when the role and the groups of the user change.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, null=True, blank=True
+    )
+    resource = models.CharField(max_length=256)
+    permission = models.CharField(max_length=PERMISSIONS_LENGTH)
+    generated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:  # noqa: D106
+        unique_together = ('user', 'resource', 'permission')
+        constraints = [
+            # NULL users are distinct in unique_together
+            models.UniqueConstraint(
+                fields=['resource', 'permission'],
+                condition=models.Q(user__isnull=True),
+                name='unique_anonymous_effective_permission'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['resource']),
+        ]
+
+    @staticmethod
+    def get_ids(model, user: User, permission, query):
+        """Return query of ids of model that user has the permission.
+
+        When it is not cached, the ids are inserted from the query
+        in one statement, so they are not loaded to the process.
+
+        :param model: The model that is queried.
+        :type model: django.db.models.Model
+        :param user: The user, None for anonymous.
+        :type user: User
+        :param permission: The minimum permission.
+        :type permission: PermissionDetail
+        :param query: Function that returns the query of the ids.
+        :type query: callable
+        :return: Query of object_id, to be used as subquery.
+        :rtype: QuerySet
+        """
+        resource = model._meta.label_lower
+        with transaction.atomic():
+            obj, created = EffectivePermission.objects.get_or_create(
+                user=user, resource=resource, permission=permission.name
+            )
+            if created:
+                sql, params = query().order_by().query.sql_with_params()
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f'INSERT INTO '
+                        f'{EffectivePermissionObject._meta.db_table} '
+                        f'(effective_permission_id, object_id) '
+                        f'SELECT DISTINCT %s, ids.id FROM ({sql}) AS ids(id)',
+                        (obj.id,) + tuple(params)
+                    )
+        return EffectivePermissionObject.objects.filter(
+            effective_permission=obj
+        ).values('object_id')
+
+    @staticmethod
+    def resources(sender) -> list:
+        """Return resource labels that are affected by change of sender.
+
+        :param sender: The model class that is changed.
+        :type sender: type
+        :return: List of model label.
+        :rtype: list
+        """
+        try:
+            return _resources[sender]
+        except KeyError:
+            pass
+
+        permission_model = None
+        if hasattr(sender, 'minimum_delete_role_level'):
+            permission_model = sender
+        elif hasattr(sender, 'obj') and (
+                hasattr(sender, 'user') or hasattr(sender, 'group')
+        ):
+            related_model = sender._meta.get_field('obj').related_model
+            if hasattr(related_model, 'minimum_delete_role_level'):
+                permission_model = related_model
+
+        labels = []
+        if permission_model:
+            permission_models = [permission_model] + [
+                apps.get_model(label) for label in DEPENDENCIES.get(
+                    permission_model._meta.label_lower, []
+                )
+            ]
+            for model in permission_models:
+                labels.append(model._meta.label_lower)
+                resource_model = model._meta.get_field('obj').related_model
+                labels += [
+                    _model._meta.label_lower
+                    for _model in [resource_model] + _proxies(resource_model)
+                ]
+        _resources[sender] = labels
+        return labels
+
+    @staticmethod
+    def invalidate_resources(resources: list):
+        """Delete effective permission of resources.
+
+        :param resources: Labels of the resource models.
+        :type resources: list
+        """
+        EffectivePermission.objects.filter(resource__in=resources).delete()
+
+    @staticmethod
+    def invalidate_users(user_ids: list):
+        """Delete effective permission of users.
+
+        :param user_ids: Ids of the users.
+        :type user_ids: list
+        """
+        EffectivePermission.objects.filter(user_id__in=user_ids).delete()
+
+
+class EffectivePermissionObject(models.Model):
+    """Id of resource of the effective permission, one row per id."""
+
+    id = models.BigAutoField(primary_key=True)
+    effective_permission = models.ForeignKey(
+        EffectivePermission, on_delete=models.CASCADE
+    )
+    object_id = models.BigIntegerField()
+
+    class Meta:  # noqa: D106
+        indexes = [
+            models.Index(fields=['effective_permission', 'object_id']),
+        ]
+
+
+# Sender : resource labels
+_resources = {}
+
+_MISSING = object()
+
+
+def _proxies(model) -> list:
+    """Return the proxy models of the model.
+
+    The proxies are cached under their own label,
+    e.g. the reference dataset of reference layer view.
+
+    :param model: The concrete model.
+    :type model: type
+    :return: List of the proxy models.
+    :rtype: list
+    """
+    return [
+        _model for _model in apps.get_models()
+        if _model._meta.proxy and _model._meta.concrete_model is model
+    ]
+
+
+def _access_fields(model) -> list:
+    """Return the fields of permission model that change the access.
+
+    :param model: The permission model.
+    :type model: type
+    :return: List of the field attribute names.
+    :rtype: list
+    """
+    return [
+        field.attname for field in model._meta.concrete_fields
+        if not field.primary_key and not getattr(field, 'auto_now', False)
+    ]
+
+
+def _access_state(instance, fields: list) -> tuple:
+    """Return the values of fields, without loading the deferred ones.
+
+    :param instance: The permission instance.
+    :type instance: django.db.models.Model
+    :param fields: The field attribute names.
+    :type fields: list
+    :return: Values of the fields, a marker for the deferred ones.
+    :rtype: tuple
+    """
+    return tuple(instance.__dict__.get(field, _MISSING) for field in fields)
+
+
+def keep_access_state(sender, instance, **kwargs):  # noqa: DOC103
+    """Keep the values that change the access, to compare them on save.
+
+    :param sender: The model class that sent the signal.
+    :type sender: type
+    :param instance: The instance that is initialized.
+    :type instance: django.db.models.Model
+    :param kwargs: Additional keyword arguments passed by the signal.
+    :type kwargs: dict
+    """
+    instance._access_state = _access_state(instance, _fields[sender])
+
+
+def access_changed(  # noqa: DOC103
+        sender, instance, created, **kwargs
+) -> bool:
+    """Return if the save changed the access, and keep the new state.
+
+    :param sender: The model class that sent the signal.
+    :type sender: type
+    :param instance: The instance that was saved.
+    :type instance: django.db.models.Model
+    :param created: True if a new record was created, False on update.
+    :type created: bool
+    :param kwargs: Additional keyword arguments passed by the signal.
+    :type kwargs: dict
+    :return: True if the access is changed.
+    :rtype: bool
+    """
+    state = _access_state(instance, _fields[sender])
+    changed = created or state != getattr(instance, '_access_state', None)
+    instance._access_state = state
+    return changed
+
+
+# Sender : fields that change the access
+_fields = {}
+
+
+def permission_saved(sender, instance, created, **kwargs):  # noqa: DOC103
+    """Invalidate effective permission when the permission changes.
+
+    The resources save their permission on every save,
+    e.g. when the version of indicator is increased,
+    so it is invalidated just when the access fields changed.
+
+    :param sender: The model class that sent the signal.
+    :type sender: type
+    :param instance: The permission that was saved.
+    :type instance: django.db.models.Model
+    :param created: True if a new record was created, False on update.
+    :type created: bool
+    :param kwargs: Additional keyword arguments passed by the signal.
+    :type kwargs: dict
+    """
+    if access_changed(sender, instance, created):
+        EffectivePermission.invalidate_resources(
+            EffectivePermission.resources(sender)
+        )
+
+
+def permission_deleted(sender, **kwargs):  # noqa: DOC103
+    """Invalidate effective permission when the permission is deleted.
+
+    :param sender: The model class that sent the signal.
+    :type sender: type
+    :param kwargs: Additional keyword arguments passed by the signal.
+    :type kwargs: dict
+    """
+    EffectivePermission.invalidate_resources(
+        EffectivePermission.resources(sender)
+    )
+
+
+def resource_saved(sender, instance, created, **kwargs):  # noqa: DOC103
+    """Invalidate effective permission when the creator is changed.
+
+    :param sender: The model class that sent the signal.
+    :type sender: type
+    :param instance: The resource that was saved.
+    :type instance: django.db.models.Model
+    :param created: True if a new record was created, False on update.
+    :type created: bool
+    :param kwargs: Additional keyword arguments passed by the signal.
+    :type kwargs: dict
+    """
+    # The new resource is invalidated by the creation of its permission
+    if access_changed(sender, instance, created) and not created:
+        EffectivePermission.invalidate_resources(
+            EffectivePermission.resources(instance.permission.__class__)
+        )
+
+
+def connect_permission_signals(models: list):
+    """Connect the invalidation to the permission models.
+
+    The signals are connected per sender,
+    so other models can still be deleted in fast way.
+
+    :param models: List of model.
+    :type models: list
+    """
+    for model in models:
+        if not EffectivePermission.resources(model):
+            continue
+        _fields[model] = _access_fields(model)
+        post_init.connect(keep_access_state, sender=model)
+        post_save.connect(permission_saved, sender=model)
+        post_delete.connect(permission_deleted, sender=model)
+
+        # The creator of resource has access too
+        if hasattr(model, 'minimum_delete_role_level'):
+            resource_model = model._meta.get_field('obj').related_model
+            try:
+                resource_model._meta.get_field('creator')
+            except FieldDoesNotExist:
+                continue
+            # The signals of proxy are sent with the proxy as sender
+            for _model in [resource_model] + _proxies(resource_model):
+                _fields[_model] = ['creator_id']
+                post_init.connect(keep_access_state, sender=_model)
+                post_save.connect(resource_saved, sender=_model)
+
+
+@receiver(post_save, sender=User)
+def user_changed(  # noqa: DOC103
+        sender, instance, created, update_fields=None, **kwargs
+) -> None:
+    """Invalidate effective permission when the user is changed.
+
+    :param sender: The model class that sent the signal.
+    :type sender: type
+    :param instance: The user that was saved.
+    :type instance: User
+    :param created: True if a new record was created, False on update.
+    :type created: bool
+    :param update_fields: The fields that are updated.
+    :type update_fields: frozenset
+    :param kwargs: Additional keyword arguments passed by the signal.
+    :type kwargs: dict
+    """
+    # Login just updates last_login
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    if not created:
+        EffectivePermission.invalidate_users([instance.id])
+
+
+@receiver(post_save, sender='core.Profile')
+def profile_changed(sender, instance, **kwargs):  # noqa: DOC103
+    """Invalidate effective permission when the role is changed.
+
+    :param sender: The model class that sent the signal.
+    :type sender: type
+    :param instance: The profile that was saved.
+    :type instance: Profile
+    :param kwargs: Additional keyword arguments passed by the signal.
+    :type kwargs: dict
+    """
+    EffectivePermission.invalidate_users([instance.user_id])
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed(  # noqa: DOC103
+        sender, instance, action, reverse, pk_set, **kwargs
+) -> None:
+    """Invalidate effective permission when the groups of user changed.
+
+    :param sender: The through model of user groups.
+    :type sender: type
+    :param instance: The user or the group that is changed.
+    :type instance: User | Group
+    :param action: The m2m action.
+    :type action: str
+    :param reverse: True if it is changed from the group.
+    :type reverse: bool
+    :param pk_set: The primary keys that are added or removed.
+    :type pk_set: set
+    :param kwargs: Additional keyword arguments passed by the signal.
+    :type kwargs: dict
+    """
+    if action not in ['post_add', 'post_remove', 'pre_clear']:
+        return
+    if not reverse:
+        EffectivePermission.invalidate_users([instance.id])
+    elif action == 'pre_clear':
+        EffectivePermission.invalidate_users(
+            list(instance.user_set.values_list('id', flat=True))
+        )
+    else:
+        EffectivePermission.invalidate_users(list(pk_set or []))
@@ -151,6 +151,10 @@ class PermissionManager(models.Manager):
         have permission to access through direct ownership, public
         permissions, user-specific permissions, or group permissions.
 
+        The ids are resolved once per user, model and minimum permission
+        and kept in :class:`EffectivePermission`,
+        so the query is an indexed ``id IN (subquery)`` lookup.
+
         :param user: The user to check permissions for.
         :type user: User
 
@@ -164,10 +168,9 @@ class PermissionManager(models.Manager):
         :rtype: django.db.models.QuerySet
         """
         from core.models.profile import ROLES
-        from geosight.georepo.models.reference_layer import (
-            ReferenceLayerIndicator
+        from geosight.permission.models.effective_permission import (
+            EffectivePermission
         )
-        from geosight.data.models.indicator import Indicator
         try:
             if user.profile.is_admin:
                 return self.all()
@@ -183,6 +186,36 @@ class PermissionManager(models.Manager):
             if user_role < minimum_role:
                 return self.none()
 
+        ids = EffectivePermission.get_ids(
+            self.model, user, minimum_permission,
+            lambda: self._query_by_permission(
+                user, minimum_permission, minimum_role
+            ).values_list('id', flat=True)
+        )
+        return self.filter(id__in=ids)
+
+    def _query_by_permission(
+            self, user, minimum_permission, minimum_role=None
+    ):
+        """
+        Query objects based on user permissions, without the cache.
+
+        :param user: The user to check permissions for, None for anonymous.
+        :type user: User
+
+        :param minimum_permission: The minimum permission level required.
+        :type minimum_permission: str
+
+        :param minimum_role: Optional minimum role level required.
+        :type minimum_role: int
+
+        :return: QuerySet of objects the user has permission to access.
+        :rtype: django.db.models.QuerySet
+        """
+        from geosight.georepo.models.reference_layer import (
+            ReferenceLayerIndicator
+        )
+        from geosight.data.models.indicator import Indicator
         permissions = PERMISSIONS().get_permissions(minimum_permission)
 
         groups = []
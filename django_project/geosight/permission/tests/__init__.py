@@ -20,6 +20,7 @@ from .context_layer import *  # noqa
 from .dashboard import *  # noqa
 from .dashboard_cache_permission import *  # noqa
 from .dataset import *  # noqa
+from .effective_permission import *  # noqa
 from .group import *  # noqa
 from .indicator import *  # noqa
 from .related_table import *  # noqa
@@ -0,0 +1,188 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+
+from core.models.profile import Profile, ROLES
+from core.tests.base_tests import TestCase
+from core.tests.model_factories import GroupF, create_user
+from geosight.data.models.indicator import Indicator
+from geosight.permission.models.effective_permission import (
+    EffectivePermission
+)
+from geosight.permission.models.factory import PERMISSIONS
+from geosight.permission.models.manager import PermissionManager
+from geosight.permission.models.resource import (
+    ReferenceLayerViewPermission
+)
+
+User = get_user_model()
+
+
+class EffectivePermissionTest(TestCase):
+    """Test for effective permission."""
+
+    def setUp(self):
+        """To setup test."""
+        self.resource_creator = create_user(ROLES.CREATOR.name)
+        self.viewer = create_user(ROLES.VIEWER.name)
+        self.group = GroupF()
+        self.resource = Indicator.permissions.create(
+            user=self.resource_creator, name='name'
+        )
+        self.permission = self.resource.permission
+
+    def assert_effective(self, user, ids):
+        """Assert the ids of list and the effective permission."""
+        self.assertEqual(
+            list(
+                Indicator.permissions.list(user).values_list('id', flat=True)
+            ),
+            ids
+        )
+        self.assertEqual(
+            list(
+                EffectivePermission.objects.get(
+                    user=user,
+                    resource=Indicator._meta.label_lower,
+                    permission=PERMISSIONS.LIST.name
+                ).effectivepermissionobject_set.order_by(
+                    'object_id'
+                ).values_list('object_id', flat=True)
+            ),
+            ids
+        )
+
+    def test_cached(self):
+        """Test the ids are cached."""
+        self.assert_effective(self.viewer, [])
+        self.assert_effective(self.resource_creator, [self.resource.id])
+        with patch.object(
+                PermissionManager, '_query_by_permission'
+        ) as query:
+            self.assertEqual(
+                list(Indicator.permissions.list(self.resource_creator)),
+                [self.resource]
+            )
+            query.assert_not_called()
+
+    def test_anonymous_unique(self):
+        """Test the anonymous entry is created just once."""
+        self.permission.public_permission = PERMISSIONS.READ_DATA.name
+        self.permission.save()
+        for _ in range(2):
+            self.assertEqual(
+                list(
+                    Indicator.permissions.list(None).values_list(
+                        'id', flat=True
+                    )
+                ),
+                [self.resource.id]
+            )
+        self.assertEqual(
+            EffectivePermission.objects.filter(user__isnull=True).count(), 1
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            EffectivePermission.objects.create(
+                user=None,
+                resource=Indicator._meta.label_lower,
+                permission=PERMISSIONS.LIST.name
+            )
+
+    def test_invalidate_by_permission(self):
+        """Test invalidation when the permission changed."""
+        self.assert_effective(self.viewer, [])
+
+        self.permission.update_user_permission(
+            self.viewer, PERMISSIONS.LIST.name
+        )
+        self.assert_effective(self.viewer, [self.resource.id])
+
+        self.permission.user_permissions.filter(user=self.viewer).delete()
+        self.assert_effective(self.viewer, [])
+
+        self.permission.public_permission = PERMISSIONS.READ_DATA.name
+        self.permission.save()
+        self.assert_effective(self.viewer, [self.resource.id])
+        self.assertEqual(
+            list(
+                Indicator.permissions.list(None).values_list('id', flat=True)
+            ),
+            [self.resource.id]
+        )
+
+    def test_invalidate_by_resource(self):
+        """Test invalidation when the resource is created or deleted."""
+        self.assert_effective(self.resource_creator, [self.resource.id])
+        resource = Indicator.permissions.create(
+            user=self.resource_creator, name='name 2'
+        )
+        self.assert_effective(
+            self.resource_creator, [self.resource.id, resource.id]
+        )
+        resource.delete()
+        self.assert_effective(self.resource_creator, [self.resource.id])
+
+    def test_invalidate_by_group(self):
+        """Test invalidation when the groups of user changed."""
+        self.permission.update_group_permission(
+            self.group, PERMISSIONS.LIST.name
+        )
+        self.assert_effective(self.viewer, [])
+
+        self.viewer.groups.add(self.group)
+        self.assert_effective(self.viewer, [self.resource.id])
+
+        self.group.user_set.remove(self.viewer)
+        self.assert_effective(self.viewer, [])
+
+    def test_invalidate_by_role(self):
+        """Test invalidation when the role of user changed."""
+        self.assert_effective(self.viewer, [])
+        self.assertTrue(
+            EffectivePermission.objects.filter(user=self.viewer).exists()
+        )
+        Profile.update_role(self.viewer, ROLES.CREATOR.name)
+        self.assertFalse(
+            EffectivePermission.objects.filter(user=self.viewer).exists()
+        )
+
+    def test_not_invalidated_by_version(self):
+        """Test saving the resource without access change keeps the ids."""
+        self.assert_effective(self.viewer, [])
+        self.resource.increase_version()
+        self.permission.save()
+        self.assertTrue(
+            EffectivePermission.objects.filter(user=self.viewer).exists()
+        )
+
+        # The creator changed
+        self.resource.creator = self.viewer
+        self.resource.save()
+        self.assertFalse(
+            EffectivePermission.objects.filter(user=self.viewer).exists()
+        )
+        self.assert_effective(self.viewer, [self.resource.id])
+
+    def test_proxy_resources(self):
+        """Test the proxy of resource is invalidated too."""
+        self.assertIn(
+            'geosight_reference_dataset.referencedataset',
+            EffectivePermission.resources(ReferenceLayerViewPermission)
+        )
@@ -25,7 +25,7 @@ from geosight.reference_dataset.models import ReferenceDataset
 from geosight.reference_dataset.serializer.reference_dataset import (
     ReferenceDatasetCentroidUrlSerializer
 )
-from geosight.reference_dataset.utils.vector_tile import querying_vector_tile
+from geosight.reference_dataset.utils.tile_cache import VectorTileCache
 
 
 class ReferenceDatasetCentroid(APIView):
@@ -69,9 +69,9 @@ class ReferenceDatasetVectorTile(APIView):
             identifier=identifier
         )
         read_data_permission_resource(view, request.user)
-        tiles = querying_vector_tile(view, z=z, x=x, y=y)
+        tile = VectorTileCache(view).tile(z=int(z), x=int(x), y=int(y))
 
         # If no tile 404
-        if not len(tiles):
+        if not tile:
             raise Http404()
-        return HttpResponse(tiles, content_type="application/x-protobuf")
+        return HttpResponse(tile, content_type="application/x-protobuf")
@@ -14,26 +14,35 @@ __author__ = 'irwan@kartoza.com'
 __date__ = '13/02/2024'
 __copyright__ = ('Copyright 2023, Unicef')
 
-import json
+import logging
 import traceback
+from itertools import islice
 from uuid import uuid4
 
 from django.contrib.auth import get_user_model
 from django.contrib.gis.geos import GEOSGeometry, Polygon, MultiPolygon
 from django.utils import timezone
-from fiona.model import to_dict
+from shapely.geometry import shape
 
 from geosight.georepo.models.entity import Entity
+from geosight.georepo.models.entity_geometry import (
+    EntitySimplifiedGeometry
+)
 from geosight.georepo.term import admin_level_country
 from geosight.reference_dataset.models.reference_dataset_importer import (
     ReferenceDatasetImporter, ReferenceDatasetImporterLevel, LogStatus
 )
+from geosight.reference_dataset.tasks import seed_vector_tiles
 from geosight.reference_dataset.utils.fiona import (
     open_collection_by_file, delete_tmp_shapefile,
     GEOJSON, SHAPEFILE, GEOPACKAGE
 )
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
+
+# Number of features that are read and saved at once
+CHUNK_SIZE = 1000
 
 
 def get_feature_value(feature, field_name, default='') -> str:
@@ -68,25 +77,28 @@ def get_feature_value(feature, field_name, default='') -> str:
     return value
 
 
-def build_geom_object(geom_str: str):
+def build_geom_from_feature(feature):
     """
-    Build a GEOSGeometry object from a geometry string.
+    Build a GEOSGeometry object from the geometry of a feature.
 
-    Attempts to parse a geometry string (WKT, WKB, or GeoJSON) into a Django
-    `GEOSGeometry` object. If parsing fails, returns `None` and logs an error.
+    The geometry is built from the feature mapping through WKB,
+    without serialising it to GeoJSON first.
+    If building fails, returns `None` and logs the exception.
 
-    :param geom_str: A geometry string in WKT, WKB, or GeoJSON format.
-    :type geom_str: str
-
-    :return: A GEOSGeometry object if parsing is successful; otherwise, None.
+    :param feature: A feature that is read by Fiona.
+    :type feature: fiona.model.Feature
+    :return: A GEOSGeometry object if building is successful; otherwise, None.
     :rtype: GEOSGeometry | None
     """
-    geom = None
     try:
-        geom = GEOSGeometry(geom_str)
+        return GEOSGeometry(
+            memoryview(shape(feature['geometry']).wkb), srid=4326
+        )
     except Exception:
-        print('Error building geom object ', geom)
-    return geom
+        logger.exception(
+            f'Error building geometry of feature {feature.get("id")}'
+        )
+        return None
 
 
 def check_layer_type(filename: str) -> str:
@@ -132,13 +144,14 @@ class ReferenceDatasetImporterTask:
     def read_file(
             self, importer_level: ReferenceDatasetImporterLevel,
             progress_changed
-    ) -> None:
+    ) -> list:
         """
         Read and process the file for a specific importer level.
 
         This method reads the file associated with the given `importer_level`
         and optionally reports progress through
         the `progress_changed` callback.
+        The features that the geometry can't be built are skipped.
 
         :param importer_level:
             The importer level instance that contains the file to read.
@@ -147,89 +160,115 @@ class ReferenceDatasetImporterTask:
             Callback function to report progress updates.
             Expected to accept a single integer argument (percentage).
         :type progress_changed: Callable[[int], None]
-        :return: None
-        :rtype: None
+        :return: The ucodes of the skipped features.
+        :rtype: list
         """
+        from geosight.georepo.models.reference_layer_entity import (
+            ReferenceLayerViewEntity
+        )
+        from geosight.georepo.sync import EntityChanges
         reference_layer = importer_level.importer.reference_layer
         level = int(importer_level.level)
         name_field = importer_level.name_field
         ucode_field = importer_level.ucode_field
         parent_ucode_field = importer_level.parent_ucode_field
 
+        # Parents of the parent level, loaded once per level
+        parents_by_ucode = {}
+        if level > 1:
+            parents_by_ucode = {
+                geom_id: parents or []
+                for geom_id, parents in reference_layer.entities_set.filter(
+                    admin_level=level - 1
+                ).values_list('geom_id', 'parents').iterator()
+            }
+
+        changes = EntityChanges()
+        skipped = []
         with open_collection_by_file(
                 importer_level.file,
                 check_layer_type(importer_level.file.path)
         ) as features:
-            data = []
             count = len(features)
-            for idx, feature in enumerate(features):
-                # default name
-                entity_name = get_feature_value(
-                    feature, name_field
-                )
-                # default name
-                entity_ucode = get_feature_value(
-                    feature, ucode_field
-                )
-
-                # find ancestor
-                parents = []
-                if level > 0:
-                    parent_code = get_feature_value(
-                        feature, parent_ucode_field
+            done = 0
+            features_iter = iter(features)
+            while True:
+                # Just a chunk of features is kept in memory
+                chunk = list(islice(features_iter, CHUNK_SIZE))
+                if not chunk:
+                    break
+                data = []
+                for feature in chunk:
+                    # default name
+                    entity_name = get_feature_value(
+                        feature, name_field
                     )
-                    if parent_code:
-                        if level == 1:
-                            parents = [parent_code]
-                        else:
-                            parent = reference_layer.entities_set.filter(
-                                admin_level=level - 1,
-                                geom_id=parent_code
-                            ).first()
-                            if parent:
-                                parents = [parent_code] + parent.parents
-
-                # create geometry
-                geom_str = json.dumps(to_dict(feature['geometry']))
-                geom = build_geom_object(geom_str)
-                if geom and isinstance(geom, Polygon):
-                    geom = MultiPolygon([geom])
-                centroid = geom.point_on_surface
-
-                data.append(
-                    Entity(
-                        parents=parents,
-                        reference_layer=reference_layer,
-                        admin_level=level,
-                        geom_id=entity_ucode,
-                        concept_uuid=str(uuid4()),
-                        geometry=geom,
-                        centroid=centroid,
-                        name=entity_name
+                    # default name
+                    entity_ucode = get_feature_value(
+                        feature, ucode_field
                     )
-                )
-                if len(data) == 5:
-                    Entity.objects.bulk_create(data, batch_size=5)
-                    data.clear()
 
-                progress_changed((idx + 1) / count)
-            if len(data) > 0:
-                Entity.objects.bulk_create(data)
+                    # find ancestor
+                    parents = []
+                    if level > 0:
+                        parent_code = get_feature_value(
+                            feature, parent_ucode_field
+                        )
+                        if parent_code:
+                            if level == 1:
+                                parents = [parent_code]
+                            elif parent_code in parents_by_ucode:
+                                parents = [parent_code] + parents_by_ucode[
+                                    parent_code
+                                ]
+
+                    # create geometry
+                    geom = build_geom_from_feature(feature)
+                    if geom is None or geom.empty:
+                        skipped.append(entity_ucode)
+                        continue
+                    if isinstance(geom, Polygon):
+                        geom = MultiPolygon([geom])
+                    centroid = geom.point_on_surface
+
+                    data.append(
+                        Entity(
+                            parents=parents,
+                            reference_layer=reference_layer,
+                            admin_level=level,
+                            geom_id=entity_ucode,
+                            concept_uuid=str(uuid4()),
+                            geometry=geom,
+                            centroid=centroid,
+                            name=entity_name
+                        )
+                    )
 
-            delete_tmp_shapefile(features.path)
+                # Save the chunk and link it to the view
+                entities = Entity.objects.bulk_create(data)
+                ReferenceLayerViewEntity.objects.bulk_create(
+                    [
+                        ReferenceLayerViewEntity(
+                            reference_layer=reference_layer,
+                            entity=entity
+                        )
+                        for entity in entities
+                    ]
+                )
+                ids = [entity.id for entity in entities]
+                changes.parents_changed(ids)
+                EntitySimplifiedGeometry.generate(ids)
+                done += len(chunk)
+                progress_changed(done / count)
 
-            # Create reference view link
-            for entity in Entity.objects.filter(
-                    reference_layer=reference_layer,
-                    admin_level=level
-            ):
-                entity.create_reference_layer_view_entity()
+            delete_tmp_shapefile(features.path)
 
             # Assign reference layer countries
             if level == admin_level_country:
                 reference_layer.assign_countries()
             else:
-                Entity.assign_country()
+                changes.propagate()
+        return skipped
 
     def _error(self, message: str) -> None:
         """
@@ -290,6 +329,7 @@ class ReferenceDatasetImporterTask:
             min_progress = 0
             max_progress = 80
             progress_section = max_progress / total
+            skipped = []
             for idx, level in enumerate(query):
                 self.importer.note = f'Importing level {idx}'
                 self.importer.progress = (progress_section * idx)
@@ -308,10 +348,19 @@ class ReferenceDatasetImporterTask:
                     self.importer.progress = progress + min_progress
                     self.importer.save()
 
-                self.read_file(level, progress_update)
+                skipped += self.read_file(level, progress_update)
                 min_progress = self.importer.progress
 
-            self._done('All data has been imported')
+            # New version, so the cached tiles of old entities are not used
+            reference_layer.increase_version()
+            message = 'All data has been imported'
+            if skipped:
+                message += (
+                    f'. {len(skipped)} feature(s) are skipped because '
+                    f'the geometry is invalid: {", ".join(skipped)}'
+                )
+            self._done(message)
+            seed_vector_tiles.delay(reference_layer.id)
         except Exception:
             self._error(
                 f'{traceback.format_exc().replace(" File", "<br>File")}'
@@ -16,8 +16,8 @@ __copyright__ = ('Copyright 2023, Unicef')
 
 from django.contrib.auth import get_user_model
 from django.contrib.gis.db.models import QuerySet
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 
@@ -126,3 +126,19 @@ def create_resource(sender, instance, created, **kwargs):
 def save_resource(sender, instance, **kwargs):
     """When resource saved."""
     instance.permission.save()
+
+
+@receiver(post_delete, sender=ReferenceLayerView)
+@receiver(post_delete, sender=ReferenceDataset)
+def delete_tile_cache(sender, instance, **kwargs):  # noqa: DOC103
+    """Delete the vector tile cache of the view when it is deleted.
+
+    :param sender: The model class that sent the signal.
+    :type sender: type
+    :param instance: The view that was deleted.
+    :type instance: ReferenceLayerView
+    :param kwargs: Additional keyword arguments passed by the signal.
+    :type kwargs: dict
+    """
+    from geosight.reference_dataset.utils.tile_cache import VectorTileCache
+    transaction.on_commit(VectorTileCache(instance).clear)
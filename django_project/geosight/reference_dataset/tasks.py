@@ -17,6 +17,9 @@ __copyright__ = ('Copyright 2023, Unicef')
 from celery.utils.log import get_task_logger
 
 from core.celery import app
+from geosight.reference_dataset.models.reference_dataset import (
+    ReferenceDataset
+)
 from geosight.reference_dataset.models.reference_dataset_importer import (
     ReferenceDatasetImporter
 )
@@ -35,3 +38,21 @@ def run_importer(_id, log_id=None):
         ReferenceDatasetImporterTask(importer).run()
     except ReferenceDatasetImporter.DoesNotExist:
         logger.error(f'Importer {_id} does not exist')
+
+
+@app.task
+def seed_vector_tiles(_id, max_zoom=None):
+    """Generate the vector tiles of the low zooms of reference dataset.
+
+    :param _id: The reference dataset id.
+    :type _id: int
+    :param max_zoom: Maximum zoom, default is the maximum zoom of cache.
+    :type max_zoom: int
+    """
+    from geosight.reference_dataset.utils.tile_cache import VectorTileCache
+    try:
+        view = ReferenceDataset.objects.get(id=_id)
+        count = VectorTileCache(view).seed(max_zoom)
+        logger.info(f'{count} vector tile(s) of {view.identifier} generated')
+    except ReferenceDataset.DoesNotExist:
+        logger.error(f'Reference dataset {_id} does not exist')
@@ -15,6 +15,7 @@ __date__ = '06/03/2025'
 __copyright__ = ('Copyright 2025, Unicef')
 
 import os
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.core.files import File
@@ -25,6 +26,9 @@ from geosight.georepo.tests.model_factories import ReferenceLayerF
 from geosight.reference_dataset.importer import (
     ReferenceDatasetImporterTask
 )
+from geosight.reference_dataset.importer.importer import (
+    build_geom_from_feature
+)
 from geosight.reference_dataset.models.reference_dataset import (
     ReferenceDatasetLevel
 )
@@ -125,3 +129,37 @@ class ImporterTest(TestCase):
                 country__geom_id='SOM_V2'
             ).count(), 92
         )
+
+    def test_importer_in_chunks(self):
+        """Test importer saves the features in chunks."""
+        with patch(
+                'geosight.reference_dataset.importer.importer.CHUNK_SIZE', 10
+        ):
+            self.test_importer()
+        self.assertEqual(
+            self.reference_layer.entities_set.filter(
+                admin_level=2
+            ).first().parents[-1],
+            'SOM_V2'
+        )
+
+    def test_importer_invalid_geometry(self):
+        """Test the feature with invalid geometry is skipped."""
+        calls = []
+
+        def _build_geom(feature):
+            """Fail the last feature."""
+            calls.append(feature)
+            if len(calls) == 93:
+                return None
+            return build_geom_from_feature(feature)
+
+        with patch(
+                'geosight.reference_dataset.importer.importer.'
+                'build_geom_from_feature', _build_geom
+        ):
+            ReferenceDatasetImporterTask(self.importer).run()
+        self.importer.refresh_from_db()
+        self.assertEqual(self.importer.status, LogStatus.SUCCESS)
+        self.assertIn('1 feature(s) are skipped', self.importer.note)
+        self.assertEqual(self.reference_layer.entities_set.count(), 92)
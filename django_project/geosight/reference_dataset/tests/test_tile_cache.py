@@ -0,0 +1,150 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.test import override_settings
+
+from core.tests.base_tests import TestCase
+from geosight.georepo.models.entity import Entity
+from geosight.georepo.models.entity_geometry import (
+    EntitySimplifiedGeometry, GEOMETRY_TIERS
+)
+from geosight.georepo.tests.model_factories import ReferenceLayerF
+from geosight.reference_dataset.utils.tile_cache import (
+    VectorTileCache, tile_range
+)
+
+QUERY = 'geosight.reference_dataset.utils.tile_cache.querying_vector_tile'
+
+
+class VectorTileCacheTest(TestCase):
+    """Test for vector tile cache."""
+
+    def setUp(self):
+        """To setup test."""
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.view = ReferenceLayerF(in_georepo=False)
+        self.cache = VectorTileCache(self.view, root=self.root, max_zoom=5)
+
+    def test_tile_range(self):
+        """Test range of tiles of extent."""
+        self.assertEqual(tile_range((-180, -90, 180, 90), 0), (0, 0, 0, 0))
+        self.assertEqual(tile_range((-180, -90, 180, 90), 2), (0, 0, 3, 3))
+        self.assertEqual(tile_range((40, -2, 51, 12), 3), (4, 3, 5, 4))
+
+    def test_tile(self):
+        """Test the tile is generated once."""
+        with patch(QUERY, return_value=[b'a', b'b']) as query:
+            self.assertEqual(self.cache.tile(1, 1, 0), b'ab')
+            self.assertEqual(self.cache.tile(1, 1, 0), b'ab')
+            query.assert_called_once()
+
+        # Empty tile is cached too
+        with patch(QUERY, return_value=[]) as query:
+            self.assertEqual(self.cache.tile(1, 0, 0), b'')
+            self.assertEqual(self.cache.tile(1, 0, 0), b'')
+            query.assert_called_once()
+
+    def test_version(self):
+        """Test new version does not use tiles of old version."""
+        with patch(QUERY, return_value=[b'old']):
+            self.cache.tile(0, 0, 0)
+        old_directory = self.cache.directory
+        self.view.version_data += timedelta(seconds=10)
+        self.view.save()
+        with patch(QUERY, return_value=[b'new']):
+            self.assertEqual(self.cache.tile(0, 0, 0), b'new')
+        self.cache.clear_old_versions()
+        self.assertFalse(os.path.exists(old_directory))
+        self.assertTrue(os.path.exists(self.cache.directory))
+
+        # Version in the same second
+        self.view.version_data += timedelta(microseconds=1)
+        self.view.save()
+        with patch(QUERY, return_value=[b'newer']):
+            self.assertEqual(self.cache.tile(0, 0, 0), b'newer')
+
+    def test_clear_on_delete(self):
+        """Test the tiles are deleted with the view."""
+        with patch(QUERY, return_value=[b'tile']):
+            self.cache.tile(0, 0, 0)
+        self.assertTrue(os.path.exists(self.cache.view_directory))
+        with override_settings(
+                VECTOR_TILE_CACHE_ROOT=self.root
+        ), self.captureOnCommitCallbacks(execute=True):
+            self.view.delete()
+        self.assertFalse(os.path.exists(self.cache.view_directory))
+
+    def test_max_zoom(self):
+        """Test the tiles of higher zoom are not cached."""
+        with patch(QUERY, return_value=[b'tile']) as query:
+            self.assertEqual(self.cache.tile(6, 0, 0), b'tile')
+            self.assertEqual(self.cache.tile(6, 0, 0), b'tile')
+            self.assertEqual(query.call_count, 2)
+        self.assertIsNone(self.cache.get(6, 0, 0))
+
+    def test_seed(self):
+        """Test seed generates the tiles that cover the view."""
+        self.assertEqual(self.cache.seed(2), 0)
+        Entity.objects.create(
+            geom_id='A', name='A', admin_level=0,
+            reference_layer=self.view,
+            geometry=MultiPolygon(
+                [Polygon.from_bbox((40, -2, 51, 12))], srid=4326
+            )
+        )
+        with patch(QUERY, return_value=[b'tile']) as query:
+            # z0: 1 tile, z1: 2 tiles, z2: 2 tiles
+            self.assertEqual(self.cache.seed(2), 5)
+            self.assertEqual(query.call_count, 5)
+            self.assertEqual(self.cache.seed(2), 0)
+        self.assertEqual(self.cache.get(2, 2, 1), b'tile')
+
+
+class SimplifiedGeometryTest(TestCase):
+    """Test for simplified geometries of entity."""
+
+    def test_tier_of_zoom(self):
+        """Test tier of zoom."""
+        self.assertEqual(EntitySimplifiedGeometry.tier_of_zoom(0), 0)
+        self.assertEqual(EntitySimplifiedGeometry.tier_of_zoom(4), 0)
+        self.assertEqual(EntitySimplifiedGeometry.tier_of_zoom(5), 1)
+        self.assertEqual(EntitySimplifiedGeometry.tier_of_zoom(10), 2)
+        self.assertIsNone(EntitySimplifiedGeometry.tier_of_zoom(11))
+
+    def test_generate(self):
+        """Test generate the simplified geometries."""
+        entity = Entity.objects.create(
+            geom_id='A', name='A', admin_level=0,
+            geometry=MultiPolygon(
+                [Polygon.from_bbox((40, -2, 51, 12))], srid=4326
+            )
+        )
+        EntitySimplifiedGeometry.generate([entity.id])
+        EntitySimplifiedGeometry.generate([entity.id])
+        geometries = entity.simplified_geometries.order_by('tier')
+        self.assertEqual(
+            list(geometries.values_list('tier', flat=True)),
+            list(range(len(GEOMETRY_TIERS)))
+        )
+        self.assertEqual(geometries.first().geometry.srid, 3857)
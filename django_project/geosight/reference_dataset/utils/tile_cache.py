@@ -0,0 +1,239 @@
+# coding=utf-8
+"""
+GeoSight is UNICEF's geospatial web-based business intelligence platform.
+
+Contact : geosight-no-reply@unicef.org
+
+.. note:: This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation; either version 3 of the License, or
+    (at your option) any later version.
+
+"""
+__author__ = 'irwan@kartoza.com'
+__date__ = '18/10/2026'
+__copyright__ = ('Copyright 2023, Unicef')
+
+import logging
+import math
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.gis.db.models import Extent
+from django.db import connection
+
+from geosight.georepo.models.reference_layer import ReferenceLayerView
+from geosight.reference_dataset.utils.vector_tile import querying_vector_tile
+
+logger = logging.getLogger(__name__)
+
+# Latitude limit of web mercator
+MAX_LATITUDE = 85.0511287798
+
+
+def tile_range(extent: tuple, z: int) -> tuple:
+    """Return range of tiles of the extent on a zoom.
+
+    :param extent: (xmin, ymin, xmax, ymax) in EPSG:4326.
+    :type extent: tuple
+    :param z: The zoom.
+    :type z: int
+    :return: (min x, min y, max x, max y) of tiles, inclusive.
+    :rtype: tuple
+    """
+    count = 2 ** z
+
+    def _x(lon):
+        x = int((lon + 180.0) / 360.0 * count)
+        return min(max(x, 0), count - 1)
+
+    def _y(lat):
+        lat = math.radians(min(max(lat, -MAX_LATITUDE), MAX_LATITUDE))
+        y = int(
+            (1.0 - math.asinh(math.tan(lat)) / math.pi) / 2.0 * count
+        )
+        return min(max(y, 0), count - 1)
+
+    xmin, ymin, xmax, ymax = extent
+    return _x(xmin), _y(ymax), _x(xmax), _y(ymin)
+
+
+class VectorTileCache(object):
+    """Disk cache of the vector tiles of a view.
+
+    The tiles are saved as
+    {root}/{schema}/{identifier}/{version}/{z}/{x}/{y}.pbf,
+    so a new version of the view does not use the tiles of the old one.
+    An empty tile is saved as an empty file.
+    Only the tiles until max zoom are saved, so the cache is bounded.
+    """
+
+    def __init__(  # noqa: DOC101,DOC103
+            self, view: ReferenceLayerView, root: str = None,
+            max_zoom: int = None
+    ):
+        """Init the cache.
+
+        :param view: The view.
+        :type view: ReferenceLayerView
+        :param root: Root directory, default is VECTOR_TILE_CACHE_ROOT.
+        :type root: str
+        :param max_zoom:
+            Maximum zoom that is cached,
+            default is VECTOR_TILE_CACHE_MAX_ZOOM.
+        :type max_zoom: int
+        """
+        self.view = view
+        self.root = root or settings.VECTOR_TILE_CACHE_ROOT
+        self.max_zoom = (
+            settings.VECTOR_TILE_CACHE_MAX_ZOOM
+            if max_zoom is None else max_zoom
+        )
+
+    @property
+    def version(self) -> str:
+        """Return version of the view in microseconds.
+
+        The version of view is in seconds, that is same for the imports
+        in the same second.
+        """
+        return f'{round(self.view.version_data.timestamp() * 1000000)}'
+
+    @property
+    def view_directory(self) -> str:
+        """Return directory of all versions of the view."""
+        return os.path.join(
+            self.root,
+            getattr(connection, 'schema_name', 'public'),
+            self.view.identifier
+        )
+
+    @property
+    def directory(self) -> str:
+        """Return directory of current version of the view."""
+        return os.path.join(self.view_directory, self.version)
+
+    def path(self, z: int, x: int, y: int) -> str:
+        """Return path of tile.
+
+        :param z: The zoom.
+        :type z: int
+        :param x: The x of tile.
+        :type x: int
+        :param y: The y of tile.
+        :type y: int
+        :return: The path.
+        :rtype: str
+        """
+        return os.path.join(self.directory, f'{z}', f'{x}', f'{y}.pbf')
+
+    def get(self, z: int, x: int, y: int):
+        """Return cached tile, None if it is not cached.
+
+        :param z: The zoom.
+        :type z: int
+        :param x: The x of tile.
+        :type x: int
+        :param y: The y of tile.
+        :type y: int
+        :return: The tile, empty bytes for empty tile.
+        :rtype: bytes
+        """
+        try:
+            with open(self.path(z, x, y), 'rb') as _file:
+                return _file.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, z: int, x: int, y: int, tile: bytes):
+        """Save the tile, the file is replaced atomically.
+
+        :param z: The zoom.
+        :type z: int
+        :param x: The x of tile.
+        :type x: int
+        :param y: The y of tile.
+        :type y: int
+        :param tile: The tile.
+        :type tile: bytes
+        """
+        path = self.path(z, x, y)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as _file:
+                _file.write(tile)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.exception(e)
+
+    def tile(self, z: int, x: int, y: int) -> bytes:
+        """Return the tile from the cache, generate it when it is missing.
+
+        The tile of zoom higher than max zoom is generated without cache.
+
+        :param z: The zoom.
+        :type z: int
+        :param x: The x of tile.
+        :type x: int
+        :param y: The y of tile.
+        :type y: int
+        :return: The tile, empty bytes for empty tile.
+        :rtype: bytes
+        """
+        if z > self.max_zoom:
+            return b''.join(querying_vector_tile(self.view, z=z, x=x, y=y))
+        tile = self.get(z, x, y)
+        if tile is None:
+            tile = b''.join(querying_vector_tile(self.view, z=z, x=x, y=y))
+            self.set(z, x, y, tile)
+        return tile
+
+    def clear_old_versions(self) -> None:
+        """Delete the tiles of other versions of the view."""
+        try:
+            versions = os.listdir(self.view_directory)
+        except FileNotFoundError:
+            return
+        for version in versions:
+            if version != self.version:
+                shutil.rmtree(
+                    os.path.join(self.view_directory, version),
+                    ignore_errors=True
+                )
+
+    def clear(self):
+        """Delete the tiles of every version of the view."""
+        shutil.rmtree(self.view_directory, ignore_errors=True)
+
+    def seed(self, max_zoom: int = None) -> int:
+        """Generate the tiles of the low zooms that cover the view.
+
+        The zooms are limited to the max zoom of cache.
+
+        :param max_zoom: Maximum zoom, default is VECTOR_TILE_SEED_MAX_ZOOM.
+        :type max_zoom: int
+        :return: Number of tiles that are generated.
+        :rtype: int
+        """
+        if max_zoom is None:
+            max_zoom = settings.VECTOR_TILE_SEED_MAX_ZOOM
+        max_zoom = min(max_zoom, self.max_zoom)
+        self.clear_old_versions()
+        extent = self.view.entities_set.aggregate(
+            extent=Extent('geometry')
+        )['extent']
+        if not extent:
+            return 0
+
+        count = 0
+        for z in range(0, max_zoom + 1):
+            min_x, min_y, max_x, max_y = tile_range(extent, z)
+            for x in range(min_x, max_x + 1):
+                for y in range(min_y, max_y + 1):
+                    if self.get(z, x, y) is None:
+                        self.tile(z, x, y)
+                        count += 1
+        return count
@@ -16,28 +16,89 @@ __copyright__ = ('Copyright 2023, Unicef')
 
 from django.db import connection
 
+from geosight.georepo.models.entity_geometry import (
+    EntitySimplifiedGeometry
+)
 from geosight.reference_dataset.models.reference_dataset import (
     ReferenceDataset
 )
 
+# Size of web mercator in meters, for the buffer of tile
+MERCATOR_SIZE = 40075016.6855784
+EXTENT = 4096
+BUFFER = 64
+
 
 def querying_vector_tile(view: ReferenceDataset, z: int, x: int, y: int):
-    """Return vector tile for all entities of view."""
+    """Return vector tile for all entities of view.
+
+    The low zooms are cut from the simplified geometries of the zoom tier,
+    the higher zooms from the full geometry.
+    The entities are filtered by the tile envelope first,
+    on the indexed geometry column of either table.
+
+    :param view: The reference dataset.
+    :type view: ReferenceDataset
+    :param z: Zoom of tile.
+    :type z: int
+    :param x: X of tile.
+    :type x: int
+    :param y: Y of tile.
+    :type y: int
+    :return: List of tile bytes.
+    :rtype: list
+    """
+    tier = EntitySimplifiedGeometry.tier_of_zoom(z)
+    margin = MERCATOR_SIZE / (2 ** z) * BUFFER / EXTENT
+    envelope = f'ST_Expand(ST_TileEnvelope({z}, {x}, {y}), {margin})'
+    entities = f"""
+        SELECT entity.id, ST_Transform(entity.geometry, 3857) AS geometry
+        FROM geosight_georepo_referencelayerviewentity AS ref_entity_view
+            JOIN geosight_georepo_entity
+                AS entity ON ref_entity_view.entity_id = entity.id
+        WHERE ref_entity_view.reference_layer_id={view.id}
+            AND entity.geometry && ST_Transform({envelope}, 4326)
+    """
+    if tier is not None:
+        simplified_table = EntitySimplifiedGeometry._meta.db_table
+        # Fallback to the full geometry when it is not generated yet
+        features = f"""
+            SELECT simplified.entity_id AS id, simplified.geometry
+            FROM {simplified_table} AS simplified
+                JOIN geosight_georepo_referencelayerviewentity
+                    AS ref_entity_view
+                    ON ref_entity_view.entity_id = simplified.entity_id
+            WHERE ref_entity_view.reference_layer_id={view.id}
+                AND simplified.tier = {tier}
+                AND simplified.geometry && {envelope}
+            UNION ALL
+            {entities}
+                AND NOT EXISTS (
+                    SELECT 1 FROM {simplified_table} AS simplified
+                    WHERE simplified.entity_id = entity.id
+                        AND simplified.tier = {tier}
+                )
+        """
+    else:
+        features = entities
+
     sql = f"""
-        WITH mvtgeom AS
+        WITH features AS
+        (
+            {features}
+        ),
+        mvtgeom AS
         (
             SELECT name, name as label, geom_id as ucode,
             concept_uuid, admin_level as level,
                 ST_AsMVTGeom(
-                    ST_Transform(geometry, 3857),
+                    features.geometry,
                     ST_TileEnvelope({z}, {x}, {y}),
-                    extent => 4096, buffer => 64
+                    extent => {EXTENT}, buffer => {BUFFER}
                 ) as geom
-                FROM geosight_georepo_referencelayerviewentity
-                    AS ref_entity_view
-                LEFT JOIN geosight_georepo_entity
-                    AS entity ON ref_entity_view.entity_id = entity.id
-                WHERE ref_entity_view.reference_layer_id={view.id}
+                FROM features
+                JOIN geosight_georepo_entity
+                    AS entity ON features.id = entity.id
         ),
         tiles as (
            SELECT
@@ -57,6 +118,7 @@ def querying_vector_tile(view: ReferenceDataset, z: int, x: int, y: int):
         cursor.execute(sql)
         rows = cursor.fetchall()
         for row in rows:
-            tiles.append(bytes(row[0]))
+            if row[0] is not None:
+                tiles.append(bytes(row[0]))
 
     return tiles